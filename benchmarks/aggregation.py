@@ -0,0 +1,78 @@
+"""Vectorized aggregation vs. a Python loop over executions.
+
+Computes ``AggregateMetrics`` and a 1-second timeline for N executions
+spread over ten minutes, with :func:`aggregate_executions` on
+:class:`ExecutionColumns` and with the per-execution loop it replaces. The
+loop is only timed on a slice and extrapolated, since it takes minutes at
+10M.
+
+Usage::
+
+    python benchmarks/aggregation.py [--count N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models import columnar  # noqa: E402
+from floweb_models.aggregation import aggregate_executions  # noqa: E402
+from floweb_models.columnar import ExecutionColumns  # noqa: E402
+
+DURATION_MS = 600_000
+
+
+def build_columns(count: int) -> ExecutionColumns:
+    rng = np.random.default_rng(5)
+    columns = ExecutionColumns()
+    columns.timestamp = array(
+        "d", np.sort(rng.uniform(0, DURATION_MS, count)) + 1_700_000_000_000
+    )
+    columns.responseTime = array("f", rng.lognormal(4, 0.8, count).astype(np.float32))
+    failed = rng.random(count) < 0.02
+    columns.statusCode = array("H", np.where(failed, 503, 200).astype(np.uint16))
+    columns.success = array("B", (~failed).astype(np.uint8))
+    columns.size = array("I", rng.integers(200, 20_000, count, dtype=np.uint32))
+    columns.error = array("i", np.where(failed, 0, -1).astype(np.int32))
+    columns.errors = ["Service Unavailable"]
+    return columns
+
+
+def timed(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    columns = build_columns(args.count)
+    vectorized = min(timed(lambda: aggregate_executions(columns)) for _ in range(3))
+
+    sample = ExecutionColumns.from_executions(columns[i] for i in range(200_000))
+    columnar._numpy = False
+    try:
+        loop = timed(lambda: aggregate_executions(sample))
+    finally:
+        columnar._numpy = None
+    loop *= args.count / len(sample)
+
+    print(f"{args.count} executions over {DURATION_MS // 1000} s")
+    print(f"python loop (extrapolated) {loop * 1000:10.0f} ms")
+    speedup = loop / vectorized
+    print(f"vectorized                 {vectorized * 1000:10.0f} ms  ({speedup:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
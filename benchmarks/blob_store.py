@@ -0,0 +1,93 @@
+"""Flow size and load/dump time with inline vs. externalized images.
+
+Builds a flow of ``--actions`` actions, each with a ``--image-kb`` KB
+reference image as inline base64, lifts the images into a
+:class:`BlobStore` with :func:`externalize_flow`, and compares the JSON
+size and the time to validate and serialize the flow before and after.
+
+Usage::
+
+    python benchmarks/blob_store.py [--actions N] [--image-kb KB]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.blob_store import BlobStore, externalize_flow  # noqa: E402
+from floweb_models.flow import Flow  # noqa: E402
+
+FLOW = Path(__file__).resolve().parent.parent / "examples" / "flow-example.json"
+
+
+def timed(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=40)
+    parser.add_argument("--image-kb", type=int, default=300)
+    args = parser.parse_args()
+
+    template = json.loads(FLOW.read_text())
+    action = template["actions"][3]
+    actions = []
+    for i in range(args.actions):
+        image = os.urandom(args.image_kb * 1024)
+        config = dict(action["data"]["config"], image=base64.b64encode(image).decode())
+        actions.append(
+            dict(action, id=f"action-{i}", data=dict(action["data"], config=config))
+        )
+    inline_json = json.dumps(dict(template, actions=actions, edges=[]))
+    inline = Flow.model_validate_json(inline_json)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = BlobStore(directory)
+        start = time.perf_counter()
+        migrated = externalize_flow(inline, store)
+        migration = time.perf_counter() - start
+        external_json = migrated.model_dump_json()
+
+        print(
+            f"{args.actions} actions with {args.image_kb} KB images; "
+            f"migration {migration * 1000:.1f} ms"
+        )
+        for name, flow, data in (
+            ("inline", inline, inline_json),
+            ("mediaId", migrated, external_json),
+        ):
+            load = timed(lambda: Flow.model_validate_json(data))
+            dump = timed(flow.model_dump_json)
+            print(
+                f"{name:>8}: {len(data) / 1024:9.1f} KB JSON, "
+                f"validate {load * 1000:7.2f} ms, serialize {dump * 1000:7.2f} ms"
+            )
+        print(f"size ratio {len(inline_json) / len(external_json):.0f}x")
+
+        reference = migrated.actions[0].data.config["image"]
+        start = time.perf_counter()
+        view = store.open(reference)
+        first = view[:8]
+        resolve = time.perf_counter() - start
+        print(
+            f"lazy resolve (mmap + first 8 bytes): {resolve * 1e6:.0f} us, {len(first)} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
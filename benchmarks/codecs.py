@@ -0,0 +1,126 @@
+"""Encode/decode throughput of each codec for the top-level models.
+
+Builds a large ``Flow`` (``--actions`` actions), a ``FlowReport`` with as
+many action results, ``PerformanceTestResults`` with ``--executions``
+executions per request and a ``RunResponse`` carrying the report, then
+times ``dumps`` and ``loads`` (decode plus validation) for every
+installed codec and prints the encoded size, MB/s and operations/s.
+
+Usage::
+
+    python benchmarks/codecs.py [--actions N] [--executions N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.codecs import available_codecs, get_codec  # noqa: E402
+from floweb_models.execution_results import FlowReport  # noqa: E402
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.performance_test import PerformanceTest  # noqa: E402
+from floweb_models.websocket_communication import RunResponse  # noqa: E402
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def timed(function, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_models(actions: int, executions: int) -> dict[str, object]:
+    template = json.loads((EXAMPLES / "flow-example.json").read_text())
+    flow = Flow.model_validate(
+        dict(
+            template,
+            actions=[
+                dict(action, id=f"{action['id']}-{i}")
+                for i in range(actions // len(template["actions"]) + 1)
+                for action in template["actions"]
+            ][:actions],
+        )
+    )
+    report = FlowReport.model_validate(
+        {
+            "flow_id": flow.id,
+            "flow_name": flow.name,
+            "success": True,
+            "start_time": 1705312800000,
+            "end_time": 1705312860000,
+            "variables": {},
+            "output": {},
+            "actions": [
+                {
+                    "node_id": action.id,
+                    "action_type": action.type,
+                    "config": action.data.config,
+                    "start_time": 1705312800000 + i,
+                    "end_time": 1705312800250 + i,
+                    "duration_seconds": 0.25,
+                    "success": True,
+                    "message": "ok",
+                }
+                for i, action in enumerate(flow.actions)
+            ],
+        }
+    )
+    test = json.loads((EXAMPLES / "performance-test-example.json").read_text())
+    for result in test["results"]["requestResults"]:
+        execution = result["executions"][0]
+        result["executions"] = [
+            dict(execution, timestamp=execution["timestamp"] + i)
+            for i in range(executions)
+        ]
+    results = PerformanceTest.model_validate(test).results
+    response = RunResponse(
+        command="run",
+        success=True,
+        mode="full",
+        reports=[{"actions": report.model_dump()["actions"], "output": {}}],
+    )
+    return {
+        "Flow": flow,
+        "FlowReport": report,
+        "PerformanceTestResults": results,
+        "RunResponse": response,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=2000)
+    parser.add_argument("--executions", type=int, default=5000)
+    args = parser.parse_args()
+
+    models = build_models(args.actions, args.executions)
+    names = available_codecs()
+    print(f"codecs: {', '.join(names)}")
+    for label, model in models.items():
+        print(label)
+        for name in names:
+            codec = get_codec(name)
+            data = codec.dumps(model)
+            assert codec.loads(type(model), data) == model
+            encode = timed(lambda: codec.dumps(model))
+            decode = timed(lambda: codec.loads(type(model), data))
+            megabytes = len(data) / 1e6
+            print(
+                f"  {name:>8}: {len(data) / 1024:8.1f} KB  "
+                f"encode {megabytes / encode:7.1f} MB/s {1 / encode:7.1f} ops/s  "
+                f"decode {megabytes / decode:7.1f} MB/s {1 / decode:7.1f} ops/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Columnar executions vs. ``RequestResults.executions`` models.
+
+Loads N executions from the JSON shape both as ``RequestResults`` (one
+``RequestExecution`` model each) and as :class:`ColumnarRequestResults`,
+then computes error rate, status counts and response time percentiles.
+Reports load time, retained memory and aggregate time.
+
+Usage::
+
+    python benchmarks/columnar.py [--count N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from pydantic_core import to_json  # noqa: E402
+
+from floweb_models.columnar import ColumnarRequestResults  # noqa: E402
+from floweb_models.performance_test import RequestResults  # noqa: E402
+
+
+def build_json(count: int) -> bytes:
+    rng = random.Random(3)
+    executions = []
+    for i in range(count):
+        failed = rng.random() < 0.02
+        executions.append(
+            {
+                "timestamp": 1_700_000_000_000.0 + i * 0.5,
+                "statusCode": 503 if failed else 200,
+                "responseTime": round(rng.lognormvariate(4, 0.8), 3),
+                "size": rng.randint(200, 20_000),
+                "success": not failed,
+                "error": "Service Unavailable" if failed else None,
+            }
+        )
+    return to_json(
+        {
+            "requestId": "r1",
+            "url": "https://api.example.com/items",
+            "method": "GET",
+            "executions": executions,
+        }
+    )
+
+
+def model_aggregates(results: RequestResults) -> tuple[float, dict[int, int], float]:
+    executions = results.executions
+    failed = sum(1 for e in executions if not e.success)
+    statuses = dict(Counter(e.statusCode for e in executions))
+    times = sorted(e.responseTime for e in executions)
+    return failed / len(executions), statuses, times[int(0.99 * (len(times) - 1))]
+
+
+def columnar_aggregates(
+    results: ColumnarRequestResults,
+) -> tuple[float, dict[int, int], float]:
+    columns = results.executions
+    return (
+        columns.error_rate(),
+        columns.status_counts(),
+        columns.response_time_metrics().p99,
+    )
+
+
+def measure(label: str, load, aggregate, data: bytes) -> None:
+    gc.collect()
+    tracemalloc.start()
+    results = load(data)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del results
+    gc.collect()
+
+    start = time.perf_counter()
+    results = load(data)
+    loaded = time.perf_counter() - start
+    start = time.perf_counter()
+    aggregate(results)
+    aggregated = time.perf_counter() - start
+    print(
+        f"{label:<12} load {loaded * 1000:8.1f} ms  "
+        f"memory {retained / 1e6:8.1f} MB  aggregates {aggregated * 1000:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500_000)
+    args = parser.parse_args()
+
+    data = build_json(args.count)
+    print(f"{args.count} executions, {len(data) / 1e6:.1f} MB of JSON")
+    measure("models", RequestResults.model_validate_json, model_aggregates, data)
+    measure("columns", ColumnarRequestResults.from_json, columnar_aggregates, data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Per-request cost of credential rotation: merge on send vs. pre-merged.
+
+Compares building the header dict and serializing the request on every
+send (recorded headers merged with the rotated credential) with
+selecting one of the request variants that :class:`CredentialPool` merged
+and :class:`LoadEngine` serialized up front.
+
+Usage::
+
+    python benchmarks/credential_rotation.py [--credentials N] [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.credential_rotation import (  # noqa: E402
+    CredentialPool,
+    merge_headers,
+)
+from floweb_models.http_client import encode_request, split_url  # noqa: E402
+from floweb_models.performance_test import CredentialRotationConfig  # noqa: E402
+
+RECORDED = {
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Content-Type": "application/json",
+    "Cookie": "session=abc123; theme=dark; consent=1",
+    "Origin": "https://app.example.com",
+    "Referer": "https://app.example.com/dashboard",
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36",
+    "X-Requested-With": "XMLHttpRequest",
+    "Authorization": "Bearer recorded",
+}
+OVERRIDE = {"X-Load-Test": "1"}
+BODY = b'{"query": "items", "page": 1}'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--credentials", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    config = CredentialRotationConfig(
+        credentials=[
+            {"headers": {"Authorization": f"Bearer token-{i}", "X-User": f"u{i}"}}
+            for i in range(args.credentials)
+        ]
+    )
+    origin, target = split_url("https://api.example.com/v1/items?limit=50")
+
+    credentials = config.credentials
+    counter = itertools.count()
+
+    def merge_on_send() -> bytes:
+        credential = credentials[next(counter) % len(credentials)]
+        headers = merge_headers(RECORDED, credential.headers, OVERRIDE)
+        return encode_request("POST", origin, target, headers, BODY)
+
+    pool = CredentialPool(config)
+    variants = tuple(
+        encode_request("POST", origin, target, headers, BODY)
+        for headers in pool.merge(RECORDED, OVERRIDE)
+    )
+
+    def pre_merged() -> bytes:
+        return pool.select(variants)
+
+    assert merge_on_send() == variants[0] and pre_merged() == variants[0]
+
+    print(f"{args.credentials} credentials, {len(RECORDED)} recorded headers")
+    baseline = None
+    for name, func in (("merge on send", merge_on_send), ("pre-merged", pre_merged)):
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        per_call = seconds / args.number * 1e9
+        baseline = baseline or per_call
+        print(f"{name:14s} {per_call:8.0f} ns/request  ({baseline / per_call:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
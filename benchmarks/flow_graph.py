@@ -0,0 +1,102 @@
+"""Flow graph index vs. linear scans of ``actions`` / ``edges``.
+
+Walks every action of a large flow and looks up the action itself, its
+successors and its predecessors, once by scanning the flat lists and once
+through :func:`flow_graph` (including the cost of building the index).
+
+Usage::
+
+    python benchmarks/flow_graph.py [--nodes N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.graph import flow_graph, invalidate_flow_graph  # noqa: E402
+
+
+def build_flow(nodes: int) -> Flow:
+    actions = [
+        {
+            "id": f"a{i}",
+            "type": "click",
+            "position": {"x": float(i), "y": 0.0},
+            "data": {"label": f"step {i}", "type": "click", "config": {}},
+        }
+        for i in range(nodes)
+    ]
+    edges = [
+        {"id": f"e{i}", "source": f"a{i}", "target": f"a{i + 1}"}
+        for i in range(nodes - 1)
+    ]
+    # Every tenth node branches, like conditionals with true/false handles.
+    edges += [
+        {
+            "id": f"b{i}",
+            "source": f"a{i}",
+            "sourceHandle": "false",
+            "target": f"a{min(i + 5, nodes - 1)}",
+        }
+        for i in range(0, nodes, 10)
+    ]
+    return Flow.model_validate(
+        {"id": "big", "name": "big", "actions": actions, "edges": edges}
+    )
+
+
+def scan(flow: Flow) -> int:
+    total = 0
+    for action in flow.actions:
+        found = next(a for a in flow.actions if a.id == action.id)
+        successors = [e.target for e in flow.edges if e.source == found.id]
+        predecessors = [e.source for e in flow.edges if e.target == found.id]
+        total += len(successors) + len(predecessors)
+    return total
+
+
+def indexed(flow: Flow) -> int:
+    invalidate_flow_graph(flow)
+    graph = flow_graph(flow)
+    total = 0
+    for action in flow.actions:
+        found = graph.action(action.id)
+        total += len(graph.successors(found.id)) + len(graph.predecessors(found.id))
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    flow = build_flow(args.nodes)
+    assert scan(flow) == indexed(flow)
+
+    build = min(
+        timeit.repeat(
+            lambda: (invalidate_flow_graph(flow), flow_graph(flow)),
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    cached = min(timeit.repeat(lambda: flow_graph(flow), number=1000, repeat=3)) / 1000
+    linear = min(timeit.repeat(lambda: scan(flow), number=1, repeat=args.repeat))
+    index = min(timeit.repeat(lambda: indexed(flow), number=1, repeat=args.repeat))
+
+    print(f"{args.nodes} nodes, {len(flow.edges)} edges")
+    print(f"index build          {build * 1000:10.2f} ms")
+    print(f"cached lookup        {cached * 1e6:10.2f} us")
+    print(f"full walk, scans     {linear * 1000:10.2f} ms")
+    print(f"full walk, index     {index * 1000:10.2f} ms  ({linear / index:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Importing a large HAR export: streaming vs. loading the whole file.
+
+Writes a synthetic HAR file with ``--entries`` entries (``--body`` bytes of
+response text each), then converts it to ``RecordedRequest`` objects once
+with :func:`iter_har` and once with ``json.load`` of the whole document.
+Each run is timed, then repeated under ``tracemalloc`` for peak memory;
+the converted requests are consumed one by one and not kept, as an importer
+that writes them out would.
+
+Usage::
+
+    python benchmarks/har.py [--entries N] [--body BYTES]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.har import har_entry_to_request, iter_har  # noqa: E402
+
+
+def write_har(path: Path, entries: int, body: int) -> None:
+    with open(path, "w") as out:
+        out.write('{"log": {"version": "1.2", "creator": {"name": "bench"},\n')
+        out.write('"entries": [\n')
+        for i in range(entries):
+            entry = {
+                "startedDateTime": "2024-01-15T10:30:00.000Z",
+                "time": 80 + i % 40,
+                "request": {
+                    "method": "GET",
+                    "url": f"https://api.example.com/items/{i}",
+                    "headers": [{"name": "Accept", "value": "application/json"}],
+                },
+                "response": {
+                    "status": 200,
+                    "statusText": "OK",
+                    "headers": [{"name": "Content-Type", "value": "text/plain"}],
+                    "content": {
+                        "size": body,
+                        "mimeType": "text/plain",
+                        "text": "x" * body,
+                    },
+                },
+                "timings": {
+                    "dns": 1,
+                    "connect": 9,
+                    "ssl": 5,
+                    "send": 1,
+                    "wait": 50,
+                    "receive": 3,
+                },
+            }
+            if i:
+                out.write(",\n")
+            json.dump(entry, out, indent=2)
+        out.write("]}}\n")
+
+
+def streamed(path: Path) -> int:
+    return sum(1 for _ in iter_har(path))
+
+
+def whole_file(path: Path) -> int:
+    with open(path) as stream:
+        document = json.load(stream)
+    count = 0
+    for i, entry in enumerate(document["log"]["entries"]):
+        if har_entry_to_request(entry, f"har-{i}") is not None:
+            count += 1
+    return count
+
+
+def measure(run: Callable[[Path], int], path: Path) -> tuple[int, float, float]:
+    start = time.perf_counter()
+    count = run(path)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--body", type=int, default=2_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.har"
+        write_har(path, args.entries, args.body)
+        size = path.stat().st_size
+        print(f"{args.entries} entries, {size / 2**20:.1f} MiB")
+        for name, run in (("json.load", whole_file), ("iter_har", streamed)):
+            count, elapsed, peak = measure(run, path)
+            assert count == args.entries
+            print(
+                f"{name:>9}: {elapsed * 1000:7.1f} ms, " f"peak {peak / 2**20:7.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
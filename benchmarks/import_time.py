@@ -0,0 +1,91 @@
+"""Cold-start import cost of the ``floweb_models`` package, per module.
+
+Every measurement runs in a fresh interpreter so nothing is cached between
+samples. Two numbers are reported for each module:
+
+* ``cold`` - wall time of the import statement in a brand-new process,
+  including pydantic itself.
+* ``own`` - the same import with pydantic already loaded, i.e. the cost of
+  building that module's schemas.
+
+Usage::
+
+    python benchmarks/import_time.py [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PYTHON_MODELS = Path(__file__).resolve().parent.parent / "python-models"
+
+MODULES = [
+    "flow",
+    "performance_test",
+    "action_configs",
+    "environment",
+    "parallel_execution",
+    "websocket_communication",
+    "execution_results",
+    "flow_validation",
+    "debug",
+]
+
+STATEMENTS = {
+    f"floweb_models.{name}": f"import floweb_models.{name}" for name in MODULES
+}
+STATEMENTS["floweb_models (package only)"] = "import floweb_models"
+STATEMENTS["from floweb_models import Flow, ActionResult"] = (
+    "from floweb_models import Flow, ActionResult"
+)
+
+_PYDANTIC = "from pydantic import AnyUrl, AwareDatetime, BaseModel, ConfigDict, Field"
+
+_PROBE = """
+import time
+{preload}
+t0 = time.perf_counter()
+{statement}
+print(time.perf_counter() - t0)
+"""
+
+
+def _sample(statement: str, preload: str) -> float:
+    env = dict(os.environ, PYTHONPATH=str(PYTHON_MODELS), PYTHONDONTWRITEBYTECODE="")
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(preload=preload, statement=statement)],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "?"
+        raise RuntimeError(last)
+    return float(proc.stdout.strip()) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'import':<48} {'cold ms':>10} {'own ms':>10}")
+    for label, statement in STATEMENTS.items():
+        try:
+            cold = statistics.median(_sample(statement, "") for _ in range(args.repeat))
+            own = statistics.median(
+                _sample(statement, _PYDANTIC) for _ in range(args.repeat)
+            )
+        except RuntimeError as exc:
+            print(f"{label:<48} failed: {exc}")
+            continue
+        print(f"{label:<48} {cold:>10.1f} {own:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Incremental vs. full flow validation while editing a large flow.
+
+Compares revalidating the whole flow with applying one edit to an
+:class:`IncrementalFlowValidator`, for a config edit (no structural work)
+and for adding an edge (reachability and cycles recomputed).
+
+Usage::
+
+    python benchmarks/incremental_validation.py [--nodes N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.flow import Action, Edge, Flow  # noqa: E402
+from floweb_models.incremental_validation import (  # noqa: E402
+    FlowChange,
+    IncrementalFlowValidator,
+    validate_flow,
+)
+
+
+def build_flow(nodes: int) -> Flow:
+    actions = [
+        {
+            "id": f"a{i}",
+            "type": "click",
+            "position": {"x": float(i), "y": 0.0},
+            # Every 50th action has no selector, so there are warnings to keep.
+            "data": {
+                "label": f"step {i}",
+                "type": "click",
+                "config": {"selector": "" if i % 50 == 0 else f"#a{i}"},
+            },
+        }
+        for i in range(nodes)
+    ]
+    edges = [
+        {"id": f"e{i}", "source": f"a{i}", "target": f"a{i + 1}"}
+        for i in range(nodes - 1)
+    ]
+    return Flow.model_validate(
+        {"id": "big", "name": "big", "actions": actions, "edges": edges}
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    flow = build_flow(args.nodes)
+    validator = IncrementalFlowValidator(flow)
+    middle = flow.actions[args.nodes // 2]
+    edited = [
+        middle.model_copy(
+            update={"data": middle.data.model_copy(update={"config": config})}
+        )
+        for config in ({"selector": ""}, {"selector": "#new"})
+    ]
+    config_edits = iter(
+        FlowChange(updated_actions=[edited[i % 2]]) for i in range(10**9)
+    )
+    new_edge = Edge(id="extra", source="a0", target=f"a{args.nodes - 1}")
+    edge_edits = iter(
+        (
+            FlowChange(added_edges=[new_edge])
+            if i % 2 == 0
+            else FlowChange(removed_edges=["extra"])
+        )
+        for i in range(10**9)
+    )
+
+    full = min(timeit.repeat(lambda: validate_flow(flow), number=1, repeat=args.repeat))
+    config = (
+        min(
+            timeit.repeat(
+                lambda: validator.apply(next(config_edits)),
+                number=10,
+                repeat=args.repeat,
+            )
+        )
+        / 10
+    )
+    edge = (
+        min(
+            timeit.repeat(
+                lambda: validator.apply(next(edge_edits)), number=10, repeat=args.repeat
+            )
+        )
+        / 10
+    )
+    warnings = len(validator.result().errors)
+
+    print(f"{args.nodes} nodes, {warnings} warnings")
+    print(f"full revalidation    {full * 1000:9.2f} ms")
+    print(f"config edit          {config * 1000:9.2f} ms  ({full / config:.0f}x)")
+    print(f"edge added/removed   {edge * 1000:9.2f} ms  ({full / edge:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Live results snapshots vs. recomputing from every execution.
+
+Feeds N executions into a :class:`LiveResultsAccumulator` and compares the
+cost of one snapshot with rebuilding the same results from the collected
+executions (columns + :func:`aggregate_executions`), as a poll would.
+
+Usage::
+
+    python benchmarks/live_results.py [--count N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.aggregation import aggregate_executions  # noqa: E402
+from floweb_models.columnar import ExecutionColumns  # noqa: E402
+from floweb_models.live_results import LiveResultsAccumulator  # noqa: E402
+from floweb_models.performance_test import RequestExecution  # noqa: E402
+
+T0 = 1_700_000_000_000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500_000)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    events = [
+        RequestExecution.model_construct(
+            timestamp=T0 + i * 0.5,
+            statusCode=200,
+            responseTime=rng.lognormvariate(4, 0.8),
+            size=1000,
+            success=rng.random() > 0.01,
+            error=None,
+        )
+        for i in range(args.count)
+    ]
+
+    live = LiveResultsAccumulator("bench", start_time=T0)
+    ids = [f"r{i}" for i in range(10)]
+    for i, request_id in enumerate(ids):
+        live.add_request(request_id, f"https://example.com/{i}", "GET")
+    start = time.perf_counter()
+    for i, execution in enumerate(events):
+        live.record(ids[i % 10], execution)
+    ingest = time.perf_counter() - start
+
+    start = time.perf_counter()
+    live.snapshot()
+    snapshot = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregate_executions(ExecutionColumns.from_executions(events), start=T0)
+    recompute = time.perf_counter() - start
+
+    print(f"{args.count} executions")
+    print(f"ingest               {ingest / args.count * 1e6:8.2f} us/event")
+    print(f"snapshot             {snapshot * 1000:8.2f} ms")
+    print(f"full recompute       {recompute * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
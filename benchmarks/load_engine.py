@@ -0,0 +1,86 @@
+"""Load engine request rate with and without connection pooling.
+
+Runs a :class:`LoadEngine` against an in-process HTTP server for a few
+seconds, once with keep-alive connection reuse and once opening a new
+connection per request, and reports the achieved request rate.
+
+Usage::
+
+    python benchmarks/load_engine.py [--users N] [--seconds S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.http_client import HttpClient  # noqa: E402
+from floweb_models.load_engine import LoadEngine  # noqa: E402
+from floweb_models.performance_test import (  # noqa: E402
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+)
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(RESPONSE)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def measure(users: int, seconds: float, pooled: bool) -> float:
+    server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+    port = server.sockets[0].getsockname()[1]
+    configuration = LoadTestConfiguration(
+        targetUrl=f"http://127.0.0.1:{port}",
+        duration=1,
+        virtualUsers=users,
+        includeRequests=["r"],
+        thresholds=LoadTestThresholds(
+            maxResponseTime=1000, maxErrorRate=1, minThroughput=0
+        ),
+    )
+    request = RecordedRequest(
+        id="r",
+        url="http://recorded/api",
+        method="GET",
+        headers={"Accept": "*/*"},
+        timestamp=0,
+        resourceType="fetch",
+    )
+    client = HttpClient(max_idle_per_origin=users if pooled else 0)
+    engine = LoadEngine(configuration, [request], duration=seconds, client=client)
+    report = await engine.run()
+    await client.close()
+    server.close()
+    await server.wait_closed()
+    return report.achieved_rps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    fresh = asyncio.run(measure(args.users, args.seconds, pooled=False))
+    pooled = asyncio.run(measure(args.users, args.seconds, pooled=True))
+    print(f"{args.users} users, {args.seconds:g} s per run")
+    print(f"new connection per request: {fresh:9.0f} req/s")
+    print(f"pooled keep-alive:          {pooled:9.0f} req/s  ({pooled / fresh:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Loop detection scaling on large flows.
+
+Runs :func:`detect_loops` on flows of growing size made of chained cycles,
+each closed by a conditional, and reports time per node so non-linear
+behaviour shows up as a growing per-node cost.
+
+Usage::
+
+    python benchmarks/loop_detection.py [--sizes N,N,...] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.graph import invalidate_flow_graph  # noqa: E402
+from floweb_models.loop_detection import detect_loops  # noqa: E402
+
+CYCLE = 10
+
+
+def build_flow(nodes: int) -> Flow:
+    actions = []
+    edges = []
+    for i in range(nodes):
+        closes_cycle = i % CYCLE == CYCLE - 1
+        action_type = "conditional" if closes_cycle else "click"
+        actions.append(
+            {
+                "id": f"a{i}",
+                "type": action_type,
+                "position": {"x": float(i), "y": 0.0},
+                "data": {"label": f"a{i}", "type": action_type, "config": {}},
+            }
+        )
+        if i + 1 < nodes:
+            edges.append({"id": f"e{i}", "source": f"a{i}", "target": f"a{i + 1}"})
+        if closes_cycle:
+            start = i - CYCLE + 1
+            edges.append({"id": f"b{i}", "source": f"a{i}", "target": f"a{start}"})
+    return Flow.model_validate(
+        {"id": "big", "name": "big", "actions": actions, "edges": edges}
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,5000,20000,50000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>8} {'loops':>6} {'total ms':>10} {'us/node':>8}")
+    for nodes in map(int, args.sizes.split(",")):
+        flow = build_flow(nodes)
+
+        def run() -> None:
+            invalidate_flow_graph(flow)
+            detect_loops(flow)
+
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        loops = detect_loops(flow).totalLoops
+        print(f"{nodes:>8} {loops:>6} {best * 1000:>10.2f} {best / nodes * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
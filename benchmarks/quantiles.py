@@ -0,0 +1,106 @@
+"""Streaming quantile sketch vs. collecting and sorting response times.
+
+Builds ``ResponseTimeMetrics`` for N lognormal response times, once by
+keeping every value in a list and sorting it, once with
+:class:`QuantileSketch`, and reports time, retained memory and the worst
+relative error of the sketch's percentiles. The values are shared with the
+input stream, so the list's memory leaves out the 24 bytes per float object
+a real collector would also keep alive.
+
+Usage::
+
+    python benchmarks/quantiles.py [--count N] [--workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.performance_test import ResponseTimeMetrics  # noqa: E402
+from floweb_models.quantiles import QuantileSketch  # noqa: E402
+
+
+def sorted_metrics(values: list[float]) -> ResponseTimeMetrics:
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def at(q: float) -> float:
+        return ordered[int(q * (n - 1))]
+
+    return ResponseTimeMetrics(
+        min=ordered[0],
+        max=ordered[-1],
+        mean=sum(ordered) / n,
+        median=at(0.5),
+        p90=at(0.9),
+        p95=at(0.95),
+        p99=at(0.99),
+    )
+
+
+def measure(label: str, build) -> ResponseTimeMetrics:
+    start = time.perf_counter()
+    _, metrics = build()
+    elapsed = time.perf_counter() - start
+    # Separate run: tracing allocations slows the build down.
+    tracemalloc.start()
+    result = build()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    print(f"{label:<26} {elapsed * 1000:9.1f} ms {retained / 1e6:9.2f} MB")
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    stream = [rng.lognormvariate(4, 1.0) for _ in range(args.count)]
+
+    def collect():
+        values = []
+        for value in stream:
+            values.append(value)
+        return values, sorted_metrics(values)
+
+    def sketch():
+        s = QuantileSketch()
+        s.update(stream)
+        return s, s.to_metrics()
+
+    def merged():
+        size = -(-args.count // args.workers)
+        parts = []
+        for start in range(0, args.count, size):
+            part = QuantileSketch()
+            part.update(stream[start : start + size])
+            parts.append(QuantileSketch.from_bytes(part.to_bytes()))
+        total = QuantileSketch()
+        for part in parts:
+            total.merge(part)
+        return total, total.to_metrics()
+
+    print(f"{args.count} values")
+    exact = measure("list + sort", collect)
+    approx = measure("sketch", sketch)
+    measure(f"{args.workers} sketches, serialized", merged)
+    error = max(
+        abs(getattr(approx, f) - getattr(exact, f)) / getattr(exact, f)
+        for f in ("median", "p90", "p95", "p99")
+    )
+    print(f"worst percentile error     {error:.3%}")
+
+
+if __name__ == "__main__":
+    main()
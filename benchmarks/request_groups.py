@@ -0,0 +1,94 @@
+"""Grouping recorded traffic: replay plan size before and after.
+
+Builds a synthetic scan of ``--count`` recorded requests to 40 endpoints
+(ids in paths, varying query values, polling), groups them with
+:func:`group_requests`, and builds a :class:`LoadEngine` replay plan from
+the raw recording and from the grouped one.
+
+Usage::
+
+    python benchmarks/request_groups.py [--count N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.load_engine import LoadEngine  # noqa: E402
+from floweb_models.performance_test import (  # noqa: E402
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+)
+from floweb_models.request_groups import group_requests  # noqa: E402
+
+
+def make_requests(count: int, rng: random.Random) -> list[RecordedRequest]:
+    requests = []
+    for i in range(count):
+        endpoint = rng.randrange(40)
+        kind = endpoint % 4
+        if kind == 0:
+            url = f"https://api.example.com/e{endpoint}/status"
+        elif kind == 1:
+            url = f"https://api.example.com/e{endpoint}/items/{rng.randrange(10**6)}"
+        elif kind == 2:
+            url = f"https://api.example.com/e{endpoint}/search?q=t{rng.randrange(99)}&page={rng.randrange(9)}"
+        else:
+            url = f"https://api.example.com/e{endpoint}/users/{rng.getrandbits(64):016x}/feed"
+        requests.append(
+            RecordedRequest(
+                id=f"r{i}",
+                url=url,
+                method="GET",
+                headers={"Accept": "application/json", "X-Trace": str(i)},
+                timestamp=i,
+                resourceType="fetch",
+            )
+        )
+    return requests
+
+
+def plan(requests: list[RecordedRequest]) -> float:
+    config = LoadTestConfiguration(
+        targetUrl="https://api.example.com",
+        duration=60,
+        virtualUsers=10,
+        includeRequests=[request.id for request in requests],
+        thresholds=LoadTestThresholds(
+            maxResponseTime=1000, maxErrorRate=1, minThroughput=0
+        ),
+    )
+    start = time.perf_counter()
+    LoadEngine(config, requests)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    requests = make_requests(args.count, random.Random(3))
+    start = time.perf_counter()
+    groups = group_requests(requests)
+    grouping = time.perf_counter() - start
+    grouped = [group.request for group in groups]
+    assert sum(group.weight for group in groups) == args.count
+
+    print(
+        f"{args.count} recorded requests -> {len(groups)} groups "
+        f"in {grouping * 1000:.1f} ms ({grouping / args.count * 1e6:.2f} us/request)"
+    )
+    print(f"replay plan, recorded: {plan(requests) * 1000:8.1f} ms")
+    print(f"replay plan, grouped:  {plan(grouped) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
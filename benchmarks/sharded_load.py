@@ -0,0 +1,115 @@
+"""Scaling of sharded load generation with the number of worker processes.
+
+Starts a stand-in HTTP server on ``--server-processes`` processes sharing one
+port (``SO_REUSEPORT``), then runs the same saturating load test (no think
+time) with 1, 2, 4, ... worker processes and reports the merged request rate
+and the scaling efficiency relative to one worker. Efficiency is bounded by
+the number of CPU cores, which the server processes share.
+
+Usage::
+
+    python benchmarks/sharded_load.py [--users N] [--seconds S] [--max-workers N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.performance_test import (  # noqa: E402
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+)
+from floweb_models.sharded_load import run_sharded_load_test  # noqa: E402
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(RESPONSE)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def serve(sock: socket.socket) -> None:
+    async def main() -> None:
+        server = await asyncio.start_server(handle, sock=sock, backlog=1024)
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--seconds", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--server-processes", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    servers = [
+        multiprocessing.Process(target=serve, args=(sock,), daemon=True)
+        for _ in range(args.server_processes)
+    ]
+    for server in servers:
+        server.start()
+
+    configuration = LoadTestConfiguration(
+        targetUrl=f"http://127.0.0.1:{port}",
+        duration=args.seconds,
+        virtualUsers=args.users,
+        includeRequests=["r"],
+        thresholds=LoadTestThresholds(
+            maxResponseTime=10_000, maxErrorRate=1, minThroughput=0
+        ),
+    )
+    request = RecordedRequest(
+        id="r",
+        url="http://recorded/api",
+        method="GET",
+        headers={"Accept": "*/*"},
+        timestamp=0,
+        resourceType="fetch",
+    )
+
+    print(
+        f"{args.users} users, {args.seconds} s per run, "
+        f"{args.server_processes} server processes, {os.cpu_count()} CPUs"
+    )
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        results = run_sharded_load_test(configuration, [request], workers=workers)
+        rps = results.metrics.throughput
+        baseline = baseline or rps
+        efficiency = rps / (baseline * workers)
+        print(
+            f"{workers:3d} workers: {rps:9.0f} req/s  "
+            f"speedup {rps / baseline:4.2f}x  efficiency {efficiency:5.1%}  "
+            f"p95 {results.metrics.responseTime.p95:.1f} ms"
+        )
+        workers *= 2
+
+    for server in servers:
+        server.kill()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Rendering request templates: compiled parts vs. ``re.sub`` per render.
+
+Renders the URL, header values and body of the login request from
+``examples/performance-test-example.json`` (with a few extra templated
+headers) for ``--number`` different users, once with a precompiled
+:class:`RequestTemplate` and once substituting every string with
+``re.sub`` and a replacement callback.
+
+Usage::
+
+    python benchmarks/templates.py [--number N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "python-models"))
+
+from floweb_models.performance_test import PerformanceTest  # noqa: E402
+from floweb_models.templates import RequestTemplate  # noqa: E402
+
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][\w.-]*)\s*\}\}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    test = PerformanceTest.model_validate_json(
+        (ROOT / "examples" / "performance-test-example.json").read_text()
+    )
+    request = test.recordedRequests[0].model_copy(
+        update={
+            "headers": {
+                **test.recordedRequests[0].headers,
+                "X-Session": "{{session}}",
+                "X-Trace": "trace-{{user}}-{{session}}",
+                "Accept": "application/json",
+            }
+        }
+    )
+    rows = [
+        {
+            "email": f"user{i}@example.com",
+            "password": f"secret-{i}",
+            "session": f"s{i:08d}",
+            "user": str(i),
+        }
+        for i in range(args.number)
+    ]
+
+    url = str(request.url)
+    headers = dict(request.headers)
+    body = request.body or ""
+
+    def with_re_sub(values: dict[str, str]) -> tuple:
+        def replace(match: re.Match[str]) -> str:
+            return values[match[1]]
+
+        return (
+            PLACEHOLDER.sub(replace, url),
+            {name: PLACEHOLDER.sub(replace, value) for name, value in headers.items()},
+            PLACEHOLDER.sub(replace, body),
+        )
+
+    template = RequestTemplate(request)
+    assert template.render(rows[0]) == with_re_sub(rows[0])
+
+    print(f"{args.number} renders, {len(template.names)} variables")
+    timings = {}
+    for name, render in (("re.sub", with_re_sub), ("compiled", template.render)):
+        start = time.perf_counter()
+        for values in rows:
+            render(values)
+        timings[name] = time.perf_counter() - start
+    base = timings["re.sub"]
+    for name, seconds in timings.items():
+        print(
+            f"{name:9s} {seconds * 1000:8.1f} ms  "
+            f"{seconds / args.number * 1e6:6.2f} us/render  ({base / seconds:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Filtering captured requests: compiled matcher vs. pattern-by-pattern.
+
+Checks ``--count`` synthetic SPA request URLs against ``filterPatterns``
+lists of growing size plus ``onlySameDomain``, once with
+:class:`TrafficFilter` and once the straightforward way (``urlsplit`` per
+URL and ``fnmatch`` per pattern).
+
+Usage::
+
+    python benchmarks/traffic_filter.py [--count N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import random
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.traffic_filter import TrafficFilter  # noqa: E402
+
+TARGET = "https://www.example.com/app"
+HOSTS = ["www.example.com", "api.example.com", "cdn.jsdelivr.net", "fonts.gstatic.com"]
+EXTS = [".js", ".css", ".png", ".svg", ".json", ""]
+
+
+def make_patterns(count: int, rng: random.Random) -> list[str]:
+    base = ["*.js", "*.css", "*.png", "*.jpg", "*.woff2", "*/analytics/*"]
+    extra = [
+        rng.choice(
+            [
+                f"*.ext{i}",
+                f"https://tracker{i}.example.org/*",
+                f"*/beacon{i}/*",
+            ]
+        )
+        for i in range(count - len(base))
+    ]
+    return (base + extra)[:count]
+
+
+def naive_allows(url: str, patterns: list[str], domain: str) -> bool:
+    host = (urlsplit(url).hostname or "").lower()
+    if host != domain and not host.endswith("." + domain):
+        return False
+    path = url.split("?", 1)[0]
+    return not any(fnmatch.fnmatchcase(path, pattern) for pattern in patterns)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    urls = [
+        f"https://{rng.choice(HOSTS)}/static/chunk-{i % 500}{rng.choice(EXTS)}"
+        f"?v={i % 7}"
+        for i in range(args.count)
+    ]
+    domain = "example.com"
+    fnmatch._compile_pattern.cache_clear()  # Cold start like a new scan.
+
+    print(f"{args.count} URLs")
+    for size in (10, 100, 1000):
+        patterns = make_patterns(size, rng)
+        start = time.perf_counter()
+        traffic = TrafficFilter(patterns, target_url=TARGET, same_domain=True)
+        compiled = [traffic.allows(url) for url in urls]
+        fast = time.perf_counter() - start
+        start = time.perf_counter()
+        naive = [naive_allows(url, patterns, domain) for url in urls]
+        slow = time.perf_counter() - start
+        assert compiled == naive
+        print(
+            f"{size:5d} patterns: pattern-by-pattern {slow * 1000:8.1f} ms, "
+            f"compiled {fast * 1000:6.1f} ms ({slow / fast:.0f}x), "
+            f"kept {sum(compiled)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Trusted loading vs. full validation for flows and reports.
+
+Compares ``Model.model_validate_json`` with ``from_trusted_json`` on
+
+* a flow library (many small flows, only listing fields read),
+* one large flow,
+* a large ``FlowReport``,
+
+and reports the trusted cost both right after loading and after every
+deferred field has been materialized. The ``summary`` rows load the same
+documents, written with ``summary_first_json``, with ``summary_from_json``.
+
+Usage::
+
+    python benchmarks/trusted_loading.py [--flows N] [--actions N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.execution_results import FlowReport  # noqa: E402
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.trusted import (  # noqa: E402
+    from_trusted_json,
+    summary_first_json,
+    summary_from_json,
+)
+
+TIMESTAMP = "2024-01-15T09:30:00Z"
+
+
+def build_flow(index: int, actions: int) -> bytes:
+    flow = {
+        "id": f"flow-{index}",
+        "name": f"Flow {index}",
+        "tags": ["regression", "login"],
+        "type": "test",
+        "createdAt": TIMESTAMP,
+        "updatedAt": TIMESTAMP,
+        "lastRun": TIMESTAMP,
+        "lastResult": "passed",
+        "actions": [
+            {
+                "id": f"a{i}",
+                "type": "click",
+                "position": {"x": i * 10.0, "y": 50.0},
+                "data": {
+                    "label": f"Click {i}",
+                    "type": "click",
+                    "config": {"selector": f"#btn-{i}", "waitTime": 1000},
+                },
+            }
+            for i in range(actions)
+        ],
+        "edges": [
+            {"id": f"e{i}", "source": f"a{i}", "target": f"a{i + 1}"}
+            for i in range(actions - 1)
+        ],
+        "environment": {
+            "id": "env",
+            "name": "staging",
+            "variables": [
+                {"id": f"v{i}", "name": f"var_{i}", "type": "string", "value": "x"}
+                for i in range(10)
+            ],
+            "createdAt": TIMESTAMP,
+        },
+    }
+    return json.dumps(flow).encode()
+
+
+def build_report(actions: int) -> bytes:
+    report = {
+        "flow_id": "flow-1",
+        "flow_name": "Checkout",
+        "success": True,
+        "start_time": 1705312800000,
+        "end_time": 1705312860000,
+        "variables": {"input": [], "output": []},
+        "output": {},
+        "actions": [
+            {
+                "node_id": f"a{i}",
+                "action_type": "click",
+                "config": {"selector": f"#btn-{i}"},
+                "start_time": 1705312800000 + i,
+                "end_time": 1705312800001 + i,
+                "duration_seconds": 0.001,
+                "success": True,
+                "message": "ok",
+                "data": {"attempts": 1},
+            }
+            for i in range(actions)
+        ],
+    }
+    return json.dumps(report).encode()
+
+
+def summary_first(model: Any, payload: bytes) -> bytes:
+    return summary_first_json(model.model_validate_json(payload)).encode()
+
+
+def _best(func: Callable[[], Any], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def _row(label: str, full: float, trusted: float, materialized: float) -> None:
+    print(
+        f"{label:<28} {full * 1000:9.1f} {trusted * 1000:9.1f} "
+        f"{materialized * 1000:9.1f} {full / trusted:7.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--flows", type=int, default=10_000)
+    parser.add_argument("--actions", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'workload':<28} {'full ms':>9} {'trusted':>9} {'+all':>9} {'speedup':>8}")
+
+    library = [build_flow(i, 20) for i in range(args.flows)]
+
+    def listing(load: Callable[[bytes], Flow]) -> list[tuple[Any, ...]]:
+        return [(f.id, f.name, f.lastResult) for f in map(load, library)]
+
+    _row(
+        f"list {args.flows} flows",
+        _best(lambda: listing(Flow.model_validate_json), args.repeat),
+        _best(lambda: listing(lambda b: from_trusted_json(Flow, b)), args.repeat),
+        _best(
+            lambda: [from_trusted_json(Flow, b).materialize() for b in library],
+            args.repeat,
+        ),
+    )
+
+    summaries = [summary_first(Flow, payload) for payload in library]
+    _row(
+        f"list {args.flows} flows, summary",
+        _best(lambda: listing(Flow.model_validate_json), args.repeat),
+        _best(
+            lambda: [
+                (f.id, f.name, f.lastResult)
+                for f in (summary_from_json(Flow, b) for b in summaries)
+            ],
+            args.repeat,
+        ),
+        _best(
+            lambda: [summary_from_json(Flow, b).materialize() for b in summaries],
+            args.repeat,
+        ),
+    )
+
+    for label, model, payload in (
+        (f"flow, {args.actions} actions", Flow, build_flow(0, args.actions)),
+        (f"report, {args.actions} actions", FlowReport, build_report(args.actions)),
+    ):
+        for suffix, load, data in (
+            ("", from_trusted_json, payload),
+            (", summary", summary_from_json, summary_first(model, payload)),
+        ):
+
+            def materialized(
+                model: Any = model, load: Any = load, data: bytes = data
+            ) -> None:
+                instance = load(model, data)
+                if hasattr(instance, "materialize"):
+                    instance.materialize()
+
+            _row(
+                label + suffix,
+                _best(lambda: model.model_validate_json(payload), args.repeat),
+                _best(lambda: load(model, data), args.repeat),
+                _best(materialized, args.repeat),
+            )
+
+
+if __name__ == "__main__":
+    main()
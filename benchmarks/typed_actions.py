@@ -0,0 +1,114 @@
+"""Typed action configs: discriminated dispatch vs. the plain config union.
+
+Validates a 500-action flow two ways:
+
+* ``plain union`` - ``Flow`` followed by validating every ``data.config``
+  against the untagged union used by ``ActionConfigurations``, which is
+  what executors re-parsing configs end up doing;
+* ``typed`` - ``TypedFlow``, which picks the config model from
+  ``data.type``.
+
+It also reports how many configs the plain union resolved to a different
+model than the one their action type calls for.
+
+Usage::
+
+    python benchmarks/typed_actions.py [--actions N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from floweb_models.action_configs import ActionConfigurations  # noqa: E402
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.typed_actions import ACTION_CONFIG_TYPES, TypedFlow  # noqa: E402
+
+SAMPLE_CONFIGS: dict[str, dict[str, Any]] = {
+    "navigate": {"url": "https://example.com/login", "waitForLoad": True},
+    "click": {"selector": "#submit", "clickType": "left", "clickCount": 1},
+    "input": {"selector": "#email", "text": "{{email}}", "clearFirst": True},
+    "wait": {"waitType": "element", "selector": ".dashboard", "timeout": 5000},
+    "scroll": {},
+    "assertion": {"selector": "h1", "expectedValue": "Welcome"},
+    "assert_visible": {"selector": ".toast"},
+    "clear_input": {"selector": "#search"},
+    "conditional": {"condition": "x > 1", "operator": ">", "value": 1},
+    "loop": {"loopType": "count", "count": 3, "condition": "true"},
+    "custom_code": {"code": "return 1"},
+    "drag_and_drop": {"sourceSelector": "#a", "targetSelector": "#b"},
+    "call_to_flow": {"flowId": "flow-2"},
+    "set_viewport": {"width": 1280, "height": 720},
+    "get_page_info": {"outputVariable": "info"},
+}
+
+
+def build_flow(size: int) -> dict[str, Any]:
+    types = list(SAMPLE_CONFIGS)
+    actions = []
+    for i in range(size):
+        action_type = types[i % len(types)]
+        actions.append(
+            {
+                "id": f"action-{i}",
+                "type": action_type,
+                "position": {"x": i * 10.0, "y": 100.0},
+                "data": {
+                    "label": f"{action_type} {i}",
+                    "type": action_type,
+                    "config": dict(SAMPLE_CONFIGS[action_type]),
+                },
+            }
+        )
+    edges = [
+        {"id": f"e-{i}", "source": f"action-{i}", "target": f"action-{i + 1}"}
+        for i in range(size - 1)
+    ]
+    return {"id": "bench", "name": "bench", "actions": actions, "edges": edges}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    raw = build_flow(args.actions)
+    plain_union = TypeAdapter(
+        ActionConfigurations.model_fields["actionConfigs"].annotation
+    ).validate_python
+
+    def plain() -> list[Any]:
+        flow = Flow.model_validate(raw)
+        configs = plain_union({a.id: a.data.config for a in flow.actions})
+        return [configs[a.id] for a in flow.actions]
+
+    def typed() -> list[Any]:
+        return [a.data.config for a in TypedFlow.model_validate(raw).actions]
+
+    mismatched = sum(
+        type(config) is not ACTION_CONFIG_TYPES[action["data"]["type"]]
+        for config, action in zip(plain(), raw["actions"])
+    )
+
+    results = {}
+    for label, func in (("plain union", plain), ("typed", typed)):
+        best = min(timeit.repeat(func, number=1, repeat=args.repeat))
+        results[label] = best
+        print(f"{label:<12} {best * 1000:8.2f} ms / {args.actions}-action flow")
+    print(f"speedup      {results['plain union'] / results['typed']:8.2f}x")
+    print(
+        f"plain union resolved {mismatched}/{args.actions} configs to the wrong model"
+    )
+
+
+if __name__ == "__main__":
+    main()
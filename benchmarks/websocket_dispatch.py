@@ -0,0 +1,105 @@
+"""WebSocket frame parsing: discriminated dispatch vs. the untagged unions.
+
+Parses a mix of realtime-action, debug and engine-status frames with the
+command/response unions declared on ``WebsocketCommunication`` and with
+``parse_command`` / ``parse_response``.
+
+Usage::
+
+    python benchmarks/websocket_dispatch.py [--frames N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, get_args
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from floweb_models.websocket_communication import WebsocketCommunication  # noqa: E402
+from floweb_models.websocket_dispatch import parse_command, parse_response  # noqa: E402
+
+COMMAND_FRAMES = [
+    {"command": "get_realtime_actions", "session_id": "rec-1"},
+    {"command": "get_latest_realtime_action", "session_id": "rec-1"},
+    {"command": "debug_step", "session_id": "dbg-1"},
+    {"command": "debug_continue", "session_id": "dbg-1"},
+    {"command": "get_engine_status"},
+]
+
+RESPONSE_FRAMES = [
+    {
+        "command": "debug_step",
+        "success": True,
+        "session_id": "dbg-1",
+        "state": "paused",
+    },
+    {
+        "command": "get_engine_status",
+        "success": True,
+        "status": "ok",
+        "uptime": 12,
+        "active_sessions": 2,
+    },
+    {"command": "stop_recording", "success": True, "session_id": "rec-1"},
+    {"command": "list_recordings", "success": True, "recordings": []},
+]
+
+
+def _untagged(field: str) -> TypeAdapter[Any]:
+    annotation = WebsocketCommunication.model_fields[field].annotation
+    list_type = get_args(annotation)[0]
+    return TypeAdapter(get_args(list_type)[0])
+
+
+def _frames(templates: list[dict[str, Any]], count: int) -> list[bytes]:
+    return [json.dumps(templates[i % len(templates)]).encode() for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            "commands",
+            _frames(COMMAND_FRAMES, args.frames),
+            _untagged("commands"),
+            parse_command,
+        ),
+        (
+            "responses",
+            _frames(RESPONSE_FRAMES, args.frames),
+            _untagged("responses"),
+            parse_response,
+        ),
+    ]
+    for label, frames, untagged, dispatch in cases:
+        old = min(
+            timeit.repeat(
+                lambda: [untagged.validate_json(f) for f in frames],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        new = min(
+            timeit.repeat(
+                lambda: [dispatch(f) for f in frames], number=1, repeat=args.repeat
+            )
+        )
+        print(
+            f"{label:<10} untagged {old / len(frames) * 1e6:6.2f} us/frame  "
+            f"dispatch {new / len(frames) * 1e6:6.2f} us/frame  ({old / new:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
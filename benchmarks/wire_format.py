@@ -0,0 +1,149 @@
+"""Bytes on the wire and latency of compact frames vs. JSON messages.
+
+Replays a debug session of ``--updates`` ``DebugActionUpdate`` messages,
+``--polls`` rounds of engine-status and realtime-action polling (commands
+and replies with ``--actions`` recorded actions), through a compact
+:class:`Channel` pair and through a JSON one (``model_dump_json`` and
+the ``websocket_dispatch`` parsers), and prints the total bytes and the
+per-message encode and decode time of each.
+
+Usage::
+
+    python benchmarks/wire_format.py [--updates N] [--polls N] [--actions N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "python-models"))
+
+from floweb_models.debug import DebugActionUpdate  # noqa: E402
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.websocket_communication import (  # noqa: E402
+    EngineStatusResponse,
+    GetEngineStatusCommand,
+    GetLatestRealtimeActionCommand,
+)
+from floweb_models.wire_format import (  # noqa: E402
+    COMPACT_PROTOCOL,
+    JSON_PROTOCOL,
+    Channel,
+    RealtimeActionsResponse,
+)
+
+FLOW = Path(__file__).resolve().parent.parent / "examples" / "flow-example.json"
+SESSION = "debug-3f2a9c1e-7b4d-4e8a-9f61-0c5d2b8e7a13"
+RECORDING = "rec-6e1f0a2b-93c4-4d57-8a6e-1b2c3d4e5f60"
+FLOW_ID = "flow-b7e2d1c4-5a6f-4b8e-9c0d-1e2f3a4b5c6d"
+
+
+def build_messages(updates: int, polls: int, actions: int) -> list[object]:
+    flow = Flow.model_validate_json(FLOW.read_bytes())
+    recorded = [
+        action.model_copy(update={"id": f"{action.id}-{i}"})
+        for i in range(actions // len(flow.actions) + 1)
+        for action in flow.actions
+    ][:actions]
+    messages: list[object] = []
+    cycle = ("debug_action_started", "debug_action_completed")
+    for i in range(updates):
+        kind = cycle[i % 2]
+        messages.append(
+            DebugActionUpdate(
+                type=kind,
+                sessionId=SESSION,
+                actionId=f"action-{i // 2 % 40}",
+                actionIndex=i // 2 % 40,
+                state="running",
+                result={"success": True, "duration": 0.125} if i % 2 else None,
+            )
+        )
+    for i in range(polls):
+        messages.append(GetEngineStatusCommand(command="get_engine_status"))
+        messages.append(
+            EngineStatusResponse(
+                command="get_engine_status",
+                success=True,
+                status="running",
+                uptime=3600 + i,
+                active_sessions=3,
+            )
+        )
+        messages.append(
+            GetLatestRealtimeActionCommand(
+                command="get_latest_realtime_action",
+                session_id=RECORDING,
+                flow_id=FLOW_ID,
+            )
+        )
+        messages.append(
+            RealtimeActionsResponse(
+                command="get_latest_realtime_action",
+                success=True,
+                session_id=RECORDING,
+                actions=recorded[i % actions : i % actions + 1],
+            )
+        )
+    messages.append(
+        RealtimeActionsResponse(
+            command="get_realtime_actions",
+            success=True,
+            session_id=RECORDING,
+            actions=recorded,
+        )
+    )
+    return messages
+
+
+def replay(protocol: str, messages: list[object]) -> tuple[int, float, float]:
+    """Bytes, best encode and best decode time of ``messages`` in order."""
+    best_encode = best_decode = float("inf")
+    for _ in range(3):
+        # Fresh channels each time: the intern tables are per connection.
+        sender, receiver = Channel(protocol), Channel(protocol)
+        start = time.perf_counter()
+        frames = [sender.encode(message) for message in messages]
+        best_encode = min(best_encode, time.perf_counter() - start)
+        start = time.perf_counter()
+        decoded = [receiver.decode(frame) for frame in frames]
+        best_decode = min(best_decode, time.perf_counter() - start)
+        assert decoded == messages
+    size = sum(
+        len(frame.encode()) if isinstance(frame, str) else len(frame)
+        for frame in frames
+    )
+    return size, best_encode, best_decode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--polls", type=int, default=5000)
+    parser.add_argument("--actions", type=int, default=200)
+    args = parser.parse_args()
+
+    messages = build_messages(args.updates, args.polls, args.actions)
+    streams = {
+        "debug updates": messages[: args.updates],
+        "polling": messages[args.updates :],
+    }
+    for label, stream in streams.items():
+        print(f"{label} ({len(stream)} messages)")
+        sizes = {}
+        for name, protocol in (("json", JSON_PROTOCOL), ("compact", COMPACT_PROTOCOL)):
+            size, encode, decode = replay(protocol, stream)
+            sizes[name] = size
+            print(
+                f"  {name:>8}: {size / len(stream):7.1f} B/msg, "
+                f"encode {encode / len(stream) * 1e6:6.2f} us/msg, "
+                f"decode {decode / len(stream) * 1e6:6.2f} us/msg"
+            )
+        print(f"  bytes on the wire: {sizes['compact'] / sizes['json']:.0%} of JSON")
+
+
+if __name__ == "__main__":
+    main()
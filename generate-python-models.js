@@ -3,6 +3,11 @@
 /**
  * Generate Python Pydantic models from JSON schemas
  * This script generates Python models that can be used in the backend
+ *
+ * Usage:
+ *   node generate-python-models.js          Regenerate all models
+ *   node generate-python-models.js --check  Only run the import guard on the
+ *                                           existing models (no rewriting)
  */
 
 const { execSync } = require('child_process');
@@ -11,6 +16,7 @@ const path = require('path');
 
 const schemasDir = path.join(__dirname, 'schemas');
 const outputDir = path.join(__dirname, 'python-models', 'floweb_models');
+const checkOnly = process.argv.includes('--check');
 
 // Ensure output directory exists
 if (!fs.existsSync(outputDir)) {
@@ -30,12 +36,165 @@ const schemaFiles = [
   'debug.json'
 ];
 
+// Third-party packages generated models may import; everything else must be stdlib
+const allowedPackages = new Set(['pydantic', 'pydantic_core', 'typing_extensions']);
+
+let stdlibModules = null;
+
+function getStdlibModules() {
+  if (stdlibModules === null) {
+    const output = execSync(
+      'python3 -c "import sys; print(\'\\n\'.join(sorted(sys.stdlib_module_names)))"',
+      { encoding: 'utf8' }
+    );
+    stdlibModules = new Set(output.split('\n').filter(Boolean));
+  }
+  return stdlibModules;
+}
+
+/**
+ * Parse the top-level import statements of a generated module.
+ * Returns [{ start, end, module, names: [{ name, binding }] }] with line ranges.
+ */
+function parseImports(lines) {
+  const statements = [];
+  for (let i = 0; i < lines.length; i++) {
+    const line = lines[i];
+    let match = line.match(/^from\s+(\S+)\s+import\s+(.*)$/);
+    if (match) {
+      let body = match[2];
+      let end = i;
+      if (body.startsWith('(')) {
+        while (!body.includes(')') && end + 1 < lines.length) {
+          end += 1;
+          body += ' ' + lines[end];
+        }
+        body = body.replace(/[()]/g, '');
+      }
+      const names = body
+        .split(',')
+        .map(part => part.trim())
+        .filter(Boolean)
+        .map(part => {
+          const [name, alias] = part.split(/\s+as\s+/);
+          return { name, binding: alias || name };
+        });
+      statements.push({ start: i, end, module: match[1], names, from: true });
+      i = end;
+      continue;
+    }
+    match = line.match(/^import\s+(.*)$/);
+    if (match) {
+      const names = match[1].split(',').map(part => {
+        const [name, alias] = part.trim().split(/\s+as\s+/);
+        return { name, binding: alias || name.split('.')[0] };
+      });
+      statements.push({ start: i, end: i, module: null, names, from: false });
+    }
+  }
+  return statements;
+}
+
+function renderImport(statement, names) {
+  const rendered = names.map(({ name, binding }) => (name === binding ? name : `${name} as ${binding}`));
+  if (!statement.from) {
+    return [`import ${rendered.join(', ')}`];
+  }
+  const single = `from ${statement.module} import ${rendered.join(', ')}`;
+  if (single.length <= 88) {
+    return [single];
+  }
+  return [`from ${statement.module} import (`, ...rendered.map(name => `    ${name},`), ')'];
+}
+
+/**
+ * Strip unused imports from a generated module and report any import that is
+ * neither stdlib nor an allowed package. With `fix` disabled, unused imports
+ * are reported instead of removed.
+ */
+function guardImports(filePath, { fix }) {
+  const lines = fs.readFileSync(filePath, 'utf8').split('\n');
+  const statements = parseImports(lines);
+  const importLines = new Set();
+  statements.forEach(({ start, end }) => {
+    for (let i = start; i <= end; i++) importLines.add(i);
+  });
+  // Ignore docstrings, string literals, comments and field declarations so that
+  // e.g. "scroll into view" or a field called `flow` do not count as usages.
+  const body = lines
+    .filter((_, i) => !importLines.has(i))
+    .join('\n')
+    .replace(/"""[\s\S]*?"""|'''[\s\S]*?'''|"[^"\n]*"|'[^'\n]*'|#.*/g, '')
+    .replace(/^(\s+)\w+(\s*:)/gm, '$1$2');
+  const isUsed = binding => new RegExp(`\\b${binding.replace(/\./g, '\\.')}\\b`).test(body);
+
+  const problems = [];
+  const replacements = new Map();
+  statements.forEach(statement => {
+    if (statement.module === '__future__') {
+      return;
+    }
+    const used = statement.names.filter(({ binding }) => isUsed(binding));
+    const unused = statement.names.filter(({ binding }) => !isUsed(binding));
+    if (unused.length > 0) {
+      const names = unused.map(({ name }) => name).join(', ');
+      if (fix) {
+        console.log(`   ✂️  Removed unused import from ${statement.module || 'import'}: ${names}`);
+        replacements.set(statement.start, used.length > 0 ? renderImport(statement, used) : []);
+      } else {
+        problems.push(`unused import ${names} (line ${statement.start + 1})`);
+      }
+    }
+    const kept = fix ? used : statement.names;
+    const modules = statement.from ? [statement.module] : kept.map(({ name }) => name);
+    modules.forEach(module => {
+      if (kept.length === 0 || module.startsWith('.')) {
+        return;
+      }
+      const root = module.split('.')[0];
+      if (!getStdlibModules().has(root) && !allowedPackages.has(root)) {
+        problems.push(`disallowed import '${module}' (line ${statement.start + 1})`);
+      }
+    });
+  });
+
+  if (fix && replacements.size > 0) {
+    const output = [];
+    for (let i = 0; i < lines.length; i++) {
+      const statement = statements.find(s => s.start === i);
+      if (statement && replacements.has(i)) {
+        output.push(...replacements.get(i));
+        i = statement.end;
+        continue;
+      }
+      output.push(lines[i]);
+    }
+    fs.writeFileSync(filePath, output.join('\n').replace(/\n{4,}/g, '\n\n\n'));
+  }
+  return problems;
+}
+
+const guardFailures = [];
+
+function runGuard(outputFile, outputPath, options) {
+  const problems = guardImports(outputPath, options);
+  problems.forEach(problem => console.error(`❌ ${outputFile}: ${problem}`));
+  if (problems.length > 0) {
+    guardFailures.push(outputFile);
+  }
+}
+
 // Generate Python models for each schema
 schemaFiles.forEach(schemaFile => {
   const schemaPath = path.join(schemasDir, schemaFile);
   const outputFile = schemaFile.replace('.json', '.py').replace(/-/g, '_');
   const outputPath = path.join(outputDir, outputFile);
 
+  if (checkOnly) {
+    runGuard(outputFile, outputPath, { fix: false });
+    return;
+  }
+
   console.log(`Generating Python model for ${schemaFile}...`);
 
   try {
@@ -43,84 +202,27 @@ schemaFiles.forEach(schemaFile => {
     const command = `datamodel-codegen --input ${schemaPath} --output ${outputPath} --input-file-type jsonschema --output-model-type pydantic_v2.BaseModel --target-python-version 3.12 --use-schema-description --use-field-description --use-title-as-name --allow-population-by-field-name --use-annotated --field-constraints`;
 
     execSync(command, { stdio: 'inherit' });
+    runGuard(outputFile, outputPath, { fix: true });
     console.log(`✅ Generated ${outputFile}`);
   } catch (error) {
     console.error(`❌ Failed to generate ${outputFile}:`, error.message);
   }
 });
 
-// Create __init__.py file to make it a Python package
-const initContent = `"""
-Floweb Domain Models - Python Pydantic Models
-Auto-generated from JSON Schema definitions
-"""
-
-from .flow import *
-from .performance_test import *
-from .action_configs import *
-from .environment import *
-from .parallel_execution import *
-from .websocket_communication import *
-from .execution_results import *
-from .flow_validation import *
-from .debug import *
-
-__all__ = [
-    # Flow models
-    "Flow", "Action", "ActionData", "Edge", "Position", "Zoom",
-    "Variable", "FlowVariables", "FlowParameters",
-    "Environment", "EnvironmentVariable", "GlobalVariable",
-
-    # Performance test models
-    "PerformanceTest", "PerformanceTestMetadata", "RecordedRequest", "RecordedResponse",
-    "ResponseTiming", "LoadTestConfiguration", "LoadTestThresholds",
-    "AuthConfig", "TokenRefreshConfig", "CredentialRotationConfig",
-    "PerformanceTestResults", "AggregateMetrics", "ResponseTimeMetrics",
-    "BandwidthMetrics", "RequestResults", "RequestExecution", "TimelineDataPoint",
-
-    # Action configuration models (all 33 types)
-    "BaseActionConfig", "ClickConfig", "InputConfig", "SendKeysConfig", "NavigateConfig",
-    "WaitConfig", "ScrollConfig", "ScreenshotConfig", "AssertionConfig", "AssertVisibleConfig",
-    "FormFillConfig", "ClearInputConfig", "OpenNewTabConfig", "SwitchTabConfig",
-    "GoForwardConfig", "GoBackConfig", "RefreshConfig", "GetPageInfoConfig", "JunctionConfig",
-    "ApiCallConfig", "ConditionalConfig", "LoopConfig", "DatabaseQueryConfig", "DatabaseInsertConfig",
-    "CustomCodeConfig", "DragAndDropConfig", "CallToFlowConfig", "SwitchToFrameConfig",
-    "ExitFrameConfig", "SetViewportConfig", "GetElementPropertiesConfig", "HandlePopupConfig",
-    "FileUploadConfig", "FileDownloadConfig", "SubflowConfig",
-
-    # Environment models
-    "EnvironmentAndGlobalVariablesConfiguration", "Environment", "Variable", "GlobalVariable",
-
-    # Execution results models
-    "ActionResult", "FlowReport",
-
-    # Flow validation models
-    "FlowWarning", "WarningSeverity", "LoopDetectionResult",
-    "FlowValidationResult", "ValidationSummary",
-
-    # Parallel execution models
-    "FlowExecutionRequest", "FlowExecutionResult",
-    "ParallelTestsRequest", "ParallelTestsResult",
-
-    # WebSocket communication models
-    "WebSocketMessage", "SessionInfo",
-    "RunCommand", "RecordCommand", "PauseRecordingCommand", "ResumeRecordingCommand",
-    "StopRecordingCommand", "FinishRecordingCommand", "GetRecordingStatusCommand",
-    "ListRecordingsCommand", "ConvertRecordingToFlowCommand", "GetRealtimeActionsCommand",
-    "GetLatestRealtimeActionCommand", "StopCommand", "CloseCommand", "ListSessionsCommand",
-    "CloseSessionCommand", "RestartEngineCommand", "CloseEngineCommand", "GetEngineStatusCommand",
-    "StartPerformanceScanCommand", "StopPerformanceScanCommand", "RunLoadTestCommand", "StopLoadTestCommand",
-    "DebugRunCommand", "DebugStepCommand", "DebugContinueCommand", "DebugPauseCommand", "DebugStopCommand",
-    "WebSocketResponse", "RunResponse", "ListSessionsResponse", "EngineStatusResponse",
-    "RecordingResponse", "RecordingStatusResponse", "ListRecordingsResponse", "DebugResponse",
-    
-    # Debug models
-    "DebugState", "PauseReason", "Breakpoint", "DebugExecutionInfo",
-    "DebugSession", "DebugActionUpdate"
-]
-`;
-
-fs.writeFileSync(path.join(outputDir, '__init__.py'), initContent);
+if (guardFailures.length > 0) {
+  console.error(`❌ Import guard failed for: ${guardFailures.join(', ')}`);
+  console.error('   Generated models may only import the standard library and pydantic.');
+  process.exit(1);
+}
+
+if (checkOnly) {
+  console.log('✅ Generated model imports are clean');
+  process.exit(0);
+}
+
+// __init__.py is maintained by hand: it exposes the generated models through a
+// lazy export table (see python-models/floweb_models/__init__.py). Add new
+// public names there instead of regenerating it.
 
 console.log('🎉 Python models generation complete!');
 console.log(`📁 Models saved to: ${outputDir}`);
@@ -1,207 +1,373 @@
-"""Floweb shared Python domain models package (`floweb_models`)."""
+"""Floweb shared Python domain models package (`floweb_models`).
 
-from .action_configs import (
-    ApiCallConfig,
-    AssertVisibleConfig,
-    AssertionConfig,
-    BaseActionConfig,
-    CallToFlowConfig,
-    ClearInputConfig,
-    ClickConfig,
-    ConditionalConfig,
-    CustomCodeConfig,
-    DatabaseInsertConfig,
-    DatabaseQueryConfig,
-    DragDropMode,
-    DragAndDropConfig,
-    ExitFrameConfig,
-    FileDownloadConfig,
-    FileUploadConfig,
-    FormField,
-    FormFieldOption,
-    FormFillConfig,
-    GetElementPropertiesConfig,
-    GetPageInfoConfig,
-    GoBackConfig,
-    GoForwardConfig,
-    HandlePopupConfig,
-    InputConfig,
-    JunctionConfig,
-    LoopConfig,
-    NavigateConfig,
-    OpenNewTabConfig,
-    RefreshConfig,
-    ScreenshotConfig,
-    ScrollConfig,
-    SendKeysConfig,
-    SetViewportConfig,
-    SubflowConfig,
-    SwitchTabConfig,
-    SwitchToFrameConfig,
-    WaitConfig,
-)
-from .debug import (
-    Breakpoint,
-    DebugActionUpdate,
-    DebugExecutionInfo,
-    DebugSession,
-    DebugState,
-    PauseReason,
-)
-from .environment import Environment, GlobalVariable, Variable
-from .execution_results import (
-    ActionResult,
-    FlowReport,
-    HealedSelectorRecord,
-    HealedSelectorSuggestion,
-    SelectorCandidateRecord,
-    SelectorCandidateSuggestion,
-)
-from .flow import Action, ActionData, Edge, EnvironmentVariable, Flow, FlowParameters, FlowVariables, Position, Zoom
-from .parallel_execution import (
-    FlowExecutionRequest,
-    FlowExecutionResult,
-    ParallelTestsRequest,
-    ParallelTestsResult,
-)
-from .websocket_communication import (
-    CloseCommand,
-    CloseEngineCommand,
-    CloseSessionCommand,
-    ConvertRecordingToFlowCommand,
-    DebugContinueCommand,
-    DebugPauseCommand,
-    DebugResponse,
-    DebugRunCommand,
-    DebugStepCommand,
-    DebugStopCommand,
-    EngineStatusResponse,
-    FinishRecordingCommand,
-    GetEngineStatusCommand,
-    GetLatestRealtimeActionCommand,
-    GetRealtimeActionsCommand,
-    GetRecordingStatusCommand,
-    ListRecordingsCommand,
-    ListRecordingsResponse,
-    ListSessionsCommand,
-    PauseRecordingCommand,
-    RecordCommand,
-    RecordingResponse,
-    RecordingStatusResponse,
-    RestartEngineCommand,
-    ResumeRecordingCommand,
-    RunCommand,
-    RunLoadTestCommand,
-    SessionInfo,
-    StartPerformanceScanCommand,
-    StopCommand,
-    StopLoadTestCommand,
-    StopPerformanceScanCommand,
-    StopRecordingCommand,
-    WebSocketMessage,
-    WebSocketResponse,
-)
+Public names are resolved lazily: each generated module (and the pydantic
+schemas it builds) is only imported the first time one of its symbols is
+accessed, so ``from floweb_models import Flow`` does not pay for the
+action-config or websocket models.
+"""
 
-__all__ = [
-    "Flow",
-    "Action",
-    "Edge",
-    "ActionData",
-    "Position",
-    "Zoom",
-    "Variable",
-    "EnvironmentVariable",
-    "FlowVariables",
-    "FlowParameters",
-    "Environment",
-    "GlobalVariable",
-    "FlowExecutionRequest",
-    "FlowExecutionResult",
-    "ParallelTestsRequest",
-    "ParallelTestsResult",
-    "DebugState",
-    "PauseReason",
-    "Breakpoint",
-    "DebugExecutionInfo",
-    "DebugSession",
-    "DebugActionUpdate",
-    "BaseActionConfig",
-    "ClickConfig",
-    "InputConfig",
-    "SendKeysConfig",
-    "NavigateConfig",
-    "WaitConfig",
-    "ScrollConfig",
-    "ScreenshotConfig",
-    "AssertionConfig",
-    "AssertVisibleConfig",
-    "FormField",
-    "FormFieldOption",
-    "FormFillConfig",
-    "ClearInputConfig",
-    "OpenNewTabConfig",
-    "SwitchTabConfig",
-    "GoBackConfig",
-    "GoForwardConfig",
-    "RefreshConfig",
-    "GetPageInfoConfig",
-    "SetViewportConfig",
-    "JunctionConfig",
-    "ApiCallConfig",
-    "ConditionalConfig",
-    "LoopConfig",
-    "DatabaseQueryConfig",
-    "DatabaseInsertConfig",
-    "CustomCodeConfig",
-    "DragDropMode",
-    "DragAndDropConfig",
-    "CallToFlowConfig",
-    "SwitchToFrameConfig",
-    "ExitFrameConfig",
-    "GetElementPropertiesConfig",
-    "HandlePopupConfig",
-    "FileUploadConfig",
-    "FileDownloadConfig",
-    "SubflowConfig",
-    "ActionResult",
-    "FlowReport",
-    "HealedSelectorRecord",
-    "HealedSelectorSuggestion",
-    "SelectorCandidateRecord",
-    "SelectorCandidateSuggestion",
-    "WebSocketMessage",
-    "SessionInfo",
-    "RunCommand",
-    "RecordCommand",
-    "PauseRecordingCommand",
-    "ResumeRecordingCommand",
-    "StopRecordingCommand",
-    "FinishRecordingCommand",
-    "GetRecordingStatusCommand",
-    "ListRecordingsCommand",
-    "ConvertRecordingToFlowCommand",
-    "GetRealtimeActionsCommand",
-    "GetLatestRealtimeActionCommand",
-    "StopCommand",
-    "CloseCommand",
-    "ListSessionsCommand",
-    "CloseSessionCommand",
-    "RestartEngineCommand",
-    "CloseEngineCommand",
-    "GetEngineStatusCommand",
-    "StartPerformanceScanCommand",
-    "StopPerformanceScanCommand",
-    "RunLoadTestCommand",
-    "StopLoadTestCommand",
-    "WebSocketResponse",
-    "EngineStatusResponse",
-    "RecordingResponse",
-    "RecordingStatusResponse",
-    "ListRecordingsResponse",
-    "DebugRunCommand",
-    "DebugStepCommand",
-    "DebugContinueCommand",
-    "DebugPauseCommand",
-    "DebugStopCommand",
-    "DebugResponse",
-]
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .action_configs import (
+        ApiCallConfig,
+        AssertVisibleConfig,
+        AssertionConfig,
+        BaseActionConfig,
+        CallToFlowConfig,
+        ClearInputConfig,
+        ClickConfig,
+        ConditionalConfig,
+        CustomCodeConfig,
+        DatabaseInsertConfig,
+        DatabaseQueryConfig,
+        DragDropMode,
+        DragAndDropConfig,
+        ExitFrameConfig,
+        FileDownloadConfig,
+        FileUploadConfig,
+        FormField,
+        FormFieldOption,
+        FormFillConfig,
+        GetElementPropertiesConfig,
+        GetPageInfoConfig,
+        GoBackConfig,
+        GoForwardConfig,
+        HandlePopupConfig,
+        InputConfig,
+        JunctionConfig,
+        LoopConfig,
+        NavigateConfig,
+        OpenNewTabConfig,
+        RefreshConfig,
+        ScreenshotConfig,
+        ScrollConfig,
+        SendKeysConfig,
+        SetViewportConfig,
+        SubflowConfig,
+        SwitchTabConfig,
+        SwitchToFrameConfig,
+        WaitConfig,
+    )
+    from .aggregation import ExecutionAggregates, aggregate_executions
+    from .blob_store import (
+        BlobStore,
+        externalize,
+        externalize_flow,
+        externalize_report,
+        is_media_reference,
+        media_bytes,
+    )
+    from .codecs import Codec, available_codecs, get_codec, register_codec
+    from .columnar import ColumnarRequestResults, ExecutionColumns
+    from .credential_rotation import CredentialPool, merge_headers
+    from .debug import (
+        Breakpoint,
+        DebugActionUpdate,
+        DebugExecutionInfo,
+        DebugSession,
+        DebugState,
+        PauseReason,
+    )
+    from .environment import Environment, GlobalVariable, Variable
+    from .execution_results import (
+        ActionResult,
+        FlowReport,
+        HealedSelectorRecord,
+        HealedSelectorSuggestion,
+        SelectorCandidateRecord,
+        SelectorCandidateSuggestion,
+    )
+    from .flow import Action, ActionData, Edge, EnvironmentVariable, Flow, FlowParameters, FlowVariables, Position, Zoom
+    from .graph import FlowGraph, flow_graph, invalidate_flow_graph
+    from .har import HarError, har_entry_to_request, iter_har
+    from .http_client import HttpClient, HttpResponse
+    from .incremental_validation import (
+        FlowChange,
+        IncrementalFlowValidator,
+        validate_flow,
+    )
+    from .live_results import LiveResultsAccumulator
+    from .load_engine import ExecutionEvent, LoadEngine, LoadRunReport
+    from .loop_detection import (
+        EXIT_ACTION_TYPES,
+        detect_loops,
+        find_loops,
+        strongly_connected_components,
+    )
+    from .parallel_execution import (
+        FlowExecutionRequest,
+        FlowExecutionResult,
+        ParallelTestsRequest,
+        ParallelTestsResult,
+    )
+    from .quantiles import QuantileSketch
+    from .request_groups import (
+        RequestGroup,
+        deduplicate_test,
+        group_requests,
+        group_variables,
+    )
+    from .sharded_load import PartialResults, run_sharded_load_test, shard_users
+    from .templates import RequestTemplate, Template
+    from .thresholds import ThresholdEvaluator
+    from .token_refresh import TokenManager, TokenRefreshError, compile_token_path
+    from .traffic_filter import TrafficFilter, url_host
+    from .trusted import (
+        construct_trusted,
+        from_trusted_json,
+        summary_first_json,
+        summary_from_json,
+        untrusted,
+    )
+    from .typed_actions import ACTION_CONFIG_TYPES, TypedAction, TypedActionData, TypedFlow
+    from .websocket_communication import (
+        CloseCommand,
+        CloseEngineCommand,
+        CloseSessionCommand,
+        ConvertRecordingToFlowCommand,
+        DebugContinueCommand,
+        DebugPauseCommand,
+        DebugResponse,
+        DebugRunCommand,
+        DebugStepCommand,
+        DebugStopCommand,
+        EngineStatusResponse,
+        FinishRecordingCommand,
+        GetEngineStatusCommand,
+        GetLatestRealtimeActionCommand,
+        GetRealtimeActionsCommand,
+        GetRecordingStatusCommand,
+        ListRecordingsCommand,
+        ListRecordingsResponse,
+        ListSessionsCommand,
+        PauseRecordingCommand,
+        RecordCommand,
+        RecordingResponse,
+        RecordingStatusResponse,
+        RestartEngineCommand,
+        ResumeRecordingCommand,
+        RunCommand,
+        RunLoadTestCommand,
+        SessionInfo,
+        StartPerformanceScanCommand,
+        StopCommand,
+        StopLoadTestCommand,
+        StopPerformanceScanCommand,
+        StopRecordingCommand,
+        WebSocketMessage,
+        WebSocketResponse,
+    )
+    from .websocket_dispatch import (
+        AnyWebSocketCommand,
+        AnyWebSocketResponse,
+        parse_command,
+        parse_response,
+    )
+    from .wire_format import (
+        COMPACT_PROTOCOL,
+        JSON_PROTOCOL,
+        Channel,
+        FrameError,
+        RealtimeActionsResponse,
+        negotiate,
+    )
+
+# Public name -> submodule that defines it.
+_EXPORTS: dict[str, str] = {
+    "Flow": "flow",
+    "Action": "flow",
+    "Edge": "flow",
+    "ActionData": "flow",
+    "Position": "flow",
+    "Zoom": "flow",
+    "Variable": "environment",
+    "EnvironmentVariable": "flow",
+    "FlowVariables": "flow",
+    "FlowParameters": "flow",
+    "Environment": "environment",
+    "GlobalVariable": "environment",
+    "FlowExecutionRequest": "parallel_execution",
+    "FlowExecutionResult": "parallel_execution",
+    "ParallelTestsRequest": "parallel_execution",
+    "ParallelTestsResult": "parallel_execution",
+    "DebugState": "debug",
+    "PauseReason": "debug",
+    "Breakpoint": "debug",
+    "DebugExecutionInfo": "debug",
+    "DebugSession": "debug",
+    "DebugActionUpdate": "debug",
+    "BaseActionConfig": "action_configs",
+    "ClickConfig": "action_configs",
+    "InputConfig": "action_configs",
+    "SendKeysConfig": "action_configs",
+    "NavigateConfig": "action_configs",
+    "WaitConfig": "action_configs",
+    "ScrollConfig": "action_configs",
+    "ScreenshotConfig": "action_configs",
+    "AssertionConfig": "action_configs",
+    "AssertVisibleConfig": "action_configs",
+    "FormField": "action_configs",
+    "FormFieldOption": "action_configs",
+    "FormFillConfig": "action_configs",
+    "ClearInputConfig": "action_configs",
+    "OpenNewTabConfig": "action_configs",
+    "SwitchTabConfig": "action_configs",
+    "GoBackConfig": "action_configs",
+    "GoForwardConfig": "action_configs",
+    "RefreshConfig": "action_configs",
+    "GetPageInfoConfig": "action_configs",
+    "SetViewportConfig": "action_configs",
+    "JunctionConfig": "action_configs",
+    "ApiCallConfig": "action_configs",
+    "ConditionalConfig": "action_configs",
+    "LoopConfig": "action_configs",
+    "DatabaseQueryConfig": "action_configs",
+    "DatabaseInsertConfig": "action_configs",
+    "CustomCodeConfig": "action_configs",
+    "DragDropMode": "action_configs",
+    "DragAndDropConfig": "action_configs",
+    "CallToFlowConfig": "action_configs",
+    "SwitchToFrameConfig": "action_configs",
+    "ExitFrameConfig": "action_configs",
+    "GetElementPropertiesConfig": "action_configs",
+    "HandlePopupConfig": "action_configs",
+    "FileUploadConfig": "action_configs",
+    "FileDownloadConfig": "action_configs",
+    "SubflowConfig": "action_configs",
+    "ActionResult": "execution_results",
+    "FlowReport": "execution_results",
+    "HealedSelectorRecord": "execution_results",
+    "HealedSelectorSuggestion": "execution_results",
+    "SelectorCandidateRecord": "execution_results",
+    "SelectorCandidateSuggestion": "execution_results",
+    "WebSocketMessage": "websocket_communication",
+    "SessionInfo": "websocket_communication",
+    "RunCommand": "websocket_communication",
+    "RecordCommand": "websocket_communication",
+    "PauseRecordingCommand": "websocket_communication",
+    "ResumeRecordingCommand": "websocket_communication",
+    "StopRecordingCommand": "websocket_communication",
+    "FinishRecordingCommand": "websocket_communication",
+    "GetRecordingStatusCommand": "websocket_communication",
+    "ListRecordingsCommand": "websocket_communication",
+    "ConvertRecordingToFlowCommand": "websocket_communication",
+    "GetRealtimeActionsCommand": "websocket_communication",
+    "GetLatestRealtimeActionCommand": "websocket_communication",
+    "StopCommand": "websocket_communication",
+    "CloseCommand": "websocket_communication",
+    "ListSessionsCommand": "websocket_communication",
+    "CloseSessionCommand": "websocket_communication",
+    "RestartEngineCommand": "websocket_communication",
+    "CloseEngineCommand": "websocket_communication",
+    "GetEngineStatusCommand": "websocket_communication",
+    "StartPerformanceScanCommand": "websocket_communication",
+    "StopPerformanceScanCommand": "websocket_communication",
+    "RunLoadTestCommand": "websocket_communication",
+    "StopLoadTestCommand": "websocket_communication",
+    "WebSocketResponse": "websocket_communication",
+    "EngineStatusResponse": "websocket_communication",
+    "RecordingResponse": "websocket_communication",
+    "RecordingStatusResponse": "websocket_communication",
+    "ListRecordingsResponse": "websocket_communication",
+    "DebugRunCommand": "websocket_communication",
+    "DebugStepCommand": "websocket_communication",
+    "DebugContinueCommand": "websocket_communication",
+    "DebugPauseCommand": "websocket_communication",
+    "DebugStopCommand": "websocket_communication",
+    "DebugResponse": "websocket_communication",
+    "ACTION_CONFIG_TYPES": "typed_actions",
+    "TypedAction": "typed_actions",
+    "TypedActionData": "typed_actions",
+    "TypedFlow": "typed_actions",
+    "construct_trusted": "trusted",
+    "from_trusted_json": "trusted",
+    "untrusted": "trusted",
+    "AnyWebSocketCommand": "websocket_dispatch",
+    "AnyWebSocketResponse": "websocket_dispatch",
+    "parse_command": "websocket_dispatch",
+    "parse_response": "websocket_dispatch",
+    "FlowGraph": "graph",
+    "flow_graph": "graph",
+    "invalidate_flow_graph": "graph",
+    "detect_loops": "loop_detection",
+    "strongly_connected_components": "loop_detection",
+    "find_loops": "loop_detection",
+    "EXIT_ACTION_TYPES": "loop_detection",
+    "FlowChange": "incremental_validation",
+    "IncrementalFlowValidator": "incremental_validation",
+    "validate_flow": "incremental_validation",
+    "QuantileSketch": "quantiles",
+    "ExecutionColumns": "columnar",
+    "ColumnarRequestResults": "columnar",
+    "ExecutionAggregates": "aggregation",
+    "aggregate_executions": "aggregation",
+    "LiveResultsAccumulator": "live_results",
+    "ThresholdEvaluator": "thresholds",
+    "HttpClient": "http_client",
+    "HttpResponse": "http_client",
+    "LoadEngine": "load_engine",
+    "LoadRunReport": "load_engine",
+    "ExecutionEvent": "load_engine",
+    "PartialResults": "sharded_load",
+    "run_sharded_load_test": "sharded_load",
+    "shard_users": "sharded_load",
+    "TokenManager": "token_refresh",
+    "TokenRefreshError": "token_refresh",
+    "compile_token_path": "token_refresh",
+    "CredentialPool": "credential_rotation",
+    "merge_headers": "credential_rotation",
+    "Template": "templates",
+    "RequestTemplate": "templates",
+    "TrafficFilter": "traffic_filter",
+    "url_host": "traffic_filter",
+    "HarError": "har",
+    "iter_har": "har",
+    "har_entry_to_request": "har",
+    "RequestGroup": "request_groups",
+    "group_requests": "request_groups",
+    "deduplicate_test": "request_groups",
+    "group_variables": "request_groups",
+    "BlobStore": "blob_store",
+    "externalize": "blob_store",
+    "externalize_flow": "blob_store",
+    "externalize_report": "blob_store",
+    "is_media_reference": "blob_store",
+    "media_bytes": "blob_store",
+    "summary_from_json": "trusted",
+    "summary_first_json": "trusted",
+    "Codec": "codecs",
+    "available_codecs": "codecs",
+    "get_codec": "codecs",
+    "register_codec": "codecs",
+    "Channel": "wire_format",
+    "FrameError": "wire_format",
+    "RealtimeActionsResponse": "wire_format",
+    "negotiate": "wire_format",
+    "COMPACT_PROTOCOL": "wire_format",
+    "JSON_PROTOCOL": "wire_format",
+}
+
+_SUBMODULES = frozenset(_EXPORTS.values())
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is not None:
+        value = getattr(import_module(f".{module_name}", __name__), name)
+    elif name in _SUBMODULES:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache on the package so later lookups skip __getattr__ entirely.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -7,9 +7,7 @@ from __future__ import annotations
 from enum import StrEnum
 from typing import Annotated, Any
 
-from aiohttp.web_routedef import view
-from black.debug import T
-from pydantic import AnyUrl, BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class BaseActionConfig(BaseModel):
@@ -0,0 +1,229 @@
+"""Aggregate metrics and timelines from raw request executions.
+
+:func:`aggregate_executions` turns the executions of a load test (as
+:class:`~floweb_models.columnar.ExecutionColumns`) into the
+``AggregateMetrics`` and ``timeline`` of ``PerformanceTestResults``.
+Executions are binned once into fixed-width time buckets; per-bucket
+counts, failures and response time sums come from ``bincount`` over the
+bucket index, and the overall percentiles from a single ``partition``, so
+the whole computation is O(n).
+
+``activeUsers`` is not recorded per execution. Unless a schedule is given,
+it is estimated with Little's law as the time spent in requests during a
+bucket divided by the bucket width, i.e. the average number of requests in
+flight.
+
+NumPy is used when installed; without it the same results are computed in
+plain Python, which is much slower.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from .columnar import (
+    ExecutionColumns,
+    empty_metrics,
+    load_numpy,
+    metrics_from_array,
+    metrics_from_values,
+)
+from .performance_test import (
+    AggregateMetrics,
+    BandwidthMetrics,
+    ResponseTimeMetrics,
+    TimelineDataPoint,
+)
+
+
+class ExecutionAggregates(NamedTuple):
+    metrics: AggregateMetrics
+    timeline: list[TimelineDataPoint]
+
+
+class _Bins(NamedTuple):
+    first: float
+    span_ms: float
+    counts: list[int]
+    failures: list[int]
+    time_sums: list[float]
+    received: int
+    response_time: ResponseTimeMetrics
+
+
+def aggregate_executions(
+    executions: ExecutionColumns | Iterable[ExecutionColumns],
+    *,
+    bucket_ms: float = 1000.0,
+    start: float | None = None,
+    end: float | None = None,
+    bytes_sent: int = 0,
+    active_users: Callable[[float], int] | None = None,
+) -> ExecutionAggregates:
+    """Compute ``AggregateMetrics`` and a bucketed timeline.
+
+    ``executions`` is one column set or several (e.g. one per request of
+    the test), aggregated together. ``start`` and ``end`` are epoch
+    milliseconds and default to the first and last timestamp; executions
+    outside them are ignored. Every bucket from ``start`` to ``end`` gets a
+    data point, stamped with its start time, including buckets without
+    executions. Rates are per full bucket width, also for the last bucket.
+
+    ``bytes_sent`` is the request volume, which executions do not record.
+    ``active_users`` maps a bucket start time to the number of virtual
+    users, e.g. from the ramp-up schedule; by default it is estimated from
+    the response times (see the module docstring).
+    """
+    if bucket_ms <= 0:
+        raise ValueError("bucket_ms must be positive")
+    if isinstance(executions, ExecutionColumns):
+        executions = [executions]
+    parts = [part for part in executions if len(part)]
+    np = load_numpy()
+    if not parts:
+        bins = _empty_bins(bucket_ms, start, end)
+    elif np is not None:
+        bins = _bin_numpy(np, parts, bucket_ms, start, end)
+    else:
+        bins = _bin_python(parts, bucket_ms, start, end)
+
+    total = sum(bins.counts)
+    failed = sum(bins.failures)
+    seconds = max(bins.span_ms, bucket_ms) / 1000
+    metrics = AggregateMetrics(
+        totalRequests=total,
+        successfulRequests=total - failed,
+        failedRequests=failed,
+        errorRate=failed / total if total else 0.0,
+        throughput=total / seconds,
+        responseTime=bins.response_time,
+        bandwidth=BandwidthMetrics(
+            sent=bytes_sent,
+            received=bins.received,
+            avgSentPerSecond=bytes_sent / seconds,
+            avgReceivedPerSecond=bins.received / seconds,
+        ),
+    )
+
+    bucket_seconds = bucket_ms / 1000
+    timeline = []
+    for i, (count, failures, time_sum) in enumerate(
+        zip(bins.counts, bins.failures, bins.time_sums)
+    ):
+        timestamp = bins.first + i * bucket_ms
+        if active_users is not None:
+            users = active_users(timestamp)
+        else:
+            users = round(time_sum / bucket_ms)
+        timeline.append(
+            TimelineDataPoint(
+                timestamp=timestamp,
+                activeUsers=users,
+                requestsPerSecond=count / bucket_seconds,
+                avgResponseTime=time_sum / count if count else 0.0,
+                errorRate=failures / count if count else 0.0,
+            )
+        )
+    return ExecutionAggregates(metrics, timeline)
+
+
+def _bucket_count(first: float, last: float, bucket_ms: float) -> int:
+    return max(int((last - first) // bucket_ms) + 1, 1)
+
+
+def _empty_bins(bucket_ms: float, start: float | None, end: float | None) -> _Bins:
+    if start is None or end is None:
+        return _Bins(start or 0.0, 0.0, [], [], [], 0, empty_metrics())
+    buckets = _bucket_count(start, end, bucket_ms)
+    return _Bins(
+        start,
+        end - start,
+        [0] * buckets,
+        [0] * buckets,
+        [0.0] * buckets,
+        0,
+        empty_metrics(),
+    )
+
+
+def _bin_numpy(
+    np: Any,
+    parts: list[ExecutionColumns],
+    bucket_ms: float,
+    start: float | None,
+    end: float | None,
+) -> _Bins:
+    views = [part.to_numpy() for part in parts]
+
+    def column(name: str) -> Any:
+        if len(views) == 1:
+            return views[0][name]
+        return np.concatenate([view[name] for view in views])
+
+    timestamps = column("timestamp")
+    times = column("responseTime")
+    success = column("success")
+    sizes = column("size")
+
+    first = float(timestamps.min()) if start is None else start
+    last = float(timestamps.max()) if end is None else end
+    if start is not None or end is not None:
+        keep = (timestamps >= first) & (timestamps <= last)
+        timestamps = timestamps[keep]
+        times = times[keep]
+        success = success[keep]
+        sizes = sizes[keep]
+
+    buckets = _bucket_count(first, last, bucket_ms)
+    index = ((timestamps - first) // bucket_ms).astype(np.intp)
+    counts = np.bincount(index, minlength=buckets)
+    failures = np.bincount(index[~success], minlength=buckets)
+    time_sums = np.bincount(index, weights=times, minlength=buckets)
+    return _Bins(
+        first,
+        last - first,
+        counts.tolist(),
+        failures.tolist(),
+        time_sums.tolist(),
+        int(sizes.sum(dtype=np.uint64)),
+        metrics_from_array(np, times),
+    )
+
+
+def _bin_python(
+    parts: list[ExecutionColumns],
+    bucket_ms: float,
+    start: float | None,
+    end: float | None,
+) -> _Bins:
+    first = min(min(part.timestamp) for part in parts) if start is None else start
+    last = max(max(part.timestamp) for part in parts) if end is None else end
+    buckets = _bucket_count(first, last, bucket_ms)
+    counts = [0] * buckets
+    failures = [0] * buckets
+    time_sums = [0.0] * buckets
+    received = 0
+    kept: list[float] = []
+    for part in parts:
+        for timestamp, time, ok, size in zip(
+            part.timestamp, part.responseTime, part.success, part.size
+        ):
+            if not first <= timestamp <= last:
+                continue
+            i = int((timestamp - first) // bucket_ms)
+            counts[i] += 1
+            time_sums[i] += time
+            if not ok:
+                failures[i] += 1
+            received += size
+            kept.append(time)
+    return _Bins(
+        first,
+        last - first,
+        counts,
+        failures,
+        time_sums,
+        received,
+        metrics_from_values(kept),
+    )
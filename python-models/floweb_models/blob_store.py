@@ -0,0 +1,191 @@
+"""Content-addressed local storage for screenshots and reference images.
+
+``BaseActionConfig.image`` and ``ActionResult.screenshot`` can hold inline
+base64 images, megabytes each, which every load, validation and
+serialization of a flow or report then carries along. :class:`BlobStore`
+keeps the decoded bytes in files named by their SHA-256 and the models
+refer to them as ``mediaId:<sha256>``, the form ``ActionResult.screenshot``
+already documents. Equal images are stored once.
+
+:func:`externalize` lifts inline base64 (plain or a ``data:`` URL) out of a
+JSON tree, under the keys in :data:`MEDIA_KEYS`; :func:`externalize_flow`
+and :func:`externalize_report` apply it to a ``Flow`` and a ``FlowReport``,
+copying only the actions that change. :meth:`BlobStore.open` resolves a
+reference lazily: the file is memory-mapped, so nothing is read until the
+bytes are used, and :func:`media_bytes` accepts either form, for consumers
+that still see legacy base64.
+"""
+
+from __future__ import annotations
+
+import binascii
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from .execution_results import FlowReport
+from .flow import Flow
+
+MEDIA_PREFIX = "mediaId:"
+MEDIA_KEYS = frozenset({"image", "screenshot"})
+# Shorter strings are left inline: paths, names, and tiny icons cost less
+# than a reference plus a file.
+DEFAULT_MIN_SIZE = 256
+
+_REFERENCE = re.compile(r"mediaId:([0-9a-f]{64})")
+_DATA_URL = re.compile(r"data:[\w.+-]+/[\w.+-]+;base64,")
+# With a length that is a multiple of 4, this is exactly canonical base64.
+# ``a2b_base64`` on its own skips anything outside the alphabet.
+_BASE64 = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+
+
+def is_media_reference(value: object) -> bool:
+    """Whether ``value`` is a ``mediaId:<sha256>`` reference."""
+    return isinstance(value, str) and _REFERENCE.fullmatch(value) is not None
+
+
+def _digest(reference: str) -> str:
+    match = _REFERENCE.fullmatch(reference)
+    if match is None:
+        raise ValueError(f"not a media reference: {reference[:80]!r}")
+    return match[1]
+
+
+def _decode_inline(value: str, min_size: int) -> bytes | None:
+    """The bytes of an inline base64 image, or ``None`` if it is not one."""
+    if len(value) < min_size:
+        return None
+    if value.startswith("data:"):
+        match = _DATA_URL.match(value)
+        if match is None:
+            return None
+        value = value[match.end() :]
+    if len(value) % 4 or _BASE64.fullmatch(value) is None:
+        return None
+    return binascii.a2b_base64(value)
+
+
+class BlobStore:
+    """Blobs under ``root``, one file per SHA-256 (``ab/cdef...``)."""
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, reference: str) -> Path:
+        digest = _digest(reference)
+        return self.root / digest[:2] / digest[2:]
+
+    def __contains__(self, reference: object) -> bool:
+        return is_media_reference(reference) and self.path(reference).exists()  # type: ignore[arg-type]
+
+    def put(self, data: bytes) -> str:
+        """Store ``data`` (if it is not stored yet) and return its reference."""
+        reference = MEDIA_PREFIX + hashlib.sha256(data).hexdigest()
+        path = self.path(reference)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            # Write under a temporary name and rename, so readers never see a
+            # partial blob and concurrent writers of the same blob are safe.
+            fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as out:
+                    out.write(data)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        return reference
+
+    def open(self, reference: str) -> memoryview:
+        """The bytes of ``reference`` as a read-only, memory-mapped view.
+
+        Raises ``KeyError`` if the blob is not in the store.
+        """
+        try:
+            with open(self.path(reference), "rb") as stream:
+                if os.fstat(stream.fileno()).st_size == 0:
+                    return memoryview(b"")
+                return memoryview(
+                    mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+        except FileNotFoundError:
+            raise KeyError(reference) from None
+
+    def read(self, reference: str) -> bytes:
+        return bytes(self.open(reference))
+
+
+def media_bytes(value: str, store: BlobStore) -> bytes | memoryview:
+    """The image bytes of a reference (memory-mapped) or of inline base64."""
+    if is_media_reference(value):
+        return store.open(value)
+    data = _decode_inline(value, 0)
+    if data is None:
+        raise ValueError("neither a media reference nor base64 image data")
+    return data
+
+
+def externalize(
+    data: Any, store: BlobStore, *, min_size: int = DEFAULT_MIN_SIZE
+) -> Any:
+    """``data`` with inline base64 under :data:`MEDIA_KEYS` moved to ``store``.
+
+    Containers are copied only along the paths that change; if nothing
+    changes, ``data`` itself is returned.
+    """
+    if isinstance(data, Mapping):
+        changed: dict[str, Any] | None = None
+        for key, value in data.items():
+            if key in MEDIA_KEYS and isinstance(value, str):
+                blob = _decode_inline(value, min_size)
+                new = store.put(blob) if blob is not None else value
+            else:
+                new = externalize(value, store, min_size=min_size)
+            if new is not value:
+                if changed is None:
+                    changed = dict(data)
+                changed[key] = new
+        return data if changed is None else changed
+    if isinstance(data, list):
+        items = [externalize(item, store, min_size=min_size) for item in data]
+        if any(new is not old for new, old in zip(items, data)):
+            return items
+    return data
+
+
+def externalize_flow(
+    flow: Flow, store: BlobStore, *, min_size: int = DEFAULT_MIN_SIZE
+) -> Flow:
+    """``flow`` with inline images in its action configs moved to ``store``."""
+    actions = []
+    for action in flow.actions:
+        config = externalize(action.data.config, store, min_size=min_size)
+        if config is not action.data.config:
+            data = action.data.model_copy(update={"config": config})
+            action = action.model_copy(update={"data": data})
+        actions.append(action)
+    return flow.model_copy(update={"actions": actions})
+
+
+def externalize_report(
+    report: FlowReport, store: BlobStore, *, min_size: int = DEFAULT_MIN_SIZE
+) -> FlowReport:
+    """``report`` with inline screenshots and config images moved to ``store``."""
+    actions = []
+    for result in report.actions:
+        update: dict[str, Any] = {}
+        if result.screenshot is not None:
+            blob = _decode_inline(result.screenshot, min_size)
+            if blob is not None:
+                update["screenshot"] = store.put(blob)
+        config = externalize(result.config, store, min_size=min_size)
+        if config is not result.config:
+            update["config"] = config
+        actions.append(result.model_copy(update=update) if update else result)
+    return report.model_copy(update={"actions": actions})
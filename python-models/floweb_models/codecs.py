@@ -0,0 +1,207 @@
+"""Pluggable wire codecs for the models: JSON, orjson and MessagePack.
+
+A :class:`Codec` turns models (and plain JSON-compatible data that contains
+models, such as a WebSocket envelope) into bytes and back:
+
+- ``"json"`` uses pydantic-core: models are serialized and validated in one
+  pass from and to JSON bytes, and :meth:`Codec.encode` accepts models
+  anywhere in the data.
+- ``"orjson"`` (``pip install floweb-domain-models[orjson]``) dumps the
+  model to Python values and lets orjson write them; it decodes with
+  ``orjson.loads`` and validates the result. Data that is not a model
+  (envelopes, caches) no longer goes through the stdlib ``json`` module.
+- ``"msgpack"`` (``pip install floweb-domain-models[msgpack]``) writes the
+  same values as MessagePack, which is smaller and keeps bytes as bytes.
+
+Every codec round-trips: ``codec.loads(type(m), codec.dumps(m)) == m``.
+Models are dumped with ``exclude_unset=True`` for that: several generated
+models declare non-optional fields with a ``None`` default, which the
+validator would reject if they were written out as ``null``. Values that
+are not native to a backend (datetimes, URLs, nested models inside plain
+data) go through ``pydantic_core.to_jsonable_python``, the same conversion
+pydantic's own JSON output uses.
+
+Backends are registered by name and imported on first use, so a missing
+optional package only matters to code that asks for its codec.
+:func:`register_codec` adds another one.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json, to_json, to_jsonable_python
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class Codec(ABC):
+    """Encoding of models and plain data to bytes; subclasses pick the format."""
+
+    name = ""
+    media_type = ""
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """JSON-compatible ``value`` (models allowed anywhere) as bytes."""
+
+    @abstractmethod
+    def decode(self, data: bytes | bytearray) -> Any:
+        """The plain data encoded in ``data``."""
+
+    def dumps(self, model: BaseModel) -> bytes:
+        """``model`` as bytes; :meth:`loads` restores an equal model."""
+        return self.encode(model.model_dump(exclude_unset=True))
+
+    def loads(self, model_type: type[ModelT], data: bytes | bytearray) -> ModelT:
+        """Validate ``data`` as ``model_type``."""
+        return model_type.model_validate(self.decode(data))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name!r}>"
+
+
+class JsonCodec(Codec):
+    """JSON through pydantic-core."""
+
+    name = "json"
+    media_type = "application/json"
+
+    def encode(self, value: Any) -> bytes:
+        return to_json(value)
+
+    def decode(self, data: bytes | bytearray) -> Any:
+        return from_json(data)
+
+    def dumps(self, model: BaseModel) -> bytes:
+        # Through ``model_dump_json`` so trusted instances materialize first.
+        return model.model_dump_json(exclude_unset=True).encode()
+
+    def loads(self, model_type: type[ModelT], data: bytes | bytearray) -> ModelT:
+        return model_type.model_validate_json(data)
+
+
+class OrjsonCodec(Codec):
+    """JSON through orjson."""
+
+    name = "orjson"
+    media_type = "application/json"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, value: Any) -> bytes:
+        return self._dumps(value, default=to_jsonable_python, option=self._options)
+
+    def decode(self, data: bytes | bytearray) -> Any:
+        return self._loads(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack through msgpack."""
+
+    name = "msgpack"
+    media_type = "application/msgpack"
+
+    def __init__(self) -> None:
+        import msgpack  # type: ignore[import-untyped]
+
+        self._pack: Callable[[Any], bytes] = msgpack.Packer(
+            default=to_jsonable_python
+        ).pack
+        self._unpackb = msgpack.unpackb
+
+    def encode(self, value: Any) -> bytes:
+        return self._pack(value)
+
+    def decode(self, data: bytes | bytearray) -> Any:
+        return self._unpackb(data)
+
+
+_FACTORIES: dict[str, Callable[[], Codec]] = {
+    "json": JsonCodec,
+    "orjson": OrjsonCodec,
+    "msgpack": MsgpackCodec,
+}
+_CODECS: dict[str, Codec] = {}
+
+
+def register_codec(name: str, factory: Callable[[], Codec]) -> None:
+    """Make ``factory()`` available as ``get_codec(name)``, replacing any other."""
+    _FACTORIES[name] = factory
+    _CODECS.pop(name, None)
+
+
+def available_codecs() -> list[str]:
+    """Names of the registered codecs whose backend can be imported."""
+    names = []
+    for name in _FACTORIES:
+        try:
+            get_codec(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_codec(codec: str | Codec = "json") -> Codec:
+    """The codec called ``codec`` (a :class:`Codec` is returned as is).
+
+    Raises ``KeyError`` for an unknown name and ``ImportError`` if the
+    backend's package is not installed.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    instance = _CODECS.get(codec)
+    if instance is None:
+        try:
+            factory = _FACTORIES[codec]
+        except KeyError:
+            raise KeyError(f"unknown codec {codec!r}") from None
+        try:
+            instance = factory()
+        except ImportError as exc:
+            raise ImportError(
+                f"the {codec!r} codec needs {exc.name}: "
+                f"pip install floweb-domain-models[{codec}]"
+            ) from exc
+        _CODECS[codec] = instance
+    return instance
+
+
+def dumps(model: BaseModel, codec: str | Codec = "json") -> bytes:
+    """Encode ``model`` (``Flow``, ``FlowReport``, a response, ...) as bytes."""
+    return get_codec(codec).dumps(model)
+
+
+def loads(
+    model_type: type[ModelT], data: bytes | bytearray, codec: str | Codec = "json"
+) -> ModelT:
+    """Decode ``data`` written by :func:`dumps` as ``model_type``."""
+    return get_codec(codec).loads(model_type, data)
+
+
+def loads_response(data: bytes | bytearray, codec: str | Codec = "json") -> Any:
+    """Decode a WebSocket response as the model named by its ``command``.
+
+    Like :func:`~floweb_models.websocket_dispatch.parse_response`, frames
+    that do not fit their specific model fall back to ``WebSocketResponse``.
+    """
+    from .websocket_communication import WebSocketResponse
+    from .websocket_dispatch import RESPONSE_ADAPTER, parse_response
+
+    codec = get_codec(codec)
+    if isinstance(codec, JsonCodec):
+        return parse_response(data)
+    value = codec.decode(data)
+    try:
+        return RESPONSE_ADAPTER.validate_python(value)
+    except ValidationError:
+        return WebSocketResponse.model_validate(value)
@@ -0,0 +1,382 @@
+"""Columnar storage for request executions.
+
+``RequestResults.executions`` holds one ``RequestExecution`` model per HTTP
+request, which costs several hundred bytes each. :class:`ExecutionColumns`
+keeps the same data in typed ``array.array`` columns instead:
+
+============  =========  ===============================================
+column        type       notes
+============  =========  ===============================================
+timestamp     float64    epoch milliseconds
+statusCode    uint16
+responseTime  float32    ~7 significant digits (sub-microsecond below 10 s)
+size          uint32     bytes; responses over 4 GiB do not fit
+success       bool       stored as one byte
+error         int32      index into ``errors``, -1 for no error
+============  =========  ===============================================
+
+which is 23 bytes per execution. Error messages are interned, so repeated
+messages are stored once.
+
+The aggregate helpers use NumPy when it is installed (``pip install
+floweb-domain-models[numpy]``) and fall back to plain Python otherwise.
+:meth:`ExecutionColumns.to_numpy` exposes the columns as zero-copy arrays.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from pydantic_core import from_json, to_json
+
+from .performance_test import RequestExecution, RequestResults, ResponseTimeMetrics
+
+_NO_ERROR = -1
+
+# Column name -> NumPy dtype matching its array typecode (native order).
+_DTYPES = {
+    "timestamp": "f8",
+    "statusCode": "u2",
+    "responseTime": "f4",
+    "size": "u4",
+    "success": "?",
+    "error": "i4",
+}
+
+_numpy: Any = None
+
+
+def load_numpy() -> Any:
+    """NumPy, imported on first use, or None if it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _at(ordered: Any, q: float) -> float:
+    # Lower order statistic, matching ``QuantileSketch``.
+    return float(ordered[int(q * (len(ordered) - 1))])
+
+
+class ExecutionColumns:
+    """Request executions stored column by column."""
+
+    __slots__ = (
+        "timestamp",
+        "statusCode",
+        "responseTime",
+        "size",
+        "success",
+        "error",
+        "errors",
+        "_error_ids",
+    )
+
+    def __init__(self) -> None:
+        self.timestamp = array("d")
+        self.statusCode = array("H")
+        self.responseTime = array("f")
+        self.size = array("I")
+        self.success = array("B")
+        self.error = array("i")
+        self.errors: list[str] = []
+        self._error_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index: int) -> RequestExecution:
+        error = self.error[index]
+        return RequestExecution.model_construct(
+            timestamp=self.timestamp[index],
+            statusCode=self.statusCode[index],
+            responseTime=self.responseTime[index],
+            size=self.size[index],
+            success=bool(self.success[index]),
+            error=self.errors[error] if error != _NO_ERROR else None,
+        )
+
+    def __iter__(self) -> Iterator[RequestExecution]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _intern(self, error: str | None) -> int:
+        if error is None:
+            return _NO_ERROR
+        index = self._error_ids.get(error)
+        if index is None:
+            index = self._error_ids[error] = len(self.errors)
+            self.errors.append(error)
+        return index
+
+    def append(
+        self,
+        timestamp: float,
+        statusCode: int,
+        responseTime: float,
+        size: int,
+        success: bool,
+        error: str | None = None,
+    ) -> None:
+        """Record one execution."""
+        self.timestamp.append(timestamp)
+        self.statusCode.append(statusCode)
+        self.responseTime.append(responseTime)
+        self.size.append(size)
+        self.success.append(success)
+        self.error.append(self._intern(error))
+
+    def extend(self, executions: Iterable[RequestExecution | dict[str, Any]]) -> None:
+        """Record ``RequestExecution`` models or their JSON-shaped dicts."""
+        append = self.append
+        for execution in executions:
+            if isinstance(execution, dict):
+                append(
+                    execution["timestamp"],
+                    execution["statusCode"],
+                    execution["responseTime"],
+                    execution["size"],
+                    execution["success"],
+                    execution.get("error"),
+                )
+            else:
+                append(
+                    execution.timestamp,
+                    execution.statusCode,
+                    execution.responseTime,
+                    execution.size,
+                    execution.success,
+                    execution.error,
+                )
+
+    @classmethod
+    def from_executions(
+        cls, executions: Iterable[RequestExecution | dict[str, Any]]
+    ) -> ExecutionColumns:
+        columns = cls()
+        columns.extend(executions)
+        return columns
+
+    def to_executions(self) -> list[RequestExecution]:
+        """Rebuild the ``RequestExecution`` models."""
+        return list(self)
+
+    def to_list(self) -> list[dict[str, Any]]:
+        """The executions in their JSON shape (``RequestExecution`` dumps)."""
+        errors = self.errors
+        return [
+            {
+                "timestamp": timestamp,
+                "statusCode": status,
+                "responseTime": response_time,
+                "size": size,
+                "success": bool(success),
+                "error": errors[error] if error != _NO_ERROR else None,
+            }
+            for timestamp, status, response_time, size, success, error in zip(
+                self.timestamp,
+                self.statusCode,
+                self.responseTime,
+                self.size,
+                self.success,
+                self.error,
+            )
+        ]
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Zero-copy NumPy views of the columns, keyed by field name.
+
+        The views share memory with the columns; appending raises
+        ``BufferError`` while any view is alive. Raises ``ImportError`` if
+        NumPy is not installed.
+        """
+        np = load_numpy()
+        if np is None:
+            raise ImportError("to_numpy() requires numpy")
+        return {name: self._view(np, name) for name in _DTYPES}
+
+    def _view(self, np: Any, name: str) -> Any:
+        return np.frombuffer(getattr(self, name), dtype=_DTYPES[name])
+
+    def nbytes(self) -> int:
+        """Memory used by the column buffers, excluding the error table."""
+        return sum(getattr(self, name).itemsize * len(self) for name in _DTYPES)
+
+    # Aggregates
+
+    def success_count(self) -> int:
+        np = load_numpy()
+        if np is not None and len(self):
+            return int(np.count_nonzero(self._view(np, "success")))
+        return sum(self.success)
+
+    def error_rate(self) -> float:
+        """Fraction of failed executions (0 when empty)."""
+        if not len(self):
+            return 0.0
+        return 1 - self.success_count() / len(self)
+
+    def total_bytes(self) -> int:
+        np = load_numpy()
+        if np is not None and len(self):
+            return int(self._view(np, "size").sum(dtype=np.uint64))
+        return sum(self.size)
+
+    def status_counts(self) -> dict[int, int]:
+        """Number of executions per HTTP status code."""
+        np = load_numpy()
+        if np is not None and len(self):
+            counts = np.bincount(self._view(np, "statusCode"))
+            return {int(s): int(counts[s]) for s in np.flatnonzero(counts)}
+        return dict(Counter(self.statusCode))
+
+    def error_counts(self) -> dict[str, int]:
+        """Number of executions per error message."""
+        np = load_numpy()
+        if np is not None and len(self):
+            ids = self._view(np, "error")
+            counts = np.bincount(ids[ids != _NO_ERROR], minlength=len(self.errors))
+            return {
+                message: int(counts[i])
+                for i, message in enumerate(self.errors)
+                if counts[i]
+            }
+        counts = Counter(self.error)
+        return {
+            message: counts[i] for i, message in enumerate(self.errors) if counts[i]
+        }
+
+    def time_range(self) -> tuple[float, float]:
+        """Earliest and latest timestamp (epoch ms); ``(0, 0)`` when empty."""
+        if not len(self):
+            return 0.0, 0.0
+        np = load_numpy()
+        if np is not None:
+            column = self._view(np, "timestamp")
+            return float(column.min()), float(column.max())
+        return min(self.timestamp), max(self.timestamp)
+
+    def response_time_metrics(
+        self, *, successful_only: bool = False
+    ) -> ResponseTimeMetrics:
+        """Exact response time statistics (all zeros when empty)."""
+        np = load_numpy()
+        if np is not None:
+            values = self._view(np, "responseTime")
+            if successful_only:
+                values = values[self._view(np, "success")]
+            return metrics_from_array(np, values)
+        source: Iterable[float] = self.responseTime
+        if successful_only:
+            source = (v for v, ok in zip(self.responseTime, self.success) if ok)
+        return metrics_from_values(source)
+
+
+_PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def empty_metrics() -> ResponseTimeMetrics:
+    """``ResponseTimeMetrics`` of no samples: every field is zero."""
+    return ResponseTimeMetrics(
+        min=0.0, max=0.0, mean=0.0, median=0.0, p90=0.0, p95=0.0, p99=0.0
+    )
+
+
+def metrics_from_array(np: Any, values: Any) -> ResponseTimeMetrics:
+    """``ResponseTimeMetrics`` of a NumPy array in O(n), without sorting it."""
+    if not values.size:
+        return empty_metrics()
+    last = values.size - 1
+    ranks = [int(q * last) for q in _PERCENTILES]
+    selected = np.partition(values, sorted({0, last, *ranks}))
+    median, p90, p95, p99 = (float(selected[rank]) for rank in ranks)
+    return ResponseTimeMetrics(
+        min=float(selected[0]),
+        max=float(selected[last]),
+        mean=float(values.mean(dtype=np.float64)),
+        median=median,
+        p90=p90,
+        p95=p95,
+        p99=p99,
+    )
+
+
+def metrics_from_values(values: Iterable[float]) -> ResponseTimeMetrics:
+    """``ResponseTimeMetrics`` of plain floats, for when NumPy is unavailable."""
+    ordered = sorted(values)
+    if not ordered:
+        return empty_metrics()
+    return ResponseTimeMetrics(
+        min=float(ordered[0]),
+        max=float(ordered[-1]),
+        mean=sum(ordered) / len(ordered),
+        median=_at(ordered, 0.5),
+        p90=_at(ordered, 0.9),
+        p95=_at(ordered, 0.95),
+        p99=_at(ordered, 0.99),
+    )
+
+
+class ColumnarRequestResults:
+    """``RequestResults`` whose executions are stored in columns."""
+
+    __slots__ = ("requestId", "url", "method", "executions")
+
+    def __init__(
+        self,
+        requestId: str,
+        url: str,
+        method: str,
+        executions: ExecutionColumns | None = None,
+    ) -> None:
+        self.requestId = requestId
+        self.url = url
+        self.method = method
+        self.executions = executions if executions is not None else ExecutionColumns()
+
+    @classmethod
+    def from_model(cls, results: RequestResults) -> ColumnarRequestResults:
+        return cls(
+            results.requestId,
+            str(results.url),
+            results.method,
+            ExecutionColumns.from_executions(results.executions),
+        )
+
+    def to_model(self) -> RequestResults:
+        """Validate back into a ``RequestResults`` model."""
+        return RequestResults.model_validate(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ColumnarRequestResults:
+        """Load the JSON shape of ``RequestResults`` without building models."""
+        return cls(
+            data["requestId"],
+            data["url"],
+            data["method"],
+            ExecutionColumns.from_executions(data["executions"]),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requestId": self.requestId,
+            "url": self.url,
+            "method": self.method,
+            "executions": self.executions.to_list(),
+        }
+
+    @classmethod
+    def from_json(cls, data: bytes | bytearray | str) -> ColumnarRequestResults:
+        return cls.from_dict(from_json(data))
+
+    def to_json(self) -> bytes:
+        return to_json(self.to_dict())
@@ -0,0 +1,79 @@
+"""Credential rotation for load tests (``CredentialRotationConfig``).
+
+:class:`CredentialPool` picks the credential for each request. Headers are
+merged once per (request, credential) pair with :meth:`CredentialPool.merge`,
+and :class:`~floweb_models.load_engine.LoadEngine` serializes every merged
+variant up front, so sending a request only selects a pre-built byte string
+instead of building a header dict.
+
+Selection is cheap and lock-free: ``round_robin`` advances an
+``itertools.count`` (a single C call, atomic under the GIL) and ``random``
+draws from a ``random.Random`` seeded when the pool is created, so runs are
+reproducible for a given seed.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+from collections.abc import Callable, Mapping, Sequence
+from typing import TypeVar
+
+from .performance_test import Credential, CredentialRotationConfig, RotationStrategy
+
+T = TypeVar("T")
+
+
+def merge_headers(*layers: Mapping[str, str] | None) -> dict[str, str]:
+    """Merge header mappings; later layers win, names compare case-insensitively.
+
+    A replaced header takes the spelling of the layer that set it last.
+    """
+    merged: dict[str, tuple[str, str]] = {}
+    for layer in layers:
+        if layer:
+            for name, value in layer.items():
+                merged[name.lower()] = (name, value)
+    return dict(merged.values())
+
+
+class CredentialPool:
+    """Rotates through the credentials of a ``CredentialRotationConfig``."""
+
+    def __init__(
+        self, config: CredentialRotationConfig, *, seed: int | None = 0
+    ) -> None:
+        if not config.credentials:
+            raise ValueError("credential rotation needs at least one credential")
+        self.credentials: tuple[Credential, ...] = tuple(config.credentials)
+        self.strategy = config.rotation_strategy
+        count = len(self.credentials)
+        if count == 1:
+            self.next_index: Callable[[], int] = lambda: 0
+        elif self.strategy == RotationStrategy.random:
+            randrange = random.Random(seed).randrange
+            self.next_index = lambda: randrange(count)
+        else:
+            counter = itertools.count()
+            self.next_index = lambda: next(counter) % count
+
+    def __len__(self) -> int:
+        return len(self.credentials)
+
+    def merge(
+        self,
+        headers: Mapping[str, str],
+        override: Mapping[str, str] | None = None,
+    ) -> tuple[dict[str, str], ...]:
+        """``headers`` merged with each credential's headers, then ``override``.
+
+        The result is indexed like :attr:`credentials`.
+        """
+        return tuple(
+            merge_headers(headers, credential.headers, override)
+            for credential in self.credentials
+        )
+
+    def select(self, variants: Sequence[T]) -> T:
+        """The variant (indexed like :attr:`credentials`) for the next request."""
+        return variants[self.next_index()]
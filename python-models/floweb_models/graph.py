@@ -0,0 +1,216 @@
+"""Graph index over a flow's actions and edges.
+
+``Flow`` stores ``actions`` and ``edges`` as flat lists, so finding an action
+by id or the successors of an action means scanning them. :func:`flow_graph`
+builds the lookup tables once per flow and caches them until ``actions`` or
+``edges`` change, including in-place edits of either list or of an edge's
+endpoints.
+
+Checking for changes costs the same for any flow size. Both lists are
+swapped for ``list`` subclasses that count their changes, and setting an
+action's ``id`` or an edge's ``source``, ``sourceHandle`` or ``target``
+bumps a global counter. A cached index is valid while the flow holds the
+same two lists and no counter moved. Editing any action or edge therefore
+also invalidates the indexes of other flows, which rebuild on their next
+lookup.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel
+
+from .flow import Action, Edge, Flow
+
+_ANY_HANDLE = object()
+
+
+class FlowGraph:
+    """Id, adjacency and degree index for one set of actions and edges."""
+
+    __slots__ = ("actions", "_outgoing", "_incoming", "_by_handle")
+
+    def __init__(self, actions: Iterable[Action], edges: Iterable[Edge]) -> None:
+        self.actions: dict[str, Action] = {}
+        for action in actions:
+            # Keep the first occurrence; duplicate ids are a validation issue.
+            self.actions.setdefault(action.id, action)
+        self._outgoing: dict[str, list[Edge]] = {}
+        self._incoming: dict[str, list[Edge]] = {}
+        self._by_handle: dict[str, dict[str | None, list[str]]] = {}
+        for edge in edges:
+            self._outgoing.setdefault(edge.source, []).append(edge)
+            self._incoming.setdefault(edge.target, []).append(edge)
+            self._by_handle.setdefault(edge.source, {}).setdefault(
+                edge.sourceHandle, []
+            ).append(edge.target)
+
+    def __contains__(self, action_id: object) -> bool:
+        return action_id in self.actions
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def action(self, action_id: str) -> Action | None:
+        """Return the action with ``action_id``, if any."""
+        return self.actions.get(action_id)
+
+    def out_edges(self, action_id: str) -> Sequence[Edge]:
+        return self._outgoing.get(action_id, ())
+
+    def in_edges(self, action_id: str) -> Sequence[Edge]:
+        return self._incoming.get(action_id, ())
+
+    def successors(self, action_id: str, handle: object = _ANY_HANDLE) -> list[str]:
+        """Target ids of edges leaving ``action_id``.
+
+        Pass ``handle`` to only follow edges from that ``sourceHandle``
+        (``None`` selects edges without a handle).
+        """
+        if handle is _ANY_HANDLE:
+            return [edge.target for edge in self._outgoing.get(action_id, ())]
+        return list(self._by_handle.get(action_id, {}).get(handle, ()))  # type: ignore[call-overload]
+
+    def successors_by_handle(self, action_id: str) -> dict[str | None, list[str]]:
+        """Target ids of edges leaving ``action_id``, keyed by ``sourceHandle``."""
+        return self._by_handle.get(action_id, {})
+
+    def predecessors(self, action_id: str) -> list[str]:
+        """Source ids of edges entering ``action_id``."""
+        return [edge.source for edge in self._incoming.get(action_id, ())]
+
+    def out_degree(self, action_id: str) -> int:
+        return len(self._outgoing.get(action_id, ()))
+
+    def in_degree(self, action_id: str) -> int:
+        return len(self._incoming.get(action_id, ()))
+
+    def roots(self) -> list[str]:
+        """Ids of actions without incoming edges, in flow order."""
+        return [
+            action_id for action_id in self.actions if action_id not in self._incoming
+        ]
+
+    def leaves(self) -> list[str]:
+        """Ids of actions without outgoing edges, in flow order."""
+        return [
+            action_id for action_id in self.actions if action_id not in self._outgoing
+        ]
+
+
+class _TrackedList(list):  # type: ignore[type-arg]
+    """``list`` that counts the changes made to it."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, items: Iterable[object] = ()) -> None:
+        super().__init__(items)
+        self.version = 0
+
+    def __reduce__(self) -> tuple[type[list[object]], tuple[list[object]]]:
+        # Copies and pickles are plain lists; tracking starts over with them.
+        return list, (list(self),)
+
+
+def _counting(name: str) -> Callable[..., Any]:
+    method = getattr(list, name)
+
+    def counted(self: _TrackedList, *args: Any, **kwargs: Any) -> Any:
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    counted.__name__ = name
+    return counted
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_TrackedList, _name, _counting(_name))
+
+# Bumped whenever a field the index reads is set on any action or edge.
+_item_generation = 0
+
+
+def _track_fields(model: type[BaseModel], fields: frozenset[str]) -> None:
+    setattr_ = model.__setattr__
+
+    def __setattr__(self: BaseModel, name: str, value: Any) -> None:
+        if name in fields:
+            global _item_generation
+            _item_generation += 1
+        setattr_(self, name, value)
+
+    setattr(model, "__setattr__", __setattr__)
+
+
+_track_fields(Action, frozenset({"id"}))
+_track_fields(Edge, frozenset({"source", "sourceHandle", "target"}))
+
+
+class _Entry(NamedTuple):
+    ref: weakref.ref[Flow]
+    actions: _TrackedList
+    edges: _TrackedList
+    versions: tuple[int, int, int]
+    graph: FlowGraph
+
+
+_cache: dict[int, _Entry] = {}
+
+
+def _tracked(flow: Flow, name: str) -> _TrackedList:
+    items = getattr(flow, name)  # Loads deferred fields of trusted flows.
+    if type(items) is not _TrackedList:
+        items = _TrackedList(items)
+        flow.__dict__[name] = items
+    return items
+
+
+def flow_graph(flow: Flow) -> FlowGraph:
+    """Return the cached graph index for ``flow``, building it if needed.
+
+    The index is rebuilt when ``actions`` or ``edges`` change: reassigned,
+    resized, an item replaced, or an action id or edge endpoint edited in
+    place. To notice the list edits, the first call replaces both lists with
+    ``list`` subclasses that count their changes; references to the
+    previous list objects no longer point into the flow.
+    """
+    entry = _cache.get(id(flow))
+    if entry is not None:
+        values = flow.__dict__
+        actions, edges = entry.actions, entry.edges
+        if (
+            values.get("actions") is actions
+            and values.get("edges") is edges
+            and entry.versions == (actions.version, edges.version, _item_generation)
+            and entry.ref() is flow
+        ):
+            return entry.graph
+    actions = _tracked(flow, "actions")
+    edges = _tracked(flow, "edges")
+    graph = FlowGraph(actions, edges)
+    key = id(flow)
+    ref = weakref.ref(flow, lambda _, key=key: _cache.pop(key, None))  # type: ignore[misc]
+    versions = (actions.version, edges.version, _item_generation)
+    _cache[key] = _Entry(ref, actions, edges, versions, graph)
+    return graph
+
+
+def invalidate_flow_graph(flow: Flow) -> None:
+    """Drop the cached graph index of ``flow``, e.g. to free it early."""
+    _cache.pop(id(flow), None)
@@ -0,0 +1,329 @@
+"""Streaming import of HAR files as ``RecordedRequest`` objects.
+
+:func:`iter_har` reads a HAR export incrementally and yields one
+``RecordedRequest`` (with its ``RecordedResponse`` and ``ResponseTiming``)
+per entry, so a large export never has to be in memory at once. Only the
+small parts of ``log`` (``version``, ``creator``, ``pages``, ...) and one
+entry at a time are decoded; memory is bounded by the read buffer and the
+largest single entry, not by the file size. ``max_body_size`` drops larger
+request and response bodies.
+
+Parsing uses ``json.JSONDecoder.raw_decode`` on a sliding text buffer: each
+entry is decoded in C, and when it is cut off by the end of the buffer more
+of the file is read (doubling the read size) and the entry is decoded again.
+A syntax error anywhere else raises :class:`HarError` at once, without
+reading further.
+
+HAR timings map to ``ResponseTiming`` as follows (``-1`` counts as 0):
+``dns`` is ``dns``, ``ssl`` is ``ssl``, ``tcp`` is ``connect`` minus
+``ssl`` (HAR includes the TLS handshake in ``connect``), ``ttfb`` is
+``send + wait``, ``download`` is ``receive`` and ``total`` is the entry's
+``time``. Entries with methods outside ``Method`` or non-HTTP URLs
+(``data:``, ``blob:``, extensions) are skipped, and so are malformed
+entries (a bad ``startedDateTime``, a field of the wrong type).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from typing import IO, Any
+
+from .performance_test import (
+    Method,
+    RecordedRequest,
+    RecordedResponse,
+    ResourceType,
+    ResponseTiming,
+)
+
+_RESOURCE_TYPES = {member.value: member for member in ResourceType}
+# Chrome ``_resourceType`` values that map to a different ``ResourceType``.
+_RESOURCE_ALIASES = {"font": ResourceType.other, "media": ResourceType.other}
+_MIME_TYPES = (
+    ("text/html", ResourceType.document),
+    ("text/css", ResourceType.stylesheet),
+    ("javascript", ResourceType.script),
+    ("ecmascript", ResourceType.script),
+    ("image/", ResourceType.image),
+    ("json", ResourceType.fetch),
+)
+
+_WHITESPACE = " \t\n\r"
+# A token cut off by the end of the buffer (``fals``, ``\u12``, ``1e``) fails
+# at most this far before the end.
+_TRUNCATION_SLACK = 6
+
+
+class HarError(ValueError):
+    """The input is not a HAR document that can be streamed."""
+
+
+class _Reader:
+    """Sliding text buffer over a file, for ``raw_decode``."""
+
+    def __init__(self, stream: IO[str], chunk_size: int) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            return False
+        # Drop what was consumed, so the buffer does not grow with the file.
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character, or "" at the end."""
+        while True:
+            buffer = self.buffer
+            pos = self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            found = self.buffer[self.pos : self.pos + 20] or "end of file"
+            raise HarError(f"expected {char!r}, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the JSON value at the current position."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                # An unterminated string reports where it starts, so it may
+                # be far from the end of the buffer.
+                truncated = exc.msg.startswith("Unterminated string") or (
+                    exc.pos >= len(self.buffer) - _TRUNCATION_SLACK
+                )
+                if not truncated or not self._fill(size):
+                    raise HarError(f"invalid JSON: {exc}") from None
+                size *= 2
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # A number may continue in the next chunk; decode again.
+                if self._fill(size):
+                    continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Keys of the object at the current position, in order.
+
+        The caller consumes each member's value before asking for the next.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise HarError("object keys must be strings")
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def items(self) -> Iterator[Any]:
+        """Decoded elements of the array at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def iter_har(
+    source: str | os.PathLike[str] | IO[str] | IO[bytes],
+    *,
+    max_body_size: int | None = None,
+    id_prefix: str = "har-",
+    chunk_size: int = 1 << 16,
+) -> Iterator[RecordedRequest]:
+    """Yield the entries of a HAR file as ``RecordedRequest`` objects.
+
+    ``source`` is a path or an open file (text or binary, UTF-8). Request
+    ids are ``id_prefix`` followed by the entry's index in the file.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8-sig") as stream:
+            yield from _iter_entries(stream, max_body_size, id_prefix, chunk_size)
+        return
+    opened: Any = source
+    if not isinstance(opened.read(0), bytes):
+        yield from _iter_entries(opened, max_body_size, id_prefix, chunk_size)
+        return
+    wrapper = io.TextIOWrapper(opened, encoding="utf-8-sig")
+    try:
+        yield from _iter_entries(wrapper, max_body_size, id_prefix, chunk_size)
+    finally:
+        # A collected wrapper would close the caller's stream with it.
+        wrapper.detach()
+
+
+def _iter_entries(
+    stream: IO[str], max_body_size: int | None, id_prefix: str, chunk_size: int
+) -> Iterator[RecordedRequest]:
+    reader = _Reader(stream, chunk_size)
+    found = False
+    for key in reader.members():
+        if key != "log":
+            reader.value()
+            continue
+        for log_key in reader.members():
+            if log_key != "entries":
+                reader.value()  # version, creator, pages, ...: small.
+                continue
+            found = True
+            for index, entry in enumerate(reader.items()):
+                request = har_entry_to_request(
+                    entry, f"{id_prefix}{index}", max_body_size=max_body_size
+                )
+                if request is not None:
+                    yield request
+    if not found:
+        raise HarError("no log.entries in HAR input")
+
+
+def _ms(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) and value > 0 else 0.0
+
+
+def _headers(items: Any) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    for item in items or ():
+        name = item.get("name", "")
+        if not name or name.startswith(":"):
+            continue  # HTTP/2 pseudo-headers are not real headers.
+        value = str(item.get("value", ""))
+        if name in headers:
+            separator = "; " if name.lower() == "cookie" else ", "
+            value = headers[name] + separator + value
+        headers[name] = value
+    return headers
+
+
+def _body(text: Any, max_body_size: int | None) -> str | None:
+    if not isinstance(text, str):
+        return None
+    if max_body_size is not None and len(text) > max_body_size:
+        return None
+    return text
+
+
+def _resource_type(entry: dict[str, Any], mime_type: str) -> ResourceType:
+    declared = entry.get("_resourceType")
+    if isinstance(declared, str):
+        declared = declared.lower()
+        if declared in _RESOURCE_TYPES:
+            return _RESOURCE_TYPES[declared]
+        if declared in _RESOURCE_ALIASES:
+            return _RESOURCE_ALIASES[declared]
+    mime_type = mime_type.lower()
+    for fragment, resource_type in _MIME_TYPES:
+        if fragment in mime_type:
+            return resource_type
+    return ResourceType.other
+
+
+def har_entry_to_request(
+    entry: dict[str, Any], request_id: str, *, max_body_size: int | None = None
+) -> RecordedRequest | None:
+    """Convert one HAR entry; ``None`` if it cannot be replayed or is malformed."""
+    try:
+        return _entry_to_request(entry, request_id, max_body_size)
+    except (AttributeError, TypeError, ValueError):
+        # ValueError covers pydantic's ValidationError and bad timestamps.
+        return None
+
+
+def _entry_to_request(
+    entry: dict[str, Any], request_id: str, max_body_size: int | None
+) -> RecordedRequest | None:
+    request = entry.get("request") or {}
+    url = request.get("url", "")
+    try:
+        method = Method(str(request.get("method", "")).upper())
+    except ValueError:
+        return None
+    if not url.startswith(("http://", "https://")):
+        return None
+
+    timings = entry.get("timings") or {}
+    ssl = _ms(timings.get("ssl"))
+    send_wait = _ms(timings.get("send")) + _ms(timings.get("wait"))
+    timing = ResponseTiming(
+        dns=_ms(timings.get("dns")),
+        tcp=max(_ms(timings.get("connect")) - ssl, 0.0),
+        ssl=ssl,
+        ttfb=send_wait,
+        download=_ms(timings.get("receive")),
+        total=_ms(entry.get("time")),
+    )
+
+    har_response = entry.get("response") or {}
+    content = har_response.get("content") or {}
+    response = None
+    if har_response.get("status"):
+        # Base64 content is binary; it cannot be kept as a text body.
+        text = None if content.get("encoding") == "base64" else content.get("text")
+        size = content.get("size")
+        if not isinstance(size, int) or size < 0:
+            size = max(har_response.get("bodySize") or 0, 0)
+        response = RecordedResponse(
+            status=har_response["status"],
+            statusText=har_response.get("statusText", ""),
+            headers=_headers(har_response.get("headers")),
+            body=_body(text, max_body_size),
+            size=size,
+            timing=timing,
+        )
+
+    started = entry.get("startedDateTime")
+    timestamp = datetime.fromisoformat(started).timestamp() * 1000 if started else 0.0
+    initiator = entry.get("_initiator")
+    if isinstance(initiator, dict):
+        initiator = initiator.get("url") or initiator.get("type")
+    post_data = request.get("postData") or {}
+    return RecordedRequest(
+        id=request_id,
+        url=url,
+        method=method,
+        headers=_headers(request.get("headers")),
+        body=_body(post_data.get("text"), max_body_size),
+        timestamp=timestamp,
+        response=response,
+        resourceType=_resource_type(entry, content.get("mimeType") or ""),
+        initiator=initiator if isinstance(initiator, str) else None,
+    )
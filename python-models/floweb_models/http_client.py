@@ -0,0 +1,350 @@
+"""Minimal pooled HTTP/1.1 client on asyncio streams, with phase timings.
+
+Load generation needs keep-alive connection reuse and a ``ResponseTiming``
+breakdown per request, and nothing else from a full HTTP client, so this
+module implements just that on top of the standard library:
+
+- ``dns``: ``getaddrinfo``; ``tcp``: the TCP connect; ``ssl``: the TLS
+  handshake. All three are 0 when a pooled connection is reused.
+- ``ttfb``: from the start of sending the request until the response
+  headers are in. Interim (1xx) responses before the final one are read
+  and discarded.
+- ``download``: reading the body; ``total``: the whole exchange.
+
+Bodies are read by ``Content-Length``, chunked transfer encoding, or until
+the server closes the connection. A connection that fails in any way is
+closed, never pooled. A request sent on a pooled connection that the server
+had closed is retried on a new one only if nothing can have reached the
+server (the connection was closed before sending), or if the method is
+idempotent and no byte of the response arrived.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import ssl
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from .performance_test import ResponseTiming
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_IDEMPOTENT_METHODS = frozenset(
+    {b"GET", b"HEAD", b"OPTIONS", b"TRACE", b"PUT", b"DELETE"}
+)
+
+# Headers the client sets itself; recorded values for these are dropped.
+_MANAGED_HEADERS = frozenset(
+    {"host", "content-length", "connection", "transfer-encoding", "keep-alive"}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Origin:
+    scheme: str
+    host: str
+    port: int
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    status: int
+    reason: str
+    headers: dict[str, str]
+    body: bytes
+    timing: ResponseTiming
+
+
+class HttpError(Exception):
+    """The server sent something that is not a valid HTTP/1.1 response."""
+
+
+class _NoResponse(ConnectionError):
+    """The connection ended before any byte of the response arrived."""
+
+
+class _Connection:
+    __slots__ = ("origin", "reader", "writer")
+
+    def __init__(
+        self, origin: Origin, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.origin = origin
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        self.writer.close()
+
+    def closed_by_peer(self) -> bool:
+        return self.reader.at_eof() or self.writer.is_closing()
+
+
+def split_url(url: str) -> tuple[Origin, str]:
+    """Origin and request target (path and query) of ``url``."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS:
+        raise ValueError(f"unsupported URL scheme: {url!r}")
+    host = parts.hostname or ""
+    port = parts.port or _DEFAULT_PORTS[scheme]
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    return Origin(scheme, host, port), target
+
+
+def encode_head(
+    method: str, origin: Origin, target: str, headers: Mapping[str, str]
+) -> str:
+    """Request line and header lines (each ending in CRLF), without
+    ``Content-Length``; managed headers in ``headers`` are replaced."""
+    host = origin.host
+    if origin.port != _DEFAULT_PORTS[origin.scheme]:
+        host = f"{host}:{origin.port}"
+    lines = [f"{method} {target} HTTP/1.1\r\n", f"Host: {host}\r\n"]
+    lines.extend(
+        f"{name}: {value}\r\n"
+        for name, value in headers.items()
+        if name.lower() not in _MANAGED_HEADERS
+    )
+    return "".join(lines)
+
+
+def finish_request(method: str, head: str, body: bytes | None) -> bytes:
+    """Complete an :func:`encode_head` head with ``Content-Length`` and body."""
+    if body is not None or method in ("POST", "PUT", "PATCH"):
+        head += f"Content-Length: {len(body or b'')}\r\n"
+    data = (head + "\r\n").encode("latin-1")
+    return data + body if body else data
+
+
+def encode_request(
+    method: str,
+    origin: Origin,
+    target: str,
+    headers: Mapping[str, str],
+    body: bytes | None,
+) -> bytes:
+    """Serialize a request; managed headers in ``headers`` are replaced."""
+    return finish_request(method, encode_head(method, origin, target, headers), body)
+
+
+class HttpClient:
+    """HTTP/1.1 client keeping idle keep-alive connections per origin."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 30.0,
+        max_idle_per_origin: int = 100,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.max_idle_per_origin = max_idle_per_origin
+        self._ssl = ssl_context
+        self._idle: dict[Origin, deque[_Connection]] = {}
+
+    async def __aenter__(self) -> HttpClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close every idle connection."""
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str] | None = None,
+        body: bytes | None = None,
+    ) -> HttpResponse:
+        origin, target = split_url(url)
+        data = encode_request(method, origin, target, headers or {}, body)
+        return await self.send(origin, data, head=method == "HEAD")
+
+    async def send(
+        self, origin: Origin, data: bytes, *, head: bool = False
+    ) -> HttpResponse:
+        """Send pre-encoded request bytes (see :func:`encode_request`).
+
+        Raises ``TimeoutError`` if there is no complete response within
+        :attr:`timeout` seconds.
+        """
+        try:
+            return await asyncio.wait_for(self._send(origin, data, head), self.timeout)
+        except asyncio.TimeoutError:
+            # Before 3.11 this is not the builtin (an ``OSError``).
+            raise TimeoutError(f"no response within {self.timeout} s") from None
+
+    async def _send(self, origin: Origin, data: bytes, head: bool) -> HttpResponse:
+        idle = self._idle.get(origin)
+        while idle:
+            connection = idle.pop()
+            if connection.closed_by_peer():
+                connection.close()  # Nothing sent yet: try the next one.
+                continue
+            try:
+                return await self._exchange(connection, data, head, 0.0, 0.0, 0.0)
+            except _NoResponse:
+                # The server most likely closed the idle connection while
+                # the request was in flight. It may still have acted on
+                # the request, so only idempotent ones are sent again.
+                if data[: data.find(b" ")] not in _IDEMPOTENT_METHODS:
+                    raise
+                break
+        connection, dns, tcp, tls = await self._connect(origin)
+        return await self._exchange(connection, data, head, dns, tcp, tls)
+
+    async def _connect(self, origin: Origin) -> tuple[_Connection, float, float, float]:
+        loop = asyncio.get_running_loop()
+        started = perf_counter()
+        infos = await loop.getaddrinfo(
+            origin.host, origin.port, type=socket.SOCK_STREAM
+        )
+        resolved = perf_counter()
+        family, _, proto, _, address = infos[0]
+        host, port = address[:2]
+        reader, writer = await asyncio.open_connection(
+            str(host), int(port), family=family, proto=proto
+        )
+        connected = perf_counter()
+        tls = 0.0
+        if origin.scheme == "https":
+            if self._ssl is None:
+                # Loading the CA store is slow; do it once per client.
+                self._ssl = ssl.create_default_context()
+            try:
+                await writer.start_tls(self._ssl, server_hostname=origin.host)
+            except BaseException:
+                writer.close()
+                raise
+            tls = (perf_counter() - connected) * 1000
+        dns = (resolved - started) * 1000
+        tcp = (connected - resolved) * 1000
+        return _Connection(origin, reader, writer), dns, tcp, tls
+
+    async def _exchange(
+        self,
+        connection: _Connection,
+        data: bytes,
+        head: bool,
+        dns: float,
+        tcp: float,
+        tls: float,
+    ) -> HttpResponse:
+        reader = connection.reader
+        started = perf_counter()
+        try:
+            connection.writer.write(data)
+            try:
+                raw = await _read_head(reader)
+            except asyncio.IncompleteReadError as exc:
+                if exc.partial:
+                    raise
+                raise _NoResponse("connection closed before the response") from exc
+            except ConnectionError as exc:
+                # A reset while waiting for the headers (a partial head is
+                # useless anyway).
+                raise _NoResponse(str(exc)) from exc
+            status, reason, headers, keep_alive = _parse_head(raw)
+            # Interim responses (100 Continue, 103 Early Hints) precede the
+            # final response, which is the one that answers the request.
+            while 100 <= status < 200 and status != 101:
+                raw = await _read_head(reader)
+                status, reason, headers, keep_alive = _parse_head(raw)
+            headers_done = perf_counter()
+
+            if status == 101:
+                keep_alive = False  # The connection speaks another protocol now.
+            if head or status in (101, 204, 304):
+                body = b""
+            elif headers.get("transfer-encoding", "").lower().endswith("chunked"):
+                body = await _read_chunked(reader)
+            elif "content-length" in headers:
+                body = await reader.readexactly(int(headers["content-length"]))
+            else:
+                body = await reader.read()
+                keep_alive = False
+        except BaseException:
+            # Errors, timeouts and cancellation leave the connection in an
+            # unknown state: never reuse it.
+            connection.close()
+            raise
+        done = perf_counter()
+
+        if keep_alive:
+            idle = self._idle.setdefault(connection.origin, deque())
+            if len(idle) < self.max_idle_per_origin:
+                idle.append(connection)
+            else:
+                connection.close()
+        else:
+            connection.close()
+
+        ttfb = (headers_done - started) * 1000
+        download = (done - headers_done) * 1000
+        return HttpResponse(
+            status,
+            reason,
+            headers,
+            body,
+            ResponseTiming(
+                dns=dns,
+                tcp=tcp,
+                ssl=tls,
+                ttfb=ttfb,
+                download=download,
+                total=dns + tcp + tls + ttfb + download,
+            ),
+        )
+
+
+async def _read_head(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError as exc:
+        raise HttpError("response headers too large") from exc
+
+
+def _parse_head(raw: bytes) -> tuple[int, str, dict[str, str], bool]:
+    lines = raw.decode("latin-1").split("\r\n")
+    try:
+        version, code, *reason = lines[0].split(" ", 2)
+        status = int(code)
+    except ValueError:
+        raise HttpError(f"bad status line: {lines[0]!r}") from None
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    connection = headers.get("connection", "").lower()
+    keep_alive = (
+        connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    )
+    return status, reason[0] if reason else "", headers, keep_alive
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+    chunks: list[bytes] = []
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0], 16)
+        if not size:
+            # Skip trailers up to the final empty line.
+            while await reader.readuntil(b"\r\n") != b"\r\n":
+                pass
+            return b"".join(chunks)
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
@@ -0,0 +1,395 @@
+"""Incremental flow validation for editors.
+
+:class:`IncrementalFlowValidator` validates a flow once and then keeps its
+warnings up to date from :class:`FlowChange` change sets, so an edit only
+re-checks what it can affect:
+
+- ``missing-selector`` and ``duplicate-id`` are re-checked for the changed
+  actions only.
+- ``invalid-reference`` is re-checked for changed edges and for edges that
+  touch added or removed actions.
+- ``unreachable-node`` and ``circular-dependency`` depend on the whole graph
+  and are recomputed in O(V+E) only when the structure changes: edges or
+  actions are added or removed, or an action changes type or label, or a
+  conditional, junction or loop action changes. Moving a node or editing the
+  config of any other action skips them, and cycle detection is also
+  skipped for removals from a flow that has no cycles.
+
+A flow starts at its first action; every action that cannot be reached
+from it is reported as unreachable.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any
+
+from .flow import Action, Edge, Flow
+from .flow_validation import (
+    Category,
+    FlowValidationResult,
+    FlowWarning,
+    Type,
+    ValidationSummary,
+    WarningsBySeverity,
+    WarningSeverity,
+)
+from .graph import FlowGraph
+from .loop_detection import EXIT_ACTION_TYPES, find_loops
+
+# Action type -> config field holding the element selector it acts on.
+SELECTOR_FIELDS: dict[str, str] = {
+    "click": "selector",
+    "input": "selector",
+    "assertion": "selector",
+    "assert_visible": "selector",
+    "clear_input": "selector",
+    "get_element_properties": "selector",
+    "file_upload": "selector",
+    "drag_and_drop": "sourceSelector",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FlowChange:
+    """Edits applied to a flow since the last validation.
+
+    Removed items are given by id; added and updated items as the new
+    ``Action``/``Edge`` values. An updated item that the validator does not
+    know yet is treated as added.
+    """
+
+    added_actions: Sequence[Action] = ()
+    removed_actions: Sequence[str] = ()
+    updated_actions: Sequence[Action] = ()
+    added_edges: Sequence[Edge] = ()
+    removed_edges: Sequence[str] = ()
+    updated_edges: Sequence[Edge] = ()
+
+
+def _config_value(config: Any, name: str) -> Any:
+    if isinstance(config, Mapping):
+        return config.get(name)
+    return getattr(config, name, None)
+
+
+def _action_type(action: Action) -> str:
+    return action.data.type or action.type
+
+
+def _has_selector(action: Action) -> bool:
+    field = SELECTOR_FIELDS.get(_action_type(action))
+    if field is None:
+        return True
+    config = action.data.config
+    selector = _config_value(config, field)
+    if isinstance(selector, str) and selector.strip():
+        return True
+    # Recorded actions may only carry the fallback list (``selectors``).
+    return any(
+        isinstance(s, str) and s.strip()
+        for s in _config_value(config, field + "s") or ()
+    )
+
+
+class IncrementalFlowValidator:
+    """Keeps the validation result of one flow current across edits."""
+
+    def __init__(self, flow: Flow) -> None:
+        start = perf_counter()
+        self.flow_id = flow.id
+        self.flow_name = flow.name
+        self._actions: dict[str, Action] = {}
+        self._counts: Counter[str] = Counter()
+        self._edges: dict[str, Edge] = {}
+        # Action id (existing or not) -> ids of edges that start or end there.
+        self._edges_at: dict[str, set[str]] = {}
+
+        self._selector: dict[str, FlowWarning] = {}
+        self._duplicate: dict[str, FlowWarning] = {}
+        self._reference: dict[str, FlowWarning] = {}
+        self._unreachable: list[FlowWarning] = []
+        self._circular: list[FlowWarning] = []
+        self._has_loops = False
+
+        for action in flow.actions:
+            self._counts[action.id] += 1
+            self._actions.setdefault(action.id, action)
+        for edge in flow.edges:
+            self._link(edge)
+        for action_id in self._actions:
+            self._check_action(action_id)
+        for edge_id in self._edges:
+            self._check_edge(edge_id)
+        self._check_structure(loops=True)
+        self._elapsed = perf_counter() - start
+
+    def apply(self, change: FlowChange) -> FlowValidationResult:
+        """Apply ``change`` and return the updated validation result."""
+        start = perf_counter()
+        actions: set[str] = set()
+        edges: set[str] = set()
+        structural = False
+        # Only additions can close a new cycle.
+        grown = bool(change.added_edges or change.updated_edges or change.added_actions)
+
+        for edge_id in change.removed_edges:
+            edge = self._edges.get(edge_id)
+            if edge is not None:
+                self._unlink(edge)
+                edges.add(edge_id)
+                structural = True
+        for edge in (*change.updated_edges, *change.added_edges):
+            old_edge = self._edges.get(edge.id)
+            if old_edge is not None:
+                self._unlink(old_edge)
+            self._link(edge)
+            edges.add(edge.id)
+            structural = True
+
+        for action_id in change.removed_actions:
+            if not self._counts[action_id]:
+                continue
+            self._counts[action_id] -= 1
+            if not self._counts[action_id]:
+                del self._counts[action_id]
+                del self._actions[action_id]
+            actions.add(action_id)
+            edges.update(self._edges_at.get(action_id, ()))
+            structural = True
+        for action in change.added_actions:
+            self._counts[action.id] += 1
+            self._actions.setdefault(action.id, action)
+            actions.add(action.id)
+            edges.update(self._edges_at.get(action.id, ()))
+            structural = True
+        for action in change.updated_actions:
+            old_action = self._actions.get(action.id)
+            if old_action is None:
+                self._counts[action.id] += 1
+            self._actions[action.id] = action
+            actions.add(action.id)
+            if (
+                old_action is None
+                or old_action.data.label != action.data.label
+                or _action_type(old_action) != _action_type(action)
+                or _action_type(action) in EXIT_ACTION_TYPES
+            ):
+                edges.update(self._edges_at.get(action.id, ()))
+                structural = True
+
+        for action_id in actions:
+            self._check_action(action_id)
+        for edge_id in edges:
+            self._check_edge(edge_id)
+        if structural:
+            self._check_structure(loops=grown or self._has_loops)
+        self._elapsed = perf_counter() - start
+        return self.result()
+
+    def result(self) -> FlowValidationResult:
+        """The current validation result.
+
+        ``validationTime`` is the time spent in the last :meth:`apply` (or
+        the initial validation).
+        """
+        found = [
+            *self._duplicate.values(),
+            *self._reference.values(),
+            *self._selector.values(),
+            *self._unreachable,
+            *self._circular,
+        ]
+        warnings = []
+        errors = []
+        for warning in found:
+            if warning.severity == WarningSeverity.critical:
+                errors.append(warning)
+            else:
+                warnings.append(warning)
+        by_type = Counter(warning.type.value for warning in found)
+        by_severity = Counter(warning.severity.value for warning in found)
+        summary = ValidationSummary(
+            totalNodes=self._counts.total(),
+            totalEdges=len(self._edges),
+            warningCount=len(warnings),
+            errorCount=len(errors),
+            criticalCount=len(errors),
+            warningsByType=dict(by_type),
+            warningsBySeverity=WarningsBySeverity(**by_severity),
+        )
+        return FlowValidationResult(
+            flowId=self.flow_id,
+            flowName=self.flow_name,
+            isValid=not errors,
+            warnings=warnings,
+            errors=errors,
+            summary=summary,
+            validatedAt=datetime.now(timezone.utc),
+            validationTime=self._elapsed,
+        )
+
+    def _link(self, edge: Edge) -> None:
+        self._edges[edge.id] = edge
+        self._edges_at.setdefault(edge.source, set()).add(edge.id)
+        self._edges_at.setdefault(edge.target, set()).add(edge.id)
+
+    def _unlink(self, edge: Edge) -> None:
+        del self._edges[edge.id]
+        for node in (edge.source, edge.target):
+            ids = self._edges_at.get(node)
+            if ids is not None:
+                ids.discard(edge.id)
+                if not ids:
+                    del self._edges_at[node]
+
+    def _label(self, action_id: str) -> str:
+        action = self._actions.get(action_id)
+        return action.data.label if action is not None else action_id
+
+    def _check_action(self, action_id: str) -> None:
+        action = self._actions.get(action_id)
+        if action is None or _has_selector(action):
+            self._selector.pop(action_id, None)
+        elif action_id not in self._selector or (
+            self._selector[action_id].nodeName != action.data.label
+        ):
+            self._selector[action_id] = _warning(
+                Type.missing_selector,
+                WarningSeverity.critical,
+                action_id,
+                action.data.label,
+                f"'{action.data.label}' has no selector",
+                f"{_action_type(action)} actions need an element "
+                "selector to act on.",
+                suggestion="Pick the target element or enter a selector.",
+                category=Category.usability,
+            )
+
+        count = self._counts.get(action_id, 0)
+        if count < 2:
+            self._duplicate.pop(action_id, None)
+        else:
+            self._duplicate[action_id] = _warning(
+                Type.duplicate_id,
+                WarningSeverity.critical,
+                action_id,
+                self._label(action_id),
+                f"{count} actions share the id '{action_id}'",
+                "Edges and breakpoints cannot tell these actions apart.",
+                suggestion="Give each action a unique id.",
+            )
+
+    def _check_edge(self, edge_id: str) -> None:
+        edge = self._edges.get(edge_id)
+        if edge is None:
+            self._reference.pop(edge_id, None)
+            return
+        missing = [n for n in (edge.source, edge.target) if n not in self._actions]
+        if not missing:
+            self._reference.pop(edge_id, None)
+            return
+        node = edge.source if edge.source in self._actions else edge.target
+        known = node in self._actions
+        self._reference[edge_id] = _warning(
+            Type.invalid_reference,
+            WarningSeverity.critical,
+            node if known else edge_id,
+            self._label(node) if known else edge_id,
+            f"Edge '{edge_id}' points to a missing action",
+            f"Edge '{edge_id}' references {', '.join(repr(n) for n in missing)}, "
+            "which is not in the flow.",
+            affected=missing,
+            suggestion="Remove the edge or reconnect it to an existing action.",
+            key=edge_id,
+        )
+
+    def _check_structure(self, loops: bool) -> None:
+        graph = FlowGraph(self._actions.values(), self._edges.values())
+        warnings = []
+
+        if self._actions:
+            start = next(iter(self._actions))
+            seen = {start}
+            pending = [start]
+            while pending:
+                for target in graph.successors(pending.pop()):
+                    if target not in seen and target in graph:
+                        seen.add(target)
+                        pending.append(target)
+            for action_id, action in self._actions.items():
+                if action_id not in seen:
+                    warnings.append(
+                        _warning(
+                            Type.unreachable_node,
+                            WarningSeverity.medium,
+                            action_id,
+                            action.data.label,
+                            f"'{action.data.label}' is never reached",
+                            f"No path leads from the start action '{start}' "
+                            "to this action, so it never runs.",
+                            suggestion="Connect the action or remove it.",
+                        )
+                    )
+        self._unreachable = warnings
+        if not loops:
+            return
+
+        found = find_loops(graph)
+        self._has_loops = bool(found)
+        warnings = []
+        for loop in found:
+            if not loop.isInfinite:
+                continue
+            first = loop.nodes[0]
+            warnings.append(
+                _warning(
+                    Type.circular_dependency,
+                    WarningSeverity.critical,
+                    first,
+                    self._label(first),
+                    f"Actions form a cycle with no way out ({len(loop.nodes)} actions)",
+                    loop.description,
+                    affected=loop.nodes[1:],
+                    suggestion="Add a conditional that leaves the cycle or a "
+                    "loop action with maxIterations.",
+                )
+            )
+        self._circular = warnings
+
+
+def _warning(
+    type: Type,
+    severity: WarningSeverity,
+    node_id: str,
+    node_name: str,
+    message: str,
+    description: str,
+    *,
+    affected: Iterable[str] | None = None,
+    suggestion: str | None = None,
+    category: Category = Category.logic,
+    key: str | None = None,
+) -> FlowWarning:
+    return FlowWarning(
+        id=f"{type.value}:{key or node_id}",
+        type=type,
+        severity=severity,
+        nodeId=node_id,
+        nodeName=node_name,
+        message=message,
+        description=description,
+        affectedNodes=list(affected) if affected is not None else None,
+        suggestion=suggestion,
+        category=category,
+        createdAt=datetime.now(timezone.utc),
+    )
+
+
+def validate_flow(flow: Flow) -> FlowValidationResult:
+    """Validate ``flow`` once, without keeping incremental state."""
+    return IncrementalFlowValidator(flow).result()
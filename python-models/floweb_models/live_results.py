@@ -0,0 +1,245 @@
+"""Running results for a load test that is still in progress.
+
+:class:`LiveResultsAccumulator` ingests request executions as they complete
+and keeps everything a ``PerformanceTestResults`` snapshot needs up to date
+in O(1) per event: totals, a :class:`~floweb_models.quantiles.QuantileSketch`
+of response times (overall and per request), a rolling window of timeline
+buckets, and the most recent executions of each request. :meth:`snapshot`
+then only formats that state; its cost depends on the window size and the
+number of requests, not on how many executions were recorded.
+
+Executions older than the timeline window still count in the aggregates.
+Keep an :class:`~floweb_models.columnar.ExecutionColumns` alongside if the
+full execution log is needed.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from pydantic import AnyUrl
+
+from .performance_test import (
+    AggregateMetrics,
+    BandwidthMetrics,
+    LoadTestThresholds,
+    PerformanceTestResults,
+    RequestExecution,
+    RequestResults,
+    TimelineDataPoint,
+)
+from .quantiles import QuantileSketch
+from .thresholds import ThresholdEvaluator
+
+
+class _Totals:
+    __slots__ = ("count", "failed", "received", "sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failed = 0
+        self.received = 0
+        self.sketch = QuantileSketch()
+
+    def add(self, response_time: float, size: int, success: bool) -> None:
+        self.count += 1
+        if not success:
+            self.failed += 1
+        self.received += size
+        self.sketch.add(response_time)
+
+    def metrics(self, seconds: float, sent: int) -> AggregateMetrics:
+        return AggregateMetrics(
+            totalRequests=self.count,
+            successfulRequests=self.count - self.failed,
+            failedRequests=self.failed,
+            errorRate=self.failed / self.count if self.count else 0.0,
+            throughput=self.count / seconds,
+            responseTime=self.sketch.to_metrics(),
+            bandwidth=BandwidthMetrics(
+                sent=sent,
+                received=self.received,
+                avgSentPerSecond=sent / seconds,
+                avgReceivedPerSecond=self.received / seconds,
+            ),
+        )
+
+
+class _Request:
+    __slots__ = ("url", "method", "totals", "recent")
+
+    def __init__(self, url: str, method: str, keep: int) -> None:
+        self.url = AnyUrl(url)  # Parsed once, not on every snapshot.
+        self.method = method
+        self.totals = _Totals()
+        self.recent: deque[RequestExecution] = deque(maxlen=keep)
+
+
+class LiveResultsAccumulator:
+    """Incrementally maintained results of a running load test.
+
+    ``bucket_ms`` is the timeline resolution and ``window`` the number of
+    most recent buckets kept. ``recent_executions`` is how many executions
+    per request are kept for ``RequestResults.executions``. Recording and
+    snapshots may happen on different threads.
+
+    With ``thresholds``, executions also feed a :class:`ThresholdEvaluator`
+    (``self.evaluator``), whose ``abort`` event signals a certain breach.
+    ``warmup_ms`` (usually the ramp-up time) delays its throughput checks.
+    """
+
+    def __init__(
+        self,
+        test_id: str,
+        *,
+        start_time: float | None = None,
+        bucket_ms: float = 1000.0,
+        window: int = 300,
+        recent_executions: int = 100,
+        thresholds: LoadTestThresholds | None = None,
+        warmup_ms: float = 0.0,
+        active_users: Callable[[float], int] | None = None,
+    ) -> None:
+        self.test_id = test_id
+        self.start_time = time.time() * 1000 if start_time is None else start_time
+        self.bucket_ms = bucket_ms
+        self.active_users = active_users
+        self.evaluator = (
+            ThresholdEvaluator(
+                thresholds, start_time=self.start_time, warmup_ms=warmup_ms
+            )
+            if thresholds is not None
+            else None
+        )
+        self._recent = recent_executions
+        self._lock = threading.Lock()
+        self._totals = _Totals()
+        self._sent = 0
+        self._last = self.start_time
+        self._requests: dict[str, _Request] = {}
+        # Rolling window: [count, failed, response time sum] per bucket;
+        # ``_first_bucket`` is the bucket number of ``_buckets[0]``.
+        self._buckets: deque[list[float]] = deque(maxlen=window)
+        self._first_bucket = 0
+
+    def add_request(self, request_id: str, url: str, method: str) -> None:
+        """Register a request; executions can only be recorded for those."""
+        with self._lock:
+            if request_id not in self._requests:
+                self._requests[request_id] = _Request(url, method, self._recent)
+
+    def record(
+        self, request_id: str, execution: RequestExecution, *, bytes_sent: int = 0
+    ) -> None:
+        """Ingest one finished execution of a registered request."""
+        with self._lock:
+            request = self._requests[request_id]
+            self._totals.add(execution.responseTime, execution.size, execution.success)
+            request.totals.add(
+                execution.responseTime, execution.size, execution.success
+            )
+            request.recent.append(execution)
+            self._sent += bytes_sent
+            if execution.timestamp > self._last:
+                self._last = execution.timestamp
+            self._bucket(execution.timestamp, execution.responseTime, execution.success)
+            if self.evaluator is not None:
+                self.evaluator.observe(
+                    execution.timestamp, execution.responseTime, execution.success
+                )
+
+    def _bucket(self, timestamp: float, response_time: float, success: bool) -> None:
+        number = int((timestamp - self.start_time) // self.bucket_ms)
+        buckets = self._buckets
+        if not buckets:
+            self._first_bucket = number
+            buckets.append([0, 0, 0.0])
+        offset = number - self._first_bucket
+        if offset < 0:
+            # A late execution: prepend buckets back to it, unless that would
+            # push the newest ones out of the window.
+            if len(buckets) - offset > buckets.maxlen:  # type: ignore[operator]
+                return  # Older than the window.
+            buckets.extendleft([0, 0, 0.0] for _ in range(-offset))
+            self._first_bucket = number
+            offset = 0
+        missing = offset - len(buckets) + 1
+        if missing > 0:
+            if missing >= buckets.maxlen:  # type: ignore[operator]
+                buckets.clear()
+                self._first_bucket = number
+                buckets.append([0, 0, 0.0])
+            else:
+                buckets.extend([0, 0, 0.0] for _ in range(missing))
+                # ``extend`` on a bounded deque dropped buckets from the left.
+                self._first_bucket = number - len(buckets) + 1
+            offset = number - self._first_bucket
+        bucket = buckets[offset]
+        bucket[0] += 1
+        if not success:
+            bucket[1] += 1
+        bucket[2] += response_time
+
+    def snapshot(self) -> PerformanceTestResults:
+        """A consistent ``PerformanceTestResults`` for everything so far."""
+        with self._lock:
+            end = max(self._last, self.start_time)
+            seconds = max(end - self.start_time, self.bucket_ms) / 1000
+            metrics = self._totals.metrics(seconds, self._sent)
+            request_results = [
+                RequestResults(
+                    requestId=request_id,
+                    url=request.url,
+                    method=request.method,
+                    executions=list(request.recent),
+                )
+                for request_id, request in self._requests.items()
+            ]
+            timeline = self._timeline()
+            reasons = (
+                self.evaluator.final_reasons(metrics, elapsed_ms=end - self.start_time)
+                if self.evaluator is not None
+                else []
+            )
+
+        return PerformanceTestResults(
+            testId=self.test_id,
+            startTime=self.start_time,
+            endTime=end,
+            duration=(end - self.start_time) / 1000,
+            metrics=metrics,
+            requestResults=request_results,
+            timeline=timeline,
+            passed=not reasons,
+            failureReasons=reasons or None,
+        )
+
+    def request_metrics(self, request_id: str) -> AggregateMetrics:
+        """Running ``AggregateMetrics`` of a single request."""
+        with self._lock:
+            request = self._requests[request_id]
+            seconds = max(self._last - self.start_time, self.bucket_ms) / 1000
+            return request.totals.metrics(seconds, 0)
+
+    def _timeline(self) -> list[TimelineDataPoint]:
+        bucket_seconds = self.bucket_ms / 1000
+        points = []
+        for i, (count, failed, time_sum) in enumerate(self._buckets):
+            timestamp = self.start_time + (self._first_bucket + i) * self.bucket_ms
+            if self.active_users is not None:
+                users = self.active_users(timestamp)
+            else:
+                users = round(time_sum / self.bucket_ms)
+            points.append(
+                TimelineDataPoint(
+                    timestamp=timestamp,
+                    activeUsers=users,
+                    requestsPerSecond=count / bucket_seconds,
+                    avgResponseTime=time_sum / count if count else 0.0,
+                    errorRate=failed / count if count else 0.0,
+                )
+            )
+        return points
@@ -0,0 +1,411 @@
+"""Asyncio load generation for a ``LoadTestConfiguration``.
+
+:class:`LoadEngine` replays the recorded requests selected by
+``includeRequests`` with ``virtualUsers`` concurrent virtual users. Each user
+runs the selected requests in order, over and over, until ``duration`` has
+passed, pausing ``thinkTime`` ms between requests. Users start on a linear
+ramp: user ``i`` of ``n`` starts ``i * rampUpTime / n`` seconds in.
+
+Requests go to the origin of ``targetUrl`` with their recorded path, query,
+method, headers and body; ``authConfig.header_override`` is applied on top.
+Each request is serialized once up front and sent over a pooled keep-alive
+connection (:class:`~floweb_models.http_client.HttpClient`).
+
+Results are streamed as :class:`ExecutionEvent` from :meth:`LoadEngine.stream`
+(and optionally recorded into a
+:class:`~floweb_models.live_results.LiveResultsAccumulator`, whose threshold
+``abort`` stops the run). :meth:`LoadEngine.run` drains the stream and
+returns a :class:`LoadRunReport` with the achieved request rate next to the
+target, which is ``target_rps`` if given and otherwise the
+``minThroughput`` threshold. With ``target_rps``, users are paced so the
+whole test issues that many requests per second instead of using
+``thinkTime``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from .credential_rotation import CredentialPool, merge_headers
+from .http_client import (
+    HttpClient,
+    HttpError,
+    Origin,
+    encode_head,
+    finish_request,
+    split_url,
+)
+from .live_results import LiveResultsAccumulator
+from .performance_test import (
+    LoadTestConfiguration,
+    RecordedRequest,
+    RequestExecution,
+    ResponseTiming,
+)
+from .templates import Template
+from .token_refresh import TokenManager, TokenRefreshError
+
+
+class ExecutionEvent(NamedTuple):
+    request_id: str
+    user: int
+    execution: RequestExecution
+    timing: ResponseTiming | None
+    bytes_sent: int
+
+
+@dataclass(frozen=True, slots=True)
+class LoadRunReport:
+    total_requests: int
+    failed_requests: int
+    duration: float
+    achieved_rps: float
+    target_rps: float
+    aborted: bool
+
+    @property
+    def rps_ratio(self) -> float:
+        """Achieved over target rate (1.0 without a target)."""
+        return self.achieved_rps / self.target_rps if self.target_rps else 1.0
+
+
+class _Prepared(NamedTuple):
+    id: str
+    origin: Origin
+    # Serialized request per credential (one without rotation), each with
+    # the offset where per-request headers (the token) are inserted.
+    variants: tuple[tuple[bytes, int], ...]
+    head: bool
+
+
+class _Templated(NamedTuple):
+    id: str
+    origin: Origin
+    method: str
+    # Compiled serialized heads, one per credential, and the body.
+    heads: tuple[Template, ...]
+    body: Template | None
+
+    @property
+    def names(self) -> frozenset[str]:
+        names = frozenset().union(*(head.names for head in self.heads))
+        return names | self.body.names if self.body is not None else names
+
+    def render(self, values: Mapping[str, str]) -> _Prepared:
+        body = self.body.render(values).encode() if self.body is not None else None
+        variants = []
+        for head in self.heads:
+            data = finish_request(self.method, head.render(values), body)
+            variants.append((data, data.index(b"\r\n\r\n") + 2))
+        return _Prepared(self.id, self.origin, tuple(variants), self.method == "HEAD")
+
+
+class LoadEngine:
+    """Generates load for one ``LoadTestConfiguration``.
+
+    ``requests`` are the recorded requests to pick ``includeRequests`` from;
+    the order of ``includeRequests`` is the order users replay them in.
+    ``duration`` (seconds) overrides the configured duration, e.g. for a
+    short smoke run. Pass a ``client`` to share or tune the connection pool.
+    ``users`` limits the engine to those 0-based user indices (all by
+    default), to shard one test across processes; ramp-up offsets and
+    pacing still follow the whole test's ``virtualUsers``.
+
+    With ``authConfig.token_refresh``, a :class:`TokenManager` (or the given
+    ``token_manager``) supplies the token header; a 401 response triggers a
+    single-flight refresh. With ``authConfig.credential_rotation``, each
+    request is pre-serialized once per credential and every send picks one
+    (see :class:`CredentialPool`; random rotation is seeded with the first
+    user index, so shards draw different sequences).
+
+    ``variables`` fills the ``{{name}}`` placeholders of the recorded
+    requests (see :mod:`~floweb_models.templates`): a sequence of rows, of
+    which user ``i`` gets row ``i % len(rows)``, or a function of the user
+    index. Requests are compiled once and rendered once per user when it
+    starts. Without ``variables``, placeholders are sent as recorded.
+    """
+
+    def __init__(
+        self,
+        configuration: LoadTestConfiguration,
+        requests: Sequence[RecordedRequest],
+        *,
+        target_rps: float | None = None,
+        duration: float | None = None,
+        client: HttpClient | None = None,
+        accumulator: LiveResultsAccumulator | None = None,
+        users: Sequence[int] | None = None,
+        token_manager: TokenManager | None = None,
+        variables: (
+            Sequence[Mapping[str, str]] | Callable[[int], Mapping[str, str]] | None
+        ) = None,
+    ) -> None:
+        by_id = {request.id: request for request in requests}
+        missing = [id_ for id_ in configuration.includeRequests if id_ not in by_id]
+        if missing:
+            raise ValueError(f"unknown requests in includeRequests: {missing}")
+        if not configuration.includeRequests:
+            raise ValueError("includeRequests is empty")
+        self.configuration = configuration
+        self.users = range(configuration.virtualUsers) if users is None else users
+        if any(not 0 <= user < configuration.virtualUsers for user in self.users):
+            raise ValueError("users must be indices below virtualUsers")
+        self.duration = configuration.duration if duration is None else duration
+        self.target_rps = (
+            target_rps
+            if target_rps is not None
+            else configuration.thresholds.minThroughput
+        )
+        self._paced = target_rps is not None
+        self.client = client
+        self.accumulator = accumulator
+        self.token_manager = token_manager
+        self._tokens: TokenManager | None = None
+        auth = configuration.authConfig
+        self.credentials = (
+            CredentialPool(auth.credential_rotation, seed=min(self.users, default=0))
+            if auth is not None and auth.credential_rotation is not None
+            else None
+        )
+        self.variables = variables
+        self._requests = [
+            self._prepare(by_id[id_]) for id_ in configuration.includeRequests
+        ]
+        self._templated = any(isinstance(r, _Templated) for r in self._requests)
+        if isinstance(variables, Sequence):
+            if not variables:
+                raise ValueError("variables has no rows")
+            names = frozenset().union(
+                *(r.names for r in self._requests if isinstance(r, _Templated))
+            )
+            for number, row in enumerate(variables):
+                if not names <= row.keys():
+                    raise ValueError(
+                        f"variables row {number} lacks {sorted(names - row.keys())}"
+                    )
+        if accumulator is not None:
+            for id_ in configuration.includeRequests:
+                request = by_id[id_]
+                accumulator.add_request(id_, str(request.url), request.method)
+
+    def _prepare(self, request: RecordedRequest) -> _Prepared | _Templated:
+        target_origin, _ = split_url(str(self.configuration.targetUrl))
+        _, target = split_url(str(request.url))
+        auth = self.configuration.authConfig
+        override = auth.header_override if auth is not None else None
+        if self.credentials is not None:
+            variants = self.credentials.merge(request.headers, override)
+        else:
+            variants = (merge_headers(request.headers, override),)
+        if auth is not None and auth.token_refresh is not None:
+            token_header = (auth.token_refresh.token_header or "Authorization").lower()
+            variants = tuple(
+                {k: v for k, v in headers.items() if k.lower() != token_header}
+                for headers in variants
+            )
+        heads = [
+            encode_head(request.method, target_origin, target, h) for h in variants
+        ]
+        if self.variables is not None:
+            templated = _Templated(
+                request.id,
+                target_origin,
+                request.method,
+                tuple(Template(head, url=True) for head in heads),
+                Template(request.body) if request.body is not None else None,
+            )
+            if templated.names:
+                return templated
+        # Nothing to fill in: serialize once, placeholders (if any) verbatim.
+        body = request.body.encode() if request.body is not None else None
+        encoded = []
+        for head in heads:
+            data = finish_request(request.method, head, body)
+            encoded.append((data, data.index(b"\r\n\r\n") + 2))
+        return _Prepared(
+            request.id, target_origin, tuple(encoded), request.method == "HEAD"
+        )
+
+    def start_offset(self, user: int) -> float:
+        """Seconds after the start at which ``user`` (0-based) starts."""
+        ramp = self.configuration.rampUpTime or 0
+        return user * ramp / self.configuration.virtualUsers
+
+    def active_users(self, elapsed: float) -> int:
+        """Number of users started ``elapsed`` seconds into the run."""
+        users = self.configuration.virtualUsers
+        ramp = self.configuration.rampUpTime or 0
+        if elapsed < 0:
+            return 0
+        if not ramp or elapsed >= ramp:
+            return users
+        return min(int(elapsed * users / ramp) + 1, users)
+
+    async def stream(self) -> AsyncIterator[ExecutionEvent]:
+        """Run the test, yielding each execution as it completes."""
+        client = self.client or HttpClient()
+        tokens = self.token_manager
+        auth = self.configuration.authConfig
+        refresh = auth.token_refresh if tokens is None and auth is not None else None
+        own_tokens = refresh is not None
+        users: list[asyncio.Task[None]] = []
+        try:
+            if refresh is not None:
+                tokens = TokenManager(refresh, client)
+                await tokens.start()
+            self._tokens = tokens
+            queue: asyncio.Queue[ExecutionEvent | None] = asyncio.Queue()
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            deadline = started + self.duration
+            users = [
+                asyncio.create_task(self._user(client, queue, index, started, deadline))
+                for index in self.users
+            ]
+            running = len(users)
+            for task in users:
+                task.add_done_callback(lambda _: queue.put_nowait(None))
+            while running:
+                event = await queue.get()
+                if event is None:
+                    running -= 1
+                    continue
+                yield event
+            for task in users:
+                if task.exception() is not None:
+                    raise task.exception()  # type: ignore[misc]
+        finally:
+            for task in users:
+                task.cancel()
+            await asyncio.gather(*users, return_exceptions=True)
+            if own_tokens and tokens is not None:
+                await tokens.close()
+            if self.client is None:
+                await client.close()
+
+    async def run(self) -> LoadRunReport:
+        """Run the test to completion and report achieved vs. target rate."""
+        started = time.perf_counter()
+        total = failed = 0
+        async for event in self.stream():
+            total += 1
+            if not event.execution.success:
+                failed += 1
+        seconds = time.perf_counter() - started
+        return LoadRunReport(
+            total_requests=total,
+            failed_requests=failed,
+            duration=seconds,
+            achieved_rps=total / seconds if seconds else 0.0,
+            target_rps=self.target_rps,
+            aborted=self._aborted(),
+        )
+
+    def _aborted(self) -> bool:
+        accumulator = self.accumulator
+        return (
+            accumulator is not None
+            and accumulator.evaluator is not None
+            and accumulator.evaluator.abort.is_set()
+        )
+
+    async def _user(
+        self,
+        client: HttpClient,
+        queue: asyncio.Queue[ExecutionEvent | None],
+        user: int,
+        started: float,
+        deadline: float,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        begin = started + self.start_offset(user)
+        if begin >= deadline:
+            return
+        await asyncio.sleep(begin - loop.time())
+        think = (self.configuration.thinkTime or 0) / 1000
+        interval = (
+            self.configuration.virtualUsers / self.target_rps if self._paced else 0.0
+        )
+        requests = self._requests_for(user)
+        next_at = loop.time()
+        while True:
+            for request in requests:
+                if loop.time() >= deadline or self._aborted():
+                    return
+                event = await self._execute(client, user, request)
+                queue.put_nowait(event)
+                if self.accumulator is not None:
+                    self.accumulator.record(
+                        request.id, event.execution, bytes_sent=event.bytes_sent
+                    )
+                if interval:
+                    next_at += interval
+                    delay = next_at - loop.time()
+                else:
+                    delay = think
+                if delay > 0:
+                    await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+
+    def _requests_for(self, user: int) -> list[_Prepared]:
+        variables = self.variables
+        if not self._templated or variables is None:
+            # Requests are only templated when there are variables.
+            return self._requests  # type: ignore[return-value]
+        if callable(variables):
+            values = variables(user)
+        else:
+            values = variables[user % len(variables)]
+        return [
+            request.render(values) if isinstance(request, _Templated) else request
+            for request in self._requests
+        ]
+
+    async def _execute(
+        self, client: HttpClient, user: int, request: _Prepared
+    ) -> ExecutionEvent:
+        variants = request.variants
+        if self.credentials is not None:
+            data, split = self.credentials.select(variants)
+        else:
+            data, split = variants[0]
+        tokens = self._tokens
+        if tokens is not None:
+            version, header = tokens.published
+            data = data[:split] + header + data[split:]
+        timestamp = time.time() * 1000
+        started = time.perf_counter()
+        try:
+            response = await client.send(request.origin, data, head=request.head)
+        except (OSError, EOFError, HttpError, ValueError) as exc:
+            execution = RequestExecution(
+                timestamp=timestamp,
+                statusCode=0,
+                responseTime=(time.perf_counter() - started) * 1000,
+                size=0,
+                success=False,
+                error=str(exc) or type(exc).__name__,
+            )
+            return ExecutionEvent(request.id, user, execution, None, len(data))
+        if response.status == 401 and tokens is not None:
+            try:
+                await tokens.refresh_after(version)
+            except (TokenRefreshError, OSError, EOFError, HttpError, ValueError):
+                pass  # Keep the old token; the next 401 retries the refresh.
+        success = response.status < 400
+        execution = RequestExecution(
+            timestamp=timestamp,
+            statusCode=response.status,
+            responseTime=response.timing.total,
+            size=len(response.body),
+            success=success,
+            error=(
+                None
+                if success
+                else f"HTTP {response.status} {response.reason}".rstrip()
+            ),
+        )
+        return ExecutionEvent(request.id, user, execution, response.timing, len(data))
@@ -0,0 +1,192 @@
+"""Cycle detection over flow graphs.
+
+:func:`detect_loops` finds the strongly connected components of a flow with
+an iterative Tarjan traversal, so it runs in O(V+E) and does not hit the
+recursion limit on long chains. Every component with more than one action,
+or a single action with an edge to itself, is reported as a ``LoopInfo``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .flow import Action, Flow
+from .flow_validation import LoopDetectionResult, LoopInfo, WarningSeverity
+from .graph import FlowGraph, flow_graph
+
+# Action types that can route execution out of a cycle.
+EXIT_ACTION_TYPES = frozenset({"conditional", "junction", "loop"})
+
+# ``LoopConfig.maxIterations`` default from the schema.
+_DEFAULT_MAX_ITERATIONS = 100
+
+
+def strongly_connected_components(graph: FlowGraph) -> list[list[str]]:
+    """Strongly connected components of ``graph``, as lists of action ids.
+
+    Components and the ids within them follow flow order. Edges to ids that
+    are not actions of the flow are ignored.
+    """
+    ids = list(graph.actions)
+    position = {action_id: i for i, action_id in enumerate(ids)}
+    successors = [
+        [position[t] for t in graph.successors(action_id) if t in position]
+        for action_id in ids
+    ]
+
+    count = len(ids)
+    index = [-1] * count
+    lowlink = [0] * count
+    on_stack = [False] * count
+    stack: list[int] = []
+    component_of = [-1] * count
+    components = 0
+    counter = 0
+
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, 0)]
+        while work:
+            node, i = work[-1]
+            edges = successors[node]
+            if i < len(edges):
+                work[-1] = (node, i + 1)
+                target = edges[i]
+                if index[target] == -1:
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, 0))
+                elif on_stack[target] and index[target] < lowlink[node]:
+                    lowlink[node] = index[target]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component_of[member] = components
+                    if member == node:
+                        break
+                components += 1
+
+    # Bucket by component in flow order instead of sorting each component.
+    result: list[list[str]] = []
+    slot = [-1] * components
+    for i, component in enumerate(component_of):
+        if slot[component] == -1:
+            slot[component] = len(result)
+            result.append([])
+        result[slot[component]].append(ids[i])
+    return result
+
+
+def _action_type(action: Action) -> str:
+    return action.data.type or action.type
+
+
+def _config_value(config: Any, name: str, default: Any = None) -> Any:
+    # ``config`` is a dict on ``Flow`` and a config model on ``TypedFlow``.
+    if isinstance(config, Mapping):
+        return config.get(name, default)
+    return getattr(config, name, default)
+
+
+def _iteration_bound(config: Any) -> int | None:
+    """Iterations a loop action allows before exiting, or None if unbounded."""
+    if _config_value(config, "loopType") == "count":
+        count = _config_value(config, "count")
+        if isinstance(count, int):
+            return count
+    bound = _config_value(config, "maxIterations", _DEFAULT_MAX_ITERATIONS)
+    return bound if isinstance(bound, int) else None
+
+
+def _loop_info(graph: FlowGraph, nodes: list[str]) -> LoopInfo:
+    members = set(nodes)
+    exits: list[str] = []
+    bounds: list[int] = []
+    unbounded_loop = False
+    for action_id in nodes:
+        action = graph.actions[action_id]
+        action_type = _action_type(action)
+        if action_type not in EXIT_ACTION_TYPES:
+            continue
+        if action_type == "loop":
+            bound = _iteration_bound(action.data.config)
+            if bound is None:
+                unbounded_loop = True
+            else:
+                bounds.append(bound)
+        if any(target not in members for target in graph.successors(action_id)):
+            exits.append(action_id)
+
+    has_exit = bool(exits)
+    max_iterations = min(bounds) if bounds else None
+    is_infinite = not has_exit and max_iterations is None
+    path = ", ".join(nodes[:5])
+    if len(nodes) > 5:
+        path += f" and {len(nodes) - 5} more"
+
+    if is_infinite:
+        severity = WarningSeverity.critical
+        reason = (
+            "has an unbounded loop action" if unbounded_loop else "has no exit path"
+        )
+        description = f"Loop over {path} {reason} and may never terminate."
+    elif max_iterations is not None:
+        severity = WarningSeverity.info
+        description = f"Loop over {path} stops after {max_iterations} iterations."
+    else:
+        severity = WarningSeverity.medium
+        description = (
+            f"Loop over {path} exits through {', '.join(exits)} but has no "
+            "iteration limit."
+        )
+
+    return LoopInfo(
+        nodes=nodes,
+        hasExitCondition=has_exit,
+        severity=severity,
+        description=description,
+        maxIterations=max_iterations,
+        isInfinite=is_infinite,
+    )
+
+
+def find_loops(graph: FlowGraph) -> list[LoopInfo]:
+    """Describe every cycle of ``graph``; see :func:`detect_loops`."""
+    loops = []
+    for nodes in strongly_connected_components(graph):
+        if len(nodes) == 1 and nodes[0] not in graph.successors(nodes[0]):
+            continue
+        loops.append(_loop_info(graph, nodes))
+    return loops
+
+
+def detect_loops(flow: Flow) -> LoopDetectionResult:
+    """Find the cycles of ``flow`` and describe how each one terminates.
+
+    A loop has an exit condition when one of its conditional, junction or
+    loop actions has an edge leaving the cycle. ``maxIterations`` is the
+    smallest bound set by a loop action inside the cycle (``count`` for
+    count loops); a loop with neither an exit nor a bound is infinite.
+    """
+    loops = find_loops(flow_graph(flow))
+    return LoopDetectionResult(
+        hasLoops=bool(loops),
+        loops=loops,
+        totalLoops=len(loops),
+        infiniteLoops=sum(1 for loop in loops if loop.isInfinite),
+    )
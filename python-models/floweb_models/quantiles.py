@@ -0,0 +1,238 @@
+"""Mergeable streaming quantile sketch for response times.
+
+:class:`QuantileSketch` is a log-bucketed sketch in the style of DDSketch:
+each value ``x > 0`` is counted in bucket ``ceil(log(x) / log(gamma))`` with
+``gamma = (1 + alpha) / (1 - alpha)``, and a bucket is reported as the
+value ``2 * gamma**k / (gamma + 1)`` in its middle.
+
+Error bound: for any ``q``, :meth:`QuantileSketch.quantile` returns a value
+within a relative error of ``alpha`` (1% by default) of the exact order
+statistic at rank ``floor(q * (count - 1))``. ``min``, ``max``, ``mean`` and
+``count`` are exact. Memory is one counter per occupied bucket, which is
+``log(max / min) / log(gamma)`` at most -- about 1,100 buckets to cover
+1 microsecond to 1 hour at 1% -- independent of the number of values.
+
+If ``max_buckets`` is exceeded, the lowest buckets are folded together; the
+bound then only holds for quantiles above the folded range, which is the
+end that matters for latency.
+
+Sketches with the same ``alpha`` can be merged, so each load worker can keep
+its own and the coordinator combines them.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+
+from .performance_test import ResponseTimeMetrics
+
+# Values at or below this (1 ns, in milliseconds) are counted as zero.
+_ZERO_THRESHOLD = 1e-6
+
+_HEADER = struct.Struct("<4sdiQQdddI")
+_MAGIC = b"FQS1"
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with relative error ``alpha``."""
+
+    __slots__ = (
+        "alpha",
+        "max_buckets",
+        "count",
+        "zero_count",
+        "sum",
+        "min",
+        "max",
+        "_gamma",
+        "_multiplier",
+        "_buckets",
+    )
+
+    def __init__(self, alpha: float = 0.01, max_buckets: int = 2048) -> None:
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.alpha = alpha
+        self.max_buckets = max_buckets
+        self.count = 0
+        self.zero_count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._multiplier = 1 / math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float) -> None:
+        """Record one value (a response time in milliseconds)."""
+        if not value >= 0:
+            raise ValueError(f"cannot add {value!r} to a quantile sketch")
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= _ZERO_THRESHOLD:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) * self._multiplier)
+        buckets = self._buckets
+        buckets[key] = buckets.get(key, 0) + 1
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Record every value of ``values``."""
+        # Same as calling add() in a loop, with the lookups hoisted.
+        buckets = self._buckets
+        log = math.log
+        ceil = math.ceil
+        multiplier = self._multiplier
+        count = 0
+        zeros = 0
+        total = 0.0
+        low = self.min
+        high = self.max
+        for value in values:
+            if not value >= 0:
+                raise ValueError(f"cannot add {value!r} to a quantile sketch")
+            count += 1
+            total += value
+            if value < low:
+                low = value
+            if value > high:
+                high = value
+            if value <= _ZERO_THRESHOLD:
+                zeros += 1
+                continue
+            key = ceil(log(value) * multiplier)
+            buckets[key] = buckets.get(key, 0) + 1
+        self.count += count
+        self.zero_count += zeros
+        self.sum += total
+        self.min = low
+        self.max = high
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Add the values recorded by ``other`` to this sketch."""
+        if other.alpha != self.alpha:
+            raise ValueError("cannot merge sketches with different alpha")
+        if not other.count:
+            return
+        self.count += other.count
+        self.zero_count += other.zero_count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        buckets = self._buckets
+        for key, n in other._buckets.items():
+            buckets[key] = buckets.get(key, 0) + n
+        if len(buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self._buckets)
+        excess = len(keys) - self.max_buckets
+        folded = sum(self._buckets.pop(key) for key in keys[: excess + 1])
+        target = keys[excess]
+        self._buckets[target] = folded
+
+    def quantile(self, q: float) -> float:
+        """Estimate the ``q`` quantile (0-1) of the recorded values."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            raise ValueError("quantile of an empty sketch")
+        return self._quantiles([q])[0]
+
+    def _quantiles(self, qs: list[float]) -> list[float]:
+        # ``qs`` must be ascending; one pass over the sorted buckets.
+        keys = sorted(self._buckets)
+        results = []
+        seen = self.zero_count
+        i = 0
+        for q in qs:
+            rank = math.floor(q * (self.count - 1))
+            if rank < self.zero_count:
+                results.append(max(self.min, 0.0))
+                continue
+            while seen <= rank:
+                seen += self._buckets[keys[i]]
+                i += 1
+            value = 2 * self._gamma ** keys[i - 1] / (self._gamma + 1)
+            results.append(min(max(value, self.min), self.max))
+        return results
+
+    def to_metrics(self) -> ResponseTimeMetrics:
+        """Summarize as ``ResponseTimeMetrics`` (all zeros when empty)."""
+        if not self.count:
+            return ResponseTimeMetrics(
+                min=0.0, max=0.0, mean=0.0, median=0.0, p90=0.0, p95=0.0, p99=0.0
+            )
+        median, p90, p95, p99 = self._quantiles([0.5, 0.9, 0.95, 0.99])
+        return ResponseTimeMetrics(
+            min=self.min,
+            max=self.max,
+            mean=self.sum / self.count,
+            median=median,
+            p90=p90,
+            p95=p95,
+            p99=p99,
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact, platform-independent byte string."""
+        keys = array("i", sorted(self._buckets))
+        counts = array("Q", (self._buckets[key] for key in keys))
+        if sys.byteorder == "big":
+            keys.byteswap()
+            counts.byteswap()
+        header = _HEADER.pack(
+            _MAGIC,
+            self.alpha,
+            self.max_buckets,
+            self.count,
+            self.zero_count,
+            self.sum,
+            self.min,
+            self.max,
+            len(keys),
+        )
+        return header + keys.tobytes() + counts.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> QuantileSketch:
+        """Rebuild a sketch serialized with :meth:`to_bytes`."""
+        magic, alpha, max_buckets, count, zeros, total, low, high, n = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != _MAGIC:
+            raise ValueError("not a serialized QuantileSketch")
+        offset = _HEADER.size
+        keys = array("i")
+        keys.frombytes(data[offset : offset + 4 * n])
+        counts = array("Q")
+        counts.frombytes(data[offset + 4 * n : offset + 12 * n])
+        if len(counts) != n:
+            raise ValueError("truncated QuantileSketch data")
+        if sys.byteorder == "big":
+            keys.byteswap()
+            counts.byteswap()
+        sketch = cls(alpha, max_buckets)
+        sketch.count = count
+        sketch.zero_count = zeros
+        sketch.sum = total
+        sketch.min = low
+        sketch.max = high
+        sketch._buckets = dict(zip(keys, counts))
+        return sketch
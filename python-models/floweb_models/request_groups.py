@@ -0,0 +1,316 @@
+"""Grouping of near-identical recorded requests into parameterized ones.
+
+A performance scan captures the same endpoint many times: polling calls,
+``/items/17`` and ``/items/18``, the same search with another ``?q=``.
+:func:`group_requests` reduces a recording to one request per endpoint:
+
+- Each request gets a signature of its method, host, path template, query
+  keys, a subset of its headers (``accept`` and ``content-type`` by
+  default, compared case-insensitively) and the shape of its body. In the
+  path template, ID-like segments (numbers, UUIDs, long hex or token
+  strings) are wildcards. A JSON body's shape is its structure with the
+  leaf values replaced by their types; a form body's shape is its keys;
+  any other body is compared as is.
+- Requests with equal signatures form a :class:`RequestGroup`. Its
+  ``request`` is the first member with every path segment, query value and
+  body value that differs within the group replaced by a ``{{name}}``
+  placeholder (see :mod:`~floweb_models.templates`). Names start with the
+  request id, so they are unique across a recording:
+  ``{{items-1.path_2}}``, ``{{items-1.query_page}}``,
+  ``{{orders-1.body.items.0.qty}}``. In a JSON body, a placeholder stands
+  for a whole JSON value (a string with its quotes); where members differ
+  in keys or list lengths, it stands for the enclosing object or list. A
+  form body gets one placeholder per differing value, or one for the whole
+  body if the members' keys come in another order. Its ``weight`` is the
+  number of members.
+  ``values`` holds each member's placeholder values in the row format
+  ``LoadEngine`` takes as ``variables``: URL values decoded (rendering
+  encodes them), body values as they go into the body.
+
+Signatures are tuples hashed by a dict, so grouping is one pass over the
+recording. :func:`deduplicate_test` applies the grouping to a
+``PerformanceTest``, so replay scales with the number of distinct endpoints
+rather than with the captured volume. The deduplicated test keeps each
+group's first request as recorded, so it replays as is; to replay the
+parameterized requests instead, pass them to ``LoadEngine`` with
+:func:`group_variables` as ``variables``.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qsl, quote_plus, unquote, urlsplit, urlunsplit
+
+from .performance_test import PerformanceTest, RecordedRequest
+
+DEFAULT_SIGNATURE_HEADERS = ("accept", "content-type")
+
+_ID_SEGMENT = re.compile(
+    r"\d+"
+    r"|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+    r"|[0-9a-f]{16,}"
+    r"|(?=[A-Za-z_-]*\d)[\w-]{24,}",
+    re.IGNORECASE,
+)
+_NAME_CHARS = re.compile(r"[^\w.-]")
+
+
+def _slot_prefix(request_id: str) -> str:
+    prefix = _NAME_CHARS.sub("_", request_id)
+    # Placeholder names start with a letter or underscore.
+    return prefix if prefix[:1].isalpha() else f"_{prefix}"
+
+
+def _path_template(segments: Sequence[str]) -> tuple[str | None, ...]:
+    return tuple(
+        None if _ID_SEGMENT.fullmatch(segment) else segment for segment in segments
+    )
+
+
+def _json_shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _json_shape(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return ("[]", frozenset(_json_shape(item) for item in value))
+    return type(value).__name__
+
+
+def _decode_body(body: str | None, content_type: str) -> tuple[Any, Any]:
+    """The shape of ``body`` and its decoded value (JSON or form pairs)."""
+    if not body:
+        return None, None
+    if "json" in content_type or body[0] in "[{":
+        try:
+            value = json.loads(body)
+        except ValueError:
+            pass
+        else:
+            return ("json", _json_shape(value)), value
+    if "x-www-form-urlencoded" in content_type:
+        pairs = parse_qsl(body, keep_blank_values=True)
+        return ("form", tuple(sorted({key for key, value in pairs if value}))), pairs
+    return ("text", body), None
+
+
+@dataclass(frozen=True)
+class RequestGroup:
+    """Recorded requests that replay as one parameterized request."""
+
+    request: RecordedRequest
+    members: tuple[str, ...]
+    values: tuple[dict[str, str], ...]
+    first: RecordedRequest
+
+    @property
+    def weight(self) -> int:
+        """How many recorded requests the group stands for."""
+        return len(self.members)
+
+
+class _Builder:
+    __slots__ = ("first", "kind", "parts", "members", "prefix", "columns")
+
+    def __init__(
+        self, first: RecordedRequest, kind: str | None, parts: tuple[Any, ...]
+    ) -> None:
+        self.first = first
+        self.kind = kind
+        self.parts = [parts]
+        self.members = [first.id]
+
+    def build(self) -> RequestGroup:
+        split, segments, query, _, _ = self.parts[0]
+        self.prefix = _slot_prefix(self.first.id)
+        # Slot name -> each member's value, in member order.
+        self.columns: dict[str, list[str]] = {}
+        template = list(segments)
+        for index, segment in enumerate(segments):
+            if any(parts[1][index] != segment for parts in self.parts):
+                template[index] = self._slot(
+                    f"path_{index}", [unquote(parts[1][index]) for parts in self.parts]
+                )
+        # Static query values are encoded here rather than in the template, so
+        # the placeholders stay intact. The values rows hold decoded values;
+        # rendering the template encodes them.
+        pairs = []
+        for index, (key, value) in enumerate(query):
+            column = [parts[2][index][1] for parts in self.parts]
+            if any(member != value for member in column):
+                value = self._slot(f"query_{_NAME_CHARS.sub('_', key)}", column)
+            else:
+                value = quote_plus(value)
+            pairs.append(f"{quote_plus(key)}={value}")
+        in_url = bool(self.columns)
+        body = self._body_template()
+        if not self.columns:
+            return RequestGroup(self.first, tuple(self.members), (), self.first)
+
+        update: dict[str, Any] = {"body": body}
+        if in_url:
+            encoded = "&".join(pairs)
+            path = "/".join(template)
+            update["url"] = urlunsplit(split._replace(path=path, query=encoded))
+        columns = self.columns
+        values = tuple(
+            {name: column[member] for name, column in columns.items()}
+            for member in range(len(self.members))
+        )
+        request = RecordedRequest.model_validate({**self.first.model_dump(), **update})
+        return RequestGroup(request, tuple(self.members), values, self.first)
+
+    def _slot(self, name: str, column: list[str]) -> str:
+        name = f"{self.prefix}.{name}"
+        if name in self.columns:
+            name = f"{name}_{len(self.columns)}"  # A repeated key.
+        self.columns[name] = column
+        return f"{{{{{name}}}}}"
+
+    def _body_template(self) -> str | None:
+        """The first member's body, with the values that differ as slots."""
+        body = self.first.body
+        if self.kind not in ("json", "form"):
+            return body  # Other bodies are grouped only if they are equal.
+        decoded = [parts[3] for parts in self.parts]
+        if all(value == decoded[0] for value in decoded):
+            return body
+        if self.kind == "json":
+            return self._json_template(decoded, "body")
+        keys = [key for key, _ in decoded[0]]
+        if any([key for key, _ in pairs] != keys for pairs in decoded):
+            # Same keys in another order or number: slot the whole body.
+            return self._slot("body", [parts[4] for parts in self.parts])
+        pairs = []
+        for index, (key, value) in enumerate(decoded[0]):
+            column = [quote_plus(member[index][1]) for member in decoded]
+            if any(member != column[0] for member in column):
+                value = self._slot(f"body_{_NAME_CHARS.sub('_', key)}", column)
+            else:
+                value = column[0]
+            pairs.append(f"{quote_plus(key)}={value}")
+        return "&".join(pairs)
+
+    def _json_template(self, values: list[Any], path: str) -> str:
+        first = values[0]
+        if all(value == first for value in values):
+            return json.dumps(first)
+        if isinstance(first, dict) and all(
+            isinstance(value, dict) and value.keys() == first.keys() for value in values
+        ):
+            members = (
+                f"{json.dumps(key)}: "
+                + self._json_template(
+                    [value[key] for value in values],
+                    f"{path}.{_NAME_CHARS.sub('_', key)}",
+                )
+                for key in first
+            )
+            return "{" + ", ".join(members) + "}"
+        if isinstance(first, list) and all(
+            isinstance(value, list) and len(value) == len(first) for value in values
+        ):
+            items = (
+                self._json_template(
+                    [value[index] for value in values], f"{path}.{index}"
+                )
+                for index in range(len(first))
+            )
+            return "[" + ", ".join(items) + "]"
+        # The slot stands for a whole JSON value, strings with their quotes.
+        return self._slot(path, [json.dumps(value) for value in values])
+
+
+def group_requests(
+    requests: Iterable[RecordedRequest],
+    *,
+    headers: Sequence[str] = DEFAULT_SIGNATURE_HEADERS,
+) -> list[RequestGroup]:
+    """Group ``requests`` by signature, in order of first appearance."""
+    header_names = frozenset(name.lower() for name in headers)
+    builders: dict[tuple[Any, ...], _Builder] = {}
+    for request in requests:
+        split = urlsplit(str(request.url))
+        segments = split.path.split("/")
+        query = tuple(parse_qsl(split.query, keep_blank_values=True))
+        selected = tuple(
+            sorted(
+                (name.lower(), value)
+                for name, value in request.headers.items()
+                if name.lower() in header_names
+            )
+        )
+        content_type = next(
+            (v for k, v in request.headers.items() if k.lower() == "content-type"),
+            "",
+        )
+        shape, decoded = _decode_body(request.body, content_type.lower())
+        signature = (
+            request.method,
+            split.scheme,
+            split.netloc.lower(),
+            _path_template(segments),
+            tuple(key for key, _ in query),
+            selected,
+            shape,
+        )
+        parts = (split, segments, query, decoded, request.body)
+        builder = builders.get(signature)
+        if builder is None:
+            kind = shape[0] if shape is not None else None
+            builders[signature] = _Builder(request, kind, parts)
+        else:
+            builder.parts.append(parts)
+            builder.members.append(request.id)
+    return [builder.build() for builder in builders.values()]
+
+
+def group_variables(groups: Iterable[RequestGroup]) -> list[dict[str, str]]:
+    """The ``values`` of all ``groups`` merged into one list of rows.
+
+    Row ``i`` holds every group's row ``i``, cycling through the rows of
+    groups with fewer members; there is one row per member of the largest
+    group (or a single empty row if no group has placeholders).
+    """
+    parameterized = [group for group in groups if group.values]
+    count = max((len(group.values) for group in parameterized), default=1)
+    return [
+        {
+            name: value
+            for group in parameterized
+            for name, value in group.values[row % len(group.values)].items()
+        }
+        for row in range(count)
+    ]
+
+
+def deduplicate_test(
+    test: PerformanceTest,
+    *,
+    headers: Sequence[str] = DEFAULT_SIGNATURE_HEADERS,
+) -> tuple[PerformanceTest, list[RequestGroup]]:
+    """A copy of ``test`` with one recorded request per group, and the groups.
+
+    Each group is represented by its first member as recorded (the
+    parameterized ``request`` needs its ``values`` to replay, and the test
+    has nowhere to keep them). ``loadTestConfig.includeRequests`` is
+    rewritten to the groups' ids (each once, in order of first inclusion);
+    a group's ``request`` has the same id.
+    """
+    groups = group_requests(test.recordedRequests, headers=headers)
+    group_of = {
+        member: group.request.id for group in groups for member in group.members
+    }
+    included = dict.fromkeys(
+        group_of.get(id_, id_) for id_ in test.loadTestConfig.includeRequests
+    )
+    config = test.loadTestConfig.model_copy(update={"includeRequests": list(included)})
+    deduplicated = test.model_copy(
+        update={
+            "recordedRequests": [group.first for group in groups],
+            "loadTestConfig": config,
+        }
+    )
+    return deduplicated, groups
@@ -0,0 +1,411 @@
+"""Load tests sharded across worker processes.
+
+One asyncio loop tops out at a few thousand requests per second (the GIL,
+HTTP parsing, TLS). :func:`run_sharded_load_test` splits the virtual users
+of a ``LoadTestConfiguration`` over ``workers`` processes, each running a
+:class:`~floweb_models.load_engine.LoadEngine` on its own event loop, and
+merges their results into one ``PerformanceTestResults``.
+
+Users are dealt round-robin (worker ``k`` of ``n`` runs users ``k``,
+``k + n``, ...), so the combined ramp-up is the same linear ramp as a single
+process. All workers start at a common epoch time chosen once every worker
+has imported and prepared its requests.
+
+Workers never send individual executions. Every ``flush_interval`` seconds
+each sends a :class:`PartialResults` delta over its pipe: per-request
+counters and a :class:`~floweb_models.quantiles.QuantileSketch` (pickled via
+its compact byte form), timeline bucket counters, and the last few
+executions. Partials are merged exactly (sketches merge without loss of
+their relative accuracy), so the result does not depend on the number of
+workers. Thresholds are checked on the merged totals when the test ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+import traceback
+from collections.abc import Callable, Sequence
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from .load_engine import LoadEngine
+from .performance_test import (
+    AggregateMetrics,
+    BandwidthMetrics,
+    LoadTestConfiguration,
+    PerformanceTestResults,
+    RecordedRequest,
+    RequestExecution,
+    RequestResults,
+    TimelineDataPoint,
+)
+from .quantiles import QuantileSketch
+from .thresholds import ThresholdEvaluator
+
+# (timestamp, statusCode, responseTime, size, success, error)
+_Execution = tuple[float, int, float, int, bool, "str | None"]
+
+
+def _timestamp(execution: _Execution) -> float:
+    return execution[0]
+
+
+class _RequestPartial:
+    __slots__ = ("count", "failed", "received", "sent", "sketch", "recent")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failed = 0
+        self.received = 0
+        self.sent = 0
+        self.sketch = QuantileSketch()
+        self.recent: list[_Execution] = []
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return (
+            self.count,
+            self.failed,
+            self.received,
+            self.sent,
+            self.sketch.to_bytes(),
+            self.recent,
+        )
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.count, self.failed, self.received, self.sent, sketch, self.recent = state
+        self.sketch = QuantileSketch.from_bytes(sketch)
+
+
+class PartialResults:
+    """Mergeable counters, sketches and timeline buckets of executions.
+
+    Timeline buckets are ``bucket_ms`` wide and numbered from
+    ``start_time`` (epoch ms), which must be the same for partials that are
+    merged. At most ``keep`` recent executions are kept per request.
+    """
+
+    __slots__ = ("start_time", "bucket_ms", "keep", "requests", "buckets")
+
+    def __init__(
+        self, start_time: float, *, bucket_ms: float = 1000.0, keep: int = 100
+    ) -> None:
+        self.start_time = start_time
+        self.bucket_ms = bucket_ms
+        self.keep = keep
+        self.requests: dict[str, _RequestPartial] = {}
+        # Bucket number -> [count, failed, response time sum].
+        self.buckets: dict[int, list[float]] = {}
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        return self.start_time, self.bucket_ms, self.keep, self.requests, self.buckets
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        self.start_time, self.bucket_ms, self.keep, self.requests, self.buckets = state
+
+    def record(
+        self, request_id: str, execution: RequestExecution, bytes_sent: int = 0
+    ) -> None:
+        request = self.requests.get(request_id)
+        if request is None:
+            request = self.requests[request_id] = _RequestPartial()
+        request.count += 1
+        request.received += execution.size
+        request.sent += bytes_sent
+        request.sketch.add(execution.responseTime)
+        if not execution.success:
+            request.failed += 1
+        recent = request.recent
+        recent.append(
+            (
+                execution.timestamp,
+                execution.statusCode,
+                execution.responseTime,
+                execution.size,
+                execution.success,
+                execution.error,
+            )
+        )
+        if len(recent) > 2 * self.keep:
+            del recent[: -self.keep]
+
+        number = int((execution.timestamp - self.start_time) // self.bucket_ms)
+        bucket = self.buckets.get(number)
+        if bucket is None:
+            bucket = self.buckets[number] = [0, 0, 0.0]
+        bucket[0] += 1
+        if not execution.success:
+            bucket[1] += 1
+        bucket[2] += execution.responseTime
+
+    def merge(self, other: PartialResults) -> None:
+        """Add ``other`` (same ``start_time`` and ``bucket_ms``) into this."""
+        if (other.start_time, other.bucket_ms) != (self.start_time, self.bucket_ms):
+            raise ValueError("cannot merge partials with different time bases")
+        for request_id, theirs in other.requests.items():
+            ours = self.requests.get(request_id)
+            if ours is None:
+                ours = self.requests[request_id] = _RequestPartial()
+            ours.count += theirs.count
+            ours.failed += theirs.failed
+            ours.received += theirs.received
+            ours.sent += theirs.sent
+            ours.sketch.merge(theirs.sketch)
+            recent = ours.recent + theirs.recent
+            recent.sort(key=_timestamp)
+            ours.recent = recent[-self.keep :]
+        for number, (count, failed, time_sum) in other.buckets.items():
+            bucket = self.buckets.get(number)
+            if bucket is None:
+                self.buckets[number] = [count, failed, time_sum]
+            else:
+                bucket[0] += count
+                bucket[1] += failed
+                bucket[2] += time_sum
+
+    def to_results(
+        self,
+        test_id: str,
+        configuration: LoadTestConfiguration,
+        requests: Sequence[RecordedRequest],
+        *,
+        end_time: float,
+        active_users: Callable[[float], int] | None = None,
+    ) -> PerformanceTestResults:
+        """Build ``PerformanceTestResults`` for the test up to ``end_time``."""
+        seconds = max(end_time - self.start_time, self.bucket_ms) / 1000
+        by_id = {request.id: request for request in requests}
+        sketch = QuantileSketch()
+        count = failed = received = sent = 0
+        request_results = []
+        for request_id in configuration.includeRequests:
+            partial = self.requests.get(request_id) or _RequestPartial()
+            sketch.merge(partial.sketch)
+            count += partial.count
+            failed += partial.failed
+            received += partial.received
+            sent += partial.sent
+            recorded = by_id[request_id]
+            request_results.append(
+                RequestResults(
+                    requestId=request_id,
+                    url=recorded.url,
+                    method=recorded.method,
+                    executions=[
+                        RequestExecution(
+                            timestamp=timestamp,
+                            statusCode=status,
+                            responseTime=response_time,
+                            size=size,
+                            success=success,
+                            error=error,
+                        )
+                        for timestamp, status, response_time, size, success, error in (
+                            sorted(partial.recent, key=_timestamp)[-self.keep :]
+                        )
+                    ],
+                )
+            )
+        metrics = AggregateMetrics(
+            totalRequests=count,
+            successfulRequests=count - failed,
+            failedRequests=failed,
+            errorRate=failed / count if count else 0.0,
+            throughput=count / seconds,
+            responseTime=sketch.to_metrics(),
+            bandwidth=BandwidthMetrics(
+                sent=sent,
+                received=received,
+                avgSentPerSecond=sent / seconds,
+                avgReceivedPerSecond=received / seconds,
+            ),
+        )
+        reasons = ThresholdEvaluator(
+            configuration.thresholds, start_time=self.start_time
+        ).final_reasons(metrics)
+        return PerformanceTestResults(
+            testId=test_id,
+            startTime=self.start_time,
+            endTime=end_time,
+            duration=(end_time - self.start_time) / 1000,
+            metrics=metrics,
+            requestResults=request_results,
+            timeline=self._timeline(end_time, active_users),
+            passed=not reasons,
+            failureReasons=reasons or None,
+        )
+
+    def _timeline(
+        self, end_time: float, active_users: Callable[[float], int] | None
+    ) -> list[TimelineDataPoint]:
+        if not self.buckets:
+            return []
+        last = max(
+            max(self.buckets), int((end_time - self.start_time) // self.bucket_ms)
+        )
+        bucket_seconds = self.bucket_ms / 1000
+        points = []
+        for number in range(min(self.buckets), last + 1):
+            count, failed, time_sum = self.buckets.get(number, (0, 0, 0.0))
+            timestamp = self.start_time + number * self.bucket_ms
+            if active_users is not None:
+                users = active_users(timestamp)
+            else:
+                users = round(time_sum / self.bucket_ms)
+            points.append(
+                TimelineDataPoint(
+                    timestamp=timestamp,
+                    activeUsers=users,
+                    requestsPerSecond=count / bucket_seconds,
+                    avgResponseTime=time_sum / count if count else 0.0,
+                    errorRate=failed / count if count else 0.0,
+                )
+            )
+        return points
+
+
+def shard_users(virtual_users: int, workers: int) -> list[range]:
+    """Round-robin user indices per worker (empty shards are dropped)."""
+    return [
+        shard
+        for shard in (range(k, virtual_users, workers) for k in range(workers))
+        if shard
+    ]
+
+
+def run_sharded_load_test(
+    configuration: LoadTestConfiguration,
+    requests: Sequence[RecordedRequest],
+    *,
+    test_id: str = "load-test",
+    workers: int | None = None,
+    target_rps: float | None = None,
+    duration: float | None = None,
+    flush_interval: float = 1.0,
+    bucket_ms: float = 1000.0,
+    recent_executions: int = 100,
+    on_update: Callable[[PartialResults], None] | None = None,
+    mp_context: multiprocessing.context.BaseContext | None = None,
+) -> PerformanceTestResults:
+    """Run a load test on ``workers`` processes (default: CPU count).
+
+    The arguments match :class:`~floweb_models.load_engine.LoadEngine`.
+    ``on_update`` is called with the merged partial results after every
+    flush received, for live progress. Raises ``RuntimeError`` if a worker
+    fails.
+    """
+    context = mp_context or multiprocessing.get_context("spawn")
+    shards = shard_users(configuration.virtualUsers, workers or os.cpu_count() or 1)
+    seconds = configuration.duration if duration is None else duration
+    settings = (target_rps, seconds, flush_interval, bucket_ms, recent_executions)
+
+    pipes: list[Connection] = []
+    processes = []
+    for shard in shards:
+        parent, child = context.Pipe()
+        # Every concrete context has ``Process``; ``BaseContext`` does not.
+        process = context.Process(  # type: ignore[attr-defined]
+            target=_worker,
+            args=(child, configuration, list(requests), shard, settings),
+            daemon=True,
+        )
+        process.start()
+        child.close()
+        pipes.append(parent)
+        processes.append(process)
+
+    try:
+        for pipe in pipes:
+            _expect(pipe, "ready")
+        # Start slightly in the future so every worker starts together.
+        start_time = time.time() * 1000 + 50
+        for pipe in pipes:
+            pipe.send(start_time)
+
+        merged = PartialResults(start_time, bucket_ms=bucket_ms, keep=recent_executions)
+        pending = list(pipes)
+        while pending:
+            ready = wait(pending)
+            for pipe in [pipe for pipe in pending if pipe in ready]:
+                kind, partial = _expect(pipe, "partial", "done")
+                merged.merge(partial)
+                if kind == "done":
+                    pending.remove(pipe)
+                if on_update is not None:
+                    on_update(merged)
+        end_time = time.time() * 1000
+    finally:
+        for process in processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+        for pipe in pipes:
+            pipe.close()
+
+    engine = LoadEngine(configuration, requests)
+    return merged.to_results(
+        test_id,
+        configuration,
+        requests,
+        end_time=min(end_time, start_time + seconds * 1000),
+        active_users=lambda t: engine.active_users((t - start_time) / 1000),
+    )
+
+
+def _expect(pipe: Connection, *kinds: str) -> Any:
+    try:
+        message = pipe.recv()
+    except EOFError:
+        raise RuntimeError("load worker exited unexpectedly") from None
+    if message[0] == "error":
+        raise RuntimeError(f"load worker failed:\n{message[1]}")
+    if message[0] not in kinds:
+        raise RuntimeError(f"unexpected message from load worker: {message[0]!r}")
+    return message
+
+
+def _worker(
+    pipe: Connection,
+    configuration: LoadTestConfiguration,
+    requests: list[RecordedRequest],
+    users: range,
+    settings: tuple[float | None, float, float, float, int],
+) -> None:
+    target_rps, duration, flush_interval, bucket_ms, keep = settings
+    try:
+        engine = LoadEngine(
+            configuration,
+            requests,
+            target_rps=target_rps,
+            duration=duration,
+            users=users,
+        )
+        pipe.send(("ready",))
+        start_time = pipe.recv()
+        asyncio.run(_drive(engine, pipe, start_time, flush_interval, bucket_ms, keep))
+    except BaseException:
+        pipe.send(("error", traceback.format_exc()))
+    finally:
+        pipe.close()
+
+
+async def _drive(
+    engine: LoadEngine,
+    pipe: Connection,
+    start_time: float,
+    flush_interval: float,
+    bucket_ms: float,
+    keep: int,
+) -> None:
+    await asyncio.sleep(max(start_time / 1000 - time.time(), 0))
+    partial = PartialResults(start_time, bucket_ms=bucket_ms, keep=keep)
+    flush_at = time.monotonic() + flush_interval
+    async for event in engine.stream():
+        partial.record(event.request_id, event.execution, event.bytes_sent)
+        if time.monotonic() >= flush_at:
+            pipe.send(("partial", partial))
+            partial = PartialResults(start_time, bucket_ms=bucket_ms, keep=keep)
+            flush_at = time.monotonic() + flush_interval
+    pipe.send(("done", partial))
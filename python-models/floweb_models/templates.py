@@ -0,0 +1,164 @@
+"""Compiled ``{{name}}`` templates for recorded requests.
+
+Recorded URLs, headers and bodies contain placeholders such as
+``{{email}}`` or ``{{authToken}}`` that are filled in per virtual user.
+:class:`Template` parses a string once into literal parts with the
+slot positions; :meth:`Template.render` then copies the parts, drops the
+values into the slots and joins them, with no regex or scanning per render.
+
+:class:`RequestTemplate` compiles the URL, header values and body of a
+``RecordedRequest``. :class:`~floweb_models.load_engine.LoadEngine` goes one
+step further and compiles the serialized request head, so rendering a
+request for a new user is one join per part.
+
+Values are escaped for where their slot sits. In a URL, a value is
+percent-encoded for its component: a path segment, a query or a fragment,
+so a value with spaces, ``/``, ``&`` or ``#`` cannot change the URL's
+structure. In a header value, a value with a line break is rejected
+(``ValueError``), as it would inject headers. Bodies take values as they
+are.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Mapping
+from functools import partial
+from urllib.parse import quote
+
+from .performance_test import RecordedRequest
+
+_PLACEHOLDER = re.compile(r"\{\{\s*([A-Za-z_][\w.-]*)\s*\}\}")
+# URL validation percent-encodes the braces and spaces of placeholders.
+_URL_PLACEHOLDER = re.compile(
+    r"(?:\{\{|%7B%7B)(?:\s|%20)*([A-Za-z_][\w.-]*)(?:\s|%20)*(?:\}\}|%7D%7D)",
+    re.IGNORECASE,
+)
+
+# The characters RFC 3986 allows unencoded in each component, less the ones
+# that would end it or split it (``/`` in a segment, ``&=+`` in a query).
+_path_segment = partial(quote, safe=":@!$&'()*+,;=")
+_query = partial(quote, safe=":/?@!$'()*,;")
+_fragment = partial(quote, safe=":/?@!$&'()*+,;=")
+
+
+def _header_value(value: str) -> str:
+    if "\r" in value or "\n" in value:
+        raise ValueError(f"line break in header value {value!r}")
+    return value
+
+
+def _url_escape(source: str, position: int) -> Callable[[str], str]:
+    # A serialized head has the target on its first line and headers below.
+    if source.rfind("\n", 0, position) >= 0:
+        return _header_value
+    before = source[:position]
+    if "#" in before:
+        return _fragment
+    if "?" in before:
+        return _query
+    return _path_segment
+
+
+class Template:
+    """A string with ``{{name}}`` slots, parsed once.
+
+    With ``url=True``, percent-encoded placeholders (``%7B%7Bname%7D%7D``)
+    are slots too, and values are percent-encoded for their URL component.
+    ``source`` may also be a serialized request head; slots below its first
+    line are header values. With ``header=True``, ``source`` is a header
+    value. Values for header slots must not contain line breaks.
+    """
+
+    __slots__ = ("source", "names", "_parts", "_slots")
+
+    def __init__(self, source: str, *, url: bool = False, header: bool = False) -> None:
+        self.source = source
+        pattern = _URL_PLACEHOLDER if url else _PLACEHOLDER
+        parts: list[str] = []
+        slots: list[tuple[int, str, Callable[[str], str] | None]] = []
+        position = 0
+        for match in pattern.finditer(source):
+            if match.start() > position:
+                parts.append(source[position : match.start()])
+            escape: Callable[[str], str] | None
+            if url:
+                escape = _url_escape(source, match.start())
+            else:
+                escape = _header_value if header else None
+            slots.append((len(parts), match[1], escape))
+            parts.append("")
+            position = match.end()
+        if position < len(source):
+            parts.append(source[position:])
+        self._parts = parts
+        self._slots = tuple(slots)
+        self.names = frozenset(name for _, name, _ in slots)
+
+    def __repr__(self) -> str:
+        return f"Template({self.source!r})"
+
+    @property
+    def static(self) -> bool:
+        """Whether the template has no slots (renders to ``source``)."""
+        return not self._slots
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Fill every slot from ``values``; raises ``KeyError`` if one is missing.
+
+        Raises ``ValueError`` for a line break in a header value.
+        """
+        if not self._slots:
+            return self.source
+        parts = self._parts.copy()
+        for index, name, escape in self._slots:
+            value = values[name]
+            parts[index] = value if escape is None else escape(value)
+        return "".join(parts)
+
+
+class RequestTemplate:
+    """The URL, header values and body of a ``RecordedRequest``, compiled."""
+
+    __slots__ = ("request", "url", "headers", "body", "names", "_dynamic")
+
+    def __init__(self, request: RecordedRequest) -> None:
+        self.request = request
+        self.url = Template(str(request.url), url=True)
+        self.headers = {
+            name: Template(value, header=True)
+            for name, value in request.headers.items()
+        }
+        self.body = Template(request.body) if request.body is not None else None
+        self.names = self.url.names.union(
+            *(template.names for template in self.headers.values())
+        )
+        if self.body is not None:
+            self.names |= self.body.names
+        # Only templated headers are rendered; the others are copied as is.
+        self._dynamic = tuple(
+            (name, template)
+            for name, template in self.headers.items()
+            if not template.static
+        )
+
+    @property
+    def static(self) -> bool:
+        return not self.names
+
+    def _render_headers(self, values: Mapping[str, str]) -> dict[str, str]:
+        # Reassigning existing keys keeps the recorded header order.
+        headers = self.request.headers.copy()
+        for name, template in self._dynamic:
+            headers[name] = template.render(values)
+        return headers
+
+    def render(
+        self, values: Mapping[str, str]
+    ) -> tuple[str, dict[str, str], str | None]:
+        """The rendered ``(url, headers, body)``."""
+        return (
+            self.url.render(values),
+            self._render_headers(values),
+            self.body.render(values) if self.body is not None else None,
+        )
@@ -0,0 +1,229 @@
+"""Streaming evaluation of ``LoadTestThresholds`` while a test runs.
+
+:class:`ThresholdEvaluator` keeps a sliding window of recent executions
+(``window_ms`` long, in ``step_ms`` steps) and checks each threshold every
+time the window advances:
+
+- ``maxErrorRate``: breached when the lower Wilson confidence bound of the
+  window's error rate is above the limit.
+- ``maxResponseTime``: read as "p95 within the limit", like the final
+  results. Breached when the lower Wilson bound of the share of responses
+  slower than the limit is above 5%.
+- ``minThroughput``: breached when an upper Poisson bound of the window's
+  request rate is below the limit. Only checked once ``warmup_ms`` (e.g. the
+  ramp-up) has passed and the window is full.
+
+A breach at the configured ``confidence`` is treated as certain: its reason
+is recorded and :attr:`ThresholdEvaluator.abort` is set, so the runner can
+stop generating load. The window is re-checked every step, so the default
+confidence is high (99.9%) to keep false aborts rare over a long run.
+Runners should also call :meth:`ThresholdEvaluator.evaluate` on a timer, so
+a throughput collapse (when no executions arrive) is noticed too.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from statistics import NormalDist
+
+from .performance_test import AggregateMetrics, LoadTestThresholds
+
+# ``maxResponseTime`` bounds the 95th percentile.
+_SLOW_SHARE = 0.05
+
+
+def wilson_lower(events: int, trials: int, z: float) -> float:
+    """Lower Wilson score bound of a proportion (0 when ``trials`` is 0)."""
+    if not trials:
+        return 0.0
+    p = events / trials
+    z2 = z * z
+    centre = p + z2 / (2 * trials)
+    margin = z * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials))
+    return max((centre - margin) / (1 + z2 / trials), 0.0)
+
+
+def poisson_upper(events: int, z: float) -> float:
+    """Approximate upper confidence bound of a Poisson mean."""
+    return (math.sqrt(events + 1) + z / 2) ** 2
+
+
+class ThresholdEvaluator:
+    """Checks ``LoadTestThresholds`` over a sliding window of executions."""
+
+    def __init__(
+        self,
+        thresholds: LoadTestThresholds,
+        *,
+        start_time: float,
+        window_ms: float = 10_000.0,
+        step_ms: float = 1000.0,
+        confidence: float = 0.999,
+        min_samples: int = 50,
+        warmup_ms: float = 0.0,
+    ) -> None:
+        self.thresholds = thresholds
+        self.start_time = start_time
+        self.window_ms = window_ms
+        self.step_ms = step_ms
+        self.min_samples = min_samples
+        self.warmup_ms = warmup_ms
+        self.abort = threading.Event()
+        self._z = NormalDist().inv_cdf(confidence)
+        self._confidence = confidence
+        self._steps: deque[list[int]] = deque()  # [step, count, failed, slow]
+        self._count = 0
+        self._failed = 0
+        self._slow = 0
+        self._step = -1
+        self._breaches: dict[str, str] = {}
+
+    @property
+    def failure_reasons(self) -> list[str]:
+        """Reasons for every threshold breached so far, in order."""
+        return list(self._breaches.values())
+
+    def observe(self, timestamp: float, response_time: float, success: bool) -> None:
+        """Record one execution (timestamps in epoch ms, roughly in order)."""
+        step = int((timestamp - self.start_time) // self.step_ms)
+        if step > self._step:
+            self._advance(step)
+        steps = self._steps
+        if not steps or steps[-1][0] != step:
+            if steps and step < steps[-1][0]:
+                # Late event: count it in the latest step still in the window.
+                step = steps[-1][0]
+            else:
+                steps.append([step, 0, 0, 0])
+        current = steps[-1]
+        slow = response_time > self.thresholds.maxResponseTime
+        current[1] += 1
+        self._count += 1
+        if not success:
+            current[2] += 1
+            self._failed += 1
+        if slow:
+            current[3] += 1
+            self._slow += 1
+
+    def evaluate(self, now: float) -> bool:
+        """Advance the window to ``now`` (epoch ms); return whether to abort."""
+        step = int((now - self.start_time) // self.step_ms)
+        if step > self._step:
+            self._advance(step)
+        return self.abort.is_set()
+
+    def _advance(self, step: int) -> None:
+        # The steps before ``step`` are complete: check them, then slide.
+        if self._step >= 0:
+            self._check(self._step)
+            if step - 1 > self._step:
+                # Also check the window that ends just before ``step``, which
+                # catches throughput drops over a gap without executions.
+                self._evict(step - 1)
+                self._check(step - 1)
+        self._step = step
+        self._evict(step)
+
+    def _evict(self, step: int) -> None:
+        oldest = step - int(self.window_ms // self.step_ms) + 1
+        steps = self._steps
+        while steps and steps[0][0] < oldest:
+            _, count, failed, slow = steps.popleft()
+            self._count -= count
+            self._failed -= failed
+            self._slow -= slow
+
+    def _check(self, last_step: int) -> None:
+        thresholds = self.thresholds
+        z = self._z
+        elapsed = (last_step + 1) * self.step_ms
+        at = f"in the {self.window_ms / 1000:g} s up to +{elapsed / 1000:g} s"
+        level = f"{self._confidence:.0%} confidence"
+
+        if self._count >= self.min_samples:
+            low = wilson_lower(self._failed, self._count, z)
+            if low > thresholds.maxErrorRate and "errorRate" not in self._breaches:
+                self._breach(
+                    "errorRate",
+                    f"error rate {self._failed / self._count:.2%} {at} exceeds "
+                    f"{thresholds.maxErrorRate:.2%} (at least {low:.2%} at {level})",
+                )
+            low = wilson_lower(self._slow, self._count, z)
+            if low > _SLOW_SHARE and "responseTime" not in self._breaches:
+                self._breach(
+                    "responseTime",
+                    f"{self._slow / self._count:.1%} of responses {at} took longer "
+                    f"than {thresholds.maxResponseTime} ms, so p95 exceeds it "
+                    f"({level})",
+                )
+
+        if (
+            thresholds.minThroughput > 0
+            and elapsed >= self.warmup_ms + self.window_ms
+            and "throughput" not in self._breaches
+        ):
+            seconds = self.window_ms / 1000
+            upper = poisson_upper(self._count, z) / seconds
+            if upper < thresholds.minThroughput:
+                self._breach(
+                    "throughput",
+                    f"throughput {self._count / seconds:.1f} req/s {at} is below "
+                    f"{thresholds.minThroughput} req/s (at most {upper:.1f} at "
+                    f"{level})",
+                )
+
+    def _breach(self, kind: str, reason: str) -> None:
+        self._breaches[kind] = reason
+        self.abort.set()
+
+    def final_reasons(
+        self, metrics: AggregateMetrics, *, elapsed_ms: float | None = None
+    ) -> list[str]:
+        """Failure reasons for a finished test, or a snapshot of a running one.
+
+        Combines the window breaches seen so far with a check of the
+        overall ``metrics`` against the thresholds. For a snapshot, pass
+        ``elapsed_ms`` (time since the start). The overall throughput of a
+        running test includes the ramp-up, so it is not checked; the rate of
+        the current window is checked instead, once the window starts after
+        ``warmup_ms``.
+        """
+        thresholds = self.thresholds
+        reasons = dict(self._breaches)
+        if "responseTime" not in reasons and (
+            metrics.responseTime.p95 > thresholds.maxResponseTime
+        ):
+            reasons["responseTime"] = (
+                f"p95 response time {metrics.responseTime.p95:.0f} ms exceeds "
+                f"{thresholds.maxResponseTime} ms"
+            )
+        if "errorRate" not in reasons and metrics.errorRate > thresholds.maxErrorRate:
+            reasons["errorRate"] = (
+                f"error rate {metrics.errorRate:.2%} exceeds "
+                f"{thresholds.maxErrorRate:.2%}"
+            )
+        throughput: float | None = metrics.throughput
+        if elapsed_ms is not None:
+            throughput = self._window_throughput(elapsed_ms)
+        if (
+            "throughput" not in reasons
+            and throughput is not None
+            and throughput < thresholds.minThroughput
+        ):
+            reasons["throughput"] = (
+                f"throughput {throughput:.1f} req/s is below "
+                f"{thresholds.minThroughput} req/s"
+            )
+        return list(reasons.values())
+
+    def _window_throughput(self, elapsed_ms: float) -> float | None:
+        """Request rate of the current window; ``None`` while warming up."""
+        if elapsed_ms < self.warmup_ms + self.window_ms:
+            return None
+        steps = int(self.window_ms // self.step_ms)
+        window_start = (self._step - steps + 1) * self.step_ms
+        seconds = (elapsed_ms - window_start) / 1000
+        return self._count / seconds if seconds > 0 else None
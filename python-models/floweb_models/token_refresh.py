@@ -0,0 +1,231 @@
+"""Shared token refresh for load tests (``TokenRefreshConfig``).
+
+One :class:`TokenManager` serves every virtual user of a run:
+
+- Refreshes are single-flight. Concurrent callers of
+  :meth:`TokenManager.refresh` share one in-flight request, and
+  :meth:`TokenManager.refresh_after` (for a user that got a 401) only
+  refreshes if nobody replaced the stale token yet, so a wave of 401s
+  causes one refresh instead of a stampede.
+- A background task refreshes proactively, ``refresh_ahead`` of the token
+  lifetime before it expires. The lifetime is ``refresh_interval`` or the
+  response's ``expires_in``, whichever is shorter. Failed proactive refreshes
+  keep the current token and retry with backoff.
+- The token is published as a ``(version, header bytes)`` tuple that is
+  replaced in one assignment, so the request hot path reads
+  :attr:`TokenManager.published` without locks or awaits.
+
+``token_path`` is compiled once by :func:`compile_token_path` into a tuple
+of keys and indices, e.g. ``data.tokens[0].access`` or ``$['token']``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections.abc import Callable
+from typing import Any
+
+from pydantic_core import from_json, to_json
+
+from .http_client import HttpClient, HttpError
+from .performance_test import TokenRefreshConfig
+
+_SEGMENT = re.compile(
+    r"""(?P<dot>\.)?(?P<name>[A-Za-z_$][\w$-]*)"""
+    r"""|\[(?P<index>-?\d+)\]"""
+    r"""|\[(?P<quote>['"])(?P<key>.*?)(?P=quote)\]"""
+)
+
+
+class TokenRefreshError(Exception):
+    """A token refresh request failed or returned no usable token."""
+
+
+def compile_token_path(path: str) -> Callable[[Any], Any]:
+    """Compile a JSON path like ``data.items[0]['access-token']``.
+
+    A leading ``$`` is optional. The returned accessor raises
+    ``LookupError`` when the document has no value at the path.
+    """
+    source = path.strip()
+    if source.startswith("$"):
+        source = source[1:]
+    steps: list[str | int] = []
+    position = 0
+    while position < len(source):
+        match = _SEGMENT.match(source, position)
+        if match is None or (match["name"] and not match["dot"] and position):
+            raise ValueError(f"invalid token_path {path!r} at {source[position:]!r}")
+        if match["name"] is not None:
+            steps.append(match["name"])
+        elif match["index"] is not None:
+            steps.append(int(match["index"]))
+        else:
+            steps.append(match["key"])
+        position = match.end()
+    if not steps:
+        raise ValueError(f"empty token_path {path!r}")
+    keys = tuple(steps)
+
+    def extract(document: Any) -> Any:
+        value = document
+        for key in keys:
+            try:
+                value = value[key]
+            except (KeyError, IndexError, TypeError):
+                raise LookupError(f"no value at token_path {path!r}") from None
+        return value
+
+    return extract
+
+
+class TokenManager:
+    """Single-flight, proactively refreshed token shared by virtual users.
+
+    ``refresh_ahead`` is the fraction of the token lifetime left when the
+    proactive refresh starts. Call :meth:`start` before sending requests and
+    :meth:`close` afterwards.
+    """
+
+    def __init__(
+        self,
+        config: TokenRefreshConfig,
+        client: HttpClient | None = None,
+        *,
+        refresh_ahead: float = 0.1,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 30.0,
+    ) -> None:
+        self.config = config
+        self.client = client
+        self.refresh_ahead = refresh_ahead
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.header = config.token_header or "Authorization"
+        self.published: tuple[int, bytes] = (0, b"")
+        self.expires_at: float | None = None
+        self._token: str | None = None
+        self._extract = compile_token_path(config.token_path)
+        self._request = self._encode_refresh(config)
+        self._inflight: asyncio.Future[tuple[int, bytes]] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._renewed = asyncio.Event()
+        self._own_client = False
+
+    @staticmethod
+    def _encode_refresh(
+        config: TokenRefreshConfig,
+    ) -> tuple[str, str, dict[str, str], bytes | None]:
+        body = config.refresh_body
+        headers = dict(config.refresh_headers or {})
+        if body is None:
+            data = None
+        elif isinstance(body, str):
+            data = body.encode()
+        else:
+            data = to_json(body)
+            if not any(name.lower() == "content-type" for name in headers):
+                headers["Content-Type"] = "application/json"
+        return config.refresh_method, str(config.refresh_url), headers, data
+
+    @property
+    def token(self) -> str | None:
+        """The current token value (without prefix), if any."""
+        return self._token
+
+    async def start(self) -> None:
+        """Fetch the first token and schedule proactive refreshes."""
+        if self.client is None:
+            self.client = HttpClient()
+            self._own_client = True
+        await self.refresh()
+        self._task = asyncio.create_task(self._keep_fresh())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._own_client and self.client is not None:
+            await self.client.close()
+
+    async def refresh(self) -> tuple[int, bytes]:
+        """Refresh now, joining a refresh that is already in flight."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._fetch())
+            self._inflight.add_done_callback(self._clear_inflight)
+        return await asyncio.shield(self._inflight)
+
+    def _clear_inflight(self, future: asyncio.Future[tuple[int, bytes]]) -> None:
+        if self._inflight is future:
+            self._inflight = None
+        if not future.cancelled():
+            future.exception()  # Mark as retrieved; callers got it already.
+
+    async def refresh_after(self, version: int) -> tuple[int, bytes]:
+        """Refresh unless the token of ``version`` was already replaced."""
+        if self.published[0] != version:
+            return self.published
+        return await self.refresh()
+
+    async def _fetch(self) -> tuple[int, bytes]:
+        assert self.client is not None, "start() the manager first"
+        method, url, headers, body = self._request
+        try:
+            response = await self.client.request(method, url, headers, body)
+        except HttpError as exc:
+            raise TokenRefreshError(f"token refresh failed: {exc}") from exc
+        if not 200 <= response.status < 300:
+            raise TokenRefreshError(f"token refresh returned HTTP {response.status}")
+        try:
+            document = from_json(response.body)
+            token = self._extract(document)
+        except (ValueError, LookupError) as exc:
+            raise TokenRefreshError(str(exc)) from exc
+        if not isinstance(token, str) or not token:
+            raise TokenRefreshError("token_path does not point to a non-empty string")
+
+        prefix = self.config.token_prefix
+        value = f"{prefix} {token}" if prefix else token
+        if "\r" in value or "\n" in value:
+            # The value goes into every request head as is.
+            raise TokenRefreshError("token contains a line break")
+        try:
+            header = f"{self.header}: {value}\r\n".encode("latin-1")
+        except UnicodeEncodeError as exc:
+            raise TokenRefreshError(f"token is not latin-1: {exc}") from exc
+
+        lifetime: float | None = self.config.refresh_interval
+        expires_in = document.get("expires_in") if isinstance(document, dict) else None
+        if isinstance(expires_in, (int, float)) and expires_in > 0:
+            lifetime = min(lifetime, expires_in) if lifetime else expires_in
+        self.expires_at = time.monotonic() + lifetime if lifetime else None
+
+        self._token = token
+        self.published = (self.published[0] + 1, header)
+        self._renewed.set()
+        return self.published
+
+    async def _keep_fresh(self) -> None:
+        delay = self.retry_delay
+        while True:
+            if self.expires_at is None:
+                # No known lifetime: nothing to schedule until a refresh after
+                # a 401 brings a token that may have one.
+                self._renewed.clear()
+                await self._renewed.wait()
+                continue
+            now = time.monotonic()
+            lifetime = self.expires_at - now
+            issued = self.published[0]
+            await asyncio.sleep(max(lifetime * (1 - self.refresh_ahead), 0))
+            if self.published[0] != issued:
+                continue  # Refreshed meanwhile (after a 401); reschedule.
+            try:
+                await self.refresh()
+                delay = self.retry_delay
+            except (TokenRefreshError, OSError, EOFError, HttpError, ValueError):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
@@ -0,0 +1,250 @@
+"""Filtering of recorded traffic by ``filterPatterns`` and ``onlySameDomain``.
+
+``PerformanceTest.filterPatterns`` lists URLs to leave out of a recording
+(``*.js``, ``*.png``, ...). :class:`TrafficFilter` compiles all of them
+once:
+
+- Globs are matched against the URL without its query and fragment;
+  ``*`` and ``?`` also match ``/``. Globs of the form ``*.ext`` go into a
+  set of suffixes, looked up by hashing the suffixes of the last path
+  segment that start at a dot.
+- All other globs are merged into a trie and compiled into one regex with
+  common prefixes factored out (``*/beacon1/*`` and ``*/beacon2/*`` become
+  ``.*/beacon(?:1|2)/.*``). At each position the regex engine only tries
+  the distinct next tokens of the trie, so matching cost depends on the
+  URL length, not on the number of globs.
+- Regular expressions, written ``re:<pattern>`` or ``/<pattern>/`` and
+  searched anywhere in the full URL, cannot be factored. Each is compiled
+  on its own first (an invalid one raises ``re.error``). Those without
+  capturing groups are then combined into one alternation, with leading
+  global flags such as ``(?i)`` turned into scoped ones (``(?i:...)``).
+  Patterns with groups, whose names and backreferences would clash in an
+  alternation, are searched one by one.
+
+``onlySameDomain`` keeps requests to the target's host and its subdomains,
+where a leading ``www.`` of the target is ignored. The target host is parsed
+once, and the decision is cached per request host.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator, Sequence
+
+from .performance_test import PerformanceTest, RecordedRequest
+
+_SUFFIX_GLOB = re.compile(r"\*(\.[^*?\[\]/]+)")
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+
+
+def url_host(url: str) -> str:
+    """Lower-cased host of an absolute URL, without userinfo or port."""
+    start = url.find("://")
+    start = start + 3 if start >= 0 else 0
+    end = len(url)
+    for terminator in "/?#":
+        index = url.find(terminator, start, end)
+        if index >= 0:
+            end = index
+    authority = url[start:end]
+    authority = authority[authority.rfind("@") + 1 :]
+    if authority.startswith("["):
+        return authority[: authority.find("]") + 1].lower()
+    return authority.partition(":")[0].lower()
+
+
+def _strip_query(url: str) -> str:
+    for terminator in "?#":
+        index = url.find(terminator)
+        if index >= 0:
+            url = url[:index]
+    return url
+
+
+def _glob_tokens(pattern: str) -> tuple[str, ...]:
+    """Regex tokens of a glob, with ``fnmatch`` semantics."""
+    tokens: list[str] = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        i += 1
+        if char == "*":
+            if not tokens or tokens[-1] != ".*":
+                tokens.append(".*")
+        elif char == "?":
+            tokens.append(".")
+        elif char == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j < 0:
+                tokens.append(re.escape(char))
+                continue
+            body = pattern[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            tokens.append(f"[{body}]")
+        else:
+            tokens.append(re.escape(char))
+    return tuple(tokens)
+
+
+def _scoped(regex: str) -> str:
+    """``regex`` as a group, with its leading global flags scoped to it."""
+    flags = ""
+    position = 0
+    while match := _GLOBAL_FLAGS.match(regex, position):
+        flags += match[1]
+        position = match.end()
+    body = regex[position:]
+    if "x" in flags:
+        body += "\n"  # A trailing comment would swallow the ")".
+    return f"(?{flags}:{body})"
+
+
+def _compile_regexes(regexes: list[str]) -> tuple[re.Pattern[str], ...]:
+    compiled = [re.compile(regex) for regex in regexes]
+    combinable = [regex for regex, c in zip(regexes, compiled) if not c.groups]
+    if len(combinable) < 2:
+        return tuple(compiled)
+    try:
+        combined = re.compile("|".join(map(_scoped, combinable)))
+    except re.error:
+        return tuple(compiled)  # Flags that cannot be scoped, e.g. ``(?L)``.
+    return (combined, *(c for c in compiled if c.groups))
+
+
+class _Node:
+    __slots__ = ("children", "end")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.end = False
+
+
+def _trie_regex(patterns: list[tuple[str, ...]]) -> str:
+    root = _Node()
+    for tokens in patterns:
+        node = root
+        for token in tokens:
+            node = node.children.setdefault(token, _Node())
+        node.end = True
+    return _emit(root)
+
+
+def _emit(node: _Node) -> str:
+    branches = []
+    for token, child in node.children.items():
+        # Collapse chains without branching into one run of tokens.
+        run = [token]
+        while not child.end and len(child.children) == 1:
+            ((token, child),) = child.children.items()
+            run.append(token)
+        branches.append("".join(run) + _emit(child))
+    if node.end:
+        branches.append(r"\Z")
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+class TrafficFilter:
+    """Compiled ``filterPatterns`` and ``onlySameDomain`` check."""
+
+    __slots__ = (
+        "patterns",
+        "target_host",
+        "_suffixes",
+        "_glob",
+        "_regexes",
+        "_domain",
+        "_hosts",
+    )
+
+    def __init__(
+        self,
+        patterns: Sequence[str] | None = None,
+        *,
+        target_url: str | None = None,
+        same_domain: bool = False,
+    ) -> None:
+        self.patterns = tuple(patterns or ())
+        suffixes = set()
+        globs = []
+        regexes = []
+        for pattern in self.patterns:
+            if pattern.startswith("re:"):
+                regexes.append(pattern[3:])
+            elif len(pattern) > 1 and pattern.startswith("/") and pattern.endswith("/"):
+                regexes.append(pattern[1:-1])
+            elif match := _SUFFIX_GLOB.fullmatch(pattern):
+                suffixes.add(match[1])
+            else:
+                globs.append(_glob_tokens(pattern))
+        self._suffixes = frozenset(suffixes)
+        self._glob = re.compile("(?s)" + _trie_regex(globs)) if globs else None
+        self._regexes = _compile_regexes(regexes)
+
+        if same_domain and target_url is None:
+            raise ValueError("same_domain needs a target_url")
+        self.target_host = url_host(target_url) if target_url is not None else None
+        self._domain = (
+            self.target_host.removeprefix("www.")
+            if same_domain and self.target_host
+            else None
+        )
+        self._hosts: dict[str, bool] = {}
+
+    @classmethod
+    def for_test(cls, test: PerformanceTest, url: str | None = None) -> TrafficFilter:
+        """The filter of ``test``.
+
+        ``url`` (e.g. the URL of a ``StartPerformanceScanCommand``) replaces
+        the ``targetUrl`` of the test's load test configuration.
+        """
+        return cls(
+            test.filterPatterns,
+            target_url=url or str(test.loadTestConfig.targetUrl),
+            same_domain=bool(test.onlySameDomain),
+        )
+
+    def excludes(self, url: str) -> bool:
+        """Whether ``url`` matches one of the patterns."""
+        if self._suffixes:
+            path = _strip_query(url)
+            segment = path[path.rfind("/") + 1 :]
+            dot = segment.find(".")
+            while dot >= 0:
+                if segment[dot:] in self._suffixes:
+                    return True
+                dot = segment.find(".", dot + 1)
+        if self._glob is not None and self._glob.match(_strip_query(url)):
+            return True
+        return any(regex.search(url) for regex in self._regexes)
+
+    def same_domain(self, url: str) -> bool:
+        """Whether ``url`` passes the ``onlySameDomain`` check."""
+        domain = self._domain
+        if domain is None:
+            return True
+        host = url_host(url)
+        allowed = self._hosts.get(host)
+        if allowed is None:
+            allowed = self._hosts[host] = host == domain or host.endswith("." + domain)
+        return allowed
+
+    def allows(self, url: str) -> bool:
+        """Whether a request to ``url`` is kept."""
+        return self.same_domain(url) and not self.excludes(url)
+
+    def filter(self, requests: Iterable[RecordedRequest]) -> Iterator[RecordedRequest]:
+        """The recorded requests that are kept, in order."""
+        allows = self.allows
+        return (request for request in requests if allows(str(request.url)))
@@ -0,0 +1,455 @@
+"""Trusted loading for models read back from Floweb's own storage.
+
+Flows and reports that we serialized ourselves do not need to be validated
+again on every load. :func:`from_trusted_json` only parses the document and
+builds the top-level model with ``model_construct`` semantics: fields whose
+JSON value is already the right Python value (strings, numbers, plain dicts)
+are assigned as-is, and every other field (nested models, enums, datetimes,
+URLs) is validated the first time it is read. Listing a flow library thus
+never pays for ``actions``, ``edges`` or ``environment`` it does not touch.
+
+Deferred fields are validated with pydantic-core rather than built through
+recursive ``model_construct`` calls: constructing nested models from Python
+is slower than pydantic-core's own validation, so the only real saving is
+the work that is skipped.
+
+Set ``verify_rate`` to fully validate a random sample of loads, so corrupted
+or out-of-date stores still surface as ``ValidationError``.
+
+Listings need even less: an id, a name, a result and some timestamps. Every
+scan of the bytes costs about as much as pydantic-core's parser, so the
+only way to make listing cheaper is to not read the heavy members at all.
+:func:`summary_first_json` writes the top-level scalar fields ahead of the
+arrays and objects (JSON member order has no meaning, so any reader still
+accepts it), and :func:`summary_from_json` decodes that head member by
+member and stops at the first array or object. The rest of the document is
+kept as one unparsed tail and decoded, once, when any field in it is first
+read. Documents in another member order load the same way; they just have
+a shorter head.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+from collections.abc import Callable
+from functools import cache
+from types import UnionType
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel, PrivateAttr, TypeAdapter
+from pydantic_core import from_json
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_object_setattr = object.__setattr__
+
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None), Any})
+
+
+def _is_plain(annotation: Any) -> bool:
+    """Whether decoded JSON is already a valid value for ``annotation``."""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _is_plain(get_args(annotation)[0])
+    if origin in (Union, UnionType, list, dict):
+        return all(_is_plain(arg) for arg in get_args(annotation))
+    return annotation in _PLAIN_TYPES
+
+
+class _DeferredField:
+    """Data descriptor that validates a trusted field on first access."""
+
+    __slots__ = ("name", "adapter")
+
+    def __init__(self, name: str, adapter: TypeAdapter[Any]) -> None:
+        self.name = name
+        self.adapter = adapter
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+        pending = instance.__pydantic_private__["_trusted_pending"]
+        if self.name in pending:
+            value = self.adapter.validate_python(value)
+            instance.__dict__[self.name] = value
+            pending.discard(self.name)
+        return value
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        # pydantic assigns fields through ``__dict__``; this only runs for
+        # direct ``object.__setattr__`` calls. A still-pending name is simply
+        # validated again on the next read.
+        instance.__dict__[self.name] = value
+
+
+class _Tail:
+    """The members of a summary-loaded document after its scalar head."""
+
+    __slots__ = ("data", "start", "plan", "names")
+
+    def __init__(
+        self, data: bytes, start: int, plan: _Plan, names: frozenset[str]
+    ) -> None:
+        self.data = data
+        self.start = start
+        self.plan = plan
+        self.names = names
+
+    def load(self, instance: Any) -> None:
+        """Decode the tail into ``instance``, replacing every placeholder.
+
+        Fields assigned since loading no longer hold the placeholder and
+        keep their new value.
+        """
+        decoded = from_json(b"{" + self.data[self.start :])
+        values = instance.__dict__
+        pending = instance.__pydantic_private__["_trusted_pending"]
+        fields_set = instance.__pydantic_fields_set__
+        names = self.plan.names
+        deferred = self.plan.deferred
+        unloaded = {name for name in self.names if values.get(name) is self}
+        for name in unloaded:
+            del values[name]
+            pending.discard(name)
+        for key, value in decoded.items():
+            field_name = names.get(key)
+            if field_name is None or field_name not in unloaded:
+                continue
+            values[field_name] = value
+            fields_set.add(field_name)
+            if value is not None and field_name in deferred:
+                pending.add(field_name)
+        for name in unloaded:
+            field = self.plan.defaults.get(name)
+            if name not in values and field is not None:
+                values[name] = field.get_default(call_default_factory=True)
+
+
+class _SummaryField(_DeferredField):
+    """:class:`_DeferredField` that first decodes the tail if it holds the field."""
+
+    __slots__ = ()
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is not None:
+            value = instance.__dict__.get(self.name)
+            if isinstance(value, _Tail):
+                value.load(instance)
+        return super().__get__(instance, owner)
+
+
+if TYPE_CHECKING:
+    # The mixin always comes first in a ``BaseModel`` subclass.
+    _MixinBase = BaseModel
+else:
+    _MixinBase = object
+
+
+class _TrustedMixin(_MixinBase):
+    """Materializes deferred fields before anything reads ``__dict__`` directly."""
+
+    __pydantic_private__: dict[str, Any]
+
+    def materialize(self) -> None:
+        """Validate every field that has not been read yet."""
+        pending = self.__pydantic_private__["_trusted_pending"]
+        for name in list(pending):
+            # Decoding a tail drops the names it turns out not to contain.
+            if name in pending:
+                getattr(self, name, None)
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]:
+        self.materialize()
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs: Any) -> str:
+        self.materialize()
+        return super().model_dump_json(**kwargs)
+
+    def model_copy(self, **kwargs: Any) -> Any:
+        self.materialize()
+        return super().model_copy(**kwargs)
+
+    def __copy__(self) -> Any:
+        self.materialize()
+        return super().__copy__()
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Any:
+        self.materialize()
+        return super().__deepcopy__(memo)
+
+    def __reduce__(self) -> Any:
+        # Pickle as the public model class; the trusted subclass is private.
+        plain = untrusted(self)
+        return _restore, (type(plain), plain.__getstate__())
+
+    def __iter__(self) -> Any:
+        self.materialize()
+        return super().__iter__()
+
+    def __repr_args__(self) -> Any:
+        self.materialize()
+        return super().__repr_args__()
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        self.materialize()
+        if isinstance(other, _TrustedMixin):
+            other.materialize()
+        return (
+            _untrusted(type(self)) is _untrusted(type(other))
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
+
+def _untrusted(cls: type[Any]) -> type[Any]:
+    return cls.__bases__[1] if issubclass(cls, _TrustedMixin) else cls
+
+
+def _restore(model: type[BaseModel], state: dict[Any, Any]) -> BaseModel:
+    instance = model.__new__(model)
+    instance.__setstate__(state)
+    return instance
+
+
+class _Plan:
+    __slots__ = ("model", "trusted_model", "names", "fields", "deferred", "defaults")
+
+    def __init__(self, model: type[BaseModel], summary: bool = False) -> None:
+        self.model = model
+        self.fields = frozenset(model.model_fields)
+        self.names: dict[str, str] = {}
+        self.deferred: set[str] = set()
+        self.defaults: dict[str, Any] = {}
+        adapters: dict[str, TypeAdapter[Any]] = {}
+        for name, field in model.model_fields.items():
+            self.names[name] = name
+            if field.alias:
+                self.names[field.alias] = name
+            if not field.is_required():
+                self.defaults[name] = field
+            if not _is_plain(field.annotation):
+                self.deferred.add(name)
+            # Any field may be in the tail of a summary, so all get a descriptor.
+            if summary or name in self.deferred:
+                annotation: Any = field.annotation
+                if field.metadata:
+                    annotation = Annotated[(annotation, *field.metadata)]
+                adapters[name] = TypeAdapter(annotation)
+        self.trusted_model = _trusted_subclass(
+            model, adapters, _SummaryField if summary else _DeferredField
+        )
+
+
+def _trusted_subclass(
+    model: type[BaseModel],
+    adapters: dict[str, TypeAdapter[Any]],
+    descriptor: type[_DeferredField],
+) -> type[BaseModel]:
+    namespace = {
+        "__module__": model.__module__,
+        "__qualname__": model.__qualname__,
+        "__annotations__": {"_trusted_pending": set[str]},
+        "_trusted_pending": PrivateAttr(default_factory=set),
+    }
+    metaclass: Callable[..., type[BaseModel]] = type(model)
+    trusted = metaclass(model.__name__, (_TrustedMixin, model), namespace)
+    # Installed after class creation so pydantic does not take them for defaults.
+    for name, adapter in adapters.items():
+        setattr(trusted, name, descriptor(name, adapter))
+    return trusted
+
+
+@cache
+def _plan(model: type[BaseModel], summary: bool = False) -> _Plan:
+    return _Plan(model, summary)
+
+
+def construct_trusted(
+    model: type[ModelT], data: dict[str, Any], *, verify_rate: float = 0.0
+) -> ModelT:
+    """Build ``model`` from already-decoded trusted data.
+
+    The result is an instance of (a private subclass of) ``model`` whose
+    non-trivial fields are validated on first access.
+    """
+    if verify_rate and random.random() < verify_rate:
+        return model.model_validate(data)
+
+    plan = _plan(model)
+    values: dict[str, Any] = {}
+    pending: set[str] = set()
+    names = plan.names
+    deferred = plan.deferred
+    for key, value in data.items():
+        name = names.get(key)
+        if name is None:
+            continue
+        values[name] = value
+        if value is not None and name in deferred:
+            pending.add(name)
+    return _build(model, plan, values, pending)
+
+
+def _build(
+    model: type[ModelT], plan: _Plan, values: dict[str, Any], pending: set[str]
+) -> ModelT:
+    fields_set = set(values)
+    for name, field in plan.defaults.items():
+        if name not in values:
+            values[name] = field.get_default(call_default_factory=True)
+
+    cls = plan.trusted_model if pending else model
+    instance = cls.__new__(cls)
+    _object_setattr(instance, "__dict__", values)
+    _object_setattr(instance, "__pydantic_fields_set__", fields_set)
+    _object_setattr(instance, "__pydantic_extra__", None)
+    _object_setattr(
+        instance,
+        "__pydantic_private__",
+        {"_trusted_pending": pending} if pending else None,
+    )
+    return instance  # type: ignore[return-value]
+
+
+def from_trusted_json(
+    model: type[ModelT], data: bytes | bytearray | str, *, verify_rate: float = 0.0
+) -> ModelT:
+    """Load ``model`` from JSON that Floweb wrote itself, skipping validation.
+
+    A fraction ``verify_rate`` (0-1) of calls validates the whole document
+    instead, which raises ``ValidationError`` if the stored data is bad.
+    """
+    if verify_rate and random.random() < verify_rate:
+        return model.model_validate_json(data)
+    return construct_trusted(model, from_json(data))
+
+
+# The end of a key whose value is an array or object. Before the first
+# container, everything is a top-level scalar member, so the first match
+# outside a string is the first top-level container.
+_CONTAINER_KEY = re.compile(rb'"\s*:\s*[\[{]')
+
+
+def _escaped(data: bytes, index: int) -> bool:
+    """Whether the quote at ``index`` is escaped by a backslash."""
+    start = index
+    while start and data[start - 1] == 0x5C:
+        start -= 1
+    return (index - start) % 2 == 1
+
+
+def _head_end(data: bytes) -> int:
+    """Where the first top-level container member starts (its key's quote)."""
+    position = 0
+    while True:
+        match = _CONTAINER_KEY.search(data, position)
+        if match is None:
+            return -1
+        end = match.start()
+        if _escaped(data, end):
+            position = end + 1  # An escaped quote inside a string.
+            continue
+        start = data.rfind(b'"', 0, end)
+        while start > 0 and _escaped(data, start):
+            start = data.rfind(b'"', 0, start)
+        return start
+
+
+def summary_from_json(model: type[ModelT], data: bytes | bytearray | str) -> ModelT:
+    """Load ``model`` from trusted JSON, decoding only its leading scalars.
+
+    Top-level members are decoded up to the first array or object;
+    everything from there on is decoded the first time one of its fields is
+    read. Plain head fields are used as-is and the others (enums,
+    datetimes) are validated on access, as with :func:`from_trusted_json`.
+    Write documents with :func:`summary_first_json` so that the head holds
+    every scalar.
+    """
+    raw = data.encode() if isinstance(data, str) else bytes(data)
+    cut = _head_end(raw)
+    if cut < 0:
+        return construct_trusted(model, from_json(raw))
+    head = raw[:cut].rstrip(b" \t\r\n,")
+    plan = _plan(model, True)
+    values: dict[str, Any] = {}
+    pending: set[str] = set()
+    names = plan.names
+    deferred = plan.deferred
+    decoded = from_json(head + b"}") if head != b"{" else {}
+    for key, value in decoded.items():
+        name = names.get(key)
+        if name is None:
+            continue
+        values[name] = value
+        if value is not None and name in deferred:
+            pending.add(name)
+    fields_set = set(values)
+    rest = plan.fields - fields_set
+    if rest:
+        tail = _Tail(raw, cut, plan, rest)
+        values.update(dict.fromkeys(rest, tail))
+        pending |= rest
+    instance = _build(model, plan, values, pending)
+    # Tail fields only count as set once the tail is decoded.
+    _object_setattr(instance, "__pydantic_fields_set__", fields_set)
+    return instance
+
+
+def summary_first_json(instance: BaseModel, **kwargs: Any) -> str:
+    """``instance.model_dump_json(**kwargs)`` with the scalar fields first.
+
+    Scalar fields are those whose value is not a list, dict or model.
+    """
+    if isinstance(instance, _TrustedMixin):
+        instance.materialize()
+    containers = {
+        name
+        for name, value in instance.__dict__.items()
+        if isinstance(value, (list, tuple, set, dict, BaseModel))
+    }
+    if not containers:
+        return instance.model_dump_json(**kwargs)
+    head = instance.model_dump_json(**kwargs, exclude=containers)
+    tail = instance.model_dump_json(**kwargs, include=containers)
+    if head == "{}":
+        return tail
+    return head[:-1] + "," + tail[1:]
+
+
+def is_materialized(instance: BaseModel) -> bool:
+    """Whether every deferred field of a trusted instance has been validated."""
+    if not isinstance(instance, _TrustedMixin):
+        return True
+    return not instance.__pydantic_private__["_trusted_pending"]
+
+
+def untrusted(instance: ModelT) -> ModelT:
+    """Return ``instance`` as a plain, fully validated model instance."""
+    if not isinstance(instance, _TrustedMixin):
+        return instance
+    instance.materialize()
+    model: type[ModelT] = _untrusted(type(instance))
+    plain = model.__new__(model)
+    _object_setattr(plain, "__dict__", dict(instance.__dict__))
+    _object_setattr(
+        plain, "__pydantic_fields_set__", set(instance.__pydantic_fields_set__)
+    )
+    _object_setattr(plain, "__pydantic_extra__", None)
+    _object_setattr(plain, "__pydantic_private__", None)
+    return plain
@@ -0,0 +1,145 @@
+"""Typed flow actions whose ``data.config`` is resolved from the action type.
+
+``flow.ActionData.config`` is a plain ``dict`` and ``ActionConfigurations``
+validates configs against an untagged union, which pydantic resolves by
+trying members one by one. The models here discriminate on
+``ActionData.type`` instead, so each config is validated against exactly one
+config model. Actions whose type is not in :data:`ACTION_CONFIG_TYPES` keep
+the untyped ``ActionData`` shape.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Annotated, Any, Literal, Union
+
+from pydantic import Discriminator, Tag, create_model
+
+from .action_configs import (
+    ApiCallConfig,
+    AssertionConfig,
+    AssertVisibleConfig,
+    BaseActionConfig,
+    CallToFlowConfig,
+    ClearInputConfig,
+    ClickConfig,
+    ConditionalConfig,
+    CustomCodeConfig,
+    DatabaseInsertConfig,
+    DatabaseQueryConfig,
+    DragAndDropConfig,
+    ExitFrameConfig,
+    FileDownloadConfig,
+    FileUploadConfig,
+    FormFillConfig,
+    GetElementPropertiesConfig,
+    GetPageInfoConfig,
+    GoBackConfig,
+    GoForwardConfig,
+    HandlePopupConfig,
+    InputConfig,
+    JunctionConfig,
+    LoopConfig,
+    NavigateConfig,
+    OpenNewTabConfig,
+    RefreshConfig,
+    ScreenshotConfig,
+    ScrollConfig,
+    SendKeysConfig,
+    SetViewportConfig,
+    SubflowConfig,
+    SwitchTabConfig,
+    SwitchToFrameConfig,
+    WaitConfig,
+)
+from .flow import Action, ActionData, Flow
+
+# Action type identifier (``ActionData.type``) -> config model.
+ACTION_CONFIG_TYPES: dict[str, type[BaseActionConfig]] = {
+    "click": ClickConfig,
+    "input": InputConfig,
+    "send_keys": SendKeysConfig,
+    "wait": WaitConfig,
+    "navigate": NavigateConfig,
+    "scroll": ScrollConfig,
+    "screenshot": ScreenshotConfig,
+    "assertion": AssertionConfig,
+    "assert_visible": AssertVisibleConfig,
+    "form_fill": FormFillConfig,
+    "clear_input": ClearInputConfig,
+    "open_new_tab": OpenNewTabConfig,
+    "switch_tab": SwitchTabConfig,
+    "go_forward": GoForwardConfig,
+    "go_back": GoBackConfig,
+    "refresh": RefreshConfig,
+    "get_page_info": GetPageInfoConfig,
+    "junction": JunctionConfig,
+    "api_call": ApiCallConfig,
+    "conditional": ConditionalConfig,
+    "loop": LoopConfig,
+    "database_query": DatabaseQueryConfig,
+    "database_insert": DatabaseInsertConfig,
+    "custom_code": CustomCodeConfig,
+    "drag_and_drop": DragAndDropConfig,
+    "call_to_flow": CallToFlowConfig,
+    "switch_to_frame": SwitchToFrameConfig,
+    "exit_frame": ExitFrameConfig,
+    "set_viewport": SetViewportConfig,
+    "get_element_properties": GetElementPropertiesConfig,
+    "handle_popup": HandlePopupConfig,
+    "file_upload": FileUploadConfig,
+    "file_download": FileDownloadConfig,
+    "subflow": SubflowConfig,
+}
+
+_UNTYPED = "__untyped__"
+
+
+def _typed_action_data(action_type: str, config_model: type[BaseActionConfig]) -> Any:
+    name = config_model.__name__.removesuffix("Config") + "ActionData"
+    model = create_model(
+        name,
+        __base__=ActionData,
+        __module__=__name__,
+        type=(Literal[action_type], ...),
+        config=(config_model, ...),
+    )
+    return Annotated[model, Tag(action_type)]
+
+
+def action_type_of(value: Any) -> str:
+    """Return the discriminator tag for raw or validated action data."""
+    if isinstance(value, dict):
+        action_type = value.get("type")
+    else:
+        action_type = getattr(value, "type", None)
+    if not isinstance(action_type, str) or action_type not in ACTION_CONFIG_TYPES:
+        return _UNTYPED  # Untrusted input may hold unhashable values.
+    return action_type
+
+
+# ``ActionData`` whose ``config`` is the config model for its ``type``.
+if TYPE_CHECKING:
+    TypedActionData = ActionData
+else:
+    TypedActionData = Annotated[
+        Union[
+            tuple(
+                _typed_action_data(action_type, config_model)
+                for action_type, config_model in ACTION_CONFIG_TYPES.items()
+            )
+            + (Annotated[ActionData, Tag(_UNTYPED)],)
+        ],
+        Discriminator(action_type_of),
+    ]
+
+
+class TypedAction(Action):
+    """Flow action whose config is validated against its action type."""
+
+    data: TypedActionData
+
+
+class TypedFlow(Flow):
+    """Flow whose actions carry typed configs."""
+
+    actions: list[TypedAction]  # type: ignore[assignment]
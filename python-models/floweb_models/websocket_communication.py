@@ -9,8 +9,6 @@ from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict
 
-from engine.server.ws.handlers import flow
-
 
 class WebSocketMessage(BaseModel):
     """
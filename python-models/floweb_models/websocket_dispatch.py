@@ -0,0 +1,167 @@
+"""O(1) parsing of WebSocket command and response frames.
+
+``WebsocketCommunication`` lists commands and responses as untagged unions,
+so pydantic tries every member until one validates. The adapters here
+dispatch on the ``command`` field instead and validate straight from the raw
+frame bytes, without an intermediate ``json.loads``.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Literal,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import Discriminator, Field, Tag, TypeAdapter, ValidationError
+
+from .websocket_communication import (
+    CloseCommand,
+    CloseEngineCommand,
+    CloseSessionCommand,
+    ConvertRecordingToFlowCommand,
+    DebugContinueCommand,
+    DebugPauseCommand,
+    DebugResponse,
+    DebugRunCommand,
+    DebugStepCommand,
+    DebugStopCommand,
+    EngineStatusResponse,
+    FinishRecordingCommand,
+    GetEngineStatusCommand,
+    GetLatestRealtimeActionCommand,
+    GetRealtimeActionsCommand,
+    GetRecordingStatusCommand,
+    ListRecordingsCommand,
+    ListRecordingsResponse,
+    ListSessionsCommand,
+    ListSessionsResponse,
+    PauseRecordingCommand,
+    RecordCommand,
+    RecordingResponse,
+    RecordingStatusResponse,
+    RestartEngineCommand,
+    ResumeRecordingCommand,
+    RunCommand,
+    RunLoadTestCommand,
+    RunResponse,
+    StartPerformanceScanCommand,
+    StopCommand,
+    StopLoadTestCommand,
+    StopPerformanceScanCommand,
+    StopRecordingCommand,
+    WebSocketResponse,
+)
+
+AnyWebSocketCommand = Annotated[
+    Union[
+        RunCommand,
+        RecordCommand,
+        PauseRecordingCommand,
+        ResumeRecordingCommand,
+        StopRecordingCommand,
+        FinishRecordingCommand,
+        GetRecordingStatusCommand,
+        ListRecordingsCommand,
+        ConvertRecordingToFlowCommand,
+        GetRealtimeActionsCommand,
+        GetLatestRealtimeActionCommand,
+        StopCommand,
+        CloseCommand,
+        ListSessionsCommand,
+        CloseSessionCommand,
+        RestartEngineCommand,
+        CloseEngineCommand,
+        GetEngineStatusCommand,
+        StartPerformanceScanCommand,
+        StopPerformanceScanCommand,
+        RunLoadTestCommand,
+        StopLoadTestCommand,
+        DebugRunCommand,
+        DebugStepCommand,
+        DebugContinueCommand,
+        DebugPauseCommand,
+        DebugStopCommand,
+    ],
+    Field(discriminator="command"),
+]
+
+_RESPONSE_MODELS: tuple[type[WebSocketResponse], ...] = (
+    RunResponse,
+    ListSessionsResponse,
+    EngineStatusResponse,
+    RecordingResponse,
+    RecordingStatusResponse,
+    ListRecordingsResponse,
+    DebugResponse,
+)
+
+_GENERIC = "__generic__"
+
+
+def _command_values(model: type[WebSocketResponse]) -> list[str]:
+    # Recording and debug responses type ``command`` as an enum rather than a
+    # Literal, which ``Field(discriminator=...)`` does not accept.
+    annotation = model.model_fields["command"].annotation
+    if get_origin(annotation) is Literal:
+        return [str(value) for value in get_args(annotation)]
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return [member.value for member in annotation]
+    raise TypeError(f"{model.__name__}.command is neither a Literal nor an Enum")
+
+
+_RESPONSE_TAGS: dict[str, str] = {
+    value: model.__name__
+    for model in _RESPONSE_MODELS
+    for value in _command_values(model)
+}
+
+
+def _response_tag(value: Any) -> str:
+    if isinstance(value, dict):
+        command = value.get("command")
+    else:
+        command = getattr(value, "command", None)
+    if not isinstance(command, str):
+        return _GENERIC  # Untrusted frames may hold unhashable values.
+    return _RESPONSE_TAGS.get(command, _GENERIC)
+
+
+if TYPE_CHECKING:
+    AnyWebSocketResponse = WebSocketResponse
+else:
+    AnyWebSocketResponse = Annotated[
+        Union[
+            tuple(Annotated[model, Tag(model.__name__)] for model in _RESPONSE_MODELS)
+            + (Annotated[WebSocketResponse, Tag(_GENERIC)],)
+        ],
+        Discriminator(_response_tag),
+    ]
+
+COMMAND_ADAPTER: TypeAdapter[Any] = TypeAdapter(AnyWebSocketCommand)
+RESPONSE_ADAPTER: TypeAdapter[Any] = TypeAdapter(AnyWebSocketResponse)
+_GENERIC_RESPONSE_ADAPTER = TypeAdapter(WebSocketResponse)
+
+
+def parse_command(data: bytes | bytearray | str) -> Any:
+    """Validate a raw command frame against the model named by its ``command``."""
+    return COMMAND_ADAPTER.validate_json(data)
+
+
+def parse_response(data: bytes | bytearray | str) -> Any:
+    """Validate a raw response frame against the model named by its ``command``.
+
+    Error replies often omit the payload fields of their specific response
+    model (e.g. a failed ``run`` has no ``reports``); those frames fall back
+    to the base ``WebSocketResponse`` like the untagged union did.
+    """
+    try:
+        return RESPONSE_ADAPTER.validate_json(data)
+    except ValidationError:
+        return _GENERIC_RESPONSE_ADAPTER.validate_json(data)
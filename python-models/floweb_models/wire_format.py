@@ -0,0 +1,318 @@
+"""Compact binary frames for high-frequency WebSocket messages.
+
+Debug updates, realtime-action polling and engine status go over the
+socket many times a second. As JSON, every one of them spells out its
+field names, its enum values and the same session and flow ids. A
+:class:`Channel` sends them as compact MessagePack frames instead:
+
+- A frame is an array ``[kind, tag, value, tag, value, ...]``. ``kind``
+  identifies the message type (see :data:`FRAME_KINDS`), and each field is
+  sent as an integer tag, its position in that kind's field list, followed
+  by its value. ``None`` fields are left out.
+- Enum fields (``type``, ``state`` and ``pauseReason`` of a debug update)
+  are sent as the member's index in the enum.
+- Ids (session, flow and action ids, action types, engine status) are
+  interned per connection and direction. The first occurrence is sent as
+  the string and both ends append it to their table; later occurrences
+  are sent as its index. WebSocket delivers messages in order, so the
+  tables stay in step without any extra messages. Past
+  :data:`INTERN_LIMIT` entries, new strings are sent as they are.
+
+Every other message, and every message on a connection that did not
+negotiate the compact format, is sent as JSON text. :func:`negotiate`
+picks the format from the subprotocols a client offers in
+``Sec-WebSocket-Protocol``: :data:`COMPACT_PROTOCOL` if the client offers
+it and msgpack is installed, :data:`JSON_PROTOCOL` otherwise.
+:meth:`Channel.decode` accepts both forms on any connection. A compact
+frame starts with a MessagePack array byte (``0x90`` and up), and JSON
+text never does.
+
+The schema defines no reply to ``get_realtime_actions``; the frames carry
+a :class:`RealtimeActionsResponse`, with the recorded actions as flow
+``Action`` objects.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from enum import Enum
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+from pydantic_core import from_json
+
+from .codecs import Codec, get_codec
+from .debug import DebugActionUpdate, DebugState, PauseReason, Type
+from .flow import Action
+from .websocket_communication import (
+    EngineStatusResponse,
+    GetEngineStatusCommand,
+    GetLatestRealtimeActionCommand,
+    GetRealtimeActionsCommand,
+    WebSocketResponse,
+)
+from .websocket_dispatch import COMMAND_ADAPTER, parse_response
+
+COMPACT_PROTOCOL = "floweb.compact.v1"
+JSON_PROTOCOL = "floweb.json"
+INTERN_LIMIT = 4096
+
+
+class FrameError(ValueError):
+    """The data is not a valid compact frame."""
+
+
+class RealtimeActionsResponse(WebSocketResponse):
+    """Reply to ``get_realtime_actions`` and ``get_latest_realtime_action``."""
+
+    model_config = ConfigDict(
+        populate_by_name=True,
+    )
+    command: Literal["get_realtime_actions", "get_latest_realtime_action"]
+    session_id: str
+    actions: list[Action] = []
+
+
+# Field codings; an enum class as the coding means "index in the enum".
+_PLAIN = "plain"
+_INTERN = "intern"
+_ACTIONS = "actions"
+
+_Fields = tuple[tuple[str, Any], ...]
+
+_REALTIME_RESPONSE_FIELDS: _Fields = (
+    ("success", _PLAIN),
+    ("message", _PLAIN),
+    ("session_id", _INTERN),
+    ("actions", _ACTIONS),
+)
+_POLL_FIELDS: _Fields = (("session_id", _INTERN), ("flow_id", _INTERN))
+
+# ``kind`` is the index in this table, and tags are indexes into the field
+# lists. Only append to either (or bump the protocol version): both ends of
+# a connection must agree on them. The same holds for the enum members.
+FRAME_KINDS: tuple[tuple[type[BaseModel], str | None, _Fields], ...] = (
+    (
+        DebugActionUpdate,
+        None,
+        (
+            ("type", Type),
+            ("sessionId", _INTERN),
+            ("actionId", _INTERN),
+            ("actionIndex", _PLAIN),
+            ("state", DebugState),
+            ("pauseReason", PauseReason),
+            ("result", _PLAIN),
+            ("error", _PLAIN),
+            ("variables", _PLAIN),
+        ),
+    ),
+    (
+        EngineStatusResponse,
+        "get_engine_status",
+        (
+            ("success", _PLAIN),
+            ("message", _PLAIN),
+            ("status", _INTERN),
+            ("uptime", _PLAIN),
+            ("active_sessions", _PLAIN),
+        ),
+    ),
+    (RealtimeActionsResponse, "get_realtime_actions", _REALTIME_RESPONSE_FIELDS),
+    (
+        RealtimeActionsResponse,
+        "get_latest_realtime_action",
+        _REALTIME_RESPONSE_FIELDS,
+    ),
+    (GetRealtimeActionsCommand, "get_realtime_actions", _POLL_FIELDS),
+    (GetLatestRealtimeActionCommand, "get_latest_realtime_action", _POLL_FIELDS),
+    (GetEngineStatusCommand, "get_engine_status", (("flow_id", _INTERN),)),
+)
+
+_KINDS: dict[tuple[type[BaseModel], str | None], int] = {
+    (model, command): kind for kind, (model, command, _) in enumerate(FRAME_KINDS)
+}
+_ENUM_MEMBERS: dict[type[Enum], tuple[Enum, ...]] = {
+    Type: tuple(Type),
+    DebugState: tuple(DebugState),
+    PauseReason: tuple(PauseReason),
+}
+_ENUM_CODES: dict[type[Enum], dict[Enum, int]] = {
+    enum: {member: code for code, member in enumerate(members)}
+    for enum, members in _ENUM_MEMBERS.items()
+}
+# Per kind: (tag, field, coding), with enum codings replaced by their codes.
+_ENCODE_PLANS: tuple[tuple[tuple[int, str, Any], ...], ...] = tuple(
+    tuple(
+        (tag, name, _ENUM_CODES.get(coding, coding))
+        for tag, (name, coding) in enumerate(fields)
+    )
+    for _, _, fields in FRAME_KINDS
+)
+_REALTIME_COMMANDS = frozenset({"get_realtime_actions", "get_latest_realtime_action"})
+
+
+def _index(value: int) -> int:
+    # A negative number would index from the end instead of failing.
+    if value < 0:
+        raise IndexError(value)
+    return value
+
+
+def negotiate(offered: Iterable[str]) -> str:
+    """The subprotocol to accept from a client's ``Sec-WebSocket-Protocol``.
+
+    Clients that offer neither protocol (or nothing) get
+    :data:`JSON_PROTOCOL`, the format every client understands.
+    """
+    if COMPACT_PROTOCOL in offered:
+        try:
+            get_codec("msgpack")
+        except ImportError:
+            return JSON_PROTOCOL
+        return COMPACT_PROTOCOL
+    return JSON_PROTOCOL
+
+
+def _decode_json(data: bytes | bytearray | str) -> BaseModel:
+    value = from_json(data)
+    if not isinstance(value, dict):
+        raise FrameError("a WebSocket message must be a JSON object")
+    command = value.get("command")
+    if command is None:
+        return DebugActionUpdate.model_validate(value)
+    message: BaseModel
+    if "success" not in value:
+        message = COMMAND_ADAPTER.validate_python(value)
+        return message
+    if command in _REALTIME_COMMANDS:
+        try:
+            return RealtimeActionsResponse.model_validate(value)
+        except ValidationError:
+            pass
+    message = parse_response(data)
+    return message
+
+
+class Channel:
+    """Encoder and decoder for one WebSocket connection.
+
+    ``protocol`` is the negotiated subprotocol. :meth:`encode` returns
+    ``bytes`` for a compact frame (send it as a binary message) and ``str``
+    for JSON (send it as text). Use one channel per connection and encode
+    and decode in the order the messages are sent and received.
+    """
+
+    def __init__(self, protocol: str = JSON_PROTOCOL) -> None:
+        if protocol not in (COMPACT_PROTOCOL, JSON_PROTOCOL):
+            raise ValueError(f"unknown protocol {protocol!r}")
+        self.protocol = protocol
+        # Only compact channels send frames; any channel can receive them.
+        self._encoder: Codec | None = None
+        if protocol == COMPACT_PROTOCOL:
+            self._encoder = get_codec("msgpack")
+        self._msgpack = self._encoder
+        self._sent: dict[str, int] = {}
+        self._received: list[str] = []
+
+    def encode(self, message: BaseModel) -> bytes | str:
+        """``message`` as a compact frame if it has a kind, else as JSON."""
+        if self._encoder is not None:
+            # ``vars``: a missing attribute on a model costs an exception.
+            kind = _KINDS.get((type(message), vars(message).get("command")))
+            if kind is not None:
+                return self._encoder.encode(self._frame(kind, message))
+        return message.model_dump_json(exclude_unset=True)
+
+    def decode(self, data: bytes | bytearray | memoryview | str) -> BaseModel:
+        """The message in a compact frame or a JSON text or binary message."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if isinstance(data, str) or not data or not data[0] & 0x80:
+            return _decode_json(data)
+        if self._msgpack is None:
+            self._msgpack = get_codec("msgpack")
+        try:
+            frame = self._msgpack.decode(data)
+        except ValueError as exc:
+            raise FrameError(f"invalid frame: {exc}") from None
+        try:
+            model, command, fields = FRAME_KINDS[_index(frame[0])]
+            values: dict[str, Any] = {} if command is None else {"command": command}
+            for index in range(1, len(frame), 2):
+                name, coding = fields[_index(frame[index])]
+                value = frame[index + 1]
+                if coding is not _PLAIN:
+                    value = self._decode_value(coding, value)
+                values[name] = value
+        except (IndexError, KeyError, TypeError, ValueError) as exc:
+            raise FrameError(f"malformed frame: {exc!r}") from None
+        # The frame holds exact Python types (enum members, not their values),
+        # so strict validation checks them without lax-mode coercion.
+        return model.model_validate(values, strict=True)
+
+    def _frame(self, kind: int, message: BaseModel) -> list[Any]:
+        frame: list[Any] = [kind]
+        intern = self._intern
+        for tag, name, coding in _ENCODE_PLANS[kind]:
+            value = getattr(message, name)
+            if value is None:
+                continue
+            if coding is _INTERN:
+                value = intern(value)
+            elif coding is _ACTIONS:
+                value = self._encode_actions(value)
+            elif coding is not _PLAIN:
+                value = coding[value]
+            frame += (tag, value)
+        return frame
+
+    def _encode_actions(self, actions: list[Action]) -> list[list[Any]]:
+        intern = self._intern
+        return [
+            [
+                intern(action.id),
+                intern(action.type),
+                action.position.x,
+                action.position.y,
+                action.data.label,
+                intern(action.data.type),
+                action.data.config,
+            ]
+            for action in actions
+        ]
+
+    def _decode_value(self, coding: Any, value: Any) -> Any:
+        if coding is _INTERN:
+            return self._resolve(value)
+        if coding is _ACTIONS:
+            resolve = self._resolve
+            return [
+                {
+                    "id": resolve(id_),
+                    "type": resolve(type_),
+                    "position": {"x": x, "y": y},
+                    "data": {
+                        "label": label,
+                        "type": resolve(data_type),
+                        "config": config,
+                    },
+                }
+                for id_, type_, x, y, label, data_type, config in value
+            ]
+        return _ENUM_MEMBERS[coding][_index(value)]
+
+    def _intern(self, value: str) -> int | str:
+        index = self._sent.get(value)
+        if index is not None:
+            return index
+        if len(self._sent) < INTERN_LIMIT:
+            self._sent[value] = len(self._sent)
+        return value
+
+    def _resolve(self, value: int | str) -> str:
+        if isinstance(value, int):
+            return self._received[_index(value)]
+        if len(self._received) < INTERN_LIMIT:
+            self._received.append(value)
+        return value
@@ -7,7 +7,7 @@ setup(
     packages=find_packages(include=["floweb_models", "floweb_models.*"]),
     include_package_data=True,
     install_requires=[
-        "pydantic>=2.0.0",
+        "pydantic>=2.5.0",
     ],
     python_requires=">=3.9",
 )
@@ -39,7 +39,7 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "pydantic>=2.0.0",
+        "pydantic>=2.5.0",
         "typing-extensions>=4.0.0",
     ],
     extras_require={
@@ -47,6 +47,7 @@ setup(
             "datamodel-code-generator>=0.21.0",
             "jsonschema>=4.0.0",
             "pytest>=7.0.0",
+            "hypothesis>=6.0.0",
             "black>=23.0.0",
             "isort>=5.0.0",
             "mypy>=1.0.0",
@@ -55,5 +56,14 @@ setup(
             "sphinx>=5.0.0",
             "sphinx-rtd-theme>=1.2.0",
         ],
+        "numpy": [
+            "numpy>=1.22",
+        ],
+        "orjson": [
+            "orjson>=3.9",
+        ],
+        "msgpack": [
+            "msgpack>=1.0",
+        ],
     },
 )
@@ -0,0 +1,71 @@
+"""Aggregate metrics and timelines from request executions."""
+
+import pytest
+
+from floweb_models import columnar
+from floweb_models.aggregation import aggregate_executions
+from floweb_models.columnar import ExecutionColumns
+
+T0 = 1_700_000_000_000.0
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "_numpy", False)
+    return request.param
+
+
+def make_columns() -> tuple[ExecutionColumns, ExecutionColumns]:
+    # Two requests over three seconds; nothing happens in the second one.
+    first = ExecutionColumns()
+    second = ExecutionColumns()
+    for offset, time, ok in [(0, 100.0, True), (400, 300.0, False), (999, 200.0, True)]:
+        first.append(T0 + offset, 200 if ok else 500, time, 1000, ok)
+    second.append(T0 + 2500, 200, 400.0, 500, True)
+    return first, second
+
+
+def test_aggregates_and_timeline(backend):
+    metrics, timeline = aggregate_executions(make_columns(), bytes_sent=700)
+
+    assert metrics.totalRequests == 4
+    assert (metrics.successfulRequests, metrics.failedRequests) == (3, 1)
+    assert metrics.errorRate == 0.25
+    assert metrics.throughput == pytest.approx(4 / 2.5)
+    assert metrics.responseTime.max == 400.0
+    assert metrics.responseTime.mean == 250.0
+    assert metrics.bandwidth.received == 3500
+    assert metrics.bandwidth.sent == 700
+    assert metrics.bandwidth.avgReceivedPerSecond == pytest.approx(3500 / 2.5)
+
+    assert [p.timestamp for p in timeline] == [T0, T0 + 1000, T0 + 2000]
+    assert [p.requestsPerSecond for p in timeline] == [3.0, 0.0, 1.0]
+    assert [p.avgResponseTime for p in timeline] == [200.0, 0.0, 400.0]
+    assert timeline[0].errorRate == pytest.approx(1 / 3)
+    # 600 ms spent in requests during a 1000 ms bucket.
+    assert [p.activeUsers for p in timeline] == [1, 0, 0]
+
+
+def test_window_and_user_schedule(backend):
+    _, timeline = aggregate_executions(
+        make_columns(),
+        bucket_ms=500,
+        start=T0 + 500,
+        end=T0 + 2999,
+        active_users=lambda timestamp: int((timestamp - T0) // 500),
+    )
+    assert len(timeline) == 5
+    assert [p.requestsPerSecond for p in timeline] == [2.0, 0.0, 0.0, 0.0, 2.0]
+    assert [p.activeUsers for p in timeline] == [1, 2, 3, 4, 5]
+
+
+def test_empty(backend):
+    metrics, timeline = aggregate_executions([])
+    assert metrics.totalRequests == 0 and metrics.errorRate == 0.0
+    assert timeline == []
+
+    _, timeline = aggregate_executions(ExecutionColumns(), start=T0, end=T0 + 1500)
+    assert [p.requestsPerSecond for p in timeline] == [0.0, 0.0]
@@ -0,0 +1,129 @@
+"""Content-addressed blob store for inline base64 images."""
+
+import base64
+import hashlib
+import json
+from pathlib import Path
+
+import pytest
+
+from floweb_models.blob_store import (
+    BlobStore,
+    externalize,
+    externalize_flow,
+    externalize_report,
+    is_media_reference,
+    media_bytes,
+)
+from floweb_models.execution_results import ActionResult, FlowReport
+from floweb_models.flow import Flow
+
+FLOW_JSON = (
+    Path(__file__).resolve().parent.parent / "examples" / "flow-example.json"
+).read_text()
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+PNG_B64 = base64.b64encode(PNG).decode()
+
+
+def test_put_is_content_addressed(tmp_path):
+    store = BlobStore(tmp_path)
+    reference = store.put(PNG)
+    assert reference == "mediaId:" + hashlib.sha256(PNG).hexdigest()
+    assert is_media_reference(reference) and reference in store
+    assert store.put(PNG) == reference
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [reference[10:]]
+    view = store.open(reference)
+    assert view.readonly and view[:4] == b"\x89PNG"
+    assert store.read(reference) == PNG
+    assert store.read(store.put(b"")) == b""
+
+
+def test_unknown_and_malformed_references(tmp_path):
+    store = BlobStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.open("mediaId:" + "0" * 64)
+    with pytest.raises(ValueError):
+        store.open("mediaId:../../etc/passwd")
+    assert "mediaId:xyz" not in store
+
+
+def test_externalize_lifts_only_inline_images(tmp_path):
+    store = BlobStore(tmp_path)
+    data = {
+        "selector": "#logo",
+        "image": PNG_B64,
+        "fields": [
+            {"image": "data:image/png;base64," + PNG_B64},
+            {"image": "/tmp/screens/field.png"},
+        ],
+        "screenshot": True,
+        "other": [{"text": PNG_B64}],
+    }
+    lifted = externalize(data, store)
+    reference = store.put(PNG)
+    assert lifted["image"] == reference
+    assert lifted["fields"][0]["image"] == reference
+    assert lifted["fields"][1] is data["fields"][1]
+    assert lifted["other"] is data["other"]
+    assert data["image"] == PNG_B64  # The input is not modified.
+    assert externalize(lifted, store) is lifted
+    assert externalize({"image": "aGk="}, store)["image"] == "aGk="  # Too small.
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        PNG_B64[:-4] + "A===",
+        PNG_B64[:-1],
+        PNG_B64[:100] + "\n" + PNG_B64[100:],
+        PNG_B64[:100] + "=" + PNG_B64[101:],
+        "/" + "a" * 255 + ".png",
+        "=" * 4 + PNG_B64,
+    ],
+)
+def test_externalize_leaves_invalid_base64_inline(tmp_path, value):
+    assert externalize({"image": value}, BlobStore(tmp_path))["image"] == value
+
+
+def test_externalize_flow(tmp_path):
+    flow_data = json.loads(FLOW_JSON)
+    flow_data["actions"][3]["data"]["config"]["image"] = PNG_B64
+    flow = Flow.model_validate(flow_data)
+    store = BlobStore(tmp_path)
+    migrated = externalize_flow(flow, store)
+    config = migrated.actions[3].data.config
+    assert is_media_reference(config["image"])
+    assert bytes(media_bytes(config["image"], store)) == PNG
+    assert migrated.actions[0] is flow.actions[0]
+    assert flow.actions[3].data.config["image"] == PNG_B64
+    assert (
+        len(migrated.model_dump_json())
+        < len(flow.model_dump_json()) - len(PNG_B64) + 100
+    )
+
+
+def test_externalize_report(tmp_path):
+    def result(node_id, screenshot):
+        return ActionResult(
+            node_id=node_id,
+            action_type="screenshot",
+            config={"image": PNG_B64},
+            start_time=0,
+            end_time=1,
+            duration_seconds=0.001,
+            success=True,
+            message="ok",
+            screenshot=screenshot,
+        )
+
+    report = FlowReport.model_construct(
+        actions=[result("a", PNG_B64), result("b", None)]
+    )
+    store = BlobStore(tmp_path)
+    migrated = externalize_report(report, store)
+    reference = store.put(PNG)
+    assert migrated.actions[0].screenshot == reference
+    assert migrated.actions[0].config == {"image": reference}
+    assert migrated.actions[1].screenshot is None
+    assert report.actions[0].screenshot == PNG_B64
+    assert media_bytes(PNG_B64, store) == PNG
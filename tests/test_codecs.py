@@ -0,0 +1,164 @@
+"""Pluggable codecs: JSON, orjson and MessagePack."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from floweb_models import codecs
+from floweb_models.execution_results import FlowReport
+from floweb_models.flow import Flow
+from floweb_models.performance_test import PerformanceTest, PerformanceTestResults
+from floweb_models.trusted import summary_first_json, summary_from_json
+from floweb_models.websocket_communication import (
+    DebugResponse,
+    EngineStatusResponse,
+    RunResponse,
+    WebSocketResponse,
+)
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+FLOW = Flow.model_validate_json((EXAMPLES / "flow-example.json").read_bytes())
+PERFORMANCE_TEST = PerformanceTest.model_validate_json(
+    (EXAMPLES / "performance-test-example.json").read_bytes()
+)
+REPORT = FlowReport.model_validate(
+    {
+        "flow_id": "flow-123",
+        "flow_name": "Login",
+        "success": False,
+        "start_time": 1705312800000,
+        "end_time": 1705312860000,
+        "variables": {"input": [{"name": "user", "value": "ann"}]},
+        "output": {"token": None, "scores": [1.5, -2, 1e300]},
+        "actions": [
+            {
+                "node_id": "a1",
+                "action_type": "click",
+                "config": {"selector": "#go", "nested": {"ü": [True, None]}},
+                "start_time": 1705312800000,
+                "end_time": 1705312800250,
+                "duration_seconds": 0.25,
+                "success": False,
+                "message": "not found",
+                "error": "timeout",
+            }
+        ],
+    }
+)
+RESPONSES = [
+    RunResponse(
+        command="run",
+        success=True,
+        mode="full",
+        reports=[{"actions": [{"id": "a"}], "output": {"x": 1}}],
+    ),
+    EngineStatusResponse(
+        command="get_engine_status",
+        success=True,
+        status="ok",
+        uptime=3,
+        active_sessions=1,
+    ),
+    DebugResponse(command="debug_error", success=False, error="x"),
+    WebSocketResponse(command="something_new", success=True, message="hi"),
+]
+MODELS = [FLOW, PERFORMANCE_TEST, PERFORMANCE_TEST.results, REPORT, *RESPONSES]
+
+
+def codec_or_skip(name):
+    try:
+        return codecs.get_codec(name)
+    except ImportError as exc:
+        pytest.skip(str(exc))
+
+
+@pytest.fixture(params=["json", "orjson", "msgpack"])
+def codec(request):
+    return codec_or_skip(request.param)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda m: type(m).__name__)
+def test_models_round_trip(codec, model):
+    data = codecs.dumps(model, codec)
+    assert isinstance(data, bytes)
+    restored = codecs.loads(type(model), data, codec.name)
+    assert restored == model
+    assert type(restored) is type(model)
+
+
+def test_unset_fields_are_not_written():
+    # ``variables`` is typed ``FlowVariables`` with a ``None`` default: a
+    # written-out null would not validate again.
+    flow = Flow(id="f", name="n", type="flow", actions=[], edges=[])
+    data = codecs.dumps(flow, "json")
+    assert json.loads(data) == {
+        "id": "f",
+        "name": "n",
+        "type": "flow",
+        "actions": [],
+        "edges": [],
+    }
+    assert codecs.loads(Flow, data) == flow
+
+
+def test_encode_accepts_models_inside_plain_data(codec):
+    envelope = {"type": "results", "id": 7, "data": PERFORMANCE_TEST.results}
+    decoded = codec.decode(codec.encode(envelope))
+    assert decoded["id"] == 7
+    assert PerformanceTestResults.model_validate(decoded["data"]) == (
+        PERFORMANCE_TEST.results
+    )
+
+
+def test_loads_response_dispatches_on_command(codec):
+    for response in RESPONSES:
+        restored = codecs.loads_response(codec.dumps(response), codec)
+        assert type(restored) is type(response) and restored == response
+    failed = codec.encode({"command": "run", "success": False, "message": "crash"})
+    assert type(codecs.loads_response(failed, codec)) is WebSocketResponse
+
+
+def test_trusted_instances_are_materialized_before_dumping(codec):
+    lazy = summary_from_json(Flow, summary_first_json(FLOW))
+    assert codec.loads(Flow, codec.dumps(lazy)) == FLOW
+
+
+def test_registry():
+    assert codecs.get_codec() is codecs.get_codec("json")
+    assert "json" in codecs.available_codecs()
+    with pytest.raises(KeyError, match="unknown codec"):
+        codecs.get_codec("yaml")
+
+    class Upper(codecs.JsonCodec):
+        name = "upper-json"
+
+    codecs.register_codec("upper-json", Upper)
+    try:
+        assert isinstance(codecs.get_codec("upper-json"), Upper)
+        assert codecs.loads(Flow, codecs.dumps(FLOW, "upper-json"), "upper-json")
+    finally:
+        codecs._FACTORIES.pop("upper-json")
+        codecs._CODECS.pop("upper-json", None)
+
+
+def test_codecs_must_implement_encode_and_decode():
+    class EncodeOnly(codecs.Codec):
+        def encode(self, value):
+            return b""
+
+    with pytest.raises(TypeError, match="decode"):
+        EncodeOnly()
+
+
+def test_missing_backend_names_the_extra():
+    def broken():
+        raise ModuleNotFoundError("No module named 'cbor2'", name="cbor2")
+
+    codecs.register_codec("cbor", broken)
+    try:
+        with pytest.raises(ImportError, match=r"floweb-domain-models\[cbor\]"):
+            codecs.get_codec("cbor")
+        assert "cbor" not in codecs.available_codecs()
+    finally:
+        codecs._FACTORIES.pop("cbor")
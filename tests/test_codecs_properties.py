@@ -0,0 +1,99 @@
+"""Property-based round-trip checks for the codecs (needs hypothesis)."""
+
+from datetime import timezone
+
+import pytest
+
+hypothesis = pytest.importorskip("hypothesis")
+st = pytest.importorskip("hypothesis.strategies")
+
+from floweb_models import codecs  # noqa: E402
+from floweb_models.flow import Flow  # noqa: E402
+from floweb_models.websocket_communication import EngineStatusResponse  # noqa: E402
+
+given = hypothesis.given
+
+text = st.text(alphabet=st.characters(blacklist_categories=("Cs",)), max_size=20)
+scalars = (
+    st.none()
+    | st.booleans()
+    | st.integers(min_value=-(2**63), max_value=2**63 - 1)
+    | st.floats(allow_nan=False, allow_infinity=False)
+    | text
+)
+json_values = st.recursive(
+    scalars,
+    lambda children: st.lists(children, max_size=4)
+    | st.dictionaries(text, children, max_size=4),
+    max_leaves=16,
+)
+actions = st.lists(
+    st.fixed_dictionaries(
+        {
+            "id": text,
+            "type": text,
+            "position": st.fixed_dictionaries(
+                {
+                    "x": st.floats(allow_nan=False, allow_infinity=False),
+                    "y": st.floats(allow_nan=False, allow_infinity=False),
+                }
+            ),
+            "data": st.fixed_dictionaries(
+                {
+                    "label": text,
+                    "type": text,
+                    "config": st.dictionaries(text, json_values, max_size=4),
+                }
+            ),
+        }
+    ),
+    max_size=4,
+)
+flows = st.fixed_dictionaries(
+    {"id": text, "name": text, "type": st.sampled_from(["flow", "test"])},
+    optional={
+        "description": st.none() | text,
+        "tags": st.lists(text, max_size=3),
+        "actions": actions,
+        "edges": st.just([]),
+        "createdAt": st.datetimes(timezones=st.just(timezone.utc)),
+    },
+).map(lambda data: Flow.model_validate({"actions": [], "edges": [], **data}))
+
+
+def available():
+    return [
+        name
+        for name in ("json", "orjson", "msgpack")
+        if name in codecs.available_codecs()
+    ]
+
+
+@given(json_values)
+def test_plain_data_round_trips(value):
+    for name in available():
+        codec = codecs.get_codec(name)
+        assert codec.decode(codec.encode(value)) == value
+
+
+@given(flows)
+def test_flows_round_trip(flow):
+    for name in available():
+        assert codecs.loads(Flow, codecs.dumps(flow, name), name) == flow
+
+
+@given(
+    st.builds(
+        EngineStatusResponse,
+        command=st.just("get_engine_status"),
+        success=st.booleans(),
+        message=st.none() | text,
+        status=text,
+        uptime=st.integers(min_value=0, max_value=2**53),
+        active_sessions=st.integers(min_value=0, max_value=2**31),
+    )
+)
+def test_responses_round_trip(response):
+    for name in available():
+        data = codecs.dumps(response, name)
+        assert codecs.loads_response(data, name) == response
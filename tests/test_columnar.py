@@ -0,0 +1,84 @@
+"""Columnar storage for request executions."""
+
+import pytest
+
+from floweb_models import columnar
+from floweb_models.columnar import ColumnarRequestResults, ExecutionColumns
+from floweb_models.performance_test import RequestExecution, RequestResults
+
+EXECUTIONS = [
+    {
+        "timestamp": 1_700_000_000_000.0 + i * 10,
+        "statusCode": 500 if i % 4 == 3 else 200,
+        "responseTime": float(i % 7) * 12.5 + 0.25,
+        "size": 1024 + i,
+        "success": i % 4 != 3,
+        "error": "Internal Server Error" if i % 4 == 3 else None,
+    }
+    for i in range(40)
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(columnar, "_numpy", False)
+    return request.param
+
+
+def test_round_trips_json_shape():
+    results = RequestResults.model_validate(
+        {
+            "requestId": "r1",
+            "url": "https://api.example.com/items",
+            "method": "GET",
+            "executions": EXECUTIONS,
+        }
+    )
+    table = ColumnarRequestResults.from_json(results.model_dump_json())
+    assert len(table.executions) == 40
+    assert table.executions.errors == ["Internal Server Error"]
+    assert table.to_model() == results
+    assert ColumnarRequestResults.from_model(results).to_dict() == table.to_dict()
+    assert table.executions[3] == RequestExecution.model_validate(EXECUTIONS[3])
+    assert table.executions.nbytes() == 40 * 23
+
+
+def test_aggregates(backend):
+    columns = ExecutionColumns.from_executions(EXECUTIONS)
+    assert columns.success_count() == 30
+    assert columns.error_rate() == 0.25
+    assert columns.total_bytes() == sum(e["size"] for e in EXECUTIONS)
+    assert columns.status_counts() == {200: 30, 500: 10}
+    assert columns.error_counts() == {"Internal Server Error": 10}
+    assert columns.time_range() == (1_700_000_000_000.0, 1_700_000_000_390.0)
+
+    times = sorted(e["responseTime"] for e in EXECUTIONS)
+    metrics = columns.response_time_metrics()
+    assert (metrics.min, metrics.max) == (times[0], times[-1])
+    assert metrics.median == times[19]
+    assert metrics.p99 == times[38]
+    assert metrics.mean == pytest.approx(sum(times) / 40)
+
+    ok = sorted(e["responseTime"] for e in EXECUTIONS if e["success"])
+    assert columns.response_time_metrics(successful_only=True).max == ok[-1]
+
+
+def test_empty_columns(backend):
+    columns = ExecutionColumns()
+    assert columns.error_rate() == 0.0
+    assert columns.status_counts() == {}
+    assert columns.response_time_metrics().p95 == 0.0
+    assert columns.time_range() == (0.0, 0.0)
+
+
+def test_numpy_views_are_zero_copy():
+    np = pytest.importorskip("numpy")
+    columns = ExecutionColumns.from_executions(EXECUTIONS)
+    views = columns.to_numpy()
+    assert views["statusCode"].dtype == np.uint16
+    assert views["success"].sum() == 30
+    columns.size[0] = 7
+    assert views["size"][0] == 7
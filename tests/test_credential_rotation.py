@@ -0,0 +1,111 @@
+"""Credential rotation pools."""
+
+import asyncio
+from collections import Counter
+
+from floweb_models.credential_rotation import CredentialPool, merge_headers
+from floweb_models.load_engine import LoadEngine
+from floweb_models.performance_test import (
+    CredentialRotationConfig,
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+)
+
+
+def rotation(strategy: str, count: int = 3) -> CredentialRotationConfig:
+    return CredentialRotationConfig(
+        credentials=[
+            {"headers": {"authorization": f"Basic u{i}"}, "user_id": f"u{i}"}
+            for i in range(count)
+        ],
+        rotation_strategy=strategy,
+    )
+
+
+def test_merge_headers_is_case_insensitive():
+    merged = merge_headers(
+        {"Accept": "*/*", "Authorization": "recorded"},
+        {"authorization": "Basic u0"},
+        None,
+        {"ACCEPT": "application/json"},
+    )
+    assert merged == {"ACCEPT": "application/json", "authorization": "Basic u0"}
+
+
+def test_round_robin():
+    pool = CredentialPool(rotation("round_robin"))
+    assert [pool.next_index() for _ in range(7)] == [0, 1, 2, 0, 1, 2, 0]
+    assert pool.select("abc") == "b"
+
+
+def test_random_is_seeded_and_covers_all_credentials():
+    first = CredentialPool(rotation("random"), seed=7)
+    second = CredentialPool(rotation("random"), seed=7)
+    draws = [first.next_index() for _ in range(300)]
+    assert draws == [second.next_index() for _ in range(300)]
+    assert all(count > 70 for count in Counter(draws).values())
+    assert len(Counter(draws)) == 3
+
+
+def test_merge_is_per_credential():
+    pool = CredentialPool(rotation("round_robin", 2))
+    variants = pool.merge({"Authorization": "old", "X-A": "1"}, {"X-A": "2"})
+    assert variants == (
+        {"authorization": "Basic u0", "X-A": "2"},
+        {"authorization": "Basic u1", "X-A": "2"},
+    )
+
+
+def test_engine_rotates_credentials_per_request():
+    seen = []
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                seen.append(
+                    next(
+                        line
+                        for line in head.decode().split("\r\n")
+                        if line.startswith("authorization:")
+                    )
+                )
+                writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        config = LoadTestConfiguration(
+            targetUrl=f"http://127.0.0.1:{port}",
+            duration=1,
+            virtualUsers=1,
+            thinkTime=1,
+            includeRequests=["r"],
+            thresholds=LoadTestThresholds(
+                maxResponseTime=1000, maxErrorRate=0, minThroughput=0
+            ),
+            authConfig={"credential_rotation": rotation("round_robin")},
+        )
+        request = RecordedRequest(
+            id="r",
+            url="https://recorded.example.com/",
+            method="GET",
+            headers={"Authorization": "recorded"},
+            timestamp=0,
+            resourceType="fetch",
+        )
+        report = await LoadEngine(config, [request], duration=0.2).run()
+        server.close()
+        return report
+
+    report = asyncio.run(main())
+    assert report.total_requests == len(seen) >= 6
+    assert seen[:4] == [
+        "authorization: Basic u0",
+        "authorization: Basic u1",
+        "authorization: Basic u2",
+        "authorization: Basic u0",
+    ]
@@ -0,0 +1,142 @@
+"""Graph index over a flow's actions and edges."""
+
+import pickle
+
+from floweb_models.flow import Edge, Flow
+from floweb_models.graph import flow_graph, invalidate_flow_graph
+
+
+def make_flow() -> Flow:
+    return Flow.model_validate(
+        {
+            "id": "f",
+            "name": "f",
+            "actions": [
+                {
+                    "id": action_id,
+                    "type": "click",
+                    "position": {"x": 0, "y": 0},
+                    "data": {"label": action_id, "type": "click", "config": {}},
+                }
+                for action_id in ("check", "yes", "no", "done")
+            ],
+            "edges": [
+                {
+                    "id": "e1",
+                    "source": "check",
+                    "sourceHandle": "true",
+                    "target": "yes",
+                },
+                {
+                    "id": "e2",
+                    "source": "check",
+                    "sourceHandle": "false",
+                    "target": "no",
+                },
+                {"id": "e3", "source": "yes", "target": "done"},
+                {"id": "e4", "source": "no", "target": "done"},
+            ],
+        }
+    )
+
+
+def test_lookups_and_degrees():
+    flow = make_flow()
+    graph = flow_graph(flow)
+
+    assert len(graph) == 4
+    assert "yes" in graph and "missing" not in graph
+    assert graph.action("no") is flow.actions[2]
+    assert graph.action("missing") is None
+    assert graph.successors("check") == ["yes", "no"]
+    assert graph.successors("check", "false") == ["no"]
+    assert graph.successors("yes", None) == ["done"]
+    assert graph.successors_by_handle("check") == {"true": ["yes"], "false": ["no"]}
+    assert graph.predecessors("done") == ["yes", "no"]
+    assert (graph.in_degree("done"), graph.out_degree("done")) == (2, 0)
+    assert graph.roots() == ["check"]
+    assert graph.leaves() == ["done"]
+
+
+def test_index_is_cached_until_flow_changes():
+    flow = make_flow()
+    graph = flow_graph(flow)
+    assert flow_graph(flow) is graph
+
+    flow.edges.append(Edge(id="e5", source="done", target="check"))
+    rebuilt = flow_graph(flow)
+    assert rebuilt is not graph
+    assert rebuilt.successors("done") == ["check"]
+
+    flow.edges = flow.edges[:4]
+    assert flow_graph(flow).successors("done") == []
+
+
+def test_in_place_edits_rebuild_the_index():
+    flow = make_flow()
+    graph = flow_graph(flow)
+    flow.edges[2] = Edge(id="e3", source="yes", target="no")
+    graph = flow_graph(flow)
+    assert graph.successors("yes") == ["no"]
+
+    flow.edges[3].target = "check"
+    graph = flow_graph(flow)
+    assert graph.successors("no") == ["check"]
+    assert graph.predecessors("done") == []
+
+    replacement = flow.actions[1].model_copy(update={"type": "navigate"})
+    flow.actions[1] = replacement
+    assert flow_graph(flow).action("yes") is replacement
+    assert flow_graph(flow) is flow_graph(flow)
+
+
+def test_explicit_invalidation():
+    flow = make_flow()
+    graph = flow_graph(flow)
+    invalidate_flow_graph(flow)
+    assert flow_graph(flow) is not graph
+
+
+def test_every_list_mutation_rebuilds_the_index():
+    flow = make_flow()
+    extra = Edge(id="e5", source="done", target="check")
+    edits = [
+        lambda edges: edges.append(extra),
+        lambda edges: edges.remove(extra),
+        lambda edges: edges.insert(0, extra),
+        lambda edges: edges.pop(0),
+        lambda edges: edges.extend([extra]),
+        lambda edges: edges.__delitem__(slice(4, None)),
+        lambda edges: edges.__iadd__([extra]),
+        lambda edges: edges.reverse(),
+        lambda edges: edges.sort(key=lambda edge: edge.id),
+        lambda edges: edges.__setitem__(slice(0, 1), []),
+        lambda edges: edges.clear(),
+    ]
+    for edit in edits:
+        graph = flow_graph(flow)
+        edit(flow.edges)
+        rebuilt = flow_graph(flow)
+        assert rebuilt is not graph
+        assert [e.target for e in flow.edges if e.source == "done"] == (
+            rebuilt.successors("done")
+        )
+
+
+def test_tracked_lists_serialize_like_plain_lists():
+    flow = make_flow()
+    expected = flow.model_dump_json()
+    flow_graph(flow)
+    assert flow.model_dump_json() == expected
+    assert flow == make_flow()
+    restored = pickle.loads(pickle.dumps(flow))
+    assert restored == flow and flow_graph(restored).roots() == ["check"]
+
+
+def test_edits_to_other_flows_only_cost_a_rebuild():
+    flow, other = make_flow(), make_flow()
+    graph = flow_graph(flow)
+    other.actions[0].id = "start"
+    assert flow_graph(flow) is not graph
+    assert flow_graph(flow).roots() == ["check"]
+    assert flow_graph(other).roots() == ["start"]
@@ -0,0 +1,184 @@
+"""Streaming HAR import."""
+
+import gc
+import io
+import json
+
+import pytest
+
+from floweb_models.har import HarError, har_entry_to_request, iter_har
+
+
+def entry(i: int, **overrides) -> dict:
+    data = {
+        "startedDateTime": "2024-01-15T10:30:00.000Z",
+        "time": 120.5,
+        "request": {
+            "method": "POST" if i % 2 else "GET",
+            "url": f"https://api.example.com/items/{i}?q=1",
+            "headers": [
+                {"name": ":authority", "value": "api.example.com"},
+                {"name": "Accept", "value": "application/json"},
+                {"name": "Cookie", "value": "a=1"},
+                {"name": "Cookie", "value": "b=2"},
+            ],
+            "postData": {"mimeType": "application/json", "text": '{"n": %d}' % i},
+        },
+        "response": {
+            "status": 200,
+            "statusText": "OK",
+            "headers": [{"name": "Content-Type", "value": "application/json"}],
+            "content": {"size": 13, "mimeType": "application/json", "text": "x" * i},
+            "bodySize": -1,
+        },
+        "timings": {
+            "blocked": 1,
+            "dns": 5,
+            "connect": 30,
+            "ssl": 20,
+            "send": 1,
+            "wait": 60,
+            "receive": 4,
+        },
+        "_resourceType": "xhr",
+        "_initiator": {"type": "script", "url": "https://app.example.com/main.js"},
+    }
+    data.update(overrides)
+    return data
+
+
+def har(entries: list, **log) -> str:
+    return json.dumps(
+        {
+            "log": {
+                "version": "1.2",
+                "creator": {"name": "test", "version": "1"},
+                "entries": entries,
+                "pages": [{"id": "page_1", "title": "after the entries"}],
+                **log,
+            }
+        },
+        indent=2,
+    )
+
+
+def test_entry_mapping():
+    request = har_entry_to_request(entry(3), "r3")
+    assert request.id == "r3"
+    assert request.method == "POST"
+    assert str(request.url) == "https://api.example.com/items/3?q=1"
+    assert request.headers == {"Accept": "application/json", "Cookie": "a=1; b=2"}
+    assert request.body == '{"n": 3}'
+    assert request.timestamp == 1705314600000.0
+    assert request.resourceType == "xhr"
+    assert request.initiator == "https://app.example.com/main.js"
+    response = request.response
+    assert (response.status, response.body, response.size) == (200, "xxx", 13)
+    timing = response.timing
+    assert (timing.dns, timing.tcp, timing.ssl) == (5, 10, 20)
+    assert (timing.ttfb, timing.download, timing.total) == (61, 4, 120.5)
+
+
+def test_unreplayable_entries_are_skipped():
+    assert (
+        har_entry_to_request(entry(0, request={"method": "GET", "url": "data:,x"}), "x")
+        is None
+    )
+    assert (
+        har_entry_to_request(
+            entry(0, request={"method": "CONNECT", "url": "https://x"}), "x"
+        )
+        is None
+    )
+
+
+def test_resource_type_falls_back_to_mime_type_and_base64_is_dropped():
+    data = entry(1, _resourceType=None)
+    data["response"]["content"] = {
+        "size": 4,
+        "mimeType": "image/png",
+        "text": "iVBO",
+        "encoding": "base64",
+    }
+    request = har_entry_to_request(data, "img")
+    assert request.resourceType == "image"
+    assert request.response.body is None
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1 << 16])
+def test_streamed_entries_match_whole_file_conversion(tmp_path, chunk_size):
+    entries = [entry(i) for i in range(40)]
+    entries[5] = entry(5, request={"method": "GET", "url": "blob:https://x/1"})
+    path = tmp_path / "big.har"
+    path.write_text(har(entries))
+
+    expected = [
+        har_entry_to_request(data, f"har-{i}") for i, data in enumerate(entries)
+    ]
+    streamed = list(iter_har(path, chunk_size=chunk_size))
+    assert streamed == [request for request in expected if request is not None]
+    assert len(streamed) == 39
+
+
+def test_binary_file_objects_and_body_cap():
+    data = ("﻿" + har([entry(i) for i in range(12)])).encode()
+    requests = list(iter_har(io.BytesIO(data), max_body_size=5, id_prefix="e"))
+    assert [r.id for r in requests][:2] == ["e0", "e1"]
+    assert requests[3].response.body == "xxx"
+    assert requests[10].response.body is None
+    assert all(r.body is None for r in requests)  # '{"n": i}' is over 5.
+
+
+def test_binary_streams_are_left_open():
+    stream = io.BytesIO(har([entry(i) for i in range(3)]).encode())
+    assert len(list(iter_har(stream))) == 3
+    gc.collect()
+    assert not stream.closed
+    stream = io.BytesIO(har([entry(i) for i in range(3)]).encode())
+    entries = iter_har(stream)
+    next(entries)
+    entries.close()
+    del entries
+    gc.collect()
+    assert not stream.closed
+
+
+def test_invalid_input():
+    with pytest.raises(HarError, match="no log.entries"):
+        list(iter_har(io.StringIO('{"log": {"version": "1.2"}}')))
+    with pytest.raises(HarError):
+        list(iter_har(io.StringIO('{"log": {"entries": [{"request": ')))
+    with pytest.raises(HarError, match="expected"):
+        list(iter_har(io.StringIO("[]")))
+
+
+def test_syntax_errors_fail_without_reading_the_rest():
+    document = har([entry(i) for i in range(2000)])
+    first = document.index('"request"')
+    broken = document[:first] + '"request": {,' + document[first + 11 :]
+    stream = io.StringIO(broken)
+    with pytest.raises(HarError, match="invalid JSON"):
+        list(iter_har(stream, chunk_size=4096))
+    assert stream.tell() <= 8192 < len(broken)
+
+
+def test_values_cut_off_by_the_buffer_are_read_on():
+    long_text = "y" * 10_000
+    entries = [entry(0), entry(1, response={"status": 200, "content": {}}), entry(2)]
+    entries[0]["request"]["url"] += "&s=" + "é" * 3 + "&t=true"
+    entries[2]["response"]["content"]["text"] = long_text
+    for chunk_size in (7, 64, 1000):
+        requests = list(iter_har(io.StringIO(har(entries)), chunk_size=chunk_size))
+        assert [r.id for r in requests] == ["har-0", "har-1", "har-2"]
+        assert requests[2].response.body == long_text
+
+
+def test_malformed_entries_are_skipped():
+    entries = [
+        entry(0, startedDateTime="yesterday"),
+        entry(1, response={"status": "not a number", "content": {}}),
+        entry(2, request={"method": "GET", "url": 7}),
+        "not an entry",
+        entry(4),
+    ]
+    assert [r.id for r in iter_har(io.StringIO(har(entries)))] == ["har-4"]
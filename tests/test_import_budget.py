@@ -0,0 +1,70 @@
+"""Import-time budget for every generated model module.
+
+Each module is imported in a fresh interpreter with pydantic already loaded,
+so the measured time is the cost of building that module's schemas. The
+import must also stay within the standard library and pydantic.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PYTHON_MODELS = Path(__file__).resolve().parent.parent / "python-models"
+
+MODULES = [
+    "flow",
+    "performance_test",
+    "action_configs",
+    "environment",
+    "parallel_execution",
+    "websocket_communication",
+    "execution_results",
+    "flow_validation",
+    "debug",
+]
+
+# Generous enough for slow CI machines; locally every module is well below 100ms.
+IMPORT_BUDGET_MS = 250.0
+
+ALLOWED_PACKAGES = {
+    "annotated_types",
+    "floweb_models",
+    "pydantic",
+    "pydantic_core",
+    "typing_extensions",
+    "typing_inspection",
+}
+
+_PROBE = """
+import json, sys, time
+from pydantic import AnyUrl, AwareDatetime, BaseModel, ConfigDict, Field
+before = set(sys.modules)
+t0 = time.perf_counter()
+import floweb_models.{module}
+elapsed = (time.perf_counter() - t0) * 1000.0
+print(json.dumps({{"ms": elapsed, "new": sorted(set(sys.modules) - before)}}))
+"""
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_import_within_budget(module):
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        env={"PYTHONPATH": str(PYTHON_MODELS)},
+    )
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout)
+
+    foreign = {
+        name.split(".")[0]
+        for name in result["new"]
+        if name.split(".")[0] not in sys.stdlib_module_names
+        and name.split(".")[0] not in ALLOWED_PACKAGES
+    }
+    assert not foreign, f"floweb_models.{module} imports {sorted(foreign)}"
+    assert result["ms"] < IMPORT_BUDGET_MS, f"{result['ms']:.1f}ms"
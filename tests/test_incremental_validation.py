@@ -0,0 +1,121 @@
+"""Incremental flow validation."""
+
+from floweb_models.flow import Action, Edge, Flow
+from floweb_models.flow_validation import Type
+from floweb_models.incremental_validation import (
+    FlowChange,
+    IncrementalFlowValidator,
+    validate_flow,
+)
+
+
+def action(action_id: str, action_type: str = "click", **config) -> dict:
+    config.setdefault("selector", f"#{action_id}")
+    return {
+        "id": action_id,
+        "type": action_type,
+        "position": {"x": 0, "y": 0},
+        "data": {"label": action_id.upper(), "type": action_type, "config": config},
+    }
+
+
+def edge(source: str, target: str) -> dict:
+    return {"id": f"{source}-{target}", "source": source, "target": target}
+
+
+def make_flow(actions, edges) -> Flow:
+    return Flow.model_validate(
+        {"id": "f", "name": "Flow", "actions": actions, "edges": edges}
+    )
+
+
+def types(result) -> list[tuple[str, str]]:
+    return sorted((w.type.value, w.nodeId) for w in result.warnings + result.errors)
+
+
+def test_clean_flow_is_valid():
+    result = validate_flow(make_flow([action("a"), action("b")], [edge("a", "b")]))
+    assert result.isValid
+    assert result.flowId == "f" and result.flowName == "Flow"
+    assert result.summary.totalNodes == 2 and result.summary.totalEdges == 1
+    assert result.summary.warningCount == result.summary.errorCount == 0
+    assert result.validationTime >= 0
+
+
+def test_initial_warnings():
+    flow = make_flow(
+        [action("a"), action("b", selector=""), action("b"), action("c")],
+        [edge("a", "b"), edge("b", "missing"), edge("c", "c")],
+    )
+    result = validate_flow(flow)
+    assert types(result) == [
+        ("circular-dependency", "c"),
+        ("duplicate-id", "b"),
+        ("invalid-reference", "b"),
+        ("missing-selector", "b"),
+        ("unreachable-node", "c"),
+    ]
+    assert not result.isValid
+    assert result.summary.warningCount == 1
+    assert result.summary.errorCount == result.summary.criticalCount == 4
+    assert result.summary.warningsByType == {
+        "duplicate-id": 1,
+        "invalid-reference": 1,
+        "missing-selector": 1,
+        "unreachable-node": 1,
+        "circular-dependency": 1,
+    }
+    assert result.summary.warningsBySeverity.critical == 4
+    assert result.summary.warningsBySeverity.medium == 1
+
+
+def test_changes_update_only_affected_warnings():
+    flow = make_flow([action("a"), action("b")], [edge("a", "b")])
+    validator = IncrementalFlowValidator(flow)
+
+    bad = Action.model_validate(action("b", selector=""))
+    result = validator.apply(FlowChange(updated_actions=[bad]))
+    assert types(result) == [("missing-selector", "b")]
+
+    fixed = Action.model_validate(action("b", selectors=["#b"], selector=""))
+    assert validator.apply(FlowChange(updated_actions=[fixed])).isValid
+
+    result = validator.apply(
+        FlowChange(added_actions=[Action.model_validate(action("c"))])
+    )
+    assert types(result) == [("unreachable-node", "c")]
+
+    result = validator.apply(
+        FlowChange(added_edges=[Edge.model_validate(edge("b", "c"))])
+    )
+    assert result.isValid and not result.warnings
+
+    result = validator.apply(FlowChange(removed_actions=["c"]))
+    assert types(result) == [("invalid-reference", "b")]
+    assert result.summary.totalNodes == 2
+
+    result = validator.apply(FlowChange(removed_edges=["b-c"]))
+    assert result.isValid
+    assert result.summary.totalEdges == 1
+
+
+def test_matches_full_validation_after_edits():
+    actions = [action(f"a{i}") for i in range(6)]
+    edges = [edge(f"a{i}", f"a{i + 1}") for i in range(5)]
+    validator = IncrementalFlowValidator(make_flow(actions, edges))
+    validator.apply(
+        FlowChange(
+            removed_edges=["a2-a3"],
+            added_edges=[Edge.model_validate(edge("a5", "a3"))],
+        )
+    )
+    incremental = validator.result()
+
+    full = validate_flow(
+        make_flow(
+            actions,
+            [e for e in edges if e["id"] != "a2-a3"] + [edge("a5", "a3")],
+        )
+    )
+    assert types(incremental) == types(full)
+    assert incremental.summary == full.summary
@@ -0,0 +1,62 @@
+"""Lazy export layer of the ``floweb_models`` package."""
+
+import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+import floweb_models
+
+PYTHON_MODELS = Path(__file__).resolve().parent.parent / "python-models"
+
+
+def _run(code: str) -> str:
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={"PYTHONPATH": str(PYTHON_MODELS)},
+    )
+    return proc.stdout.strip()
+
+
+def test_package_import_loads_no_model_modules():
+    out = _run(
+        "import sys, floweb_models\n"
+        "print(sorted(m for m in sys.modules if m.startswith('floweb_models.')))"
+    )
+    assert out == "[]"
+
+
+def test_symbol_access_imports_only_its_module():
+    out = _run(
+        "import sys\n"
+        "from floweb_models import Flow, ActionResult\n"
+        "print(sorted(m for m in sys.modules if m.startswith('floweb_models.')))"
+    )
+    assert out == "['floweb_models.execution_results', 'floweb_models.flow']"
+
+
+def test_lazy_symbol_is_the_defining_class():
+    from floweb_models.flow import Flow
+
+    assert floweb_models.Flow is Flow
+    assert "Flow" in dir(floweb_models)
+
+
+def test_unknown_attribute_raises():
+    try:
+        floweb_models.DoesNotExist
+    except AttributeError as exc:
+        assert "DoesNotExist" in str(exc)
+    else:
+        raise AssertionError("expected AttributeError")
+
+
+def test_every_export_resolves():
+    for name in floweb_models.__all__:
+        module = importlib.import_module(
+            f"floweb_models.{floweb_models._EXPORTS[name]}"
+        )
+        assert getattr(floweb_models, name) is getattr(module, name)
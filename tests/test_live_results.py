@@ -0,0 +1,133 @@
+"""Running results of an in-progress load test."""
+
+import pytest
+
+from floweb_models.aggregation import aggregate_executions
+from floweb_models.columnar import ExecutionColumns
+from floweb_models.live_results import LiveResultsAccumulator
+from floweb_models.performance_test import LoadTestThresholds, RequestExecution
+
+T0 = 1_700_000_000_000.0
+
+
+def executions(count: int, step: float = 50.0) -> list[RequestExecution]:
+    return [
+        RequestExecution(
+            timestamp=T0 + i * step,
+            statusCode=500 if i % 10 == 9 else 200,
+            responseTime=float(20 + i % 13),
+            size=100,
+            success=i % 10 != 9,
+        )
+        for i in range(count)
+    ]
+
+
+def make_live(**kwargs) -> LiveResultsAccumulator:
+    live = LiveResultsAccumulator("t1", start_time=T0, **kwargs)
+    live.add_request("r1", "https://example.com/a", "GET")
+    live.add_request("r2", "https://example.com/b", "POST")
+    return live
+
+
+def test_snapshot_matches_batch_aggregation():
+    events = executions(200)
+    live = make_live(recent_executions=5)
+    for i, execution in enumerate(events):
+        live.record("r1" if i % 2 else "r2", execution, bytes_sent=10)
+
+    snapshot = live.snapshot()
+    batch = aggregate_executions(
+        ExecutionColumns.from_executions(events), start=T0, bytes_sent=2000
+    )
+    assert snapshot.testId == "t1"
+    assert snapshot.duration == pytest.approx(9.95)
+    metrics = snapshot.metrics
+    assert metrics.totalRequests == batch.metrics.totalRequests == 200
+    assert metrics.failedRequests == batch.metrics.failedRequests == 20
+    assert metrics.throughput == pytest.approx(batch.metrics.throughput)
+    assert metrics.bandwidth == batch.metrics.bandwidth
+    assert metrics.responseTime.p99 == pytest.approx(
+        batch.metrics.responseTime.p99, rel=0.01
+    )
+    assert snapshot.timeline == batch.timeline
+
+    first, second = snapshot.requestResults
+    assert (first.requestId, second.requestId) == ("r1", "r2")
+    assert first.executions == events[1::2][-5:]
+    assert live.request_metrics("r2").totalRequests == 100
+
+
+def test_timeline_window_rolls_and_keeps_totals():
+    live = make_live(window=3)
+    for execution in executions(100, step=100.0):
+        live.record("r1", execution)
+    snapshot = live.snapshot()
+    assert [p.timestamp for p in snapshot.timeline] == [
+        T0 + 7000,
+        T0 + 8000,
+        T0 + 9000,
+    ]
+    assert snapshot.metrics.totalRequests == 100
+
+    # A long gap clears the window; late events outside it are dropped.
+    live.record("r1", executions(1)[0].model_copy(update={"timestamp": T0 + 60_000}))
+    live.record("r1", executions(1)[0])
+    timeline = live.snapshot().timeline
+    assert [p.timestamp for p in timeline] == [T0 + 60_000]
+    assert timeline[0].requestsPerSecond == 1.0
+
+
+def test_late_executions_land_in_the_timeline():
+    live = make_live(window=3)
+    template = executions(1)[0]
+    for offset in (1500, 900, 2100, 100, -3000):
+        live.record("r1", template.model_copy(update={"timestamp": T0 + offset}))
+    snapshot = live.snapshot()
+    # The last one is before the start, three buckets before the newest.
+    assert snapshot.metrics.totalRequests == 5
+    assert [p.timestamp for p in snapshot.timeline] == [T0, T0 + 1000, T0 + 2000]
+    assert [p.requestsPerSecond for p in snapshot.timeline] == [2.0, 1.0, 1.0]
+    assert sum(p.requestsPerSecond for p in snapshot.timeline) == 4
+
+
+def test_timeline_does_not_depend_on_arrival_order():
+    events = executions(100, step=200.0)
+    in_order, reversed_ = make_live(window=30), make_live(window=30)
+    for execution in events:
+        in_order.record("r1", execution)
+    for execution in reversed(events):
+        reversed_.record("r1", execution)
+    snapshot = reversed_.snapshot()
+    assert sum(p.requestsPerSecond for p in snapshot.timeline) == (
+        snapshot.metrics.totalRequests
+    )
+    assert snapshot.timeline == in_order.snapshot().timeline
+
+
+def test_thresholds():
+    live = make_live(
+        thresholds=LoadTestThresholds(
+            maxResponseTime=25, maxErrorRate=0.05, minThroughput=1
+        )
+    )
+    for execution in executions(100):
+        live.record("r1", execution)
+    snapshot = live.snapshot()
+    assert not snapshot.passed
+    assert len(snapshot.failureReasons) == 2
+
+    with pytest.raises(KeyError):
+        live.record("unknown", executions(1)[0])
+
+
+def test_ramp_up_does_not_fail_throughput():
+    live = make_live(
+        thresholds=LoadTestThresholds(
+            maxResponseTime=1000, maxErrorRate=1.0, minThroughput=100
+        ),
+        warmup_ms=30_000,
+    )
+    for execution in executions(100):
+        live.record("r1", execution)
+    assert live.snapshot().passed
@@ -0,0 +1,381 @@
+"""Load generation against an in-process HTTP server."""
+
+import asyncio
+import ssl
+
+import pytest
+
+from floweb_models.http_client import HttpClient, HttpError
+from floweb_models.live_results import LiveResultsAccumulator
+from floweb_models.load_engine import LoadEngine
+from floweb_models.performance_test import (
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+)
+
+
+class StandInServer:
+    """Keep-alive HTTP/1.1 server answering by path; records what it saw."""
+
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str, dict[str, str], bytes]] = []
+        self.connections = 0
+
+    async def __aenter__(self) -> "StandInServer":
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                method, target, _ = head.split(b"\r\n", 1)[0].decode().split(" ")
+                headers = dict(
+                    line.split(": ", 1)
+                    for line in head.decode().split("\r\n")[1:]
+                    if line
+                )
+                body = await reader.readexactly(int(headers.get("Content-Length", 0)))
+                self.requests.append((method, target, headers, body))
+                writer.write(self.respond(target))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def respond(target: str) -> bytes:
+        if target == "/fail":
+            return b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n"
+        if target == "/chunked":
+            return (
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+            )
+        return b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+def recorded(id_: str, path: str, method: str = "GET", body=None) -> RecordedRequest:
+    return RecordedRequest(
+        id=id_,
+        url=f"https://recorded.example.com{path}",
+        method=method,
+        headers={"Accept": "application/json", "Host": "recorded.example.com"},
+        body=body,
+        timestamp=0,
+        resourceType="fetch",
+    )
+
+
+REQUESTS = [
+    recorded("home", "/"),
+    recorded("submit", "/api/items?x=1", "POST", '{"a": 1}'),
+    recorded("broken", "/fail"),
+]
+
+
+def configuration(url: str, **kwargs) -> LoadTestConfiguration:
+    values = {
+        "targetUrl": url,
+        "duration": 1,
+        "virtualUsers": 2,
+        "includeRequests": ["home", "submit"],
+        "thresholds": LoadTestThresholds(
+            maxResponseTime=1000, maxErrorRate=0.5, minThroughput=10
+        ),
+    }
+    values.update(kwargs)
+    return LoadTestConfiguration(**values)
+
+
+def test_client_reuses_connections_and_reads_chunked_bodies():
+    async def main():
+        async with StandInServer() as server, HttpClient() as client:
+            first = await client.request("GET", server.url + "/chunked")
+            second = await client.request("GET", server.url + "/")
+            return server.connections, first, second
+
+    connections, first, second = asyncio.run(main())
+    assert connections == 1
+    assert first.body == b"hello world"
+    assert second.status == 200 and second.body == b"ok"
+    assert first.timing.tcp > 0
+    assert second.timing.dns == second.timing.tcp == second.timing.ssl == 0
+    assert second.timing.total == pytest.approx(
+        second.timing.ttfb + second.timing.download
+    )
+
+
+class ScriptedServer:
+    """Answers request ``n`` of each connection with ``script(conn, n)``.
+
+    ``None`` closes the connection instead of answering.
+    """
+
+    def __init__(self, script) -> None:
+        self.script = script
+        self.requests: list[tuple[int, int, str]] = []
+        self.closed_by_client = 0
+
+    async def __aenter__(self) -> "ScriptedServer":
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+        self.connections = 0
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer) -> None:
+        connection = self.connections
+        self.connections += 1
+        try:
+            for number in range(100):
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    self.closed_by_client += 1
+                    return
+                length = int(head.lower().partition(b"content-length: ")[2][:4] or 0)
+                await reader.readexactly(length)
+                self.requests.append((connection, number, head.split(b" ")[0].decode()))
+                response = self.script(connection, number)
+                if response is None:
+                    return
+                writer.write(response)
+                await writer.drain()
+                if b"Connection: close" in response:
+                    return
+        finally:
+            writer.close()
+
+
+OK = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+
+
+def first_request_only(connection, number):
+    # Keep-alive is promised, but a second request on a connection is dropped.
+    return OK if number == 0 else None
+
+
+@pytest.mark.parametrize("method, retried", [("GET", True), ("POST", False)])
+def test_only_idempotent_requests_are_retried_on_stale_connections(method, retried):
+    async def main():
+        async with ScriptedServer(first_request_only) as server:
+            async with HttpClient() as client:
+                await client.request(method, server.url, body=b"x")
+                try:
+                    response = await client.request(method, server.url, body=b"x")
+                except ConnectionError:
+                    response = None
+            return server.requests, response
+
+    requests, response = asyncio.run(main())
+    if retried:
+        assert response.body == b"ok"
+        assert [r[:2] for r in requests] == [(0, 0), (0, 1), (1, 0)]
+    else:
+        assert response is None
+        assert [r[:2] for r in requests] == [(0, 0), (0, 1)]
+
+
+def test_failures_after_the_headers_are_not_retried():
+    truncated = b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 10\r\n\r\nok"
+
+    async def main():
+        async with ScriptedServer(lambda c, n: OK if n == 0 else truncated) as server:
+            async with HttpClient() as client:
+                await client.request("GET", server.url)
+                with pytest.raises(asyncio.IncompleteReadError):
+                    await client.request("GET", server.url)
+            return server.requests
+
+    assert len(asyncio.run(main())) == 2
+
+
+def test_interim_responses_are_skipped():
+    interim = (
+        b"HTTP/1.1 100 Continue\r\n\r\n"
+        b"HTTP/1.1 103 Early Hints\r\nLink: </a.css>; rel=preload\r\n\r\n"
+    )
+
+    def script(connection, number):
+        body = b"%d" % number
+        return interim + b"HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\n" + body
+
+    async def main():
+        async with ScriptedServer(script) as server:
+            async with HttpClient() as client:
+                first = await client.request("GET", server.url)
+                second = await client.request("GET", server.url)
+            return server.connections, first, second
+
+    connections, first, second = asyncio.run(main())
+    assert connections == 1
+    assert (first.status, first.body, second.status, second.body) == (
+        200,
+        b"0",
+        200,
+        b"1",
+    )
+
+
+@pytest.mark.parametrize(
+    "response, error",
+    [(b"garbage\r\n\r\n", HttpError), (b"", TimeoutError)],
+)
+def test_failed_connections_are_closed(response, error):
+    # ``b""`` never answers, so the request times out.
+    async def main():
+        async with ScriptedServer(lambda c, n: response) as server:
+            async with HttpClient(timeout=0.2) as client:
+                with pytest.raises(error):
+                    await client.request("GET", server.url)
+                assert not client._idle
+            await asyncio.sleep(0.05)
+            return server.closed_by_client
+
+    assert asyncio.run(main()) == 1
+
+
+def test_tls_context_is_created_once_per_client(monkeypatch):
+    created = []
+
+    def create_default_context():
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        created.append(context)
+        return context
+
+    monkeypatch.setattr(ssl, "create_default_context", create_default_context)
+
+    async def main():
+        # A plain-text server: every handshake fails or stalls.
+        async with ScriptedServer(lambda c, n: OK) as server:
+            url = server.url.replace("http:", "https:")
+            async with HttpClient(timeout=0.2) as client:
+                for _ in range(2):
+                    with pytest.raises((ssl.SSLError, OSError)):
+                        await client.request("GET", url)
+
+    asyncio.run(main())
+    assert len(created) == 1
+
+
+def test_engine_replays_selected_requests_against_target():
+    async def main():
+        async with StandInServer() as server:
+            config = configuration(
+                server.url,
+                thinkTime=10,
+                authConfig={"header_override": {"Authorization": "Bearer t"}},
+            )
+            engine = LoadEngine(config, REQUESTS, duration=0.3)
+            events = [event async for event in engine.stream()]
+            return server, events
+
+    server, events = asyncio.run(main())
+    assert events
+    assert len(server.requests) == len(events)
+    assert {event.request_id for event in events} == {"home", "submit"}
+    assert {event.user for event in events} == {0, 1}
+    assert all(event.execution.success for event in events)
+    assert server.connections == 2  # One keep-alive connection per user.
+
+    method, target, headers, body = next(
+        request for request in server.requests if request[0] == "POST"
+    )
+    assert target == "/api/items?x=1"
+    assert body == b'{"a": 1}'
+    assert headers["Host"] == f"127.0.0.1:{server.port}"
+    assert headers["Authorization"] == "Bearer t"
+    assert headers["Accept"] == "application/json"
+
+
+def test_paced_run_reports_achieved_vs_target_rate():
+    async def main():
+        async with StandInServer() as server:
+            engine = LoadEngine(
+                configuration(server.url), REQUESTS, target_rps=40, duration=0.5
+            )
+            return await engine.run()
+
+    report = asyncio.run(main())
+    assert report.target_rps == 40
+    assert report.failed_requests == 0
+    assert report.achieved_rps == pytest.approx(40, rel=0.25)
+    assert report.rps_ratio == pytest.approx(report.achieved_rps / 40)
+    assert not report.aborted
+
+
+def test_linear_ramp_up():
+    config = configuration("http://localhost", virtualUsers=4, rampUpTime=8)
+    engine = LoadEngine(config, REQUESTS)
+    assert [engine.start_offset(user) for user in range(4)] == [0, 2, 4, 6]
+    assert [engine.active_users(t) for t in (-1, 0, 1.9, 2, 7, 8)] == [
+        0,
+        1,
+        1,
+        2,
+        4,
+        4,
+    ]
+
+
+def test_failures_feed_live_results_and_abort():
+    async def main():
+        async with StandInServer() as server:
+            config = configuration(
+                server.url,
+                includeRequests=["broken"],
+                thresholds=LoadTestThresholds(
+                    maxResponseTime=1000, maxErrorRate=0.1, minThroughput=0
+                ),
+            )
+            live = LiveResultsAccumulator("t1", thresholds=config.thresholds)
+            live.evaluator.step_ms = 50
+            engine = LoadEngine(config, REQUESTS, accumulator=live, duration=5)
+            return await engine.run(), live.snapshot()
+
+    report, snapshot = asyncio.run(main())
+    assert report.aborted
+    assert report.duration < 5
+    assert report.failed_requests == report.total_requests > 0
+    assert snapshot.metrics.failedRequests == report.total_requests
+    assert snapshot.requestResults[0].executions[-1].error == (
+        "HTTP 503 Service Unavailable"
+    )
+    assert not snapshot.passed
+
+
+def test_connection_errors_are_recorded():
+    async def main():
+        async with StandInServer() as server:
+            url = server.url
+        engine = LoadEngine(configuration(url, virtualUsers=1), REQUESTS, duration=0.1)
+        return [event async for event in engine.stream()]
+
+    events = asyncio.run(main())
+    assert events
+    assert all(
+        event.execution.statusCode == 0 and event.execution.error for event in events
+    )
+
+
+def test_unknown_requests_are_rejected():
+    with pytest.raises(ValueError, match="missing"):
+        LoadEngine(configuration("http://localhost", includeRequests=["missing"]), [])
@@ -0,0 +1,98 @@
+"""Cycle detection producing LoopDetectionResult."""
+
+from floweb_models.flow import Flow
+from floweb_models.flow_validation import WarningSeverity
+from floweb_models.graph import flow_graph
+from floweb_models.loop_detection import detect_loops, strongly_connected_components
+
+
+def make_flow(actions, edges) -> Flow:
+    return Flow.model_validate(
+        {
+            "id": "f",
+            "name": "f",
+            "actions": [
+                {
+                    "id": action_id,
+                    "type": action_type,
+                    "position": {"x": 0, "y": 0},
+                    "data": {"label": action_id, "type": action_type, "config": config},
+                }
+                for action_id, action_type, config in actions
+            ],
+            "edges": [
+                {"id": f"e{i}", "source": source, "target": target}
+                for i, (source, target) in enumerate(edges)
+            ],
+        }
+    )
+
+
+def test_acyclic_flow_has_no_loops():
+    flow = make_flow(
+        [("a", "click", {}), ("b", "click", {}), ("c", "click", {})],
+        [("a", "b"), ("b", "c"), ("a", "c")],
+    )
+    result = detect_loops(flow)
+    assert not result.hasLoops
+    assert result.loops == []
+    assert (result.totalLoops, result.infiniteLoops) == (0, 0)
+
+
+def test_cycle_without_exit_is_infinite():
+    flow = make_flow(
+        [("a", "click", {}), ("b", "click", {}), ("c", "click", {})],
+        [("a", "b"), ("b", "c"), ("c", "b")],
+    )
+    (loop,) = detect_loops(flow).loops
+    assert loop.nodes == ["b", "c"]
+    assert not loop.hasExitCondition
+    assert loop.isInfinite
+    assert loop.severity == WarningSeverity.critical
+
+
+def test_conditional_leaving_cycle_is_exit():
+    flow = make_flow(
+        [
+            ("a", "click", {}),
+            ("check", "conditional", {"condition": "x", "operator": "", "value": 1}),
+            ("done", "click", {}),
+        ],
+        [("a", "check"), ("check", "a"), ("check", "done")],
+    )
+    (loop,) = detect_loops(flow).loops
+    assert loop.hasExitCondition
+    assert not loop.isInfinite
+    assert loop.maxIterations is None
+    assert loop.severity == WarningSeverity.medium
+
+
+def test_loop_action_bounds_iterations():
+    flow = make_flow(
+        [
+            ("repeat", "loop", {"loopType": "condition", "maxIterations": 7}),
+            ("step", "click", {}),
+            ("once", "loop", {"loopType": "count", "count": 3}),
+        ],
+        [("repeat", "step"), ("step", "repeat"), ("once", "once")],
+    )
+    result = detect_loops(flow)
+    assert [loop.nodes for loop in result.loops] == [["repeat", "step"], ["once"]]
+    assert [loop.maxIterations for loop in result.loops] == [7, 3]
+    assert result.infiniteLoops == 0
+
+    unbounded = make_flow(
+        [("repeat", "loop", {"loopType": "condition", "maxIterations": None})],
+        [("repeat", "repeat")],
+    )
+    assert detect_loops(unbounded).loops[0].isInfinite
+
+
+def test_long_chain_does_not_recurse():
+    n = 20_000
+    flow = make_flow(
+        [(f"a{i}", "click", {}) for i in range(n)],
+        [(f"a{i}", f"a{i + 1}") for i in range(n - 1)] + [(f"a{n - 1}", "a0")],
+    )
+    components = strongly_connected_components(flow_graph(flow))
+    assert len(components) == 1 and len(components[0]) == n
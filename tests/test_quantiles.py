@@ -0,0 +1,86 @@
+"""Streaming quantile sketch for response times."""
+
+import math
+import random
+
+import pytest
+
+from floweb_models.quantiles import QuantileSketch
+
+
+def exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+@pytest.fixture
+def latencies() -> list[float]:
+    rng = random.Random(7)
+    return [rng.lognormvariate(4, 1.2) for _ in range(50_000)] + [0.0] * 100
+
+
+def test_quantiles_within_relative_error(latencies):
+    sketch = QuantileSketch(alpha=0.01)
+    sketch.update(latencies)
+    for q in (0, 0.001, 0.25, 0.5, 0.9, 0.95, 0.99, 0.999, 1):
+        expected = exact(latencies, q)
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.01, abs=1e-9)
+
+
+def test_to_metrics_has_exact_extremes_and_mean(latencies):
+    sketch = QuantileSketch()
+    for value in latencies:
+        sketch.add(value)
+    metrics = sketch.to_metrics()
+    assert metrics.min == min(latencies)
+    assert metrics.max == max(latencies)
+    assert metrics.mean == pytest.approx(sum(latencies) / len(latencies))
+    assert metrics.median == pytest.approx(exact(latencies, 0.5), rel=0.01)
+    assert metrics.p99 == pytest.approx(exact(latencies, 0.99), rel=0.01)
+    assert metrics.median <= metrics.p90 <= metrics.p95 <= metrics.p99
+
+
+def test_merge_matches_single_sketch(latencies):
+    whole = QuantileSketch()
+    whole.update(latencies)
+    merged = QuantileSketch()
+    for start in range(0, len(latencies), 7_000):
+        part = QuantileSketch()
+        part.update(latencies[start : start + 7_000])
+        merged.merge(part)
+    for q in (0.5, 0.9, 0.99):
+        assert merged.quantile(q) == whole.quantile(q)
+    assert merged.count == whole.count
+    assert merged.sum == pytest.approx(whole.sum)
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(alpha=0.05))
+
+
+def test_bytes_round_trip(latencies):
+    sketch = QuantileSketch(alpha=0.02)
+    sketch.update(latencies)
+    data = sketch.to_bytes()
+    assert len(data) < 5_000
+    restored = QuantileSketch.from_bytes(data)
+    assert restored.alpha == 0.02
+    assert restored.to_metrics() == sketch.to_metrics()
+    with pytest.raises(ValueError):
+        QuantileSketch.from_bytes(b"XXXX" + data[4:])
+
+
+def test_empty_and_invalid_values():
+    sketch = QuantileSketch()
+    assert sketch.to_metrics().p99 == 0.0
+    with pytest.raises(ValueError):
+        sketch.quantile(0.5)
+    with pytest.raises(ValueError):
+        sketch.add(-1.0)
+    with pytest.raises(ValueError):
+        sketch.add(math.nan)
+
+
+def test_bucket_limit_keeps_high_quantiles(latencies):
+    sketch = QuantileSketch(alpha=0.01, max_buckets=100)
+    sketch.update(latencies)
+    assert len(sketch._buckets) <= 100
+    assert sketch.quantile(0.99) == pytest.approx(exact(latencies, 0.99), rel=0.01)
@@ -0,0 +1,241 @@
+"""Grouping of near-identical recorded requests."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from floweb_models.load_engine import LoadEngine
+from floweb_models.performance_test import (
+    LoadTestThresholds,
+    PerformanceTest,
+    RecordedRequest,
+)
+from floweb_models.request_groups import (
+    deduplicate_test,
+    group_requests,
+    group_variables,
+)
+from floweb_models.templates import Template
+
+EXAMPLE = (
+    Path(__file__).resolve().parent.parent
+    / "examples"
+    / "performance-test-example.json"
+)
+
+
+def recorded(id_, url, method="GET", body=None, **headers):
+    return RecordedRequest(
+        id=id_,
+        url=url,
+        method=method,
+        headers={"Accept": "application/json", **headers},
+        body=body,
+        timestamp=0,
+        resourceType="fetch",
+    )
+
+
+def test_id_segments_and_varying_query_values_become_placeholders():
+    requests = [
+        recorded("a", "https://api.x.com/items/17?page=1&size=20"),
+        recorded("b", "https://api.x.com/items/18?page=2&size=20"),
+        recorded("c", "https://api.x.com/items/17?page=3&size=20"),
+        recorded("d", "https://api.x.com/items/17/comments"),
+    ]
+    items, comments = group_requests(requests)
+    assert items.members == ("a", "b", "c") and items.weight == 3
+    assert items.request.id == "a"
+    template = Template(str(items.request.url), url=True)
+    assert template.names == {"a.path_2", "a.query_page"}
+    assert items.values[1] == {"a.path_2": "18", "a.query_page": "2"}
+    assert [template.render(row) for row in items.values] == [
+        str(request.url) for request in requests[:3]
+    ]
+    assert comments.members == ("d",) and comments.values == ()
+    assert comments.request is requests[3]
+
+
+def test_identical_requests_keep_their_url():
+    polls = [recorded(str(i), "https://api.x.com/status?x=a b") for i in range(5)]
+    (group,) = group_requests(polls)
+    assert group.weight == 5
+    assert group.request.url == polls[0].url and group.values == ()
+
+
+def test_signature_covers_method_headers_and_body_shape():
+    url = "https://api.x.com/orders"
+    requests = [
+        recorded("a", url, "POST", '{"sku": "A", "qty": 1}'),
+        recorded("b", url, "POST", '{"qty": 5, "sku": "B"}'),
+        recorded("c", url, "POST", '{"sku": "A", "qty": "1"}'),
+        recorded("d", url, "POST", '{"sku": "A", "qty": 1}', Accept="text/html"),
+        recorded("e", url, "PUT", '{"sku": "A", "qty": 1}'),
+        recorded(
+            "f",
+            url,
+            "POST",
+            "a=1&b=2",
+            **{"Content-Type": "application/x-www-form-urlencoded"},
+        ),
+        recorded(
+            "g",
+            url,
+            "POST",
+            "b=3&a=4",
+            **{"content-type": "application/x-www-form-urlencoded"},
+        ),
+    ]
+    groups = group_requests(requests)
+    assert [group.members for group in groups] == [
+        ("a", "b"),
+        ("c",),
+        ("d",),
+        ("e",),
+        ("f", "g"),
+    ]
+    assert [group.weight for group in group_requests(requests, headers=())] == [
+        3,
+        1,
+        1,
+        2,
+    ]
+
+
+def test_uuid_and_token_segments():
+    requests = [
+        recorded("a", "https://x.com/u/3f2b8c1e-0d4a-4b6e-9f1a-2c3d4e5f6a7b/avatar"),
+        recorded("b", "https://x.com/u/9a8b7c6d-5e4f-4a3b-8c2d-1e0f9a8b7c6d/avatar"),
+        recorded("c", "https://x.com/u/settings/avatar"),
+    ]
+    assert [group.weight for group in group_requests(requests)] == [2, 1]
+
+
+def test_deduplicate_test_rewrites_include_requests():
+    data = json.loads(EXAMPLE.read_text())
+    first = data["recordedRequests"][0]
+    extra = []
+    for n in range(3):
+        copy = dict(first, id=f"poll-{n}")
+        extra.append(copy)
+    data["recordedRequests"] += extra
+    data["loadTestConfig"]["includeRequests"] += ["poll-2", "poll-0"]
+    test = PerformanceTest.model_validate(data)
+
+    deduplicated, groups = deduplicate_test(test)
+    assert len(deduplicated.recordedRequests) == len(groups)
+    assert len(groups) == len(test.recordedRequests) - 3
+    assert groups[0].members == (first["id"], "poll-0", "poll-1", "poll-2")
+    included = deduplicated.loadTestConfig.includeRequests
+    assert len(included) == len(set(included))
+    ids = {request.id for request in deduplicated.recordedRequests}
+    assert set(included) <= ids
+    assert test.loadTestConfig.includeRequests[-1] == "poll-0"  # Not modified.
+
+
+def test_deduplicated_groups_replay_with_their_values():
+    seen = []
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                seen.append(head.split(b" ")[1].decode())
+                writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    requests = [
+        recorded("items-1", "https://api.x.com/items/17?q=a%20b"),
+        recorded("items-2", "https://api.x.com/items/18?q=c%26d"),
+        recorded("users-1", "https://api.x.com/users/5/x"),
+        recorded("users-2", "https://api.x.com/users/6/x"),
+        recorded("users-3", "https://api.x.com/users/7/x"),
+    ]
+    items, users = group_requests(requests)
+    assert items.values[0].keys().isdisjoint(users.values[0].keys())
+    rows = group_variables([items, users])
+    assert len(rows) == 3
+    assert rows[2] == {
+        "items-1.path_2": "17",
+        "items-1.query_q": "a b",
+        "users-1.path_2": "7",
+    }
+
+    async def replay(test, recorded_requests, variables):
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        config = test.loadTestConfig.model_copy(
+            update={
+                "targetUrl": f"http://127.0.0.1:{port}",
+                "virtualUsers": 3,
+                "thinkTime": 20,
+                "rampUpTime": 0,
+                "authConfig": None,
+                "thresholds": LoadTestThresholds(
+                    maxResponseTime=1000, maxErrorRate=0, minThroughput=0
+                ),
+            }
+        )
+        engine = LoadEngine(
+            config, recorded_requests, duration=0.1, variables=variables
+        )
+        await engine.run()
+        server.close()
+
+    data = json.loads(EXAMPLE.read_text())
+    data["recordedRequests"] = [r.model_dump(mode="json") for r in requests]
+    data["loadTestConfig"]["includeRequests"] = [r.id for r in requests]
+    test = PerformanceTest.model_validate(data)
+    deduplicated, groups = deduplicate_test(test)
+    assert deduplicated.loadTestConfig.includeRequests == ["items-1", "users-1"]
+
+    # As is, the deduplicated test replays each group's first request.
+    asyncio.run(replay(deduplicated, deduplicated.recordedRequests, None))
+    assert set(seen) == {"/items/17?q=a%20b", "/users/5/x"}
+
+    # With the values, the group requests replay every member.
+    seen.clear()
+    parameterized = [group.request for group in groups]
+    asyncio.run(replay(deduplicated, parameterized, group_variables(groups)))
+    assert set(seen) == {
+        "/items/17?q=a%20b",
+        "/items/18?q=c%26d",
+        "/users/5/x",
+        "/users/6/x",
+        "/users/7/x",
+    }
+
+
+def test_body_values_that_differ_become_placeholders():
+    form = {"Content-Type": "application/x-www-form-urlencoded"}
+    requests = [
+        recorded("o1", "https://x.com/orders", "POST", '{"sku": "A", "qty": 1}'),
+        recorded("o2", "https://x.com/orders", "POST", '{"qty": 2, "sku": "A"}'),
+        recorded(
+            "o3", "https://x.com/orders", "POST", '{"sku": "B \\"x\\"", "qty": 3}'
+        ),
+        recorded("l1", "https://x.com/lists", "POST", '{"ids": [1, 2], "n": 0}'),
+        recorded("l2", "https://x.com/lists", "POST", '{"ids": [3], "n": 0}'),
+        recorded("f1", "https://x.com/login", "POST", "u=a+b&p=1", **form),
+        recorded("f2", "https://x.com/login", "POST", "u=c%26d&p=1", **form),
+        recorded("f3", "https://x.com/login", "POST", "p=1&u=e", **form),
+    ]
+    orders, lists, login = group_requests(requests)
+    assert orders.request.url == requests[0].url
+    assert Template(orders.request.body).names == {"o1.body.sku", "o1.body.qty"}
+    assert lists.values[1] == {"l1.body.ids": "[3]"}
+    assert login.values[0] == {"f1.body": "u=a+b&p=1"}
+    for group, members in ((orders, requests[:3]), (lists, requests[3:5])):
+        template = Template(group.request.body)
+        assert [json.loads(template.render(row)) for row in group.values] == [
+            json.loads(member.body) for member in members
+        ]
+
+    login = group_requests(requests[5:7])[0]
+    assert login.values == ({"f1.body_u": "a+b"}, {"f1.body_u": "c%26d"})
+    template = Template(login.request.body)
+    assert [template.render(row) for row in login.values] == [
+        "u=a+b&p=1",
+        "u=c%26d&p=1",
+    ]
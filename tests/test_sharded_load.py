@@ -0,0 +1,156 @@
+"""Load tests sharded across processes, and merging their partial results."""
+
+import asyncio
+import pickle
+import threading
+
+import pytest
+
+from floweb_models.performance_test import (
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+    RequestExecution,
+)
+from floweb_models.sharded_load import (
+    PartialResults,
+    run_sharded_load_test,
+    shard_users,
+)
+
+T0 = 1_700_000_000_000.0
+
+REQUESTS = [
+    RecordedRequest(
+        id=id_,
+        url=f"https://recorded.example.com{path}",
+        method="GET",
+        headers={},
+        timestamp=0,
+        resourceType="fetch",
+    )
+    for id_, path in (("a", "/a"), ("b", "/fail"))
+]
+
+
+def configuration(url: str, **kwargs) -> LoadTestConfiguration:
+    values = {
+        "targetUrl": url,
+        "duration": 1,
+        "virtualUsers": 4,
+        "rampUpTime": 1,
+        "thinkTime": 20,
+        "includeRequests": ["a", "b"],
+        "thresholds": LoadTestThresholds(
+            maxResponseTime=1000, maxErrorRate=0.1, minThroughput=0
+        ),
+    }
+    values.update(kwargs)
+    return LoadTestConfiguration(**values)
+
+
+def execution(i: int) -> RequestExecution:
+    return RequestExecution(
+        timestamp=T0 + i * 7,
+        statusCode=200 if i % 5 else 500,
+        responseTime=float(10 + i % 17),
+        size=50,
+        success=bool(i % 5),
+    )
+
+
+def test_shard_users_round_robin():
+    assert shard_users(5, 2) == [range(0, 5, 2), range(1, 5, 2)]
+    assert [list(shard) for shard in shard_users(2, 4)] == [[0], [1]]
+
+
+def test_merged_partials_match_a_single_partial():
+    whole = PartialResults(T0, keep=3)
+    parts = [PartialResults(T0, keep=3) for _ in range(3)]
+    for i in range(600):
+        request_id = "a" if i % 2 else "b"
+        whole.record(request_id, execution(i), bytes_sent=20)
+        parts[i % 3].record(request_id, execution(i), bytes_sent=20)
+
+    merged = PartialResults(T0, keep=3)
+    for part in parts:
+        merged.merge(pickle.loads(pickle.dumps(part)))
+
+    config = configuration("http://localhost")
+    end = T0 + 600 * 7
+    expected = whole.to_results("t", config, REQUESTS, end_time=end)
+    results = merged.to_results("t", config, REQUESTS, end_time=end)
+    assert results.metrics.totalRequests == 600
+    assert results.metrics.errorRate == pytest.approx(0.2)
+    assert results.metrics == expected.metrics
+    assert results.timeline == expected.timeline
+    assert results.requestResults == expected.requestResults
+    assert len(results.requestResults[0].executions) == 3
+    assert results.failureReasons == ["error rate 20.00% exceeds 10.00%"]
+
+
+def test_merge_rejects_different_time_bases():
+    with pytest.raises(ValueError):
+        PartialResults(T0).merge(PartialResults(T0 + 1))
+
+
+class ThreadedServer:
+    """Stand-in HTTP server on its own thread, so worker processes can reach
+    it while the test blocks in :func:`run_sharded_load_test`."""
+
+    def __enter__(self) -> str:
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        async def handle(reader, writer):
+            try:
+                while True:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    status = b"500 Oops" if b" /fail " in head else b"200 OK"
+                    writer.write(
+                        b"HTTP/1.1 " + status + b"\r\nContent-Length: 1\r\n\r\nx"
+                    )
+            except (asyncio.IncompleteReadError, ConnectionError):
+                writer.close()
+
+        async def serve():
+            self.server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            ready.set()
+
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(serve(), self.loop)
+        ready.wait(5)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    def __exit__(self, *exc_info) -> None:
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+def test_sharded_run_merges_worker_results():
+    updates = []
+    with ThreadedServer() as url:
+        results = run_sharded_load_test(
+            configuration(url),
+            REQUESTS,
+            test_id="sharded",
+            workers=2,
+            flush_interval=0.2,
+            on_update=lambda partial: updates.append(
+                sum(request.count for request in partial.requests.values())
+            ),
+        )
+
+    metrics = results.metrics
+    assert results.testId == "sharded"
+    assert metrics.totalRequests > 20
+    assert metrics.failedRequests == pytest.approx(metrics.totalRequests / 2, abs=4)
+    assert updates[-1] == metrics.totalRequests
+    assert len(updates) > 2
+    assert [r.requestId for r in results.requestResults] == ["a", "b"]
+    assert results.requestResults[1].executions[-1].statusCode == 500
+    assert results.timeline[0].activeUsers == 1
+    assert not results.passed
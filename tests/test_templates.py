@@ -0,0 +1,144 @@
+"""Compiled request templates."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from floweb_models.load_engine import LoadEngine
+from floweb_models.performance_test import (
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    PerformanceTest,
+    RecordedRequest,
+)
+from floweb_models.templates import RequestTemplate, Template
+
+EXAMPLE = (
+    Path(__file__).resolve().parent.parent
+    / "examples"
+    / "performance-test-example.json"
+)
+
+
+def test_render_fills_slots():
+    template = Template('{"email":"{{email}}","password":"{{ password }}"} {{email}}')
+    assert template.names == {"email", "password"}
+    assert not template.static
+    assert (
+        template.render({"email": "a@b.c", "password": "pw"})
+        == '{"email":"a@b.c","password":"pw"} a@b.c'
+    )
+
+
+def test_static_and_missing_values():
+    assert Template("no slots {x}").static
+    assert Template("no slots {x}").render({}) == "no slots {x}"
+    assert Template("{{a}}").render({"a": "1"}) == "1"
+    with pytest.raises(KeyError):
+        Template("x {{a}}").render({})
+
+
+def test_url_templates_accept_percent_encoded_placeholders():
+    template = Template("/u/%7B%7Bid%7D%7D?q={{%20q%20}}", url=True)
+    assert template.render({"id": "7", "q": "x"}) == "/u/7?q=x"
+
+
+def test_url_values_are_encoded_per_component():
+    template = Template("https://h.example/u/{{id}}?q={{q}}&n=1#{{f}}", url=True)
+    assert (
+        template.render({"id": "a b/c?", "q": "x&y=z+1 #", "f": "s p?/&"})
+        == "https://h.example/u/a%20b%2Fc%3F?q=x%26y%3Dz%2B1%20%23&n=1#s%20p?/&"
+    )
+
+
+def test_line_breaks_in_header_values_are_rejected():
+    head = Template("GET /u/{{id}} HTTP/1.1\r\nX-User: {{id}}\r\n", url=True)
+    assert head.render({"id": "a b"}) == "GET /u/a%20b HTTP/1.1\r\nX-User: a b\r\n"
+    with pytest.raises(ValueError, match="line break"):
+        head.render({"id": "a\r\nX-Injected: 1"})
+    request = RecordedRequest(
+        id="r",
+        url="https://recorded.example.com/",
+        method="GET",
+        headers={"Authorization": "Bearer {{token}}"},
+        timestamp=0,
+        resourceType="fetch",
+    )
+    with pytest.raises(ValueError, match="line break"):
+        RequestTemplate(request).render({"token": "t\nX-Injected: 1"})
+
+
+def test_request_template_from_example():
+    test = PerformanceTest.model_validate_json(EXAMPLE.read_text())
+    login, profile = (RequestTemplate(r) for r in test.recordedRequests)
+    assert login.names == {"email", "password"}
+    assert profile.names == {"authToken"}
+    url, headers, body = login.render({"email": "e", "password": "p"})
+    assert json.loads(body) == {"email": "e", "password": "p"}
+    assert url == str(test.recordedRequests[0].url)
+    _, headers, body = profile.render({"authToken": "tok"})
+    assert headers["Authorization"] == "Bearer tok"
+    assert body is None
+
+
+def test_engine_renders_requests_per_user():
+    seen = []
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                length = next(
+                    int(line.split(": ")[1])
+                    for line in lines
+                    if line.startswith("Content-Length")
+                )
+                body = await reader.readexactly(length)
+                seen.append((lines[0], json.loads(body)))
+                writer.write(b"HTTP/1.1 204 No Content\r\n\r\n")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        config = LoadTestConfiguration(
+            targetUrl=f"http://127.0.0.1:{port}",
+            duration=1,
+            virtualUsers=3,
+            thinkTime=20,
+            includeRequests=["login"],
+            thresholds=LoadTestThresholds(
+                maxResponseTime=1000, maxErrorRate=0, minThroughput=0
+            ),
+        )
+        request = RecordedRequest(
+            id="login",
+            url="https://recorded.example.com/users/{{user}}/login",
+            method="POST",
+            headers={"Content-Type": "application/json"},
+            body='{"email":"{{email}}"}',
+            timestamp=0,
+            resourceType="fetch",
+        )
+        rows = [
+            {"user": "u1", "email": "first@example.com"},
+            {"user": "u2", "email": "a.much.longer.address@example.com"},
+        ]
+        with pytest.raises(ValueError, match="row 1 lacks"):
+            LoadEngine(config, [request], variables=[rows[0], {"user": "x"}])
+        await LoadEngine(config, [request], duration=0.1, variables=rows).run()
+        server.close()
+
+    asyncio.run(main())
+    assert {line for line, _ in seen} == {
+        "POST /users/u1/login HTTP/1.1",
+        "POST /users/u2/login HTTP/1.1",
+    }
+    assert {body["email"] for _, body in seen} == {
+        "first@example.com",
+        "a.much.longer.address@example.com",
+    }
@@ -0,0 +1,115 @@
+"""Streaming threshold evaluation with early abort."""
+
+import random
+
+import pytest
+
+from floweb_models.performance_test import (
+    AggregateMetrics,
+    BandwidthMetrics,
+    LoadTestThresholds,
+    ResponseTimeMetrics,
+)
+from floweb_models.thresholds import ThresholdEvaluator, poisson_upper, wilson_lower
+
+T0 = 1_700_000_000_000.0
+THRESHOLDS = LoadTestThresholds(
+    maxResponseTime=500, maxErrorRate=0.05, minThroughput=10
+)
+
+
+def feed(evaluator, seconds, rps, error_rate=0.0, slow_rate=0.0, seed=1):
+    rng = random.Random(seed)
+    for i in range(int(seconds * rps)):
+        evaluator.observe(
+            T0 + i * 1000 / rps,
+            900.0 if rng.random() < slow_rate else 100.0,
+            rng.random() >= error_rate,
+        )
+
+
+def test_bounds():
+    assert wilson_lower(0, 0, 2.33) == 0.0
+    assert wilson_lower(50, 100, 1.96) == pytest.approx(0.4038, abs=1e-3)
+    assert poisson_upper(100, 2.33) > 100
+
+
+def test_healthy_run_is_not_aborted():
+    evaluator = ThresholdEvaluator(THRESHOLDS, start_time=T0)
+    feed(evaluator, 60, 50, error_rate=0.01, slow_rate=0.01)
+    assert not evaluator.evaluate(T0 + 60_000)
+    assert evaluator.failure_reasons == []
+
+
+def test_borderline_error_rate_is_not_certain():
+    evaluator = ThresholdEvaluator(THRESHOLDS, start_time=T0)
+    feed(evaluator, 20, 20, error_rate=0.06)
+    assert not evaluator.abort.is_set()
+
+
+def test_error_storm_aborts_quickly():
+    evaluator = ThresholdEvaluator(THRESHOLDS, start_time=T0)
+    feed(evaluator, 3, 100, error_rate=0.4)
+    assert evaluator.abort.is_set()
+    (reason,) = evaluator.failure_reasons
+    assert reason.startswith("error rate")
+
+
+def test_slow_responses_breach_p95():
+    evaluator = ThresholdEvaluator(THRESHOLDS, start_time=T0)
+    feed(evaluator, 5, 100, slow_rate=0.3)
+    assert evaluator.abort.is_set()
+    assert "p95" in evaluator.failure_reasons[0]
+
+
+def test_throughput_collapse_after_warmup():
+    evaluator = ThresholdEvaluator(THRESHOLDS, start_time=T0, warmup_ms=5000)
+    feed(evaluator, 5, 50)
+    assert not evaluator.evaluate(T0 + 10_000)
+    assert evaluator.evaluate(T0 + 16_000)
+    assert evaluator.failure_reasons[0].startswith("throughput")
+
+
+def metrics(throughput=5.0, error_rate=0.1):
+    return AggregateMetrics(
+        totalRequests=100,
+        successfulRequests=round(100 * (1 - error_rate)),
+        failedRequests=round(100 * error_rate),
+        errorRate=error_rate,
+        throughput=throughput,
+        responseTime=ResponseTimeMetrics(
+            min=1, max=2, mean=1, median=1, p90=1, p95=1, p99=2
+        ),
+        bandwidth=BandwidthMetrics(
+            sent=0, received=0, avgSentPerSecond=0, avgReceivedPerSecond=0
+        ),
+    )
+
+
+def test_final_reasons_check_overall_metrics():
+    evaluator = ThresholdEvaluator(THRESHOLDS, start_time=T0)
+    reasons = evaluator.final_reasons(metrics())
+    assert [r.split()[0] for r in reasons] == ["error", "throughput"]
+
+
+def test_snapshot_reasons_skip_throughput_during_warmup():
+    evaluator = ThresholdEvaluator(
+        THRESHOLDS, start_time=T0, window_ms=2000, warmup_ms=5000
+    )
+    # A linear ramp: the overall average stays below 10 req/s for a while.
+    for second in range(10):
+        rps = min(second + 1, 5) * 4
+        for i in range(rps):
+            evaluator.observe(T0 + second * 1000 + i * 1000 / rps, 100.0, True)
+    ramping = metrics(throughput=4.0, error_rate=0.0)
+    assert evaluator.final_reasons(ramping, elapsed_ms=4000) == []
+    # After the warm-up the current window (20 req/s) is what counts.
+    assert evaluator.final_reasons(ramping, elapsed_ms=9999) == []
+    assert evaluator.final_reasons(ramping) != []
+
+    stalled = ThresholdEvaluator(
+        THRESHOLDS, start_time=T0, window_ms=2000, warmup_ms=5000
+    )
+    feed(stalled, 10, 5)
+    reasons = stalled.final_reasons(ramping, elapsed_ms=9999)
+    assert reasons and reasons[0].startswith("throughput")
@@ -0,0 +1,322 @@
+"""Shared single-flight token refresh."""
+
+import asyncio
+import json
+
+import pytest
+
+from floweb_models.http_client import HttpClient
+from floweb_models.load_engine import LoadEngine
+from floweb_models.performance_test import (
+    LoadTestConfiguration,
+    LoadTestThresholds,
+    RecordedRequest,
+    TokenRefreshConfig,
+)
+from floweb_models.token_refresh import (
+    TokenManager,
+    TokenRefreshError,
+    compile_token_path,
+)
+
+
+class AuthServer:
+    """Issues numbered tokens on ``/token``; ``/api`` wants the latest one."""
+
+    def __init__(self, expires_in=None, delay=0.0) -> None:
+        self.expires_in = expires_in
+        self.delay = delay
+        self.issued = 0
+        self.token_requests: list[bytes] = []
+        self.rejected = 0
+
+    async def __aenter__(self) -> "AuthServer":
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def rotate(self) -> None:
+        """Invalidate the current token, as a server-side expiry would."""
+        self.issued += 1
+
+    async def handle(self, reader, writer) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                body = await reader.readexactly(length)
+                if head.startswith(b"POST /token "):
+                    self.token_requests.append(body)
+                    await asyncio.sleep(self.delay)
+                    self.issued += 1
+                    document = {"data": {"access": [f"t{self.issued}"]}}
+                    if self.expires_in:
+                        document["expires_in"] = self.expires_in
+                    payload = json.dumps(document).encode()
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s"
+                        % (len(payload), payload)
+                    )
+                elif b"\r\nX-Token: Token t%d\r\n" % self.issued in head:
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                else:
+                    self.rejected += 1
+                    writer.write(
+                        b"HTTP/1.1 401 Unauthorized\r\nContent-Length: 0\r\n\r\n"
+                    )
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+
+def token_config(url: str, **kwargs) -> TokenRefreshConfig:
+    values = {
+        "refresh_url": f"{url}/token",
+        "refresh_body": {"grant_type": "client_credentials"},
+        "token_path": "$.data.access[0]",
+        "token_header": "X-Token",
+        "token_prefix": "Token",
+    }
+    values.update(kwargs)
+    return TokenRefreshConfig(**values)
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("token", "a"),
+        ("$.token", "a"),
+        ("nested.items[1]['odd-key']", "c"),
+        ("$['nested'][\"items\"][-1].odd-key", "c"),
+    ],
+)
+def test_compile_token_path(path, expected):
+    document = {"token": "a", "nested": {"items": [{}, {"odd-key": "c"}]}}
+    assert compile_token_path(path)(document) == expected
+
+
+def test_compile_token_path_errors():
+    with pytest.raises(ValueError):
+        compile_token_path("a[0")
+    with pytest.raises(ValueError):
+        compile_token_path("$")
+    with pytest.raises(LookupError):
+        compile_token_path("a.b")({"a": []})
+
+
+def test_concurrent_refreshes_share_one_request():
+    async def main():
+        async with AuthServer(delay=0.05) as server, HttpClient() as client:
+            manager = TokenManager(token_config(server.url), client)
+            results = await asyncio.gather(*(manager.refresh() for _ in range(20)))
+            stale, _ = manager.published
+            await asyncio.gather(*(manager.refresh_after(stale) for _ in range(20)))
+            await asyncio.gather(*(manager.refresh_after(stale) for _ in range(20)))
+            return server, manager, results
+
+    server, manager, results = asyncio.run(main())
+    assert len(set(results)) == 1
+    assert results[0] == (1, b"X-Token: Token t1\r\n")
+    assert len(server.token_requests) == 2
+    assert json.loads(server.token_requests[0]) == {"grant_type": "client_credentials"}
+    assert manager.token == "t2"
+
+
+def test_refreshes_proactively_before_expiry():
+    async def main():
+        async with AuthServer(expires_in=0.2) as server, HttpClient() as client:
+            manager = TokenManager(
+                token_config(server.url, refresh_interval=60), client
+            )
+            await manager.start()
+            await asyncio.sleep(0.5)
+            await manager.close()
+            return server, manager
+
+    server, manager = asyncio.run(main())
+    # expires_in (0.2 s) is shorter than refresh_interval; refreshed at 0.18 s.
+    assert len(server.token_requests) == 3
+    assert manager.token == "t3"
+
+
+def test_keeps_refreshing_after_a_token_without_expiry():
+    async def main():
+        async with AuthServer() as server, HttpClient() as client:
+            manager = TokenManager(token_config(server.url), client)
+            await manager.start()
+            await asyncio.sleep(0.05)
+            # A 401-driven refresh brings a token that does expire.
+            server.expires_in = 0.2
+            await manager.refresh()
+            await asyncio.sleep(0.3)
+            await manager.close()
+            return server, manager
+
+    server, manager = asyncio.run(main())
+    # t1 has no expiry; t2 expires after 0.2 s and is refreshed at 0.18 s.
+    assert len(server.token_requests) == 3
+    assert manager.token == "t3"
+
+
+def test_failed_refresh_raises():
+    async def main():
+        async with AuthServer() as server, HttpClient() as client:
+            manager = TokenManager(
+                token_config(server.url, token_path="missing"), client
+            )
+            await manager.refresh()
+
+    with pytest.raises(TokenRefreshError, match="missing"):
+        asyncio.run(main())
+
+
+async def serve(responses):
+    """A server answering each request with the next of ``responses``."""
+    replies = iter(responses)
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(head.lower().partition(b"content-length: ")[2][:4] or 0)
+                await reader.readexactly(length)
+                writer.write(next(replies))
+        except (asyncio.IncompleteReadError, ConnectionError, StopIteration):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def token_response(token: str, **extra) -> bytes:
+    payload = json.dumps({"data": {"access": [token]}, **extra}).encode()
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (
+        len(payload),
+        payload,
+    )
+
+
+@pytest.mark.parametrize("token", ["t\r\nX-Injected: 1", "t\nX", "caf\u20ac"])
+def test_tokens_that_cannot_go_into_a_header_are_rejected(token):
+    async def main():
+        server, url = await serve([token_response(token)])
+        async with HttpClient() as client:
+            manager = TokenManager(token_config(url), client)
+            try:
+                await manager.refresh()
+            finally:
+                server.close()
+            return manager
+
+    with pytest.raises(TokenRefreshError):
+        asyncio.run(main())
+
+
+def test_proactive_refresh_survives_a_malformed_response():
+    async def main():
+        server, url = await serve(
+            [
+                token_response("t1", expires_in=0.1),
+                b"garbage\r\n\r\n",
+                token_response("t2", expires_in=60),
+            ]
+        )
+        async with HttpClient() as client:
+            manager = TokenManager(token_config(url), client, retry_delay=0.05)
+            await manager.start()
+            await asyncio.sleep(0.3)
+            alive = not manager._task.done()
+            await manager.close()
+        server.close()
+        return manager, alive
+
+    manager, alive = asyncio.run(main())
+    assert alive
+    assert manager.token == "t2"
+
+
+def test_engine_sends_current_token_and_recovers_from_401():
+    async def main():
+        async with AuthServer() as server:
+            config = LoadTestConfiguration(
+                targetUrl=server.url,
+                duration=1,
+                virtualUsers=10,
+                thinkTime=5,
+                includeRequests=["api"],
+                thresholds=LoadTestThresholds(
+                    maxResponseTime=1000, maxErrorRate=1, minThroughput=0
+                ),
+                authConfig={"token_refresh": token_config(server.url)},
+            )
+            request = RecordedRequest(
+                id="api",
+                url="https://recorded.example.com/api",
+                method="GET",
+                headers={"x-token": "recorded"},
+                timestamp=0,
+                resourceType="fetch",
+            )
+            engine = LoadEngine(config, [request], duration=0.4)
+            events = []
+            async for event in engine.stream():
+                events.append(event)
+                if len(events) == 50:
+                    server.rotate()
+            return server, events
+
+    server, events = asyncio.run(main())
+    # One token for the start and one after the rotation: the 401s of all
+    # ten users in flight share a single refresh.
+    assert len(server.token_requests) == 2
+    assert 0 < server.rejected <= 10
+    assert sum(not event.execution.success for event in events) == server.rejected
+    assert events[-1].execution.success
+
+
+def test_engine_closes_its_client_when_the_first_token_fetch_fails(monkeypatch):
+    closed = []
+
+    class RecordingClient(HttpClient):
+        async def close(self) -> None:
+            closed.append(self)
+            await super().close()
+
+    monkeypatch.setattr("floweb_models.load_engine.HttpClient", RecordingClient)
+
+    async def main():
+        async with AuthServer() as server:
+            config = LoadTestConfiguration(
+                targetUrl=server.url,
+                duration=1,
+                virtualUsers=2,
+                thinkTime=5,
+                includeRequests=["api"],
+                thresholds=LoadTestThresholds(
+                    maxResponseTime=1000, maxErrorRate=1, minThroughput=0
+                ),
+                authConfig={
+                    "token_refresh": token_config(server.url, token_path="missing")
+                },
+            )
+            request = RecordedRequest(
+                id="api",
+                url="https://recorded.example.com/api",
+                method="GET",
+                headers={},
+                timestamp=0,
+                resourceType="fetch",
+            )
+            engine = LoadEngine(config, [request], duration=0.2)
+            async for _ in engine.stream():
+                pass
+
+    with pytest.raises(TokenRefreshError):
+        asyncio.run(main())
+    assert len(closed) == 1
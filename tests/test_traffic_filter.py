@@ -0,0 +1,119 @@
+"""Compiled filterPatterns / onlySameDomain matching."""
+
+import fnmatch
+import random
+import re
+from pathlib import Path
+
+import pytest
+
+from floweb_models.performance_test import PerformanceTest
+from floweb_models.traffic_filter import TrafficFilter, url_host
+
+EXAMPLE = (
+    Path(__file__).resolve().parent.parent
+    / "examples"
+    / "performance-test-example.json"
+)
+
+
+@pytest.mark.parametrize(
+    "url, host",
+    [
+        ("https://API.example.com/a", "api.example.com"),
+        ("http://user:pw@example.com:8080?x=1", "example.com"),
+        ("https://[::1]:443/", "[::1]"),
+        ("https://example.com#top", "example.com"),
+    ],
+)
+def test_url_host(url, host):
+    assert url_host(url) == host
+
+
+def test_suffix_globs_ignore_query_and_match_multi_dot_names():
+    traffic = TrafficFilter(["*.js", "*.min.css"])
+    assert traffic.excludes("https://x.com/static/app.js?v=3")
+    assert traffic.excludes("https://x.com/a/b.min.css")
+    assert not traffic.excludes("https://x.com/a/b.css")
+    assert not traffic.excludes("https://x.com/app.json")
+    assert not traffic.excludes("https://x.com/js/app")
+
+
+def test_globs_and_regexes():
+    traffic = TrafficFilter(
+        ["https://cdn.*", "*/analytics/?*", "re:[?&]track=", "/\\.(woff2?|ttf)$/"]
+    )
+    assert traffic.excludes("https://cdn.example.com/a")
+    assert traffic.excludes("https://x.com/analytics/collect")
+    assert not traffic.excludes("https://x.com/analytics/")
+    assert traffic.excludes("https://x.com/api?a=1&track=1")
+    assert traffic.excludes("https://x.com/font.woff2")
+    assert not traffic.excludes("https://x.com/api/users")
+    assert TrafficFilter().allows("https://anything")
+
+
+def test_same_domain():
+    traffic = TrafficFilter(target_url="https://www.example.com/app", same_domain=True)
+    assert traffic.target_host == "www.example.com"
+    assert traffic.allows("https://example.com/")
+    assert traffic.allows("https://api.example.com/v1")
+    assert not traffic.allows("https://notexample.com/")
+    assert not traffic.allows("https://example.com.evil.io/")
+    with pytest.raises(ValueError):
+        TrafficFilter(same_domain=True)
+
+
+def test_for_test_filters_example_recording():
+    test = PerformanceTest.model_validate_json(EXAMPLE.read_text())
+    extra = test.recordedRequests[0].model_copy
+    requests = [
+        *test.recordedRequests,
+        extra(update={"id": "js", "url": "https://api.example.com/app.js"}),
+        extra(update={"id": "cdn", "url": "https://cdn.other.com/lib"}),
+    ]
+    kept = TrafficFilter.for_test(test).filter(requests)
+    assert [request.id for request in kept] == ["req-1", "req-2"]
+
+
+def test_matches_pattern_by_pattern_reference():
+    rng = random.Random(3)
+    words = ["api", "static", "img", "v1", "users", "app", "cdn", "x"]
+    exts = [".js", ".css", ".png", ".json", ".html", ""]
+    patterns = [f"*.{ext[1:]}" for ext in exts if ext] + [
+        "*/static/*",
+        "https://img.*",
+        "*users?",
+        "*/v[12]/*",
+        "*[!a-c]s.png",
+    ]
+    traffic = TrafficFilter(patterns)
+    for _ in range(500):
+        path = "/".join(rng.choices(words, k=rng.randint(1, 4)))
+        url = f"https://{rng.choice(words)}.example.com/{path}{rng.choice(exts)}"
+        expected = any(fnmatch.fnmatchcase(url, pattern) for pattern in patterns)
+        assert traffic.excludes(url) == expected, url
+        assert traffic.excludes(url + "?q=1") == expected
+
+
+def test_regexes_with_flags_and_groups():
+    traffic = TrafficFilter(
+        [
+            "re:(?i)\\.JS$",
+            "/(?x) track= # tracking parameter/",
+            "re:(?P<n>a+)b(?P=n)",
+            "re:(?P<n>x+)y(?P=n)",
+            "re:^https://(\\w+)\\.\\1\\.com",
+            "re:/beacon",
+        ]
+    )
+    assert traffic.excludes("https://x.com/app.js")
+    assert traffic.excludes("https://x.com/?track=1")
+    assert traffic.excludes("https://x.com/aabaa")
+    assert not traffic.excludes("https://x.com/aab")
+    assert traffic.excludes("https://x.com/xyx")
+    assert traffic.excludes("https://ab.ab.com/")
+    assert not traffic.excludes("https://ab.cd.com/")
+    assert traffic.excludes("https://x.com/beacon")
+    assert not traffic.excludes("https://x.com/api")
+    with pytest.raises(re.error):
+        TrafficFilter(["re:a(?i)b"])
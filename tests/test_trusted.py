@@ -0,0 +1,117 @@
+"""Trusted loading of flows and reports written by Floweb itself."""
+
+import copy
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from floweb_models.flow import Action, Flow, LastResult
+from floweb_models.trusted import (
+    from_trusted_json,
+    is_materialized,
+    summary_first_json,
+    summary_from_json,
+    untrusted,
+)
+
+FLOW_JSON = (
+    Path(__file__).resolve().parent.parent / "examples" / "flow-example.json"
+).read_bytes()
+
+
+def test_trusted_flow_defers_nested_fields():
+    flow = from_trusted_json(Flow, FLOW_JSON)
+    assert isinstance(flow, Flow)
+    assert flow.id == "flow-123"
+    assert not is_materialized(flow)
+
+    assert isinstance(flow.actions[0], Action)
+    flow.materialize()
+    assert is_materialized(flow)
+
+
+def test_trusted_flow_matches_validated_flow():
+    validated = Flow.model_validate_json(FLOW_JSON)
+    assert from_trusted_json(Flow, FLOW_JSON) == validated
+    assert (
+        from_trusted_json(Flow, FLOW_JSON).model_dump_json()
+        == validated.model_dump_json()
+    )
+
+
+def test_deferred_enum_is_converted_on_access():
+    flow = from_trusted_json(
+        Flow, b'{"id":"f","name":"f","actions":[],"edges":[],' b'"lastResult":"failed"}'
+    )
+    assert flow.lastResult is LastResult.failed
+
+
+def test_trusted_instances_copy_and_pickle_as_plain_models():
+    validated = Flow.model_validate_json(FLOW_JSON)
+    restored = pickle.loads(pickle.dumps(from_trusted_json(Flow, FLOW_JSON)))
+    assert type(restored) is Flow
+    assert restored == validated
+    assert copy.deepcopy(from_trusted_json(Flow, FLOW_JSON)) == validated
+    assert type(untrusted(from_trusted_json(Flow, FLOW_JSON))) is Flow
+
+
+def test_verify_rate_runs_full_validation():
+    bad = b'{"id":"f","name":"f","actions":[{"id":1}],"edges":[]}'
+    from_trusted_json(Flow, bad)  # trusted: not checked
+    with pytest.raises(ValidationError):
+        from_trusted_json(Flow, bad, verify_rate=1.0)
+
+
+def test_summary_reads_the_scalar_head_and_defers_the_rest():
+    validated = Flow.model_validate_json(FLOW_JSON)
+    data = summary_first_json(validated)
+    assert Flow.model_validate_json(data) == validated
+
+    flow = summary_from_json(Flow, data)
+    pending = flow.__pydantic_private__["_trusted_pending"]
+    assert {"actions", "edges", "tags", "lastResult"} <= pending
+    assert flow.__dict__["actions"] is flow.__dict__["edges"]  # One tail.
+    assert (flow.id, flow.name) == ("flow-123", "Login and Navigate Flow")
+    assert flow.lastResult is LastResult.passed
+    assert "actions" in pending
+    assert "actions" not in flow.model_fields_set
+
+    assert isinstance(flow.actions[0], Action)
+    assert "actions" in flow.model_fields_set
+    assert flow == validated
+    assert is_materialized(flow)
+
+
+def test_summary_fields_assigned_before_the_tail_is_loaded_are_kept():
+    validated = Flow.model_validate_json(FLOW_JSON)
+    flow = summary_from_json(Flow, summary_first_json(validated))
+    flow.actions = []
+    assert flow.edges == validated.edges  # Loads the tail.
+    assert flow.actions == []
+    assert flow.model_dump()["actions"] == []
+    assert flow == validated.model_copy(update={"actions": []})
+
+
+def test_summary_of_documents_in_any_member_order():
+    validated = Flow.model_validate_json(FLOW_JSON)
+    flow = summary_from_json(Flow, FLOW_JSON)  # "tags" comes third.
+    assert flow.id == "flow-123"
+    assert isinstance(flow.__dict__["lastResult"], type(flow.__dict__["actions"]))
+    assert flow.lastResult is LastResult.passed
+    assert flow == validated
+    assert pickle.loads(pickle.dumps(flow)) == validated
+
+
+def test_summary_handles_escapes_and_brackets_in_strings():
+    document = json.loads(FLOW_JSON)
+    document["id"] = 'a"b\\c'
+    document["name"] = "x [y] {z}: 1, 2"
+    document["actions"][0]["data"]["config"]["s"] = "]}"
+    data = json.dumps(document, indent=1)
+    flow = summary_from_json(Flow, data)
+    assert flow.id == 'a"b\\c' and flow.name == "x [y] {z}: 1, 2"
+    assert flow == Flow.model_validate_json(data)
+    assert summary_from_json(Flow, "{}").model_fields_set == set()
@@ -0,0 +1,64 @@
+"""Typed action configs discriminated on ``ActionData.type``."""
+
+import json
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from floweb_models.action_configs import ClickConfig, NavigateConfig
+from floweb_models.flow import ActionData
+from floweb_models.typed_actions import ACTION_CONFIG_TYPES, TypedAction, TypedFlow
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+
+
+def _action(action_type, config):
+    return {
+        "id": "a1",
+        "type": action_type,
+        "position": {"x": 0, "y": 0},
+        "data": {"label": "step", "type": action_type, "config": config},
+    }
+
+
+def test_example_flow_configs_are_typed():
+    flow = TypedFlow.model_validate_json((EXAMPLES / "flow-example.json").read_text())
+    for action in flow.actions:
+        assert type(action.data.config) is ACTION_CONFIG_TYPES[action.data.type]
+
+
+def test_config_model_follows_action_type():
+    # An empty config is valid for many models; the type alone decides.
+    action = TypedAction.model_validate(_action("click", {}))
+    assert isinstance(action.data.config, ClickConfig)
+
+
+def test_config_errors_point_at_the_single_candidate():
+    with pytest.raises(ValidationError) as info:
+        TypedAction.model_validate(_action("navigate", {"waitForLoad": True}))
+    errors = info.value.errors()
+    assert len(errors) == 1
+    assert errors[0]["loc"] == ("data", "navigate", "config", "url")
+
+
+def test_unknown_action_type_keeps_untyped_config():
+    action = TypedAction.model_validate(_action("custom_plugin", {"anything": 1}))
+    assert type(action.data) is ActionData
+    assert action.data.config == {"anything": 1}
+
+
+def test_typed_flow_round_trips_to_plain_json():
+    raw = _action("navigate", {"url": "https://example.com"})
+    flow = TypedFlow.model_validate(
+        {"id": "f", "name": "f", "actions": [raw], "edges": []}
+    )
+    dumped = json.loads(flow.model_dump_json())
+    assert isinstance(flow.actions[0].data.config, NavigateConfig)
+    assert dumped["actions"][0]["data"]["config"]["url"] == "https://example.com"
+
+
+@pytest.mark.parametrize("action_type", [["click"], {"a": 1}])
+def test_unhashable_action_types_fail_validation(action_type):
+    with pytest.raises(ValidationError):
+        TypedAction.model_validate(_action(action_type, {}))
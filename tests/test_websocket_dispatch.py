@@ -0,0 +1,85 @@
+"""Discriminated parsing of WebSocket command and response frames."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from floweb_models.websocket_communication import (
+    DebugResponse,
+    DebugStepCommand,
+    EngineStatusResponse,
+    RecordingResponse,
+    RunCommand,
+    WebSocketResponse,
+)
+from floweb_models.websocket_dispatch import parse_command, parse_response
+
+
+def _frame(payload):
+    return json.dumps(payload).encode()
+
+
+def test_parse_command_dispatches_on_command():
+    command = parse_command(_frame({"command": "debug_step", "session_id": "s1"}))
+    assert type(command) is DebugStepCommand
+    assert command.session_id == "s1"
+
+    run = parse_command(
+        _frame(
+            {
+                "command": "run",
+                "flow": {"id": "f", "name": "f", "actions": [], "edges": []},
+            }
+        )
+    )
+    assert type(run) is RunCommand
+
+
+def test_parse_command_rejects_unknown_command():
+    with pytest.raises(ValidationError):
+        parse_command(_frame({"command": "self_destruct"}))
+
+
+def test_parse_command_reports_only_the_matching_model():
+    with pytest.raises(ValidationError) as info:
+        parse_command(_frame({"command": "pause_recording"}))
+    assert [e["loc"] for e in info.value.errors()] == [
+        ("pause_recording", "session_id")
+    ]
+
+
+@pytest.mark.parametrize(
+    "payload, model",
+    [
+        (
+            {
+                "command": "get_engine_status",
+                "success": True,
+                "status": "ok",
+                "uptime": 3,
+                "active_sessions": 1,
+            },
+            EngineStatusResponse,
+        ),
+        ({"command": "finish_recording", "success": True}, RecordingResponse),
+        ({"command": "debug_error", "success": False, "error": "x"}, DebugResponse),
+        ({"command": "something_new", "success": True}, WebSocketResponse),
+    ],
+)
+def test_parse_response_dispatches_on_command(payload, model):
+    assert type(parse_response(_frame(payload))) is model
+
+
+def test_failed_response_without_payload_falls_back_to_base_model():
+    response = parse_response(
+        _frame({"command": "run", "success": False, "message": "browser crashed"})
+    )
+    assert type(response) is WebSocketResponse
+    assert response.message == "browser crashed"
+
+
+@pytest.mark.parametrize("command", [[1], {"a": 1}, 7, None])
+def test_responses_with_odd_command_values_fail_validation(command):
+    with pytest.raises(ValidationError):
+        parse_response(_frame({"command": command, "success": True}))
@@ -0,0 +1,214 @@
+"""Compact WebSocket frames and JSON fallback."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from floweb_models import codecs
+from floweb_models.debug import DebugActionUpdate, DebugState, PauseReason, Type
+from floweb_models.flow import Flow
+from floweb_models.websocket_communication import (
+    DebugResponse,
+    EngineStatusResponse,
+    GetEngineStatusCommand,
+    GetLatestRealtimeActionCommand,
+    GetRealtimeActionsCommand,
+    RunResponse,
+    WebSocketResponse,
+)
+from floweb_models.wire_format import (
+    COMPACT_PROTOCOL,
+    FRAME_KINDS,
+    JSON_PROTOCOL,
+    Channel,
+    FrameError,
+    RealtimeActionsResponse,
+    negotiate,
+)
+
+pytest.importorskip("msgpack")
+
+FLOW = Flow.model_validate_json(
+    (
+        Path(__file__).resolve().parent.parent / "examples" / "flow-example.json"
+    ).read_bytes()
+)
+UPDATE = DebugActionUpdate(
+    type=Type.debug_paused,
+    sessionId="debug-session-8f14e45f",
+    actionId="action-3",
+    actionIndex=2,
+    state=DebugState.paused,
+    pauseReason=PauseReason.breakpoint,
+    result={"ok": True, "items": [1, 2.5, None, "ü"]},
+    variables={"user": {"name": "ann"}},
+)
+MESSAGES = [
+    UPDATE,
+    DebugActionUpdate(
+        type="debug_action_started", sessionId="s", state="running", actionIndex=0
+    ),
+    EngineStatusResponse(
+        command="get_engine_status",
+        success=True,
+        status="running",
+        uptime=3600,
+        active_sessions=2,
+    ),
+    RealtimeActionsResponse(
+        command="get_realtime_actions",
+        success=True,
+        session_id="rec-1",
+        actions=FLOW.actions,
+    ),
+    RealtimeActionsResponse(
+        command="get_latest_realtime_action",
+        success=True,
+        message="1 action",
+        session_id="rec-1",
+        actions=FLOW.actions[-1:],
+    ),
+    GetRealtimeActionsCommand(
+        command="get_realtime_actions", session_id="rec-1", flow_id="flow-9"
+    ),
+    GetLatestRealtimeActionCommand(
+        command="get_latest_realtime_action", session_id="rec-1"
+    ),
+    GetEngineStatusCommand(command="get_engine_status"),
+]
+
+
+def pair(protocol=COMPACT_PROTOCOL):
+    return Channel(protocol), Channel(protocol)
+
+
+@pytest.mark.parametrize("protocol", [COMPACT_PROTOCOL, JSON_PROTOCOL])
+def test_messages_round_trip_in_order(protocol):
+    sender, receiver = pair(protocol)
+    for _ in range(2):  # The second pass uses interned ids.
+        for message in MESSAGES:
+            frame = sender.encode(message)
+            assert isinstance(frame, bytes if protocol == COMPACT_PROTOCOL else str)
+            decoded = receiver.decode(frame)
+            assert type(decoded) is type(message)
+            assert decoded == message
+
+
+def test_compact_frames_are_smaller_and_intern_ids():
+    sender, receiver = pair()
+    first = sender.encode(UPDATE)
+    second = sender.encode(UPDATE)
+    assert b"debug-session-8f14e45f" in first
+    assert b"debug-session-8f14e45f" not in second
+    assert len(second) < len(first) < len(UPDATE.model_dump_json())
+    assert b"paused" not in first and b"pauseReason" not in first
+    assert receiver.decode(first) == receiver.decode(second) == UPDATE
+
+
+def test_intern_table_is_bounded(monkeypatch):
+    monkeypatch.setattr("floweb_models.wire_format.INTERN_LIMIT", 1)
+    sender, receiver = pair()
+    for session in ("a", "b", "b", "a"):
+        message = GetLatestRealtimeActionCommand(
+            command="get_latest_realtime_action", session_id=session
+        )
+        assert receiver.decode(sender.encode(message)) == message
+    assert sender._sent == {"a": 0} and receiver._received == ["a"]
+
+
+def test_other_messages_fall_back_to_json():
+    sender, receiver = pair()
+    for message in (
+        RunResponse(command="run", success=True, mode="full", reports=[]),
+        DebugResponse(command="debug_step", success=True),
+        WebSocketResponse(command="get_realtime_actions", success=False, message="x"),
+    ):
+        frame = sender.encode(message)
+        assert frame == message.model_dump_json(exclude_unset=True)
+        decoded = receiver.decode(frame)
+        assert type(decoded) is type(message) and decoded == message
+
+
+def test_decode_accepts_json_from_legacy_senders():
+    receiver = Channel(COMPACT_PROTOCOL)
+    assert receiver.decode(UPDATE.model_dump_json().encode()) == UPDATE
+    response = MESSAGES[3]
+    assert receiver.decode(response.model_dump_json()) == response
+    command = json.dumps({"command": "get_engine_status"})
+    assert type(receiver.decode(command)) is GetEngineStatusCommand
+    with pytest.raises(FrameError):
+        receiver.decode("[1, 2]")
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [[99], [0, 42, 1], [0, -1, 1], [1, 2, 5], [0, 0, 100], "not a frame"],
+)
+def test_malformed_frames_raise(frame):
+    data = codecs.get_codec("msgpack").encode(frame)
+    if isinstance(frame, str):
+        data = b"\x92\xc1"
+    with pytest.raises(FrameError):
+        Channel(COMPACT_PROTOCOL).decode(data)
+
+
+def test_negotiate(monkeypatch):
+    assert negotiate(["floweb.json", COMPACT_PROTOCOL]) == COMPACT_PROTOCOL
+    assert negotiate([JSON_PROTOCOL]) == JSON_PROTOCOL
+    assert negotiate([]) == JSON_PROTOCOL
+
+    def missing():
+        raise ModuleNotFoundError("No module named 'msgpack'", name="msgpack")
+
+    monkeypatch.setitem(codecs._FACTORIES, "msgpack", missing)
+    monkeypatch.setattr(codecs, "_CODECS", {})
+    assert negotiate([COMPACT_PROTOCOL]) == JSON_PROTOCOL
+    with pytest.raises(ValueError, match="unknown protocol"):
+        Channel("floweb.xml")
+
+
+def test_json_channel_never_sends_compact_frames():
+    receiver = Channel(JSON_PROTOCOL)
+    receiver.decode(Channel(COMPACT_PROTOCOL).encode(UPDATE))
+    assert isinstance(receiver.encode(UPDATE), str)
+
+
+def test_codes_are_pinned():
+    # Frame kinds, tags and enum codes are the wire protocol: changing their
+    # order breaks peers on the same protocol version.
+    assert [(model.__name__, command) for model, command, _ in FRAME_KINDS] == [
+        ("DebugActionUpdate", None),
+        ("EngineStatusResponse", "get_engine_status"),
+        ("RealtimeActionsResponse", "get_realtime_actions"),
+        ("RealtimeActionsResponse", "get_latest_realtime_action"),
+        ("GetRealtimeActionsCommand", "get_realtime_actions"),
+        ("GetLatestRealtimeActionCommand", "get_latest_realtime_action"),
+        ("GetEngineStatusCommand", "get_engine_status"),
+    ]
+    assert [name for name, _ in FRAME_KINDS[0][2]] == [
+        "type",
+        "sessionId",
+        "actionId",
+        "actionIndex",
+        "state",
+        "pauseReason",
+        "result",
+        "error",
+        "variables",
+    ]
+    assert [m.value for m in DebugState] == [
+        "ready",
+        "running",
+        "paused",
+        "stepping",
+        "completed",
+        "error",
+        "stopped",
+    ]
+    assert [m.value for m in PauseReason] == ["breakpoint", "manual", "error", "step"]
+    assert [m.value for m in Type][:3] == [
+        "debug_action_started",
+        "debug_action_completed",
+        "debug_action_failed",
+    ]